@@ -0,0 +1,169 @@
+import asyncio
+import logging
+import time
+from blob_metrics import record_listing, sdk_hooks
+from blob_snapshot import BlobSnapshot, entry_from_blob
+from blob_storage import ListingCancelled
+
+# 비동기 백엔드는 선택 사항입니다. aiohttp가 없으면 스레드 기반 백엔드를 사용합니다.
+try:
+    import aiohttp
+    from azure.core.pipeline.transport import AioHttpTransport
+    from azure.storage.blob.aio import BlobServiceClient as AsyncBlobServiceClient
+except ImportError:
+    aiohttp = None
+
+try:
+    import qasync
+except ImportError:
+    qasync = None
+
+
+def async_backend_available():
+    """비동기 백엔드에 필요한 패키지(aiohttp, qasync)가 설치되어 있는지 확인합니다."""
+    return aiohttp is not None and qasync is not None
+
+
+def install_qt_event_loop(app):
+    """Qt 이벤트 루프 위에서 asyncio 코루틴이 실행되도록 qasync 이벤트 루프를 설치하고 반환합니다."""
+    loop = qasync.QEventLoop(app)
+    asyncio.set_event_loop(loop)
+    return loop
+
+
+class AsyncBlobEngine:
+    """azure.storage.blob.aio 클라이언트로 목록 조회를 코루틴으로 실행하는 엔진입니다.
+
+    모든 계정의 클라이언트가 하나의 aiohttp 세션(연결 풀, keep-alive)을 공유하며, 동시에 보내는 요청 수는
+    전체(async_max_requests)와 계정별 목록 조회(list_per_account_concurrency) 세마포어로 제한합니다.
+    파일 전송과 삭제는 백엔드와 관계없이 전송 대기열(TransferManager)에서 실행됩니다.
+    """
+
+    def __init__(self, config):
+        self.config = config
+        self.max_requests = int(config.get('async_max_requests') or 64)
+        self.per_account_concurrency = max(1, int(config.get('list_per_account_concurrency') or 4))
+        self.container_timeout = config.get('list_container_timeout', 120)
+        self.probe_page_size = int(config.get('poll_probe_page_size') or 1000)
+
+        self._session = None
+        self._clients = {}  # 계정 이름 -> aio BlobServiceClient
+        self._request_slots = None
+        self._account_slots = {}
+
+    async def _ensure_open(self):
+        if self._session is not None:
+            return
+        connector = aiohttp.TCPConnector(
+            limit=self.max_requests,
+            limit_per_host=int(self.config.get('async_max_connections_per_host') or 32),
+            keepalive_timeout=int(self.config.get('async_keepalive_timeout') or 60),
+            ttl_dns_cache=300,
+        )
+        self._session = aiohttp.ClientSession(connector=connector)
+        self._request_slots = asyncio.Semaphore(self.max_requests)
+        logging.debug(f"비동기 엔진 시작. 최대 동시 요청: {self.max_requests}")
+
+    async def client_for(self, account):
+        """계정의 aio 클라이언트를 반환합니다. 모든 클라이언트는 같은 aiohttp 세션을 공유합니다."""
+        await self._ensure_open()
+        client = self._clients.get(account['account_name'])
+        if client is None:
+            transport = AioHttpTransport(session=self._session, session_owner=False)
+            client = AsyncBlobServiceClient.from_connection_string(account['connection_string'], transport=transport,
+                                                                   **sdk_hooks())
+            self._clients[account['account_name']] = client
+        return client
+
+    async def close(self):
+        """클라이언트와 공유 세션을 닫습니다."""
+        for client in self._clients.values():
+            await client.close()
+        self._clients.clear()
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    # --- 목록 조회 ---
+
+    async def list_container(self, account, container, cancel_event=None, probe=None):
+        """컨테이너의 전체 블랍 목록을 조회해 BlobSnapshot으로 반환합니다.
+
+        probe의 의미는 BlobStorageHandler.list_container와 같으며, 첫 페이지가 같으면 None을 반환합니다.
+        """
+        started = time.perf_counter()
+        stats = {'pages': 0, 'blobs': 0}
+        try:
+            snapshot = await self._list_pages(account, container, cancel_event, probe, stats)
+        except (ListingCancelled, asyncio.CancelledError):
+            raise
+        except Exception:
+            record_listing(account['account_name'], container, time.perf_counter() - started,
+                           stats['pages'], stats['blobs'], 'error')
+            raise
+        record_listing(account['account_name'], container, time.perf_counter() - started,
+                       stats['pages'], stats['blobs'], 'unchanged' if snapshot is None else 'full')
+        return snapshot
+
+    async def _list_pages(self, account, container, cancel_event, probe, stats):
+        client = await self.client_for(account)
+        container_client = client.get_container_client(container)
+        deadline = time.monotonic() + self.container_timeout if self.container_timeout else None
+        entries = []
+        continuation_token = None
+        if probe is not None:
+            first_page = container_client.list_blobs(results_per_page=self.probe_page_size).by_page()
+            async with self._request_slots:
+                try:
+                    page = await first_page.__anext__()
+                    entries.extend([entry_from_blob(blob) async for blob in page])
+                    stats['pages'] += 1
+                    stats['blobs'] = len(entries)
+                except StopAsyncIteration:
+                    pass
+            continuation_token = first_page.continuation_token
+            if not continuation_token:
+                return BlobSnapshot(entries)
+            if [(entry.name, entry.etag) for entry in entries] == probe:
+                return None
+        pages = container_client.list_blobs().by_page(continuation_token=continuation_token)
+        while True:
+            async with self._request_slots:
+                try:
+                    page = await pages.__anext__()
+                except StopAsyncIteration:
+                    break
+                entries.extend([entry_from_blob(blob) async for blob in page])
+                stats['pages'] += 1
+                stats['blobs'] = len(entries)
+            if cancel_event is not None and cancel_event.is_set():
+                raise ListingCancelled(container)
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"목록 조회가 {self.container_timeout}초를 초과했습니다. ({len(entries)}개까지 조회)")
+        return BlobSnapshot(entries)
+
+    async def iter_container_listings(self, accounts, cancel_event=None, probes=None):
+        """모든 계정의 컨테이너를 동시에 조회하고 끝나는 순서대로 (account, container, snapshot, error)를 생성합니다."""
+        probes = probes or {}
+
+        async def guarded(account, container):
+            slots = self._account_slots.setdefault(account['account_name'],
+                                                   asyncio.Semaphore(self.per_account_concurrency))
+            probe = probes.get((account['account_name'], container))
+            async with slots:
+                try:
+                    return account, container, await self.list_container(account, container, cancel_event, probe), None
+                except Exception as e:
+                    return account, container, None, e
+
+        tasks = [asyncio.ensure_future(guarded(account, container))
+                 for account in accounts for container in account['containers']]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                yield result
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,119 @@
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+
+BATCH_SIZE = 256  # Blob Batch 요청 하나에 담을 수 있는 최대 하위 요청 수
+
+
+class BlobBatchDeleter:
+    """Blob Batch API로 여러 블랍을 한 번의 요청에 최대 256개씩 묶어 삭제합니다.
+
+    배치는 스레드 풀에서 동시에 실행되며, 결과는 (삭제된 키 목록, [(실패한 키, 사유), ...])로 반환됩니다.
+    이미 없는 블랍(404)은 삭제된 것으로 봅니다.
+    """
+
+    def __init__(self, max_concurrency=4):
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='blob-batch')
+
+    def delete(self, account, keys, progress_callback=None, cancel_event=None):
+        """(컨테이너, 블랍 이름) 목록을 컨테이너별 배치로 나누어 삭제합니다.
+
+        progress_callback(처리한 수, 전체 수)는 작업 스레드에서 호출됩니다.
+        """
+        by_container = {}
+        for container, name in keys:
+            by_container.setdefault(container, []).append(name)
+
+        batches = []
+        for container, names in by_container.items():
+            for start in range(0, len(names), BATCH_SIZE):
+                batches.append((container, names[start:start + BATCH_SIZE]))
+        return self._run_batches(account, iter(batches), len(keys), progress_callback, cancel_event)
+
+    def delete_prefix(self, account, container, prefix, progress_callback=None, cancel_event=None):
+        """prefix 아래의 모든 블랍을 삭제합니다. 목록을 전부 모으지 않고 조회하는 대로 배치로 보냅니다.
+
+        전체 수를 미리 알 수 없으므로 progress_callback에는 전체 수 대신 None이 전달됩니다.
+        """
+        container_client = account['client'].get_container_client(container)
+        names = (blob.name for blob in container_client.list_blobs(name_starts_with=prefix or None))
+
+        def batches():
+            while True:
+                chunk = list(islice(names, BATCH_SIZE))
+                if not chunk:
+                    return
+                yield container, chunk
+
+        logging.info(f"경로 아래 전체 삭제 시작: {account['account_name']}/{container}/{prefix}")
+        return self._run_batches(account, batches(), None, progress_callback, cancel_event)
+
+    def _run_batches(self, account, batches, total, progress_callback, cancel_event):
+        deleted, failures = [], []
+        lock = threading.Lock()
+        # 동시에 실행 중인 배치 수를 제한해 prefix 삭제 시 목록이 메모리에 쌓이지 않도록 합니다.
+        slots = threading.BoundedSemaphore(self.max_concurrency * 2)
+        futures = []
+
+        def run(container, names):
+            try:
+                ok, failed = self._delete_batch(account, container, names)
+            finally:
+                slots.release()
+            with lock:
+                deleted.extend((container, name) for name in ok)
+                failures.extend(((container, name), reason) for name, reason in failed)
+                done = len(deleted) + len(failures)
+            if progress_callback:
+                progress_callback(done, total)
+
+        try:
+            for container, names in batches:
+                if cancel_event is not None and cancel_event.is_set():
+                    break
+                slots.acquire()
+                futures.append(self._executor.submit(run, container, names))
+        finally:
+            # 목록 조회가 실패하더라도 이미 보낸 배치는 끝까지 기다립니다.
+            for future in futures:
+                try:
+                    future.result()
+                except Exception as e:
+                    logging.error(f"배치 삭제 실행 중 오류: {e}")
+
+        logging.info(f"배치 삭제 완료: {len(deleted)}개 삭제, {len(failures)}개 실패")
+        return deleted, failures
+
+    def _delete_batch(self, account, container, names):
+        """배치 하나를 삭제하고 (삭제된 이름 목록, [(실패한 이름, 사유), ...])를 반환합니다."""
+        container_client = account['client'].get_container_client(container)
+        try:
+            responses = list(container_client.delete_blobs(*names, raise_on_any_failure=False))
+        except Exception as e:
+            # 배치 요청 자체가 거부된 경우(예: 배치를 지원하지 않는 인증 방식) 하나씩 삭제합니다.
+            logging.warning(f"배치 삭제 요청 실패, 개별 삭제로 전환합니다: {container}, 오류: {e}")
+            return self._delete_one_by_one(container_client, names)
+
+        ok, failed = [], []
+        for name, response in zip(names, responses):
+            if response.status_code in (200, 202, 404):
+                ok.append(name)
+            else:
+                failed.append((name, f"{response.status_code} {response.reason}"))
+        return ok, failed
+
+    @staticmethod
+    def _delete_one_by_one(container_client, names):
+        ok, failed = [], []
+        for name in names:
+            try:
+                container_client.delete_blob(name)
+                ok.append(name)
+            except Exception as e:
+                if getattr(e, 'status_code', None) == 404:
+                    ok.append(name)
+                else:
+                    failed.append((name, str(e)))
+        return ok, failed
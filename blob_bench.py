@@ -0,0 +1,411 @@
+import argparse
+import json
+import logging
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from blob_engine import BlobListing
+from blob_fakeservice import FakeBlobService
+from blob_index import BlobNameIndex, parse_query
+from blob_storage import BlobStorageHandler
+
+# 가짜 Blob 서비스(blob_fakeservice)로 목록 갱신, 전체 선택, 삭제, 다운로드/업로드의 규모별 성능을 측정합니다.
+#
+#   python blob_bench.py --blobs 1000,100000,1000000 --latency 0.02
+#   python blob_bench.py --baseline bench_baseline.json --threshold 0.2   # 기준보다 20% 넘게 느려지면 종료 코드 1
+#
+# 시나리오마다 별도 프로세스에서 실행해 최대 메모리(peak RSS)를 따로 잽니다.
+
+SCENARIOS = ('refresh', 'select_all', 'search', 'delete', 'copy', 'download', 'upload')
+TRANSFER_SCENARIOS = ('download', 'upload')
+MB = 1024 * 1024
+
+
+def peak_rss_mb():
+    """현재 프로세스의 최대 메모리 사용량(MB)을 반환합니다. 잴 수 없는 환경에서는 None을 반환합니다."""
+    try:
+        import resource
+    except ImportError:
+        return None  # Windows
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return round(peak / MB if sys.platform == 'darwin' else peak / 1024, 1)
+
+
+def make_handler(params):
+    config = {
+        'catalog_enabled': False,
+        'change_feed_cursor_path': os.path.join(tempfile.gettempdir(), 'blobmoni_bench_changefeed.json'),
+        'list_max_workers': params['list_max_workers'],
+        'list_per_account_concurrency': params['list_per_account_concurrency'],
+        'list_container_timeout': 0,
+        'poll_probe_page_size': params['page_size'],
+        'transfer_parallel_files': params['parallel_files'],
+        'copy_max_concurrency': params.get('copy_max_concurrency', 16),
+        'download_chunk_mb': params['chunk_mb'],
+        'upload_block_mb': params['chunk_mb'],
+    }
+    return BlobStorageHandler(config)
+
+
+def make_account(service):
+    return {'account_name': 'bench', 'client': service, 'connection_string': '', 'containers': list(service.containers),
+            'change_source': None, 'index': 1}
+
+
+def make_target(account):
+    """화면 반영 시간을 잴 목록 대상을 만듭니다. PyQt5가 있으면 실제 BlobTableModel을 사용합니다."""
+    try:
+        from blob_model import BlobTableModel
+    except ImportError:
+        target = BlobListing()
+    else:
+        target = BlobTableModel(account)
+    target.register_containers(account['containers'])
+    return target
+
+
+def run_refresh(handler, account, target, probes=None):
+    """목록 조회와 화면 반영을 GUI와 같은 순서(끝나는 컨테이너부터 반영)로 실행하고 (전체 시간, 반영 시간)을 반환합니다."""
+    started = time.perf_counter()
+    apply_seconds = 0.0
+    for _, container, snapshot, error in handler.iter_container_listings([account], None, probes):
+        if error is not None:
+            raise error
+        if snapshot is None:
+            continue
+        applied = time.perf_counter()
+        target.apply_snapshot(container, snapshot)
+        apply_seconds += time.perf_counter() - applied
+    return time.perf_counter() - started, apply_seconds
+
+
+def fill_target(params, blobs):
+    """지연 없이 목록을 채운 (service, handler, account, target)을 반환합니다."""
+    service = FakeBlobService(blobs, params['containers'], 0.0, params['page_size'])
+    handler = make_handler(params)
+    account = make_account(service)
+    target = make_target(account)
+    run_refresh(handler, account, target)
+    service.latency = params['latency']
+    return service, handler, account, target
+
+
+def bench_refresh(params, blobs):
+    service = FakeBlobService(blobs, params['containers'], params['latency'], params['page_size'])
+    handler = make_handler(params)
+    account = make_account(service)
+    target = make_target(account)
+
+    wall, apply_seconds = run_refresh(handler, account, target)
+    result = {
+        'target': type(target).__name__,
+        'refresh_wall_s': round(wall, 4),
+        'apply_s': round(apply_seconds, 4),
+        'blobs_per_s': round(blobs / wall, 1) if wall else None,
+        'list_requests': service.requests,
+    }
+
+    # 0.1%가 바뀐 뒤의 갱신: 변경분만 반영하는 비용
+    changes = max(1, blobs // 2000)
+    for container_client in service.containers.values():
+        container_client.mutate(changed=changes, deleted=changes)
+    wall, apply_seconds = run_refresh(handler, account, target)
+    result['incremental_wall_s'] = round(wall, 4)
+    result['incremental_apply_s'] = round(apply_seconds, 4)
+
+    # 변경이 없을 때 첫 페이지만 비교하는 갱신
+    probes = {('bench', container): target.store.container_head(container, handler.probe_page_size)
+              for container in account['containers']}
+    requests_before = service.requests
+    wall, _ = run_refresh(handler, account, target, probes)
+    result['probe_wall_s'] = round(wall, 4)
+    result['probe_requests'] = service.requests - requests_before
+    return result
+
+
+def bench_select_all(params, blobs):
+    _, _, account, target = fill_target(params, blobs)
+    started = time.perf_counter()
+    if hasattr(target, 'fetch_all'):
+        target.fetch_all()  # BlobMonitor.select_all_files와 같은 동작
+    keys = target.keys_for_rows(range(len(target.store)))
+    elapsed = time.perf_counter() - started
+    return {'target': type(target).__name__, 'selected': len(keys), 'select_all_s': round(elapsed, 4)}
+
+
+# 가짜 서비스의 블랍 이름은 'd{번호 // 1000:05d}/b{번호:08d}.dat', 크기는 1024 + 번호 % 4096입니다.
+SEARCH_QUERIES = {
+    'substring': 'b0000123',
+    'prefix': '^d00042/',
+    'glob': 'd0000?/*7.dat',
+    'size': 'size>5000',
+    'combined': '^d0001 .dat size<2000',
+}
+
+
+def bench_search(params, blobs):
+    _, _, _, target = fill_target(params, blobs)
+    index = BlobNameIndex(target.store)
+    result = {}
+    started = time.perf_counter()
+    index.search(parse_query(SEARCH_QUERIES['substring']))  # 첫 검색은 이어 붙인 이름을 만드는 시간을 포함합니다.
+    result['search_first_s'] = round(time.perf_counter() - started, 4)
+    for name, text in SEARCH_QUERIES.items():
+        query = parse_query(text)
+        started = time.perf_counter()
+        rows = index.search(query)
+        result[f'search_{name}_s'] = round(time.perf_counter() - started, 4)
+        result[f'search_{name}_matches'] = len(rows)
+    # 블랍 하나가 바뀐 뒤의 검색은 바뀐 묶음만 다시 이어 붙입니다.
+    target.remove_blobs(target.keys_for_rows([len(target.store) // 2]))
+    started = time.perf_counter()
+    index.search(parse_query(SEARCH_QUERIES['substring']))
+    result['search_after_change_s'] = round(time.perf_counter() - started, 4)
+    return result
+
+
+def bench_delete(params, blobs):
+    service, handler, account, target = fill_target(params, blobs)
+    count = min(blobs, params['delete_count'])
+    keys = target.keys_for_rows(range(count))
+    requests_before = service.requests
+    started = time.perf_counter()
+    deleted, failures = handler.delete_blobs(account, keys)
+    delete_seconds = time.perf_counter() - started
+    started = time.perf_counter()
+    target.remove_blobs(deleted)
+    remove_seconds = time.perf_counter() - started
+    return {
+        'target': type(target).__name__,
+        'deleted': len(deleted),
+        'failed': len(failures),
+        'delete_s': round(delete_seconds, 4),
+        'deleted_per_s': round(len(deleted) / delete_seconds, 1) if delete_seconds else None,
+        'batch_requests': service.requests - requests_before,
+        'remove_apply_s': round(remove_seconds, 4),
+    }
+
+
+def bench_copy(params, blobs):
+    """목록의 앞쪽 블랍을 다른 가짜 계정으로 서버 측 복사합니다. 요청 지연만 있고 데이터는 오가지 않습니다."""
+    service, handler, account, target = fill_target(params, blobs)
+    dest_service = FakeBlobService(0, 1, params['latency'], params['page_size'], account_name='bench_copy')
+    dest_account = dict(make_account(dest_service), account_name='bench_copy')
+    count = min(blobs, params['delete_count'])
+    by_container = {}
+    for container, name in target.keys_for_rows(range(count)):
+        by_container.setdefault(container, []).append((container, name))
+    started = time.perf_counter()
+    copied, failures = [], []
+    for container, keys in by_container.items():
+        ok, failed = handler.copy_blobs(account, keys, dest_account, container, "")
+        copied += ok
+        failures += failed
+    elapsed = time.perf_counter() - started
+    return {
+        'copied': len(copied),
+        'failed': len(failures),
+        'copy_s': round(elapsed, 4),
+        'copied_per_s': round(len(copied) / elapsed, 1) if elapsed else None,
+        'copy_requests': dest_service.requests + service.requests,
+    }
+
+
+def bench_download(params, blobs):
+    service = FakeBlobService(0, 1, params['latency'], params['page_size'], params['bandwidth_mbps'])
+    handler = make_handler(params)
+    account = make_account(service)
+    container = service.get_container_client('transfer')
+    size = params['file_mb'] * MB
+    keys = []
+    for index in range(params['files']):
+        name = f"file{index:03d}.bin"
+        container._put(name, size)
+        keys.append(('transfer', name))
+
+    directory = tempfile.mkdtemp(prefix='blobmoni_bench_')
+    try:
+        started = time.perf_counter()
+        for future in handler.download_blobs(account, keys, directory):
+            future.result()
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    total = size * len(keys)
+    return {'files': len(keys), 'file_mb': params['file_mb'], 'download_s': round(elapsed, 4),
+            'download_mb_per_s': round(total / MB / elapsed, 1)}
+
+
+def bench_upload(params, blobs):
+    service = FakeBlobService(0, 1, params['latency'], params['page_size'], params['bandwidth_mbps'])
+    handler = make_handler(params)
+    account = make_account(service)
+    size = params['file_mb'] * MB
+
+    directory = tempfile.mkdtemp(prefix='blobmoni_bench_')
+    try:
+        items = []
+        block = os.urandom(MB)
+        for index in range(params['files']):
+            path = os.path.join(directory, f"file{index:03d}.bin")
+            with open(path, "wb") as f:
+                for _ in range(params['file_mb']):
+                    f.write(block)
+            items.append((path, f"upload/file{index:03d}.bin"))
+        started = time.perf_counter()
+        for future in handler.upload_files(account, 'transfer', items):
+            future.result()
+        elapsed = time.perf_counter() - started
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+    total = size * len(items)
+    return {'files': len(items), 'file_mb': params['file_mb'], 'upload_s': round(elapsed, 4),
+            'upload_mb_per_s': round(total / MB / elapsed, 1)}
+
+
+BENCHMARKS = {
+    'refresh': bench_refresh,
+    'select_all': bench_select_all,
+    'search': bench_search,
+    'delete': bench_delete,
+    'copy': bench_copy,
+    'download': bench_download,
+    'upload': bench_upload,
+}
+
+
+def run_scenario(scenario, params, blobs):
+    """시나리오 하나를 현재 프로세스에서 실행하고 결과에 최대 메모리를 더해 반환합니다."""
+    result = BENCHMARKS[scenario](params, blobs)
+    result['peak_rss_mb'] = peak_rss_mb()
+    return result
+
+
+def run_isolated(scenario, params, blobs):
+    """시나리오 하나를 새 프로세스에서 실행해 결과를 받습니다."""
+    command = [sys.executable, os.path.abspath(__file__), '_child', scenario, str(blobs), json.dumps(params)]
+    completed = subprocess.run(command, capture_output=True, text=True)
+    if completed.returncode != 0:
+        raise RuntimeError(f"{scenario}@{blobs} 실패:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def find_regressions(results, baseline, threshold, noise_floor):
+    """기준 결과보다 threshold 비율 넘게 나빠진 항목을 [(키, 항목, 기준 값, 현재 값), ...]로 반환합니다.
+
+    '_per_s'로 끝나는 항목은 클수록, 초('_s')와 메모리(peak_rss_mb)는 작을수록 좋은 값입니다.
+    noise_floor초보다 짧은 시간은 측정 오차가 커서 비교하지 않습니다.
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if not previous:
+            continue
+        for name, value in current.items():
+            old = previous.get(name)
+            if not isinstance(value, (int, float)) or not isinstance(old, (int, float)) or old <= 0:
+                continue
+            if name.endswith('_per_s'):
+                worse = value < old * (1 - threshold)
+            elif name.endswith('_s'):
+                worse = old >= noise_floor and value > old * (1 + threshold)
+            elif name == 'peak_rss_mb':
+                worse = value > old * (1 + threshold)
+            else:
+                continue
+            if worse:
+                regressions.append((key, name, old, value))
+    return regressions
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='blob_bench', description="blobmoni 성능 측정 (가짜 Blob 서비스 사용)")
+    parser.add_argument('--blobs', default='1000,100000',
+                        help="블랍 수 목록 (쉼표로 구분, 예: 1000,100000,10000000)")
+    parser.add_argument('--scenarios', default=','.join(SCENARIOS), help=f"실행할 시나리오 ({', '.join(SCENARIOS)})")
+    parser.add_argument('--containers', type=int, default=4, help="블랍을 나누어 담을 컨테이너 수")
+    parser.add_argument('--latency', type=float, default=0.01, help="요청 한 번의 지연 시간 (초)")
+    parser.add_argument('--page-size', type=int, default=5000, help="목록 한 페이지의 항목 수 (최대 5000)")
+    parser.add_argument('--bandwidth-mbps', type=float, default=None, help="전송 대역폭 (MB/s, 없으면 제한 없음)")
+    parser.add_argument('--files', type=int, default=4, help="다운로드/업로드 시나리오의 파일 수")
+    parser.add_argument('--file-mb', type=int, default=32, help="다운로드/업로드 시나리오의 파일 크기 (MB)")
+    parser.add_argument('--chunk-mb', type=int, default=8, help="다운로드 구간/업로드 블록 크기 (MB)")
+    parser.add_argument('--delete-count', type=int, default=10000, help="삭제 시나리오에서 지울 최대 블랍 수")
+    parser.add_argument('--list-max-workers', type=int, default=16)
+    parser.add_argument('--list-per-account-concurrency', type=int, default=4)
+    parser.add_argument('--parallel-files', type=int, default=3)
+    parser.add_argument('--copy-max-concurrency', type=int, default=16, help="복사 시나리오에서 동시에 시작하는 복사 수")
+    parser.add_argument('--output', default='bench_results.json', help="결과를 저장할 JSON 파일")
+    parser.add_argument('--baseline', help="비교할 기준 결과 JSON 파일")
+    parser.add_argument('--threshold', type=float, default=0.2, help="회귀로 판단할 비율 (기본 0.2 = 20%%)")
+    parser.add_argument('--noise-floor', type=float, default=0.05, help="비교하지 않을 짧은 시간 (초)")
+    parser.add_argument('--in-process', action='store_true', help="시나리오를 별도 프로세스 없이 실행")
+    return parser
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    logging.getLogger().setLevel(logging.WARNING)
+    if argv[:1] == ['_child']:
+        _, scenario, blobs, params = argv
+        print(json.dumps(run_scenario(scenario, json.loads(params), int(blobs))))
+        return 0
+
+    args = build_parser().parse_args(argv)
+    sizes = [int(float(size)) for size in args.blobs.split(',') if size]
+    scenarios = [name.strip() for name in args.scenarios.split(',') if name.strip()]
+    unknown = [name for name in scenarios if name not in BENCHMARKS]
+    if unknown:
+        print(f"알 수 없는 시나리오: {', '.join(unknown)}", file=sys.stderr)
+        return 2
+    params = {
+        'containers': args.containers, 'latency': args.latency, 'page_size': args.page_size,
+        'bandwidth_mbps': args.bandwidth_mbps, 'files': args.files, 'file_mb': args.file_mb,
+        'chunk_mb': args.chunk_mb, 'delete_count': args.delete_count, 'list_max_workers': args.list_max_workers,
+        'list_per_account_concurrency': args.list_per_account_concurrency, 'parallel_files': args.parallel_files,
+        'copy_max_concurrency': args.copy_max_concurrency,
+    }
+
+    results = {}
+    for scenario in scenarios:
+        # 전송 시나리오는 블랍 수와 관계가 없으므로 한 번만 실행합니다.
+        for blobs in ([0] if scenario in TRANSFER_SCENARIOS else sizes):
+            key = scenario if scenario in TRANSFER_SCENARIOS else f"{scenario}@{blobs}"
+            print(f"실행 중: {key}", file=sys.stderr)
+            result = run_scenario(scenario, params, blobs) if args.in_process else run_isolated(scenario, params, blobs)
+            results[key] = result
+            print(f"  {json.dumps(result, ensure_ascii=False)}", file=sys.stderr)
+
+    report = {
+        'created': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'params': params,
+        'results': results,
+    }
+
+    regressions = []
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = find_regressions(results, baseline.get('results', {}), args.threshold, args.noise_floor)
+        report['baseline'] = args.baseline
+        report['regressions'] = [{'key': key, 'metric': name, 'baseline': old, 'current': value}
+                                 for key, name, old, value in regressions]
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"결과 저장: {args.output}", file=sys.stderr)
+
+    for key, name, old, value in regressions:
+        print(f"회귀: {key} {name} {old} -> {value}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,142 @@
+import logging
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from blob_snapshot import BlobEntry, BlobSnapshot
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS containers (
+    account TEXT NOT NULL,
+    container TEXT NOT NULL,
+    listed_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    blob_count INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account, container)
+);
+CREATE TABLE IF NOT EXISTS blobs (
+    account TEXT NOT NULL,
+    container TEXT NOT NULL,
+    name TEXT NOT NULL,
+    etag TEXT,
+    size INTEGER,
+    last_modified REAL,
+    tier TEXT,
+    PRIMARY KEY (account, container, name)
+) WITHOUT ROWID;
+"""
+
+
+class BlobCatalog:
+    """컨테이너별 마지막 블랍 목록을 SQLite 파일에 보관하는 로컬 카탈로그입니다.
+
+    시작할 때 카탈로그의 목록으로 화면을 먼저 채우고, 실제 목록 조회 결과는 변경분(BlobDiff)만 기록합니다.
+    쓰기는 전용 스레드 하나에서 순서대로 처리되며, 파일 크기가 max_bytes를 넘으면
+    가장 오래 사용하지 않은 컨테이너부터 지웁니다.
+    """
+
+    def __init__(self, path, max_bytes=512 * 1024 * 1024):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='blob-catalog')
+        logging.debug(f"카탈로그 열기: {os.path.abspath(path)}")
+
+    def close(self):
+        """대기 중인 쓰기를 마친 뒤 카탈로그를 닫습니다."""
+        self._writer.shutdown(wait=True)
+        with self._lock:
+            self._conn.close()
+
+    def cached_containers(self, account_name):
+        """카탈로그에 목록이 있는 컨테이너 이름 목록을 반환합니다."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT container FROM containers WHERE account = ? ORDER BY container", (account_name,)).fetchall()
+        return [row[0] for row in rows]
+
+    def load_container(self, account_name, container):
+        """저장된 컨테이너 목록을 BlobSnapshot으로 반환합니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            found = self._conn.execute(
+                "SELECT listed_at FROM containers WHERE account = ? AND container = ?",
+                (account_name, container)).fetchone()
+            if found is None:
+                return None
+            self._conn.execute(
+                "UPDATE containers SET accessed_at = ? WHERE account = ? AND container = ?",
+                (time.time(), account_name, container))
+            self._conn.commit()
+            rows = self._conn.execute(
+                "SELECT name, etag, size, last_modified, tier FROM blobs WHERE account = ? AND container = ?",
+                (account_name, container)).fetchall()
+        return BlobSnapshot(
+            BlobEntry(name, etag, size, datetime.fromtimestamp(modified, timezone.utc) if modified else None, tier)
+            for name, etag, size, modified, tier in rows)
+
+    def save_diff(self, account_name, container, diff):
+        """목록 조회 결과의 변경분을 백그라운드 쓰기 스레드에 기록 요청합니다."""
+        return self._writer.submit(self._write_diff, account_name, container, diff)
+
+    def invalidate_account(self, account_name):
+        """계정의 모든 캐시된 목록을 지웁니다."""
+        return self._writer.submit(self._delete_account, account_name)
+
+    def _write_diff(self, account_name, container, diff):
+        now = time.time()
+        upserts = [(account_name, container, entry.name, entry.etag, entry.size,
+                    entry.last_modified.timestamp() if entry.last_modified else None, entry.tier)
+                   for entry in diff.added + diff.changed]
+        try:
+            with self._lock, self._conn:
+                if diff.removed:
+                    self._conn.executemany(
+                        "DELETE FROM blobs WHERE account = ? AND container = ? AND name = ?",
+                        [(account_name, container, entry.name) for entry in diff.removed])
+                if upserts:
+                    self._conn.executemany("INSERT OR REPLACE INTO blobs VALUES (?, ?, ?, ?, ?, ?, ?)", upserts)
+                self._conn.execute(
+                    "INSERT INTO containers (account, container, listed_at, accessed_at, blob_count) "
+                    "VALUES (?, ?, ?, ?, (SELECT COUNT(*) FROM blobs WHERE account = ? AND container = ?)) "
+                    "ON CONFLICT (account, container) DO UPDATE SET "
+                    "listed_at = excluded.listed_at, accessed_at = excluded.accessed_at, blob_count = excluded.blob_count",
+                    (account_name, container, now, now, account_name, container))
+            if upserts or diff.removed:
+                logging.debug(f"카탈로그 기록: {account_name}/{container} ({diff.summary()})")
+            self._evict(keep=(account_name, container))
+        except sqlite3.Error as e:
+            logging.error(f"카탈로그 기록 실패: {account_name}/{container}, 오류: {e}")
+
+    def _delete_account(self, account_name):
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM blobs WHERE account = ?", (account_name,))
+            self._conn.execute("DELETE FROM containers WHERE account = ?", (account_name,))
+        logging.info(f"카탈로그에서 계정 {account_name}의 목록을 삭제했습니다.")
+
+    def _used_bytes(self):
+        page_size = self._conn.execute("PRAGMA page_size").fetchone()[0]
+        page_count = self._conn.execute("PRAGMA page_count").fetchone()[0]
+        free_pages = self._conn.execute("PRAGMA freelist_count").fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def _evict(self, keep):
+        """파일 크기가 max_bytes를 넘으면 가장 오래 사용하지 않은 컨테이너 목록부터 삭제합니다."""
+        if not self.max_bytes:
+            return
+        with self._lock:
+            while self._used_bytes() > self.max_bytes:
+                victim = self._conn.execute(
+                    "SELECT account, container FROM containers WHERE NOT (account = ? AND container = ?) "
+                    "ORDER BY accessed_at LIMIT 1", keep).fetchone()
+                if victim is None:
+                    break
+                with self._conn:
+                    self._conn.execute("DELETE FROM blobs WHERE account = ? AND container = ?", victim)
+                    self._conn.execute("DELETE FROM containers WHERE account = ? AND container = ?", victim)
+                logging.info(f"카탈로그 용량 초과로 {victim[0]}/{victim[1]} 목록을 삭제했습니다.")
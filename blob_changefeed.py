@@ -0,0 +1,227 @@
+import io
+import json
+import logging
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta, timezone
+from blob_snapshot import BlobEntry
+
+# 변경 피드 청크(Avro)는 fastavro로 읽습니다. 없으면 변경 피드를 쓰지 않고 목록 조회로 갱신합니다.
+try:
+    import fastavro
+except ImportError:
+    fastavro = None
+
+CHANGE_FEED_CONTAINER = "$blobchangefeed"
+SEGMENTS_META = "meta/segments.json"
+SEGMENT_INDEX_PREFIX = "idx/segments/"
+
+# 블랍 하나의 변경 이벤트. 삭제 이벤트는 entry가 None입니다.
+ChangeEvent = namedtuple('ChangeEvent', ['container', 'name', 'entry', 'event_type', 'event_time'])
+
+
+def avro_available():
+    """변경 피드 청크를 읽는 데 필요한 fastavro가 설치되어 있는지 확인합니다."""
+    return fastavro is not None
+
+
+class AzureSegmentStore:
+    """$blobchangefeed 컨테이너에서 세그먼트 매니페스트와 Avro 청크를 읽습니다."""
+
+    def __init__(self, container_client):
+        self.container_client = container_client
+
+    def exists(self):
+        return self.container_client.exists()
+
+    def list_names(self, prefix):
+        return sorted(blob.name for blob in self.container_client.list_blobs(name_starts_with=prefix))
+
+    def read_bytes(self, name):
+        return self.container_client.download_blob(name).readall()
+
+
+class LocalSegmentStore:
+    """$blobchangefeed 컨테이너를 그대로 내려받아 둔 디렉토리에서 읽습니다. 네트워크 없이 리더를 확인할 때 사용합니다."""
+
+    def __init__(self, root):
+        self.root = root
+
+    def exists(self):
+        return os.path.exists(os.path.join(self.root, SEGMENTS_META))
+
+    def list_names(self, prefix):
+        names = []
+        for dirpath, _, filenames in os.walk(self.root):
+            for filename in filenames:
+                name = os.path.relpath(os.path.join(dirpath, filename), self.root).replace(os.sep, '/')
+                if name.startswith(prefix):
+                    names.append(name)
+        return sorted(names)
+
+    def read_bytes(self, name):
+        with open(os.path.join(self.root, *name.split('/')), "rb") as f:
+            return f.read()
+
+
+class ChangeFeedReader:
+    """Blob 변경 피드의 확정된(consumable) 세그먼트를 커서 이후부터 순서대로 읽어 ChangeEvent로 돌려줍니다.
+
+    세그먼트는 한 시간 단위이며 'idx/segments/YYYY/MM/DD/HHMM/meta.json' 매니페스트에 샤드별 청크 경로가
+    들어 있습니다. 커서는 마지막으로 다 읽은 세그먼트 경로이며, 'meta/segments.json'의 lastConsumable보다
+    뒤의 세그먼트는 아직 기록 중이므로 읽지 않습니다. 같은 블랍의 이벤트는 한 샤드 안에서 순서가 보장됩니다.
+    """
+
+    def __init__(self, segment_store, containers=None):
+        self.segment_store = segment_store
+        self.containers = set(containers) if containers else None
+
+    def latest_cursor(self):
+        """지금까지 확정된 마지막 세그먼트 경로를 반환합니다. 처음 연결할 때 과거 이벤트를 건너뛰는 데 씁니다."""
+        last = self._last_consumable()
+        if last is None:
+            return None
+        # 커서는 세그먼트 시작 시각만 비교하므로 lastConsumable 시각의 경로를 그대로 커서로 씁니다.
+        return f"{SEGMENT_INDEX_PREFIX}{last:%Y/%m/%d/%H%M}/meta.json"
+
+    def read_changes(self, cursor, max_segments=24):
+        """cursor 다음 세그먼트부터 최대 max_segments개를 읽어 (이벤트 목록, 새 커서)를 반환합니다.
+
+        cursor가 None이면 과거 이벤트는 읽지 않고 최신 커서만 돌려줍니다.
+        """
+        if cursor is None:
+            return [], self.latest_cursor()
+        last = self._last_consumable()
+        if last is None:
+            return [], cursor
+        events = []
+        new_cursor = cursor
+        for segment in self._segments_between(cursor, last)[:max_segments]:
+            events.extend(self._read_segment(segment))
+            new_cursor = segment
+        return events, new_cursor
+
+    def _last_consumable(self):
+        try:
+            meta = json.loads(self.segment_store.read_bytes(SEGMENTS_META))
+        except Exception as e:
+            logging.error(f"변경 피드 메타데이터를 읽을 수 없습니다: {e}")
+            return None
+        return _parse_time(meta.get('lastConsumable'))
+
+    def _segments_between(self, start, last):
+        """start 이후부터 last까지(포함) 시작한 세그먼트 매니페스트 경로를 시간순으로 반환합니다.
+
+        start는 커서(세그먼트 경로) 또는 시각입니다. 매번 전체 인덱스를 조회하지 않도록 하루 단위 prefix로 조회합니다.
+        """
+        if isinstance(start, str):
+            start = _segment_time(start)
+        if start is None:
+            return []
+        segments = []
+        day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+        while day <= last:
+            for name in self.segment_store.list_names(f"{SEGMENT_INDEX_PREFIX}{day:%Y/%m/%d}/"):
+                begin = _segment_time(name)
+                if name.endswith("/meta.json") and begin is not None and start < begin <= last:
+                    segments.append(name)
+            day += timedelta(days=1)
+        return sorted(segments)
+
+    def _read_segment(self, segment):
+        manifest = json.loads(self.segment_store.read_bytes(segment))
+        events = []
+        for shard_path in manifest.get('chunkFilePaths', []):
+            # 경로는 '$blobchangefeed/log/00/...' 형식이므로 컨테이너 이름을 뗍니다.
+            shard_prefix = shard_path.split('/', 1)[1] if shard_path.startswith('$') else shard_path
+            for chunk in self.segment_store.list_names(shard_prefix):
+                if chunk.endswith(".avro"):
+                    events.extend(self._read_chunk(chunk))
+        logging.debug(f"변경 피드 세그먼트 읽음: {segment} ({len(events)}개 이벤트)")
+        return events
+
+    def _read_chunk(self, chunk):
+        events = []
+        for record in read_avro_records(self.segment_store.read_bytes(chunk)):
+            event = parse_event(record)
+            if event is not None and (self.containers is None or event.container in self.containers):
+                events.append(event)
+        return events
+
+
+class ChangeFeedCursors:
+    """계정별 변경 피드 커서를 JSON 파일에 보관합니다."""
+
+    def __init__(self, path):
+        self.path = path
+        self._cursors = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self._cursors = json.load(f)
+            except (OSError, ValueError) as e:
+                logging.warning(f"변경 피드 커서 파일을 읽을 수 없어 새로 시작합니다: {path}, 오류: {e}")
+
+    def get(self, account_name):
+        return self._cursors.get(account_name)
+
+    def set(self, account_name, cursor):
+        """커서를 기록하고 파일에 원자적으로 저장합니다."""
+        self._cursors[account_name] = cursor
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._cursors, f)
+        os.replace(tmp_path, self.path)
+
+
+def read_avro_records(data):
+    """Avro 컨테이너 파일(bytes)의 레코드를 dict로 돌려줍니다."""
+    return iter(fastavro.reader(io.BytesIO(data)))
+
+
+def parse_event(record):
+    """변경 피드 레코드를 ChangeEvent로 변환합니다. 블랍 생성/삭제/속성 변경이 아닌 이벤트는 None을 반환합니다."""
+    event_type = record.get('eventType')
+    if event_type not in ('BlobCreated', 'BlobDeleted', 'BlobPropertiesUpdated'):
+        return None
+    # subject: /blobServices/default/containers/<컨테이너>/blobs/<블랍 이름>
+    subject = record.get('subject') or ''
+    _, _, rest = subject.partition('/containers/')
+    container, sep, name = rest.partition('/blobs/')
+    if not sep or not name:
+        return None
+    event_time = _parse_time(record.get('eventTime'))
+    if event_type == 'BlobDeleted':
+        return ChangeEvent(container, name, None, event_type, event_time)
+    data = record.get('data') or {}
+    # 이벤트에는 액세스 계층이 없으므로 tier는 None(알 수 없음)이며, 반영할 때 저장된 값을 유지합니다.
+    entry = BlobEntry(name=name, etag=data.get('etag'), size=data.get('contentLength'),
+                      last_modified=event_time, tier=None)
+    return ChangeEvent(container, name, entry, event_type, event_time)
+
+
+def _parse_time(value):
+    """'2019-02-22T18:12:01.079Z' 형식의 시각을 UTC datetime으로 변환합니다."""
+    if not value:
+        return None
+    text = value.rstrip('Z')
+    if '.' in text:
+        head, frac = text.split('.', 1)
+        text = f"{head}.{frac[:6]}"  # 파이썬은 소수점 아래 6자리까지만 읽습니다.
+    try:
+        parsed = datetime.fromisoformat(text)
+    except ValueError:
+        return None
+    return parsed.replace(tzinfo=timezone.utc) if parsed.tzinfo is None else parsed
+
+
+def _segment_time(path):
+    """'idx/segments/YYYY/MM/DD/HHMM/meta.json' 경로의 세그먼트 시작 시각을 반환합니다."""
+    parts = path[len(SEGMENT_INDEX_PREFIX):].split('/') if path.startswith(SEGMENT_INDEX_PREFIX) else []
+    if len(parts) < 4:
+        return None
+    try:
+        return datetime(int(parts[0]), int(parts[1]), int(parts[2]), int(parts[3][:2]), int(parts[3][2:4]),
+                        tzinfo=timezone.utc)
+    except ValueError:
+        return None
@@ -0,0 +1,330 @@
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from datetime import datetime, timedelta, timezone
+from blob_metrics import metrics
+
+LIST_POLL_MIN = 8  # 한 컨테이너에서 진행 중인 복사가 이만큼 이상이면 목록 조회 한 번으로 상태를 확인합니다.
+
+
+class CopyFailed(Exception):
+    """서버 측 복사가 실패했거나 복사본이 원본과 달라 확인에 실패했을 때 발생합니다."""
+
+
+def parent_dir(path):
+    """'a/b/c' 또는 'a/b/c/'의 부모 경로 'a/b/'를 반환합니다. 최상위면 ''입니다."""
+    path = path.rstrip('/')
+    return path[:path.rfind('/') + 1]
+
+
+def copy_target_name(name, source_dir, dest_prefix):
+    """source_dir('a/b/' 형태) 아래의 블랍 name을 dest_prefix 아래 같은 상대 경로로 옮긴 이름을 반환합니다."""
+    relative = name[len(source_dir):] if name.startswith(source_dir) else name
+    dest_prefix = dest_prefix.strip('/')
+    return f"{dest_prefix}/{relative}" if dest_prefix else relative
+
+
+def prefix_overlaps(container, prefix, dest_container, dest_prefix):
+    """같은 계정에서 경로를 자기 자신 아래로 복사하는지 확인합니다. 이때는 목록 조회가 새 복사본을 다시 만나게 됩니다."""
+    if container != dest_container:
+        return False
+    dest_dir = dest_prefix.strip('/') + '/' if dest_prefix.strip('/') else ""
+    return dest_dir.startswith(prefix) or dest_dir == parent_dir(prefix)
+
+
+class _PendingCopy:
+    """시작했지만 아직 끝나지 않은 비동기 복사 하나입니다."""
+
+    __slots__ = ('source_key', 'dest_key', 'source_etag', 'size', 'content_md5', 'copy_id', 'dest_client')
+
+    def __init__(self, source_key, dest_key, properties, dest_client):
+        self.source_key = source_key
+        self.dest_key = dest_key
+        self.source_etag = properties.etag
+        self.size = properties.size
+        self.content_md5 = content_md5(properties)
+        self.copy_id = None
+        self.dest_client = dest_client
+
+
+def content_md5(properties):
+    settings = getattr(properties, 'content_settings', None)
+    md5 = getattr(settings, 'content_md5', None)
+    return bytes(md5) if md5 else None
+
+
+def copy_status(properties):
+    """블랍 속성의 (복사 id, 복사 상태, 상태 설명)을 반환합니다. 복사 정보가 없으면 상태는 None입니다."""
+    copy = getattr(properties, 'copy', None)
+    return getattr(copy, 'id', None), getattr(copy, 'status', None), getattr(copy, 'status_description', None)
+
+
+class BlobCopier:
+    """블랍을 내려받지 않고 서버 측 복사로 다른 컨테이너나 다른 계정에 복사/이동합니다.
+
+    sync_max_bytes 이하의 블랍은 Put Blob From URL(upload_blob_from_url)로 요청 하나 안에서 복사하고, 더 큰
+    블랍은 Copy Blob(start_copy_from_url)으로 복사를 시작만 해 두고 끝났는지를 모아서 확인합니다. 같은 컨테이너에
+    진행 중인 복사가 많으면 목록 조회(include=copy) 한 번으로, 적으면 블랍별 속성 조회로 확인하며, 바뀐 것이
+    없으면 확인 간격을 poll_max_interval까지 늘립니다.
+
+    원본은 읽기 전용 SAS를 붙인 URL로 넘기고, 원본 ETag를 조건으로 걸어 복사 중에 원본이 바뀌면 실패하게 합니다.
+    복사본은 크기(와 양쪽에 있으면 Content-MD5)가 원본과 같은지 확인하며, 이동은 확인이 끝난 뒤 그 사이 원본이
+    바뀌지 않았을 때만 원본을 지웁니다.
+    """
+
+    def __init__(self, max_concurrency=16, sync_max_bytes=256 * 1024 * 1024, poll_interval=1.0,
+                 poll_max_interval=30.0, max_pending=1000, sas_hours=24):
+        self.max_concurrency = max(1, max_concurrency)
+        self.sync_max_bytes = sync_max_bytes
+        self.poll_interval = max(0.05, poll_interval)
+        self.poll_max_interval = max(self.poll_interval, poll_max_interval)
+        self.max_pending = max(1, max_pending)
+        self.sas_hours = sas_hours
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='blob-copy')
+
+    def copy_blobs(self, source_account, keys, dest_account, dest_container, dest_prefix="", move=False,
+                   progress_callback=None, cancel_event=None):
+        """(컨테이너, 블랍 이름) 목록을 dest_container/dest_prefix 아래에 같은 파일 이름으로 복사합니다.
+
+        (복사한 원본 키 목록, [(실패한 원본 키, 사유), ...])를 반환합니다. 대상 이름이 겹치면 ValueError를 발생시킵니다.
+        """
+        pairs = [(tuple(key), (dest_container, copy_target_name(key[1], parent_dir(key[1]), dest_prefix)))
+                 for key in keys]
+        targets = set()
+        for _, target in pairs:
+            if target in targets:
+                raise ValueError(f"대상 이름이 겹칩니다: {target[0]}/{target[1]}")
+            targets.add(target)
+        return self.copy(source_account, dest_account, pairs, move, len(pairs), progress_callback, cancel_event)
+
+    def copy_prefix(self, source_account, container, prefix, dest_account, dest_container, dest_prefix="",
+                    move=False, progress_callback=None, cancel_event=None):
+        """container/prefix 아래의 모든 블랍을 목록 조회와 동시에 복사합니다.
+
+        prefix의 마지막 경로 이름부터 dest_prefix 아래에 붙습니다. 예를 들어 'logs/2024/'를 'archive'로 복사하면
+        'archive/2024/...'가 됩니다. 전체 수를 미리 알 수 없으므로 progress_callback에는 전체 수 대신 None이 전달됩니다.
+        """
+        if (source_account['account_name'] == dest_account['account_name']
+                and prefix_overlaps(container, prefix, dest_container, dest_prefix)):
+            raise ValueError(f"대상 경로가 원본 경로와 겹칩니다: {container}/{prefix} -> {dest_container}/{dest_prefix}")
+        source_dir = parent_dir(prefix)
+        container_client = source_account['client'].get_container_client(container)
+        # 목록 항목에 크기와 ETag가 있으므로 원본 속성을 따로 조회하지 않습니다.
+        pairs = (((container, blob.name), (dest_container, copy_target_name(blob.name, source_dir, dest_prefix)), blob)
+                 for blob in container_client.list_blobs(name_starts_with=prefix or None))
+        logging.info(f"경로 아래 전체 {'이동' if move else '복사'} 시작: {source_account['account_name']}/{container}/"
+                     f"{prefix} -> {dest_account['account_name']}/{dest_container}/{dest_prefix}")
+        return self.copy(source_account, dest_account, pairs, move, None, progress_callback, cancel_event)
+
+    def copy(self, source_account, dest_account, pairs, move=False, total=None, progress_callback=None,
+             cancel_event=None):
+        """((원본 컨테이너, 이름), (대상 컨테이너, 이름)[, 원본 속성]) 쌍들을 복사합니다. pairs는 생성기여도 됩니다.
+
+        복사 시작은 스레드 풀에서 동시에 실행하고, 진행 중인 비동기 복사 상태는 이 스레드에서 모아서 확인합니다.
+        cancel_event가 설정되면 새 복사를 시작하지 않고 진행 중인 비동기 복사를 중단합니다.
+        progress_callback(처리한 수, 전체 수)는 이 스레드와 작업 스레드에서 호출됩니다.
+        """
+        pairs = iter(pairs)
+        copied, failures = [], []
+        running = {}  # Future -> 원본 키
+        pending = {}  # 대상 키 -> _PendingCopy
+        interval = self.poll_interval
+        next_poll = None
+        exhausted = False
+
+        def report():
+            if progress_callback:
+                progress_callback(len(copied) + len(failures), total)
+
+        try:
+            while True:
+                cancelled = cancel_event is not None and cancel_event.is_set()
+                while (not exhausted and not cancelled and len(running) < self.max_concurrency * 2
+                       and len(pending) < self.max_pending):
+                    pair = next(pairs, None)
+                    if pair is None:
+                        exhausted = True
+                        break
+                    future = self._executor.submit(self._start, source_account, dest_account, pair[0], pair[1], move,
+                                                   pair[2] if len(pair) > 2 else None)
+                    running[future] = pair[0]
+                if cancelled or (exhausted and not running and not pending):
+                    break
+
+                if pending and time.monotonic() >= next_poll:
+                    finished = self._poll(dest_account, pending)
+                    for copy, properties in finished:
+                        del pending[copy.dest_key]
+                        future = self._executor.submit(self._finish, source_account, copy, properties, move)
+                        running[future] = copy.source_key
+                    # 끝난 복사가 없으면 확인 간격을 늘려 요청 수를 줄입니다.
+                    interval = self.poll_interval if finished else min(interval * 2, self.poll_max_interval)
+                    next_poll = time.monotonic() + interval
+
+                timeout = max(0.0, next_poll - time.monotonic()) if pending else None
+                if not running:
+                    if cancel_event is not None:
+                        cancel_event.wait(timeout)
+                    else:
+                        time.sleep(timeout)
+                    continue
+                done, _ = wait(running, timeout=timeout, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source_key = running.pop(future)
+                    try:
+                        copy = future.result()
+                    except Exception as e:
+                        logging.error(f"복사 실패: {source_key[0]}/{source_key[1]}, 이유: {e}")
+                        failures.append((source_key, str(e)))
+                        report()
+                        continue
+                    if copy is None:
+                        copied.append(source_key)
+                        report()
+                    else:
+                        pending[copy.dest_key] = copy
+                        if next_poll is None or len(pending) == 1:
+                            interval = self.poll_interval
+                            next_poll = time.monotonic() + interval
+        finally:
+            # 목록 조회가 실패하거나 취소되었더라도 이미 시작한 요청은 끝까지 기다리고, 끝나지 않은 복사는 중단합니다.
+            for future in list(running):
+                try:
+                    copy = future.result()
+                except Exception as e:
+                    failures.append((running[future], str(e)))
+                    continue
+                if copy is None:
+                    copied.append(running[future])
+                else:
+                    pending[copy.dest_key] = copy
+            for copy in pending.values():
+                self._abort(copy)
+
+        logging.info(f"서버 측 {'이동' if move else '복사'} 완료: {len(copied)}개 완료, {len(failures)}개 실패"
+                     + (f", {len(pending)}개 중단" if pending else ""))
+        return copied, failures
+
+    def source_url(self, account, blob_client):
+        """원본 블랍의 URL을 반환합니다. 계정 키가 있으면 읽기 권한만 있는 SAS를 붙입니다.
+
+        SAS 연결 문자열로 연결한 계정은 블랍 URL에 이미 SAS가 들어 있으므로 그대로 사용합니다.
+        """
+        credential = getattr(account['client'], 'credential', None)
+        account_key = getattr(credential, 'account_key', None)
+        if not account_key:
+            return blob_client.url
+        from azure.storage.blob import BlobSasPermissions, generate_blob_sas
+
+        sas = generate_blob_sas(credential.account_name, blob_client.container_name, blob_client.blob_name,
+                                account_key=account_key, permission=BlobSasPermissions(read=True),
+                                expiry=datetime.now(timezone.utc) + timedelta(hours=self.sas_hours))
+        return f"{blob_client.url}?{sas}"
+
+    def _start(self, source_account, dest_account, source_key, dest_key, move, properties=None):
+        """복사 하나를 시작합니다. 끝났으면 None을, 비동기 복사가 진행 중이면 _PendingCopy를 반환합니다."""
+        from azure.core import MatchConditions
+
+        if source_account['account_name'] == dest_account['account_name'] and source_key == dest_key:
+            raise CopyFailed("원본과 대상이 같습니다.")
+        source = source_account['client'].get_blob_client(*source_key)
+        if properties is None:
+            properties = source.get_blob_properties()
+        url = self.source_url(source_account, source)
+        dest = dest_account['client'].get_blob_client(*dest_key)
+        copy = _PendingCopy(source_key, dest_key, properties, dest)
+        conditions = {'source_etag': properties.etag, 'source_match_condition': MatchConditions.IfNotModified}
+
+        if properties.size <= self.sync_max_bytes:
+            # Put Blob From URL은 한 요청으로 끝나고 원본 ETag 조건이 걸려 있으므로, 복사본 확인은 원본을 지우는
+            # 이동일 때만 합니다.
+            dest.upload_blob_from_url(url, overwrite=True, **conditions)
+            self._finish(source_account, copy, dest.get_blob_properties() if move else None, move, 'sync')
+            return None
+        result = dest.start_copy_from_url(url, **conditions)
+        copy.copy_id = result.get('copy_id')
+        if result.get('copy_status') == 'success':
+            self._finish(source_account, copy, dest.get_blob_properties(), move, 'async')
+            return None
+        logging.debug(f"비동기 복사 시작: {source_key[0]}/{source_key[1]} -> {dest_key[0]}/{dest_key[1]} ({copy.copy_id})")
+        return copy
+
+    def _finish(self, source_account, copy, properties, move, mode='async'):
+        """끝난 복사본을 원본과 비교해 확인하고, 이동이면 원본을 지웁니다. properties가 None이면 확인하지 않습니다."""
+        from azure.core import MatchConditions
+
+        if properties is not None:
+            self._verify(copy, properties)
+
+        if move:
+            source = source_account['client'].get_blob_client(*copy.source_key)
+            try:
+                source.delete_blob(etag=copy.source_etag, match_condition=MatchConditions.IfNotModified)
+            except Exception as e:
+                status_code = getattr(e, 'status_code', None)
+                if status_code == 412:
+                    raise CopyFailed("복사한 뒤 원본이 바뀌어 원본을 지우지 않았습니다.")
+                if status_code != 404:
+                    raise
+        metrics.inc('blobmoni_copy_blobs_total', mode=mode, operation='move' if move else 'copy')
+        metrics.inc('blobmoni_copy_bytes_total', copy.size, mode=mode)
+        return None
+
+    @staticmethod
+    def _verify(copy, properties):
+        copy_id, status, description = copy_status(properties)
+        if copy.copy_id is not None and status is not None:
+            if copy_id != copy.copy_id:
+                raise CopyFailed("복사하는 동안 대상 블랍이 다른 요청으로 바뀌었습니다.")
+            if status != 'success':
+                raise CopyFailed(f"복사 {status}: {description or ''}".strip())
+        if properties.size != copy.size:
+            raise CopyFailed(f"복사본 크기가 다릅니다 (원본 {copy.size}, 복사본 {properties.size}).")
+        dest_md5 = content_md5(properties)
+        if copy.content_md5 and dest_md5 and dest_md5 != copy.content_md5:
+            raise CopyFailed("복사본의 Content-MD5가 원본과 다릅니다.")
+
+    def _poll(self, dest_account, pending):
+        """진행 중인 복사의 상태를 확인해 끝난 [(복사, 대상 블랍 속성), ...]를 반환합니다. 실패한 복사도 포함됩니다."""
+        by_container = {}
+        for copy in pending.values():
+            by_container.setdefault(copy.dest_key[0], []).append(copy)
+        finished = []
+        for container, copies in by_container.items():
+            try:
+                if len(copies) >= LIST_POLL_MIN:
+                    finished.extend(self._poll_listing(dest_account, container, copies))
+                else:
+                    for copy in copies:
+                        properties = copy.dest_client.get_blob_properties()
+                        if copy_status(properties)[1] != 'pending':
+                            finished.append((copy, properties))
+            except Exception as e:
+                # 확인 요청이 실패하면 다음 확인 때 다시 봅니다.
+                logging.warning(f"복사 상태 확인 실패: {container}, 오류: {e}")
+        return finished
+
+    @staticmethod
+    def _poll_listing(dest_account, container, copies):
+        """복사 대상 이름들의 공통 prefix를 한 번 조회해 끝난 복사를 찾습니다. 마지막 이름을 지나면 멈춥니다."""
+        by_name = {copy.dest_key[1]: copy for copy in copies}
+        names = sorted(by_name)
+        prefix = os.path.commonprefix(names)
+        container_client = dest_account['client'].get_container_client(container)
+        finished = []
+        for blob in container_client.list_blobs(name_starts_with=prefix or None, include=['copy']):
+            if blob.name > names[-1]:
+                break
+            copy = by_name.get(blob.name)
+            if copy is not None and copy_status(blob)[1] != 'pending':
+                finished.append((copy, blob))
+        return finished
+
+    @staticmethod
+    def _abort(copy):
+        try:
+            copy.dest_client.abort_copy(copy.copy_id)
+            logging.info(f"진행 중인 복사를 중단했습니다: {copy.dest_key[0]}/{copy.dest_key[1]}")
+        except Exception as e:
+            logging.warning(f"복사 중단 실패: {copy.dest_key[0]}/{copy.dest_key[1]}, 오류: {e}")
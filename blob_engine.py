@@ -0,0 +1,295 @@
+import logging
+import threading
+import time
+from blob_metrics import log_sampler, metrics, profiler
+from blob_scheduler import PollScheduler
+from blob_storage import ListingCancelled
+from blob_store import BlobColumnStore
+
+
+class BlobListing:
+    """Qt 없이 계정 하나의 블랍 목록을 BlobColumnStore에 보관합니다.
+
+    BlobTableModel과 같은 인터페이스(store, container_errors, apply_snapshot, apply_diff 등)를 제공하므로
+    MonitorEngine과 BlobStorageHandler는 둘을 구분하지 않습니다.
+    """
+
+    def __init__(self):
+        self.store = BlobColumnStore()
+        self.container_errors = {}
+
+    def register_containers(self, containers):
+        for container in containers:
+            self.store.container_id(container)
+
+    def apply_snapshot(self, container, snapshot):
+        self.container_errors.pop(container, None)
+        diff = self.store.diff_container(container, snapshot)
+        self.store.apply_diff(container, diff)
+        return diff
+
+    def apply_diff(self, container, diff):
+        self.store.apply_diff(container, diff)
+
+    def set_container_error(self, container, message):
+        self.container_errors[container] = message
+
+    def remove_blobs(self, keys):
+        """(컨테이너, 블랍 이름) 목록에 해당하는 행을 한 번에 제거합니다."""
+        by_container = {}
+        for container, name in keys:
+            by_container.setdefault(container, []).append(name)
+        for container, names in by_container.items():
+            for row, count in self.store.removal_runs(container, names):
+                self.store.remove_rows(row, count)
+
+    def keys_for_rows(self, rows):
+        """행 번호 목록을 (컨테이너, 블랍 이름) 목록으로 변환합니다."""
+        return [self.store.key_at(row) for row in rows]
+
+
+class RefreshBatch:
+    """한 번에 시작한 컨테이너 조회 묶음입니다. 여러 묶음이 동시에 진행될 수 있습니다."""
+
+    def __init__(self, keys):
+        self.keys = keys
+        self.started = time.perf_counter()
+        self.apply_seconds = 0.0  # 이 묶음에서 변경분 반영에 쓴 시간
+        self.profiled = False  # 이 묶음이 프로파일러를 켰는지
+
+
+class MonitorEngine:
+    """컨테이너별 폴링 스케줄, 첫 페이지 확인, 변경 피드 반영 규칙을 담은 모니터링 엔진입니다.
+
+    Qt에 의존하지 않으며, GUI(BlobMonitor)는 타이머와 작업 스레드에서 이 엔진의 메서드를 호출하고 헤드리스 모드는
+    run()으로 같은 규칙의 루프를 직접 돌립니다. 계정마다 목록 대상(BlobTableModel 또는 BlobListing)을
+    set_target으로 등록해야 하며, 반영된 변경은 on_diff(account, container, diff, source) 콜백으로 알립니다.
+    """
+
+    def __init__(self, blob_handler, config, min_interval, on_diff=None):
+        self.blob_handler = blob_handler
+        self.config = config
+        self.on_diff = on_diff
+        self.scheduler = PollScheduler(min_interval=min_interval,
+                                       max_interval=config.get('poll_max_interval', 3600),
+                                       backoff=config.get('poll_backoff', 2.0),
+                                       jitter=config.get('poll_jitter', 0.1),
+                                       error_max_interval=config.get('poll_error_max_interval', 900),
+                                       full_interval=config.get('poll_full_interval', 3600))
+        self.change_feed_interval = int(config.get('change_feed_interval', 60))
+        self.targets = {}  # 계정 이름 -> 목록 대상
+        self.listed_containers = set()  # 이번 실행에서 실제로 조회한 (계정, 컨테이너)
+        self.refresh_keys = {}  # 결과를 기다리는 (계정 이름, 컨테이너) -> RefreshBatch
+
+    def set_target(self, account, target):
+        self.targets[account['account_name']] = target
+
+    def schedule_account(self, account):
+        """계정의 컨테이너를 폴링 스케줄러에 등록합니다.
+
+        변경 피드를 쓰는 계정은 안전을 위한 전체 목록 조회만 poll_full_interval마다 하며, 저장된 커서와 카탈로그
+        목록이 모두 있으면 시작 시의 전체 조회도 건너뛰고 피드로 따라잡습니다.
+        """
+        name = account['account_name']
+        if account['change_source'] is None:
+            for container in account['containers']:
+                self.scheduler.add((name, container))
+            return
+        fixed_interval = self.scheduler.full_interval or self.scheduler.max_interval
+        cached = set()
+        if self.blob_handler.catalog is not None and self.blob_handler.change_cursors.get(name) is not None:
+            cached = set(self.blob_handler.catalog.cached_containers(name))
+        for container in account['containers']:
+            self.scheduler.add((name, container), fixed_interval=fixed_interval, due_now=container not in cached)
+
+    def unschedule_account(self, account):
+        """숨긴 계정이나 트리 보기로 바꾼 계정의 컨테이너를 폴링 스케줄러에서 뺍니다."""
+        for container in account['containers']:
+            self.scheduler.discard((account['account_name'], container))
+
+    def reschedule_now(self, accounts):
+        """accounts의 컨테이너를 바로 조회할 차례로 만듭니다. ("지금" 버튼, 업로드 후 갱신)"""
+        self.scheduler.reschedule_now([(account['account_name'], container)
+                                       for account in accounts for container in account['containers']])
+
+    def due_refresh(self, accounts):
+        """조회할 차례가 된 컨테이너만 남긴 계정 목록과 첫 페이지 확인용 probes를 반환합니다.
+
+        이미 조회 중인 컨테이너는 빼므로 느린 컨테이너가 있어도 다른 컨테이너는 제 주기대로 조회됩니다.
+        이번 실행에서 이미 전체 목록을 받은 컨테이너는 첫 페이지만 먼저 비교하도록 probe를 함께 보냅니다.
+        """
+        due = set(self.scheduler.due()).difference(self.refresh_keys)
+        if not due:
+            return [], {}
+        due_accounts, probes = [], {}
+        for account in accounts:
+            containers = [container for container in account['containers']
+                          if (account['account_name'], container) in due]
+            if not containers:
+                continue
+            due_accounts.append(dict(account, containers=containers))
+            store = self.targets[account['account_name']].store
+            for container in containers:
+                key = (account['account_name'], container)
+                if key in self.listed_containers and not self.scheduler.needs_full_listing(key):
+                    probes[key] = store.container_head(container, self.blob_handler.probe_page_size)
+        if due_accounts:
+            logging.debug(f"조회할 차례인 컨테이너 {sum(len(a['containers']) for a in due_accounts)}개 "
+                          f"(첫 페이지 확인 {len(probes)}개)")
+        return due_accounts, probes
+
+    def begin_refresh(self, accounts):
+        """accounts의 컨테이너 조회 시작을 기록하고 RefreshBatch를 반환합니다.
+
+        프로파일링이 예약되어 있고 기록 중인 갱신이 없으면 이 묶음을 기록하기 시작합니다.
+        """
+        batch = RefreshBatch({(account['account_name'], container)
+                              for account in accounts for container in account['containers']})
+        for key in batch.keys:
+            self.refresh_keys[key] = batch
+        if not profiler.active:
+            profiler.begin()
+            batch.profiled = profiler.active
+        return batch
+
+    def finish_refresh(self, batch):
+        """결과를 받지 못한(취소된) 컨테이너는 바로 다시 조회하지 않고 한 주기 뒤로 미룹니다."""
+        unfinished = [key for key in batch.keys if self.refresh_keys.get(key) is batch]
+        for key in unfinished:
+            del self.refresh_keys[key]
+        self.scheduler.postpone(unfinished)
+        metrics.observe('blobmoni_refresh_duration_seconds', time.perf_counter() - batch.started)
+        metrics.observe('blobmoni_refresh_apply_seconds', batch.apply_seconds)
+        if batch.profiled:
+            profiler.end()
+
+    def should_apply_cached(self, account, container):
+        """이미 실제 목록을 받았다면 오래된 카탈로그 목록으로 덮어쓰지 않습니다."""
+        return (account['account_name'], container) not in self.listed_containers
+
+    def container_listed(self, account, container, snapshot):
+        """조회한 목록을 대상에 반영하고 변경분을 카탈로그에 기록한 뒤 BlobDiff를 반환합니다."""
+        key = (account['account_name'], container)
+        self.listed_containers.add(key)
+        batch = self.refresh_keys.pop(key, None)
+        target = self.targets[account['account_name']]
+        started = time.perf_counter()
+        diff = self.blob_handler.apply_snapshot(account, target, container, snapshot)
+        self._record_apply('listing', time.perf_counter() - started, batch)
+        self.scheduler.record_result(key, changed=bool(diff), full_listing=True)
+        self._log_diff_entries(account, container, diff)
+        if self.blob_handler.catalog is not None:
+            self.blob_handler.catalog.save_diff(account['account_name'], container, diff)
+        if diff and self.on_diff:
+            self.on_diff(account, container, diff, 'listing')
+        return diff
+
+    def container_unchanged(self, account, container):
+        """첫 페이지 확인 결과 변경이 없는 컨테이너는 다음 조회 간격만 늘립니다."""
+        key = (account['account_name'], container)
+        self.refresh_keys.pop(key, None)
+        self.scheduler.record_result(key, changed=False, full_listing=False)
+        logging.debug(f"변경 없음: {key[0]}/{container}, 다음 조회 간격 {self.scheduler.interval_of(key):.0f}초")
+
+    def container_failed(self, account, container, error):
+        """컨테이너 조회 실패를 기록하고 다음 조회를 늦춥니다."""
+        key = (account['account_name'], container)
+        self.refresh_keys.pop(key, None)
+        self.scheduler.record_error(key)
+        self.blob_handler.show_listing_error(account, self.targets[account['account_name']], container, error)
+
+    def apply_changes(self, account, events, cursor):
+        """변경 피드 이벤트를 대상과 카탈로그에 반영한 뒤 커서를 저장하고 [(컨테이너, BlobDiff), ...]를 반환합니다."""
+        target = self.targets[account['account_name']]
+        by_container = {}
+        for event in events:
+            by_container.setdefault(event.container, []).append(event)
+        diffs = []
+        for container, container_events in by_container.items():
+            started = time.perf_counter()
+            diff = target.store.diff_changes(container, container_events)
+            if not diff:
+                continue
+            target.apply_diff(container, diff)
+            self._record_apply('change_feed', time.perf_counter() - started)
+            self._log_diff_entries(account, container, diff)
+            if self.blob_handler.catalog is not None:
+                self.blob_handler.catalog.save_diff(account['account_name'], container, diff)
+            logging.info(f"변경 피드 반영 '{account['account_name']}/{container}': {diff.summary()}")
+            if self.on_diff:
+                self.on_diff(account, container, diff, 'change_feed')
+            diffs.append((container, diff))
+        self.blob_handler.commit_change_cursor(account, cursor)
+        if events:
+            metrics.inc('blobmoni_change_feed_events_total', len(events), account=account['account_name'])
+        return diffs
+
+    def _record_apply(self, source, seconds, batch=None):
+        metrics.observe('blobmoni_apply_seconds', seconds, source=source)
+        if batch is not None:
+            batch.apply_seconds += seconds
+
+    @staticmethod
+    def _log_diff_entries(account, container, diff):
+        """블랍별 변경 내역은 debug 로그가 켜져 있을 때만 log_sample_every개에 하나씩 남깁니다."""
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            return
+        for kind, entries in (('추가', diff.added), ('삭제', diff.removed), ('변경', diff.changed)):
+            for entry in entries:
+                log_sampler.debug(('diff', kind),
+                                  lambda: f"블랍 {kind}: {account['account_name']}/{container}/{entry.name}")
+
+    def load_catalog(self, account, containers=None):
+        """카탈로그에 저장된 목록으로 대상을 먼저 채웁니다. (헤드리스 모드에서 사용)"""
+        catalog = self.blob_handler.catalog
+        if catalog is None:
+            return
+        for container in containers or account['containers']:
+            snapshot = catalog.load_container(account['account_name'], container)
+            if snapshot is not None and self.should_apply_cached(account, container):
+                self.targets[account['account_name']].apply_snapshot(container, snapshot)
+
+    def run(self, accounts, stop_event=None, tick=1.0):
+        """헤드리스 모드의 모니터링 루프입니다. stop_event가 설정될 때까지 GUI와 같은 규칙으로 조회합니다.
+
+        accounts는 연결이 끝난 계정이어야 합니다. 조회는 BlobStorageHandler의 스레드 풀에서 동시에 실행됩니다.
+        """
+        stop_event = stop_event or threading.Event()
+        for account in accounts:
+            if account['account_name'] not in self.targets:
+                self.set_target(account, BlobListing())
+            self.targets[account['account_name']].register_containers(account['containers'])
+            self.load_catalog(account)
+            self.schedule_account(account)
+
+        next_feed = 0.0
+        while not stop_event.is_set():
+            feed_accounts = [account for account in accounts if account['change_source'] is not None]
+            if feed_accounts and time.monotonic() >= next_feed:
+                next_feed = time.monotonic() + self.change_feed_interval
+                for account in feed_accounts:
+                    try:
+                        events, cursor = self.blob_handler.read_changes(account)
+                    except Exception as e:
+                        logging.error(f"변경 피드 읽기 실패: {account['account_name']}, 오류: {e}")
+                        continue
+                    self.apply_changes(account, events, cursor)
+
+            due_accounts, probes = self.due_refresh(accounts)
+            if due_accounts:
+                batch = self.begin_refresh(due_accounts)
+                listings = self.blob_handler.iter_container_listings(due_accounts, stop_event, probes)
+                try:
+                    for account, container, snapshot, error in listings:
+                        if isinstance(error, ListingCancelled):
+                            continue
+                        if error is not None:
+                            self.container_failed(account, container, error)
+                        elif snapshot is None:
+                            self.container_unchanged(account, container)
+                        else:
+                            self.container_listed(account, container, snapshot)
+                finally:
+                    listings.close()
+                    self.finish_refresh(batch)
+            stop_event.wait(tick)
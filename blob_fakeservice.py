@@ -0,0 +1,469 @@
+import bisect
+import itertools
+import threading
+import time
+import zlib
+from datetime import datetime, timedelta, timezone
+from urllib.parse import quote, unquote, urlsplit
+
+# 벤치마크와 부하 시험용으로 BlobServiceClient/ContainerClient/BlobClient의 필요한 부분만 흉내 내는 가짜 서비스입니다.
+# 블랍 목록은 번호로 계산해 만들므로 1,000만 개도 메모리에 미리 만들어 두지 않으며, 요청마다 latency만큼 기다립니다.
+
+BASE_TIME = datetime(2024, 1, 1, tzinfo=timezone.utc)
+MAX_PAGE_SIZE = 5000  # Azure list_blobs 한 페이지의 최대 항목 수
+URL_SUFFIX = ".blob.fake"  # 가짜 계정의 블랍 URL 호스트 뒷부분
+
+_SERVICES = {}  # 계정 이름 -> FakeBlobService (복사 원본 URL을 찾을 때 사용)
+_copy_ids = itertools.count(1)
+
+
+class FakeBlob:
+    """list_blobs()가 돌려주는 BlobProperties 대신 쓰는 항목입니다."""
+
+    __slots__ = ('name', 'etag', 'size', 'last_modified', 'blob_tier', 'copy')
+
+    def __init__(self, name, etag, size, last_modified, blob_tier='Hot', copy=None):
+        self.name = name
+        self.etag = etag
+        self.size = size
+        self.last_modified = last_modified
+        self.blob_tier = blob_tier
+        self.copy = copy
+
+
+class FakeResponse:
+    __slots__ = ('status_code', 'reason')
+
+    def __init__(self, status_code, reason):
+        self.status_code = status_code
+        self.reason = reason
+
+
+class FakeBlock:
+    __slots__ = ('id', 'size')
+
+    def __init__(self, block_id, size):
+        self.id = block_id
+        self.size = size
+
+
+class FakeCopy:
+    """BlobProperties.copy(CopyProperties) 흉내입니다. 비동기 복사는 complete_at이 지나면 끝난 것으로 봅니다."""
+
+    __slots__ = ('id', 'source', 'status', 'progress', 'status_description', 'size', 'complete_at')
+
+    def __init__(self, source, size, complete_at):
+        self.id = f"copy-{next(_copy_ids)}"
+        self.source = source
+        self.status = 'pending' if complete_at > time.monotonic() else 'success'
+        self.size = size
+        self.complete_at = complete_at
+        self.status_description = None
+        self.progress = f"{size}/{size}" if self.status == 'success' else f"0/{size}"
+
+    def refresh(self):
+        if self.status == 'pending' and time.monotonic() >= self.complete_at:
+            self.status = 'success'
+            self.progress = f"{self.size}/{self.size}"
+        return self
+
+
+class FakeNotFound(Exception):
+    status_code = 404
+
+
+class FakeConditionFailed(Exception):
+    status_code = 412
+
+
+class FakeExists(Exception):
+    status_code = 409
+
+
+class FakeBlobService:
+    """가짜 Blob 서비스 계정입니다. BlobServiceClient 대신 account['client']에 넣어 사용합니다.
+
+    blob_count개의 블랍을 containers개 컨테이너에 고르게 나누어 만들고, 모든 요청은 latency초를 기다립니다.
+    bandwidth_mbps를 주면 다운로드/업로드 데이터도 그 속도로 전송하는 것처럼 기다립니다.
+    서버 측 복사는 account_name으로 만든 블랍 URL로 다른 가짜 계정의 블랍도 찾으며, copy_mbps를 주면
+    start_copy_from_url 복사가 그 속도로 진행되는 것처럼 한동안 pending 상태로 남습니다.
+    """
+
+    def __init__(self, blob_count=1000, containers=1, latency=0.0, page_size=MAX_PAGE_SIZE, bandwidth_mbps=None,
+                 blob_size=1024, account_name='bench', copy_mbps=None):
+        self.account_name = account_name
+        self.credential = None  # 원본 URL에 SAS를 붙이지 않습니다.
+        self.copy_bandwidth = copy_mbps * 1024 * 1024 if copy_mbps else None
+        self.latency = latency
+        self.page_size = max(1, min(int(page_size), MAX_PAGE_SIZE))
+        self.bandwidth = bandwidth_mbps * 1024 * 1024 if bandwidth_mbps else None
+        self.blob_size = blob_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        per_container = -(-blob_count // max(1, containers)) if blob_count else 0
+        self.containers = {}
+        remaining = blob_count
+        for index in range(max(1, containers)):
+            count = min(per_container, remaining)
+            remaining -= count
+            name = f"bench{index:03d}"
+            self.containers[name] = FakeContainerClient(self, name, count)
+        _SERVICES[account_name] = self
+
+    def request(self, payload_bytes=0):
+        """요청 한 번의 지연과 요청 본문의 전송 시간을 흉내 냅니다."""
+        with self._lock:
+            self.requests += 1
+        if self.latency > 0:
+            time.sleep(self.latency)
+        self.transfer(payload_bytes)
+
+    def transfer(self, payload_bytes):
+        """bandwidth_mbps가 있으면 payload_bytes를 전송하는 시간만큼 기다립니다."""
+        if self.bandwidth and payload_bytes:
+            time.sleep(payload_bytes / self.bandwidth)
+
+    def list_containers(self):
+        self.request()
+        return [FakeBlob(name, None, 0, BASE_TIME) for name in self.containers]
+
+    def get_container_client(self, container):
+        client = self.containers.get(container)
+        if client is None:
+            client = self.containers[container] = FakeContainerClient(self, container, 0)
+        return client
+
+    def get_blob_client(self, container, blob):
+        return self.get_container_client(container).get_blob_client(blob)
+
+
+def resolve_url(url):
+    """가짜 블랍 URL이 가리키는 (FakeContainerClient, 블랍 이름)을 반환합니다. 쿼리(SAS)는 무시합니다."""
+    parts = urlsplit(url)
+    service = _SERVICES.get(parts.hostname[:-len(URL_SUFFIX)] if parts.hostname.endswith(URL_SUFFIX) else None)
+    if service is None:
+        raise FakeNotFound(url)
+    container, _, name = unquote(parts.path).lstrip('/').partition('/')
+    return service.get_container_client(container), name
+
+
+class FakeContainerClient:
+    """번호로 만든 블랍과 새로 올린 블랍을 이름순으로 합쳐 보여주는 가짜 컨테이너입니다.
+
+    번호 i의 블랍 이름은 'd{i // 1000:05d}/b{i:08d}.dat'이므로 번호 순서와 이름 순서가 같습니다.
+    mutate()로 일부 블랍의 ETag를 바꾸거나 지운 상태를 만들 수 있습니다.
+    """
+
+    def __init__(self, service, name, count):
+        self.service = service
+        self.container_name = name
+        self.count = count
+        self._lock = threading.Lock()
+        self._deleted = set()  # 지운 번호 블랍 이름
+        self._versions = {}  # 이름 -> 바뀐 횟수
+        self._extra = {}  # 새로 올린 블랍 이름 -> 크기
+        self._extra_names = []  # _extra의 이름 정렬 목록
+        self._staged = {}  # 블랍 이름 -> {블록 id: 크기}
+        self._copies = {}  # 서버 측 복사로 만든 블랍 이름 -> FakeCopy
+
+    # --- 번호로 만드는 블랍 ---
+
+    @staticmethod
+    def generated_name(index):
+        return f"d{index // 1000:05d}/b{index:08d}.dat"
+
+    def _generated_index(self, name):
+        """name 이상인 첫 번호 블랍의 번호를 이분 탐색으로 찾습니다."""
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.generated_name(mid) < name:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _generated_blob(self, index):
+        name = self.generated_name(index)
+        version = self._versions.get(name, 0)
+        return FakeBlob(name, f'"0x{index:X}-{version}"', self.service.blob_size + index % 4096,
+                        BASE_TIME + timedelta(seconds=index + version))
+
+    def _extra_blob(self, name):
+        version = self._versions.get(name, 0)
+        copy = self._copies.get(name)
+        return FakeBlob(name, f'"0xE{zlib.crc32(name.encode()):08X}-{version}"', self._extra[name],
+                        BASE_TIME + timedelta(seconds=version), copy=copy.refresh() if copy else None)
+
+    def _blob(self, name):
+        """이름으로 블랍을 찾습니다. 없으면 None을 반환합니다."""
+        with self._lock:
+            if name in self._extra:
+                return self._extra_blob(name)
+            if name in self._deleted:
+                return None
+        index = self._generated_index(name)
+        if index < self.count and self.generated_name(index) == name:
+            return self._generated_blob(index)
+        return None
+
+    def mutate(self, changed=0, deleted=0, step=None):
+        """번호 블랍 중 changed개의 ETag를 바꾸고 deleted개를 지웁니다. 변경 위치는 고르게 흩어집니다."""
+        total = changed + deleted
+        if not total or not self.count:
+            return
+        step = step or max(1, self.count // total)
+        with self._lock:
+            for n in range(total):
+                name = self.generated_name((n * step) % self.count)
+                if n < changed:
+                    self._versions[name] = self._versions.get(name, 0) + 1
+                else:
+                    self._deleted.add(name)
+
+    # --- ContainerClient 흉내 ---
+
+    def exists(self):
+        self.service.request()
+        return True
+
+    def get_blob_client(self, blob):
+        return FakeBlobClient(self, blob)
+
+    def list_blobs(self, name_starts_with=None, results_per_page=None, **kwargs):
+        return FakeItemPaged(self, name_starts_with or "", results_per_page or self.service.page_size)
+
+    def list_page(self, prefix, marker, page_size):
+        """marker 다음 이름부터 prefix로 시작하는 블랍을 page_size개까지 돌려주고 (블랍 목록, 다음 marker)를 반환합니다."""
+        self.service.request()
+        start = marker or prefix
+        index = self._generated_index(start)
+        page = []
+        with self._lock:
+            extra_pos = bisect.bisect_left(self._extra_names, start)
+            while len(page) < page_size:
+                generated = self.generated_name(index) if index < self.count else None
+                extra = self._extra_names[extra_pos] if extra_pos < len(self._extra_names) else None
+                if generated is None and extra is None:
+                    break
+                if extra is None or (generated is not None and generated < extra):
+                    name = generated
+                    index += 1
+                    if name in self._deleted or name in self._extra:
+                        continue  # 같은 이름으로 새로 올린 블랍은 _extra 쪽에서 돌려줍니다.
+                    blob = self._generated_blob(index - 1)
+                else:
+                    name = extra
+                    extra_pos += 1
+                    blob = self._extra_blob(name)
+                if marker and name <= marker:
+                    continue
+                if not name.startswith(prefix):
+                    break  # 이름순이므로 이후 이름도 prefix로 시작하지 않습니다.
+                page.append(blob)
+        return page, (page[-1].name if len(page) == page_size else None)
+
+    def delete_blobs(self, *names, raise_on_any_failure=True, **kwargs):
+        """Blob Batch 요청 한 번으로 여러 블랍을 지웁니다. 응답 목록을 반환합니다."""
+        self.service.request()
+        responses = []
+        for name in names:
+            responses.append(FakeResponse(202, "Accepted") if self._delete(name) else FakeResponse(404, "Not Found"))
+        return iter(responses)
+
+    def delete_blob(self, name, **kwargs):
+        self.service.request()
+        if not self._delete(name):
+            raise FakeNotFound(name)
+
+    def _delete(self, name):
+        if self._blob(name) is None:
+            return False
+        with self._lock:
+            if name in self._extra:
+                del self._extra[name]
+                self._extra_names.remove(name)
+            else:
+                self._deleted.add(name)
+        return True
+
+    def _put(self, name, size):
+        with self._lock:
+            if name not in self._extra:
+                bisect.insort(self._extra_names, name)
+            self._extra[name] = size
+            self._versions[name] = self._versions.get(name, 0) + 1
+            self._staged.pop(name, None)
+            self._copies.pop(name, None)
+
+
+class FakeItemPaged:
+    """ItemPaged 흉내입니다. 그대로 순회하면 블랍을, by_page()로 순회하면 페이지를 돌려줍니다."""
+
+    def __init__(self, container_client, prefix, page_size):
+        self.container_client = container_client
+        self.prefix = prefix
+        self.page_size = page_size
+
+    def __iter__(self):
+        for page in self.by_page():
+            yield from page
+
+    def by_page(self, continuation_token=None):
+        return FakePageIterator(self, continuation_token)
+
+
+class FakePageIterator:
+    def __init__(self, paged, continuation_token):
+        self.paged = paged
+        self.continuation_token = continuation_token
+        self._started = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self._started and not self.continuation_token:
+            raise StopIteration
+        self._started = True
+        page, self.continuation_token = self.paged.container_client.list_page(
+            self.paged.prefix, self.continuation_token, self.paged.page_size)
+        if not page and not self.continuation_token:
+            raise StopIteration
+        return page
+
+
+class FakeBlobProperties:
+    __slots__ = ('name', 'size', 'etag', 'copy')
+
+    def __init__(self, blob):
+        self.name = blob.name
+        self.size = blob.size
+        self.etag = blob.etag
+        self.copy = blob.copy
+
+
+class FakeDownloadStream:
+    CHUNK = 4 * 1024 * 1024
+
+    def __init__(self, service, length):
+        self.service = service
+        self.length = length
+
+    def chunks(self):
+        remaining = self.length
+        while remaining > 0:
+            size = min(self.CHUNK, remaining)
+            self.service.transfer(size)
+            yield _zeros(size)
+            remaining -= size
+
+    def readall(self):
+        return bytes(_zeros(self.length))
+
+
+_ZEROS = bytes(FakeDownloadStream.CHUNK)
+
+
+def _zeros(size):
+    return memoryview(_ZEROS)[:size] if size <= len(_ZEROS) else bytes(size)
+
+
+class FakeBlobClient:
+    def __init__(self, container_client, blob_name):
+        self.container_client = container_client
+        self.container_name = container_client.container_name
+        self.blob_name = blob_name
+
+    def _existing(self):
+        blob = self.container_client._blob(self.blob_name)
+        if blob is None:
+            raise FakeNotFound(self.blob_name)
+        return blob
+
+    def get_blob_properties(self, **kwargs):
+        self.container_client.service.request()
+        return FakeBlobProperties(self._existing())
+
+    def download_blob(self, offset=None, length=None, **kwargs):
+        service = self.container_client.service
+        service.request()
+        blob = self._existing()
+        offset = offset or 0
+        length = blob.size - offset if length is None else min(length, blob.size - offset)
+        return FakeDownloadStream(service, max(0, length))
+
+    def upload_blob(self, data, overwrite=False, **kwargs):
+        size = len(data)
+        self.container_client.service.request(size)
+        self.container_client._put(self.blob_name, size)
+
+    def get_block_list(self, block_list_type='committed', **kwargs):
+        self.container_client.service.request()
+        staged = self.container_client._staged.get(self.blob_name, {})
+        return [], [FakeBlock(block_id, size) for block_id, size in staged.items()]
+
+    def stage_block(self, block_id, data, length=None, **kwargs):
+        size = length if length is not None else len(data)
+        self.container_client.service.request(size)
+        with self.container_client._lock:
+            self.container_client._staged.setdefault(self.blob_name, {})[block_id] = size
+
+    def commit_block_list(self, block_list, **kwargs):
+        self.container_client.service.request()
+        staged = self.container_client._staged.get(self.blob_name, {})
+        self.container_client._put(self.blob_name, sum(staged.get(block.id, 0) for block in block_list))
+
+    def delete_blob(self, etag=None, **kwargs):
+        if etag is not None:
+            blob = self._existing()
+            if blob.etag != etag:
+                raise FakeConditionFailed(self.blob_name)
+        self.container_client.delete_blob(self.blob_name)
+
+    # --- 서버 측 복사 ---
+
+    @property
+    def url(self):
+        service = self.container_client.service
+        return f"https://{service.account_name}{URL_SUFFIX}/{self.container_name}/{quote(self.blob_name)}"
+
+    def _copy_source(self, source_url, source_etag, overwrite):
+        container_client, name = resolve_url(source_url)
+        source = container_client._blob(name)
+        if source is None:
+            raise FakeNotFound(source_url)
+        if source_etag is not None and source.etag != source_etag:
+            raise FakeConditionFailed(source_url)
+        if not overwrite and self.container_client._blob(self.blob_name) is not None:
+            raise FakeExists(self.blob_name)
+        return source
+
+    def upload_blob_from_url(self, source_url, overwrite=False, source_etag=None, **kwargs):
+        """Put Blob From URL 흉내입니다. 요청 하나 안에서 복사를 마칩니다."""
+        self.container_client.service.request()
+        source = self._copy_source(source_url, source_etag, overwrite)
+        self.container_client._put(self.blob_name, source.size)
+        return {'etag': self.container_client._blob(self.blob_name).etag}
+
+    def start_copy_from_url(self, source_url, source_etag=None, **kwargs):
+        """Copy Blob 흉내입니다. copy_mbps가 있으면 크기에 비례한 시간 동안 pending 상태로 남습니다."""
+        service = self.container_client.service
+        service.request()
+        source = self._copy_source(source_url, source_etag, True)
+        seconds = source.size / service.copy_bandwidth if service.copy_bandwidth else 0
+        copy = FakeCopy(source_url, source.size, time.monotonic() + seconds)
+        self.container_client._put(self.blob_name, source.size)
+        with self.container_client._lock:
+            self.container_client._copies[self.blob_name] = copy
+        return {'copy_id': copy.id, 'copy_status': copy.status, 'etag': self.container_client._blob(self.blob_name).etag}
+
+    def abort_copy(self, copy_id, **kwargs):
+        self.container_client.service.request()
+        copy = self.container_client._copies.get(self.blob_name)
+        if copy is None or copy.id != copy_id or copy.refresh().status != 'pending':
+            raise FakeConditionFailed(self.blob_name)  # 진행 중인 복사가 없으면 409/412로 거절됩니다.
+        self.container_client._put(self.blob_name, 0)
+        copy.status = 'aborted'
+        with self.container_client._lock:
+            self.container_client._copies[self.blob_name] = copy
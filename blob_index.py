@@ -0,0 +1,301 @@
+import bisect
+import operator
+import re
+import shlex
+from array import array
+from datetime import datetime
+from itertools import accumulate, compress, repeat
+
+# 필터 입력 예시:
+#   report            이름에 'report'가 들어간 블랍
+#   ^logs/2024/       'logs/2024/'로 시작하는 블랍
+#   logs/*.csv        glob 패턴 (*, ?, [...])과 이름 전체가 일치하는 블랍
+#   size>10MB size<=1GB modified>=2024-01-01 container:raw
+# 공백으로 구분한 조건을 모두 만족하는 블랍을 찾으며, 공백이 들어간 이름은 따옴표로 감쌉니다. 대소문자를 구분합니다.
+
+SIZE_UNITS = {'': 1, 'b': 1, 'k': 1024, 'kb': 1024, 'm': 1024 ** 2, 'mb': 1024 ** 2,
+              'g': 1024 ** 3, 'gb': 1024 ** 3, 't': 1024 ** 4, 'tb': 1024 ** 4}
+COMPARISONS = {'>': operator.gt, '>=': operator.ge, '<': operator.lt, '<=': operator.le, '=': operator.eq}
+_FIELD_TERM = re.compile(r'^(size|modified)(>=|<=|>|<|=)(.+)$')
+_SIZE_VALUE = re.compile(r'^(\d+(?:\.\d+)?)\s*([a-zA-Z]*)$')
+_GLOB_CHARS = re.compile(r'[*?\[]')
+_GLOB_SPLIT = re.compile(r'[*?]|\[[^\]]*\]?')  # glob 패턴의 고정 문자열 사이 구분
+DENSE_MATCH_RATIO = 20  # 부분 문자열이 나온 횟수가 행 수의 1/20을 넘으면 모든 이름을 직접 비교
+CHUNK_ROWS = 4096  # 이어 붙인 이름을 나누어 보관하는 묶음의 행 수
+
+
+class BlobQuery:
+    """필터 입력을 해석한 조건입니다. parse_query()로 만듭니다.
+
+    prefixes/substrings/globs는 블랍 이름 조건, conditions는 (열 이름, 비교 함수, 값) 목록이며
+    containers가 비어 있지 않으면 그 컨테이너의 블랍만 찾습니다.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.prefixes = []
+        self.substrings = []
+        self.globs = []  # (패턴, 이름 하나에 대한 정규식)
+        self.conditions = []  # ('sizes' 또는 'modified', 비교 함수, 값)
+        self.containers = set()
+
+    def __repr__(self):
+        return f"BlobQuery({self.text!r})"
+
+
+def parse_query(text):
+    """필터 입력을 BlobQuery로 해석합니다. 빈 입력이면 None을 반환하고, 잘못된 조건은 ValueError를 발생시킵니다."""
+    try:
+        terms = shlex.split(text)
+    except ValueError as e:
+        raise ValueError(f"따옴표가 닫히지 않았습니다: {e}")
+    if not terms:
+        return None
+
+    query = BlobQuery(text)
+    for term in terms:
+        match = _FIELD_TERM.match(term)
+        if match:
+            field, op, value = match.groups()
+            if field == 'size':
+                query.conditions.append(('sizes', COMPARISONS[op], parse_size(value)))
+            else:
+                query.conditions.append(('modified', COMPARISONS[op], parse_time(value)))
+        elif term.startswith('container:') and len(term) > len('container:'):
+            query.containers.add(term[len('container:'):])
+        elif term.startswith('^') and len(term) > 1:
+            query.prefixes.append(term[1:])
+        elif _GLOB_CHARS.search(term):
+            query.globs.append((term, re.compile(glob_regex(term) + r'\Z')))
+        else:
+            query.substrings.append(term)
+    return query
+
+
+def parse_size(value):
+    """'10MB', '1.5g', '2048' 같은 크기를 바이트 수로 변환합니다. (1KB = 1024바이트)"""
+    match = _SIZE_VALUE.match(value.strip())
+    unit = match.group(2).lower() if match else None
+    if unit not in SIZE_UNITS:
+        raise ValueError(f"크기를 해석할 수 없습니다: {value}")
+    return int(float(match.group(1)) * SIZE_UNITS[unit])
+
+
+def parse_time(value):
+    """'2024-01-01' 또는 '2024-01-01T12:00' 형식의 시각을 epoch 초로 변환합니다. 시간대가 없으면 현지 시각으로 봅니다."""
+    try:
+        return datetime.fromisoformat(value).timestamp()
+    except ValueError:
+        raise ValueError(f"날짜를 해석할 수 없습니다: {value} (예: 2024-01-01 또는 2024-01-01T12:00)")
+
+
+def glob_regex(pattern):
+    """glob 패턴을 한 줄 안에서만 일치하는 정규식 본문으로 바꿉니다. (*는 '/'를 포함한 모든 문자와 일치)"""
+    parts = []
+    i = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        i += 1
+        if ch == '*':
+            parts.append(r'[^\n]*')
+        elif ch == '?':
+            parts.append(r'[^\n]')
+        elif ch == '[':
+            end = pattern.find(']', i + 1 if pattern[i:i + 1] in ('!', ']') else i)
+            if end < 0:
+                parts.append(re.escape(ch))
+                continue
+            body = pattern[i:end].replace('\\', '\\\\')
+            if body.startswith('!'):
+                body = '^' + body[1:]
+            parts.append(f'[{body}]')
+            i = end + 1
+        else:
+            parts.append(re.escape(ch))
+    return ''.join(parts)
+
+
+def literal_prefix(pattern):
+    """glob 패턴에서 첫 와일드카드 앞의 고정된 앞부분을 반환합니다."""
+    match = _GLOB_CHARS.search(pattern)
+    return pattern[:match.start()] if match else pattern
+
+
+class BlobNameIndex:
+    """BlobColumnStore의 블랍을 이름, 크기, 수정 시각 조건으로 찾는 색인입니다. Qt에 의존하지 않습니다.
+
+    저장소의 행은 컨테이너마다 이름순으로 정렬되어 있으므로 prefix 조건과 glob의 고정된 앞부분은 이분 탐색으로
+    행 구간을 좁힙니다. 부분 문자열과 glob은 컨테이너마다 이름을 줄바꿈으로 이어 붙인 문자열을 str.find와 정규식으로
+    C 수준에서 훑고, 줄 시작 위치 배열을 이분 탐색해 행 번호로 바꿉니다. 이어 붙인 문자열은 컨테이너를 처음
+    검색할 때 CHUNK_ROWS행 묶음으로 나누어 만들고, 이후에는 저장소의 삽입/삭제 알림(store.listeners)으로 행 수를
+    맞추면서 바뀐 묶음만 다음 검색 때 다시 만듭니다. 백만 개짜리 컨테이너에서 블랍 하나가 바뀌어도 한 묶음만
+    다시 이어 붙입니다.
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._chunks = {}  # 컨테이너 id -> [[행 수, 이어 붙인 이름(바뀌었으면 None), 줄 시작 위치 배열], ...]
+        store.listeners.append(self._rows_changed)
+
+    def search(self, query):
+        """조건을 모두 만족하는 행 번호를 오름차순 목록으로 반환합니다."""
+        store = self.store
+        rows = []
+        start = 0
+        for cid, container in enumerate(store.containers):
+            end = start + store.counts[cid]
+            if start < end and (not query.containers or container in query.containers):
+                rows.extend(self._search_container(cid, start, end, query))
+            start = end
+        return rows
+
+    def row_matches(self, query, row):
+        """저장소의 행 하나가 조건을 모두 만족하는지 확인합니다. (목록이 바뀐 행만 다시 확인할 때 사용)"""
+        store = self.store
+        if query.containers and store.container_at(row) not in query.containers:
+            return False
+        name = store.names[row]
+        return (all(name.startswith(prefix) for prefix in query.prefixes)
+                and all(substring in name for substring in query.substrings)
+                and all(pattern.match(name) for _, pattern in query.globs)
+                and all(compare(getattr(store, column_name)[row], value)
+                        for column_name, compare, value in query.conditions))
+
+    def _search_container(self, cid, start, end, query):
+        names = self.store.names
+        lo, hi = start, end
+        for prefix in query.prefixes + [literal_prefix(pattern) for pattern, _ in query.globs]:
+            if prefix:
+                lo, hi = _prefix_range(names, prefix, lo, hi)
+        if lo >= hi:
+            return []
+
+        # 이름 조건: 부분 문자열은 (contains, 문자열), glob은 (정규식 match, None)으로 같은 방식으로 확인합니다.
+        tests = [(operator.contains, substring) for substring in sorted(query.substrings, key=len, reverse=True)]
+        tests += [(pattern.match, None) for _, pattern in query.globs]
+
+        # 가장 긴 고정 문자열이 드물게 나오면 이어 붙인 이름에서 찾은 행만 후보로 삼습니다.
+        literals = query.substrings + [max(_GLOB_SPLIT.split(pattern), key=len) for pattern, _ in query.globs]
+        literal = max(literals, key=len, default='')
+        candidates = range(lo, hi)
+        if literal:
+            rows = self._sparse_substring_rows(cid, start, end, lo, hi, literal)
+            if rows is not None:
+                candidates = rows
+                if query.substrings and literal == tests[0][1]:
+                    tests.pop(0)
+
+        # 크기/수정 시각 조건은 열 배열에서 바로 비교하므로 이름 조건보다 먼저 확인합니다.
+        for column_name, compare, value in query.conditions:
+            column = getattr(self.store, column_name)
+            if isinstance(candidates, range):
+                values = column[candidates.start:candidates.stop]
+            else:
+                values = map(column.__getitem__, candidates)
+            candidates = list(compress(candidates, map(compare, values, repeat(value))))
+
+        for test, argument in tests:
+            if isinstance(candidates, range):
+                values = names[candidates.start:candidates.stop]
+            else:
+                values = map(names.__getitem__, candidates)
+            if argument is None:
+                candidates = list(compress(candidates, map(test, values)))
+            else:
+                candidates = list(compress(candidates, map(test, values, repeat(argument))))
+        return list(candidates)
+
+    def _rows_changed(self, cid, position, delta):
+        """저장소의 삽입(delta > 0)/삭제(delta < 0)를 묶음의 행 수에 반영하고 그 묶음을 다시 만들 대상으로 표시합니다."""
+        chunks = self._chunks.get(cid)
+        if chunks is None:
+            return  # 아직 검색하지 않은 컨테이너는 처음 검색할 때 만듭니다.
+        index, first = 0, 0
+        while index < len(chunks) and first + chunks[index][0] <= position:
+            first += chunks[index][0]
+            index += 1
+        if delta > 0:
+            if index == len(chunks):
+                if not chunks:
+                    chunks.append([0, None, None])
+                index -= 1
+            chunks[index][0] += delta
+            chunks[index][1] = None
+            return
+        remaining, offset = -delta, position - first
+        while remaining and index < len(chunks):
+            chunk = chunks[index]
+            taken = min(chunk[0] - offset, remaining)
+            chunk[0] -= taken
+            chunk[1] = None
+            remaining -= taken
+            offset = 0
+            if chunk[0]:
+                index += 1
+            else:
+                del chunks[index]
+
+    def _packed_chunks(self, cid, start, end):
+        """컨테이너의 (이어 붙인 이름, 줄 시작 위치 배열) 묶음 목록을 반환합니다. 바뀐 묶음만 다시 만듭니다.
+
+        너무 커진 묶음은 나누고, 줄어든 묶음은 다음 묶음과 합칩니다.
+        """
+        chunks = self._chunks.get(cid)
+        if chunks is None or sum(chunk[0] for chunk in chunks) != end - start:
+            chunks = self._chunks[cid] = [[min(CHUNK_ROWS, end - row), None, None]
+                                          for row in range(start, end, CHUNK_ROWS)]
+        index, first = 0, start
+        while index < len(chunks):
+            chunk = chunks[index]
+            if chunk[1] is None:
+                if chunk[0] > 2 * CHUNK_ROWS:
+                    chunks[index:index + 1] = [[min(CHUNK_ROWS, chunk[0] - row), None, None]
+                                               for row in range(0, chunk[0], CHUNK_ROWS)]
+                    continue
+                following = chunks[index + 1] if index + 1 < len(chunks) else None
+                if following is not None and chunk[0] + following[0] <= CHUNK_ROWS:
+                    following[0] += chunk[0]
+                    following[1] = None
+                    del chunks[index]
+                    continue
+                names = self.store.names[first:first + chunk[0]]
+                chunk[1] = '\n'.join(names)
+                chunk[2] = array('Q', accumulate(map((1).__add__, map(len, names)), initial=0))
+            first += chunk[0]
+            index += 1
+        return [(text, offsets) for _, text, offsets in chunks]
+
+    def _sparse_substring_rows(self, cid, start, end, lo, hi, substring):
+        """names[lo:hi] 중 substring이 들어간 행 번호 목록을 이어 붙인 이름에서 찾아 반환합니다.
+
+        일치하는 행이 전체의 1/DENSE_MATCH_RATIO를 넘으면 위치를 하나씩 행 번호로 바꾸는 것보다 이름을 직접
+        비교하는 편이 빠르므로 중단하고 None을 반환합니다.
+        """
+        limit = max(64, (hi - lo) // DENSE_MATCH_RATIO)
+        rows = []
+        first = start
+        for text, offsets in self._packed_chunks(cid, start, end):
+            count = len(offsets) - 1
+            if first + count > lo:
+                if first >= hi:
+                    break
+                position, stop = offsets[max(lo - first, 0)], offsets[min(hi - first, count)]
+                find = text.find
+                while True:
+                    position = find(substring, position, stop)
+                    if position < 0:
+                        break
+                    line = bisect.bisect_right(offsets, position) - 1
+                    rows.append(first + line)
+                    if len(rows) > limit:
+                        return None
+                    position = offsets[line + 1]  # 같은 이름에서 다시 찾지 않도록 다음 줄로 넘어갑니다.
+            first += count
+        return rows
+
+
+def _prefix_range(names, prefix, lo, hi):
+    """정렬된 names[lo:hi]에서 prefix로 시작하는 이름의 구간을 반환합니다."""
+    first = bisect.bisect_left(names, prefix, lo, hi)
+    upper = prefix[:-1] + chr(ord(prefix[-1]) + 1)
+    return first, bisect.bisect_left(names, upper, first, hi)
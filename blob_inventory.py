@@ -0,0 +1,347 @@
+import csv
+import logging
+import os
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+# Blob Inventory 보고서(CSV/Parquet)로 전체 목록 조회 없이 컨테이너/prefix별 사용량을 집계합니다.
+# pyarrow가 있으면 보고서를 열 단위 배치로 읽어 pyarrow.compute로 집계하고, 없으면 CSV만 표준 csv 모듈로 읽습니다.
+try:
+    import pyarrow
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+except ImportError:
+    pyarrow = None
+
+REPORT_EXTENSIONS = ('.csv', '.parquet')
+NAME_COLUMN = 'Name'
+SIZE_COLUMN = 'Content-Length'
+MODIFIED_COLUMN = 'Last-Modified'
+TIER_COLUMN = 'AccessTier'
+
+AGE_LIMITS = (1, 7, 30, 90, 180, 365)  # 나이 구간 경계 (일)
+AGE_LABELS = ("1일 미만", "1~7일", "7~30일", "30~90일", "90~180일", "180일~1년", "1년 이상", "알 수 없음")
+UNKNOWN_AGE = len(AGE_LABELS) - 1
+OTHER_PREFIX = "(기타)/"  # max_prefixes를 넘은 prefix를 모으는 항목
+CSV_BLOCK_BYTES = 1 << 20  # pyarrow로 CSV를 읽을 때 한 번에 해석하는 크기
+
+
+def arrow_available():
+    """Parquet 보고서와 열 단위 집계에 필요한 pyarrow가 설치되어 있는지 확인합니다."""
+    return pyarrow is not None
+
+
+def format_size(size):
+    """바이트 수를 사람이 읽기 쉬운 단위로 변환합니다."""
+    for unit in ("B", "KB", "MB", "GB", "TB"):
+        if size < 1024:
+            return f"{size:.0f} {unit}" if unit == "B" else f"{size:.1f} {unit}"
+        size /= 1024
+    return f"{size:.1f} PB"
+
+
+def find_report_files(paths):
+    """파일 또는 디렉토리 목록에서 인벤토리 보고서 파일(.csv, .parquet)을 찾아 정렬된 목록으로 반환합니다."""
+    files = []
+    for path in paths:
+        if os.path.isdir(path):
+            for directory, _, names in os.walk(path):
+                files.extend(os.path.join(directory, name) for name in names
+                             if name.lower().endswith(REPORT_EXTENSIONS))
+        elif path.lower().endswith(REPORT_EXTENSIONS):
+            files.append(path)
+        else:
+            raise ValueError(f"인벤토리 보고서 파일이 아닙니다: {path}")
+    return sorted(files)
+
+
+def age_bucket(age_days):
+    """나이(일)가 속한 AGE_LABELS의 번호를 반환합니다."""
+    bucket = 0
+    for limit in AGE_LIMITS:
+        if age_days >= limit:
+            bucket += 1
+    return bucket
+
+
+def parse_report_time(value):
+    """보고서의 시각 문자열(ISO 8601 또는 RFC 1123)을 epoch 초로 변환합니다. 해석할 수 없으면 None을 반환합니다."""
+    if not value:
+        return None
+    try:
+        return datetime.strptime(value[:19], '%Y-%m-%dT%H:%M:%S').replace(tzinfo=timezone.utc).timestamp()
+    except ValueError:
+        pass
+    try:
+        return parsedate_to_datetime(value).timestamp()
+    except (TypeError, ValueError):
+        return None
+
+
+def split_prefix(rest, depth):
+    """컨테이너 이름을 뺀 블랍 경로에서 최대 depth단계의 디렉토리 prefix('a/b/')를 반환합니다."""
+    parts = rest.split('/', depth)
+    directories = parts[:depth] if len(parts) > depth else parts[:-1]
+    return ''.join(part + '/' for part in directories)
+
+
+class InventoryRollup:
+    """컨테이너 또는 prefix 하나의 블랍 수, 용량, 계층별/나이별 분포입니다."""
+
+    __slots__ = ('count', 'bytes', 'tiers', 'age_counts', 'age_bytes')
+
+    def __init__(self):
+        self.count = 0
+        self.bytes = 0
+        self.tiers = {}  # 계층 -> [블랍 수, 용량]
+        self.age_counts = [0] * len(AGE_LABELS)
+        self.age_bytes = [0] * len(AGE_LABELS)
+
+    def add(self, tier, age, count, size):
+        self.count += count
+        self.bytes += size
+        totals = self.tiers.setdefault(tier, [0, 0])
+        totals[0] += count
+        totals[1] += size
+        self.age_counts[age] += count
+        self.age_bytes[age] += size
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'bytes': self.bytes,
+            'tiers': {tier or "": {'count': count, 'bytes': size} for tier, (count, size) in self.tiers.items()},
+            'ages': {label: {'count': self.age_counts[i], 'bytes': self.age_bytes[i]}
+                     for i, label in enumerate(AGE_LABELS)},
+        }
+
+
+class InventoryAnalyzer:
+    """Blob Inventory 보고서를 배치 단위로 읽어 컨테이너별, prefix별 집계(InventoryRollup)를 만듭니다.
+
+    보고서의 Name 열은 '컨테이너/블랍 경로' 형식이며, prefix는 최대 prefix_depth단계까지 상위 디렉토리마다
+    누적됩니다. 배치(Parquet과 표준 csv 모듈은 batch_rows행, pyarrow CSV는 CSV_BLOCK_BYTES)는
+    (컨테이너, prefix, 계층, 나이 구간)으로 먼저 묶은 뒤 합치므로 메모리는 보고서 크기가 아니라 배치 크기와 prefix 수에
+    비례하며, prefix가 max_prefixes개를 넘으면 이후 새 prefix는 '(기타)/'로 모읍니다.
+    나이는 now(기본: 분석 시작 시각) 기준으로 Last-Modified에서 계산합니다.
+    """
+
+    def __init__(self, prefix_depth=2, max_prefixes=100000, batch_rows=65536, now=None):
+        self.prefix_depth = max(0, int(prefix_depth))
+        self.max_prefixes = max(1, int(max_prefixes))
+        self.batch_rows = max(1, int(batch_rows))
+        self.now = now if now is not None else time.time()
+        self.rollups = {}  # (컨테이너, prefix) -> InventoryRollup, prefix가 None이면 컨테이너 전체
+        self.children = {}  # (컨테이너, 상위 prefix 또는 None) -> 바로 아래 prefix 집합
+        self.rows = 0
+        self.files = []
+        self.overflowed = False  # max_prefixes를 넘어 '(기타)/'로 모은 prefix가 있는지
+
+    # --- 읽기 ---
+
+    def add_files(self, paths, progress_callback=None, cancel_event=None):
+        """보고서 파일들을 차례로 집계합니다. progress_callback(파일 번호, 파일 수, 누적 행 수)을 배치마다 호출합니다."""
+        for index, path in enumerate(paths):
+            started = time.perf_counter()
+            rows_before = self.rows
+            for batch in self._read_batches(path):
+                if cancel_event is not None and cancel_event.is_set():
+                    return False
+                if progress_callback:
+                    progress_callback(index, len(paths), self.rows)
+            self.files.append(path)
+            logging.info(f"인벤토리 보고서 집계: {path} ({self.rows - rows_before}행, "
+                         f"{time.perf_counter() - started:.1f}초)")
+        if progress_callback:
+            progress_callback(len(paths), len(paths), self.rows)
+        return True
+
+    def _read_batches(self, path):
+        """보고서를 배치 단위로 집계하며, 배치마다 한 번씩 yield합니다."""
+        is_parquet = path.lower().endswith('.parquet')
+        if pyarrow is not None:
+            batches = self._parquet_batches(path) if is_parquet else self._arrow_csv_batches(path)
+            for batch in batches:
+                self._add_arrow_batch(batch)
+                yield
+        elif is_parquet:
+            raise RuntimeError("Parquet 보고서를 읽으려면 pyarrow가 필요합니다. (pip install pyarrow)")
+        else:
+            for groups, rows in self._csv_groups(path):
+                self._merge_groups(groups, rows)
+                yield
+
+    def _parquet_batches(self, path):
+        parquet_file = pq.ParquetFile(path)
+        available = set(parquet_file.schema_arrow.names)
+        _require_columns(path, available)
+        columns = [name for name in (NAME_COLUMN, SIZE_COLUMN, MODIFIED_COLUMN, TIER_COLUMN) if name in available]
+        yield from parquet_file.iter_batches(batch_size=self.batch_rows, columns=columns)
+
+    def _arrow_csv_batches(self, path):
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            header = next(csv.reader(f), None) or []
+        _require_columns(path, set(header))
+        types = {NAME_COLUMN: pyarrow.string(), SIZE_COLUMN: pyarrow.int64(),
+                 MODIFIED_COLUMN: pyarrow.string(), TIER_COLUMN: pyarrow.string()}
+        columns = [name for name in types if name in header]
+        convert_options = pa_csv.ConvertOptions(include_columns=columns,
+                                                column_types={name: types[name] for name in columns})
+        # pyarrow는 블록 수십 개를 미리 읽어 두므로 메모리 사용량은 보고서 크기가 아니라 블록 크기에 비례합니다.
+        read_options = pa_csv.ReadOptions(block_size=CSV_BLOCK_BYTES, use_threads=False)
+        yield from pa_csv.open_csv(path, read_options=read_options, convert_options=convert_options)
+
+    def _add_arrow_batch(self, batch):
+        """pyarrow RecordBatch 하나를 열 단위 연산으로 묶어 집계합니다."""
+        if batch.num_rows == 0:
+            return
+        names = batch.column(batch.schema.get_field_index(NAME_COLUMN))
+        parts = pc.extract_regex(names, rf'^(?P<container>[^/]*)/(?P<prefix>(?:[^/]*/){{0,{self.prefix_depth}}})')
+        containers = pc.fill_null(pc.struct_field(parts, 'container'), "")
+        prefixes = pc.fill_null(pc.struct_field(parts, 'prefix'), "")
+
+        size_index = batch.schema.get_field_index(SIZE_COLUMN)
+        sizes = pc.fill_null(pc.cast(batch.column(size_index), pyarrow.int64()), 0)
+
+        tier_index = batch.schema.get_field_index(TIER_COLUMN)
+        if tier_index < 0 or batch.schema.field(tier_index).type == pyarrow.null():
+            tiers = pyarrow.nulls(batch.num_rows, pyarrow.string())
+        else:
+            tiers = pc.cast(batch.column(tier_index), pyarrow.string())
+
+        modified_index = batch.schema.get_field_index(MODIFIED_COLUMN)
+        if modified_index < 0:
+            ages = pyarrow.array([UNKNOWN_AGE] * batch.num_rows, pyarrow.int8())
+        else:
+            seconds = _arrow_epoch_seconds(batch.column(modified_index))
+            age_days = pc.divide(pc.subtract(pyarrow.scalar(float(self.now)), pc.cast(seconds, pyarrow.float64())),
+                                 86400.0)
+            ages = pyarrow.array([0] * batch.num_rows, pyarrow.int8())
+            for limit in AGE_LIMITS:
+                ages = pc.add(ages, pc.cast(pc.greater_equal(age_days, float(limit)), pyarrow.int8()))
+            ages = pc.fill_null(ages, UNKNOWN_AGE)
+
+        table = pyarrow.table({'container': containers, 'prefix': prefixes, 'tier': tiers, 'age': ages,
+                               'size': sizes})
+        grouped = table.group_by(['container', 'prefix', 'tier', 'age']).aggregate([('size', 'sum'),
+                                                                                  ('size', 'count')])
+        groups = {}
+        for row in grouped.to_pylist():
+            groups[(row['container'], row['prefix'], row['tier'], row['age'])] = [row['size_count'], row['size_sum']]
+        self._merge_groups(groups, batch.num_rows)
+
+    def _csv_groups(self, path):
+        """pyarrow가 없을 때 CSV를 batch_rows행씩 읽어 (묶음 dict, 행 수)를 생성합니다."""
+        with open(path, newline='', encoding='utf-8-sig') as f:
+            reader = csv.reader(f)
+            header = next(reader, None) or []
+            _require_columns(path, set(header))
+            name_at = header.index(NAME_COLUMN)
+            size_at = header.index(SIZE_COLUMN)
+            modified_at = header.index(MODIFIED_COLUMN) if MODIFIED_COLUMN in header else None
+            tier_at = header.index(TIER_COLUMN) if TIER_COLUMN in header else None
+            depth, now = self.prefix_depth, self.now
+
+            groups, rows = {}, 0
+            for record in reader:
+                if not record:
+                    continue
+                container, _, rest = record[name_at].partition('/')
+                prefix = split_prefix(rest, depth)
+                tier = (record[tier_at] or None) if tier_at is not None else None
+                modified = parse_report_time(record[modified_at]) if modified_at is not None else None
+                age = UNKNOWN_AGE if modified is None else age_bucket((now - modified) / 86400)
+                size = int(record[size_at] or 0)
+                totals = groups.get((container, prefix, tier, age))
+                if totals is None:
+                    groups[(container, prefix, tier, age)] = [1, size]
+                else:
+                    totals[0] += 1
+                    totals[1] += size
+                rows += 1
+                if rows >= self.batch_rows:
+                    yield groups, rows
+                    groups, rows = {}, 0
+            if rows:
+                yield groups, rows
+
+    # --- 집계 ---
+
+    def _merge_groups(self, groups, rows):
+        """(컨테이너, prefix, 계층, 나이 구간) -> [블랍 수, 용량] 묶음을 컨테이너와 상위 prefix 집계에 더합니다."""
+        self.rows += rows
+        for (container, prefix, tier, age), (count, size) in groups.items():
+            self._rollup(container, None).add(tier, age, count, size)
+            parent = None
+            position = prefix.find('/')
+            while position >= 0:
+                key = self._prefix_key(container, parent, prefix[:position + 1])
+                self._rollup(*key).add(tier, age, count, size)
+                if key[1] == OTHER_PREFIX:
+                    break
+                parent = key[1]
+                position = prefix.find('/', position + 1)
+            if not prefix:
+                self._rollup(container, "").add(tier, age, count, size)  # 컨테이너 바로 아래의 블랍
+
+    def _prefix_key(self, container, parent, prefix):
+        key = (container, prefix)
+        if key not in self.rollups and len(self.rollups) >= self.max_prefixes:
+            self.overflowed = True
+            key = (container, OTHER_PREFIX)
+            parent = None
+        self.children.setdefault((container, parent), set()).add(key[1])
+        return key
+
+    def _rollup(self, container, prefix):
+        rollup = self.rollups.get((container, prefix))
+        if rollup is None:
+            rollup = self.rollups[(container, prefix)] = InventoryRollup()
+            if prefix is None:
+                self.children.setdefault((None, None), set()).add(container)
+            elif prefix == "":
+                self.children.setdefault((container, None), set()).add(prefix)
+        return rollup
+
+    # --- 결과 ---
+
+    def containers(self):
+        """[(컨테이너, InventoryRollup), ...]를 용량이 큰 순서로 반환합니다."""
+        names = self.children.get((None, None), ())
+        return sorted(((name, self.rollups[(name, None)]) for name in names), key=lambda item: -item[1].bytes)
+
+    def child_prefixes(self, container, prefix=None):
+        """컨테이너(prefix가 None) 또는 prefix 바로 아래의 [(prefix, InventoryRollup), ...]를 용량이 큰 순서로 반환합니다.
+
+        컨테이너 바로 아래의 블랍은 prefix ''로 묶입니다.
+        """
+        prefixes = self.children.get((container, prefix), ())
+        return sorted(((child, self.rollups[(container, child)]) for child in prefixes),
+                      key=lambda item: -item[1].bytes)
+
+    def records(self):
+        """모든 집계를 JSON으로 바꿀 수 있는 dict 목록으로 반환합니다. (컨테이너 전체는 prefix가 None)"""
+        return [dict(container=container, prefix=prefix, **rollup.to_dict())
+                for (container, prefix), rollup in sorted(self.rollups.items(),
+                                                          key=lambda item: (item[0][0], item[0][1] or ""))]
+
+
+def _require_columns(path, columns):
+    missing = [name for name in (NAME_COLUMN, SIZE_COLUMN) if name not in columns]
+    if missing:
+        raise ValueError(f"인벤토리 보고서에 {', '.join(missing)} 열이 없습니다: {path} "
+                         f"(인벤토리 규칙의 스키마 필드에 Name과 Content-Length를 포함하세요)")
+
+
+def _arrow_epoch_seconds(column):
+    """Last-Modified 열(타임스탬프 또는 ISO 8601/RFC 1123 문자열)을 int64 epoch 초 배열로 바꿉니다."""
+    if pyarrow.types.is_timestamp(column.type):
+        return pc.cast(pc.cast(column, pyarrow.timestamp('s', tz=column.type.tz), safe=False), pyarrow.int64())
+    text = pc.cast(column, pyarrow.string())
+    iso = pc.strptime(pc.utf8_slice_codeunits(text, 0, 19), format='%Y-%m-%dT%H:%M:%S', unit='s',
+                      error_is_null=True)
+    rfc1123 = pc.strptime(pc.utf8_slice_codeunits(text, 5, 25), format='%d %b %Y %H:%M:%S', unit='s',
+                          error_is_null=True)
+    return pc.cast(pc.coalesce(iso, rfc1123), pyarrow.int64())
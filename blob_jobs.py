@@ -0,0 +1,705 @@
+import heapq
+import itertools
+import json
+import logging
+import os
+import random
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from blob_copy import CopyFailed
+from blob_metrics import metrics, record_transfer
+from blob_sync import SYNC_DOWN, SYNC_UP, SyncFailed, path_key
+from blob_transfer import MANIFEST_SUFFIX, PARTIAL_SUFFIX, TransferCancelled
+
+QUEUED, RUNNING, PAUSED, DONE, FAILED, CANCELLED = 'queued', 'running', 'paused', 'done', 'failed', 'cancelled'
+FINISHED_STATES = (DONE, FAILED, CANCELLED)
+STATE_LABELS = {QUEUED: "대기", RUNNING: "진행 중", PAUSED: "일시 정지", DONE: "완료", FAILED: "실패",
+                CANCELLED: "취소됨"}
+KIND_LABELS = {'upload': "업로드", 'download': "다운로드", 'delete': "삭제", 'delete_prefix': "경로 삭제",
+               'copy': "복사", 'move': "이동", 'copy_prefix': "경로 복사", 'move_prefix': "경로 이동",
+               'sync_up': "동기화 올리기", 'sync_down': "동기화 받기", 'mirror_up': "미러 올리기",
+               'mirror_down': "미러 받기"}
+COPY_KINDS = ('copy', 'move', 'copy_prefix', 'move_prefix')
+SYNC_KINDS = ('sync_up', 'sync_down', 'mirror_up', 'mirror_down')
+UPLOAD_KINDS = ('upload', 'sync_up', 'mirror_up')  # 바이트를 세는 작업 중 올리는 쪽
+PRIORITY_LOW, PRIORITY_NORMAL, PRIORITY_HIGH = 0, 1, 2
+PRIORITY_LABELS = {PRIORITY_LOW: "낮음", PRIORITY_NORMAL: "보통", PRIORITY_HIGH: "높음"}
+NON_RETRYABLE_STATUS = (400, 401, 403, 404, 409)  # 다시 보내도 결과가 같은 응답
+ACCOUNT_RETRY_SECONDS = 1.0  # 연결되지 않은 계정의 작업을 다시 확인하는 간격
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    account TEXT NOT NULL,
+    container TEXT NOT NULL,
+    blob_name TEXT NOT NULL DEFAULT '',
+    local_path TEXT NOT NULL DEFAULT '',
+    keys TEXT,
+    priority INTEGER NOT NULL DEFAULT 1,
+    state TEXT NOT NULL,
+    attempts INTEGER NOT NULL DEFAULT 0,
+    error TEXT,
+    done INTEGER NOT NULL DEFAULT 0,
+    total INTEGER,
+    created_at REAL NOT NULL,
+    finished_at REAL,
+    dest_account TEXT,
+    dest_container TEXT NOT NULL DEFAULT '',
+    dest_prefix TEXT NOT NULL DEFAULT ''
+);
+"""
+# 예전 대기열 파일에 없는 열 (열 이름, 정의)
+_ADDED_COLUMNS = (("dest_account", "TEXT"), ("dest_container", "TEXT NOT NULL DEFAULT ''"),
+                  ("dest_prefix", "TEXT NOT NULL DEFAULT ''"))
+_COLUMNS = ("kind, account, container, blob_name, local_path, keys, priority, state, attempts, error, done, total, "
+            "created_at, finished_at, dest_account, dest_container, dest_prefix")
+_PLACEHOLDERS = ", ".join("?" * len(_COLUMNS.split(", ")))
+
+
+class DeleteFailed(Exception):
+    """배치 삭제에서 일부 블랍을 지우지 못했을 때 발생합니다. 남은 블랍은 다시 시도할 때 삭제합니다."""
+
+
+def is_retryable(error):
+    """오류가 다시 시도하면 성공할 수 있는 종류(네트워크 오류, 408/412/429/5xx 응답 등)인지 반환합니다."""
+    if isinstance(error, TransferCancelled):
+        return False
+    status = getattr(error, 'status_code', None)
+    if status is not None:
+        return status not in NON_RETRYABLE_STATUS
+    return not isinstance(error, (FileNotFoundError, IsADirectoryError, NotADirectoryError, PermissionError,
+                                  ValueError))
+
+
+def mbps_to_bytes(value):
+    """설정의 MB/s 값을 초당 바이트로 바꿉니다. 비어 있거나 0이면 0(제한 없음)입니다."""
+    return int(float(value or 0) * 1024 * 1024)
+
+
+class TokenBucket:
+    """초당 rate 바이트로 채워지는 토큰 버킷입니다. 여러 전송 스레드가 하나를 공유해 전체 속도를 제한합니다.
+
+    consume()은 토큰이 모자라도 먼저 차감하고(빚) 그만큼 기다리므로 블록 하나가 버킷보다 커도 평균 속도가
+    지켜지며, 먼저 요청한 스레드가 먼저 보냅니다. rate가 0이면 제한하지 않습니다.
+    """
+
+    def __init__(self, rate=0, burst_seconds=1.0):
+        self._lock = threading.Lock()
+        self.rate = 0
+        self.burst_seconds = burst_seconds
+        self._tokens = 0.0
+        self._stamp = time.monotonic()
+        self.set_rate(rate)
+
+    def set_rate(self, rate):
+        """초당 바이트 수를 바꿉니다. 0이면 제한을 풉니다. 기다리던 스레드는 다음 확인 때 새 속도를 따릅니다."""
+        with self._lock:
+            self.rate = max(0, int(rate or 0))
+            self._tokens = min(self._tokens, self.rate * self.burst_seconds)
+            self._stamp = time.monotonic()
+
+    def consume(self, amount, cancel_event=None):
+        """amount 바이트만큼 토큰을 쓰고 필요하면 기다립니다. 기다린 시간(초)을 반환합니다.
+
+        기다리는 중에 cancel_event가 설정되면 TransferCancelled를 발생시킵니다.
+        """
+        with self._lock:
+            if not self.rate:
+                return 0.0
+            now = time.monotonic()
+            self._tokens = min(self.rate * self.burst_seconds, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp = now
+            self._tokens -= amount
+            deadline = now - self._tokens / self.rate if self._tokens < 0 else now
+        started = time.monotonic()
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not self.rate:
+                break
+            # 짧게 나누어 기다려야 취소와 제한 해제에 바로 반응합니다.
+            if cancel_event is not None and cancel_event.wait(min(remaining, 0.2)):
+                raise TransferCancelled("속도 제한 대기 중 취소")
+            elif cancel_event is None:
+                time.sleep(min(remaining, 0.2))
+        waited = time.monotonic() - started
+        if waited > 0:
+            metrics.inc('blobmoni_transfer_throttle_seconds_total', waited)
+        return waited
+
+
+class TransferJob:
+    """전송 대기열의 작업 하나입니다.
+
+    kind는 'upload'(local_path -> container/blob_name), 'download'(container/blob_name -> local_path),
+    'delete'(keys의 (컨테이너, 블랍 이름) 목록), 'delete_prefix'(container/blob_name 아래 전체)입니다.
+    'copy'/'move'(keys)와 'copy_prefix'/'move_prefix'(container/blob_name 아래 전체)는 dest_account(없으면 같은
+    계정)의 dest_container/dest_prefix 아래로 서버 측 복사합니다.
+    'sync_up'/'sync_down'은 local_path 디렉토리와 container/blob_name 아래를 한 방향으로 증분 동기화하며,
+    'mirror_up'/'mirror_down'은 여기에 더해 반대쪽에만 있는 파일을 지웁니다.
+    done/total은 전송/삭제 작업에 따라 바이트 수 또는 블랍 수이며, rate는 최근 1초 남짓의 초당 바이트입니다.
+    """
+
+    def __init__(self, kind, account_name, container, blob_name="", local_path="", keys=None,
+                 priority=PRIORITY_NORMAL, dest_account=None, dest_container="", dest_prefix=""):
+        self.id = None
+        self.kind = kind
+        self.account_name = account_name
+        self.container = container
+        self.blob_name = blob_name
+        self.local_path = local_path
+        self.keys = keys
+        self.priority = priority
+        self.dest_account = dest_account
+        self.dest_container = dest_container
+        self.dest_prefix = dest_prefix
+        self.state = QUEUED
+        self.attempts = 0
+        self.error = None  # 마지막 오류 메시지
+        self.done = 0
+        self.total = None
+        self.rate = 0.0
+        self.created_at = time.time()
+        self.finished_at = None
+        self.deleted = []  # 삭제/이동 작업에서 지운 (컨테이너, 블랍 이름) - 화면에 반영한 뒤 비웁니다.
+        self.next_attempt_at = 0.0  # 다시 시도할 시각 (time.monotonic 기준)
+        self._token = 0  # 대기열 항목이 최신인지 확인하는 번호
+        self._stop_event = threading.Event()
+        self._stop_reason = None  # 'pause', 'cancel', 'shutdown'
+        self._sample = (0, time.monotonic())
+
+    def __repr__(self):
+        return f"TransferJob({self.id}, {self.kind}, {self.label()!r}, {self.state})"
+
+    @property
+    def counts_bytes(self):
+        return self.kind in ('upload', 'download') or self.kind in SYNC_KINDS
+
+    @property
+    def direction(self):
+        """바이트를 세는 작업의 전송 방향('upload' 또는 'download')입니다."""
+        return 'upload' if self.kind in UPLOAD_KINDS else 'download'
+
+    @property
+    def finished(self):
+        return self.state in FINISHED_STATES
+
+    def label(self):
+        """작업 대상을 사람이 읽을 수 있게 표시합니다."""
+        if self.kind in ('delete', 'copy', 'move'):
+            keys = self.keys or []
+            label = f"{keys[0][0]}/{keys[0][1]}" if len(keys) == 1 else f"{self.container} 외 블랍 {len(keys):,}개"
+        elif self.kind in ('delete_prefix', 'copy_prefix', 'move_prefix'):
+            label = f"{self.container}/{self.blob_name}*"
+        elif self.kind in SYNC_KINDS:
+            remote = f"{self.container}/{self.blob_name.strip('/')}".rstrip('/')
+            return f"{self.local_path} → {remote}" if self.kind in UPLOAD_KINDS else f"{remote} → {self.local_path}"
+        else:
+            label = f"{self.container}/{self.blob_name}"
+        if self.kind in COPY_KINDS:
+            account = f"{self.dest_account}:" if self.dest_account and self.dest_account != self.account_name else ""
+            prefix = self.dest_prefix.strip('/')
+            label += f" → {account}{self.dest_container}/{prefix}" if prefix else f" → {account}{self.dest_container}"
+        return label
+
+    def update_progress(self, done, total):
+        """작업 스레드에서 진행 상황을 기록합니다."""
+        self.done = done
+        self.total = total
+
+    def sample_rate(self, now):
+        """직전 샘플 이후의 평균 속도로 rate를 갱신합니다. 1초보다 짧은 간격은 무시합니다."""
+        last_done, last_time = self._sample
+        if now - last_time >= 1.0:
+            self.rate = max(0.0, (self.done - last_done) / (now - last_time))
+            self._sample = (self.done, now)
+        return self.rate
+
+
+class TransferJobStore:
+    """전송 작업을 SQLite 파일에 보관하는 영속 대기열입니다. 프로그램을 다시 시작하면 끝나지 않은 작업을 이어 갑니다.
+
+    진행 중 바이트는 기록하지 않고 상태가 바뀔 때만 씁니다. 다운로드/업로드의 실제 진행 상태는 전송 엔진의
+    매니페스트와 미확정 블록으로 이어받습니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for name, definition in _ADDED_COLUMNS:
+            if name not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {name} {definition}")
+        self._conn.commit()
+        logging.debug(f"전송 대기열 열기: {os.path.abspath(path)}")
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    def load(self):
+        """완료/취소된 작업을 지우고 남은 작업을 번호순으로 반환합니다. 진행 중이던 작업은 대기 상태로 되돌립니다."""
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM jobs WHERE state IN (?, ?)", (DONE, CANCELLED))
+            self._conn.execute("UPDATE jobs SET state = ? WHERE state = ?", (QUEUED, RUNNING))
+            rows = self._conn.execute(f"SELECT id, {_COLUMNS} FROM jobs ORDER BY id").fetchall()
+        jobs = []
+        for (job_id, kind, account, container, blob_name, local_path, keys, priority, state, attempts, error, done,
+             total, created_at, finished_at, dest_account, dest_container, dest_prefix) in rows:
+            job = TransferJob(kind, account, container, blob_name, local_path,
+                              [tuple(key) for key in json.loads(keys)] if keys else None, priority,
+                              dest_account, dest_container, dest_prefix)
+            job.id, job.state, job.attempts, job.error = job_id, state, attempts, error
+            job.done, job.total, job.created_at, job.finished_at = done, total, created_at, finished_at
+            jobs.append(job)
+        return jobs
+
+    def add(self, jobs):
+        """새 작업을 한 트랜잭션으로 기록하고 번호를 매깁니다."""
+        with self._lock, self._conn:
+            for job in jobs:
+                cursor = self._conn.execute(f"INSERT INTO jobs ({_COLUMNS}) VALUES ({_PLACEHOLDERS})",
+                                            self._values(job))
+                job.id = cursor.lastrowid
+
+    def save(self, job):
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(f"UPDATE jobs SET ({_COLUMNS}) = ({_PLACEHOLDERS}) WHERE id = ?",
+                                   self._values(job) + (job.id,))
+        except sqlite3.Error as e:
+            logging.error(f"전송 대기열 기록 실패: {job}, 오류: {e}")
+
+    def remove(self, job_ids):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM jobs WHERE id = ?", [(job_id,) for job_id in job_ids])
+
+    @staticmethod
+    def _values(job):
+        keys = json.dumps(job.keys, ensure_ascii=False) if job.keys is not None else None
+        return (job.kind, job.account_name, job.container, job.blob_name, job.local_path, keys, job.priority,
+                job.state, job.attempts, job.error, job.done, job.total, job.created_at, job.finished_at,
+                job.dest_account, job.dest_container, job.dest_prefix)
+
+
+class TransferManager:
+    """업로드, 다운로드, 삭제, 복사/이동 작업을 대기열에 넣고 백그라운드에서 실행하는 전송 관리자입니다. Qt에 의존하지 않습니다.
+
+    - 동시에 실행하는 작업 수를 전체(transfer_parallel_files)와 계정별(transfer_per_account_jobs)로 제한합니다.
+    - 우선순위가 높은 작업부터, 같으면 먼저 넣은 작업부터 시작합니다. 계정마다 대기열 힙을 따로 둡니다.
+    - 업로드/다운로드 속도는 방향별 TokenBucket으로 제한합니다 (upload_limit_mbps, download_limit_mbps).
+    - 실패한 작업은 다시 시도할 수 있는 오류면 지수적으로 늘어나는 간격으로 transfer_retries번까지 다시 실행합니다.
+    - 일시 정지는 실행 중인 작업을 멈추고, 다시 시작하면 전송 엔진의 이어받기/이어올리기로 남은 부분만 보냅니다.
+
+    listener(job)는 작업이 추가되거나 상태가 바뀔 때 작업 스레드에서 호출됩니다. account_lookup(계정 이름)은
+    연결된 계정 dict를 반환해야 하며, None이면 그 계정의 작업(다른 계정으로 복사하는 작업은 대상 계정까지)은
+    연결될 때까지 기다립니다.
+    """
+
+    def __init__(self, handler, config, account_lookup, listener=None):
+        self.handler = handler
+        self.account_lookup = account_lookup
+        self.listener = listener
+        self.max_jobs = max(1, int(config.get('transfer_parallel_files', 3)))
+        self.max_jobs_per_account = max(1, int(config.get('transfer_per_account_jobs') or self.max_jobs))
+        self.max_attempts = 1 + max(0, int(config.get('transfer_retries', 3)))
+        self.retry_delay = float(config.get('transfer_retry_delay', 2))
+        self.retry_max_delay = float(config.get('transfer_retry_max_delay', 60))
+        self.buckets = {'upload': TokenBucket(mbps_to_bytes(config.get('upload_limit_mbps'))),
+                        'download': TokenBucket(mbps_to_bytes(config.get('download_limit_mbps')))}
+
+        self.jobs = []  # 모든 작업 (번호순)
+        self._ready = {}  # 계정 이름 -> [(-우선순위, 번호, 토큰, 작업)] 힙
+        self._delayed = []  # [(다시 시도할 시각, 번호, 토큰, 작업)] 힙
+        self._running = {}  # 작업 번호 -> 작업
+        self._active = {}  # 계정 이름 -> 실행 중인 작업 수
+        self._ids = itertools.count(1)
+        self._closed = False
+        self._cond = threading.Condition()
+
+        self.store = None
+        if config.get('transfer_queue_enabled', True):
+            try:
+                self.store = TransferJobStore(config.get('transfer_queue_path') or 'blobmoni_transfers.sqlite3')
+                self.jobs = self.store.load()
+            except Exception as e:
+                logging.error(f"전송 대기열 파일을 열 수 없습니다. 작업을 저장하지 않습니다. 오류: {e}")
+                self.store = None
+        for job in self.jobs:
+            if job.state == QUEUED:
+                self._push(job)
+        if self.jobs:
+            logging.info(f"저장된 전송 작업 {len(self.jobs)}개를 불러왔습니다. "
+                         f"(대기 {sum(job.state == QUEUED for job in self.jobs)}개)")
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_jobs, thread_name_prefix='blob-job')
+        self._dispatcher = threading.Thread(target=self._dispatch_loop, name='blob-job-dispatch', daemon=True)
+        self._dispatcher.start()
+
+    # --- 작업 추가와 제어 ---
+
+    def enqueue(self, jobs):
+        """작업 목록을 대기열에 넣습니다. 넣은 작업 목록을 반환합니다.
+
+        끝나지 않은 다운로드(앞서 넣은 작업 포함)와 같은 로컬 경로로 받는 다운로드 작업은 받다 만 파일과 매니페스트를
+        함께 쓰게 되므로 넣지 않습니다. 넣지 않은 작업은 id가 None으로 남습니다.
+        """
+        jobs = list(jobs)
+        with self._cond:
+            jobs = self._without_path_conflicts(jobs)
+            if not jobs:
+                return jobs
+            if self.store is not None:
+                self.store.add(jobs)
+            else:
+                for job in jobs:
+                    job.id = next(self._ids)
+            for job in jobs:
+                self.jobs.append(job)
+                self._push(job)
+            self._cond.notify_all()
+        logging.info(f"전송 작업 {len(jobs)}개 추가: {KIND_LABELS[jobs[0].kind]} {jobs[0].label()}"
+                     + (f" 외 {len(jobs) - 1}개" if len(jobs) > 1 else ""))
+        for job in jobs:
+            self._notify(job)
+        return jobs
+
+    def _without_path_conflicts(self, jobs):
+        taken = {path_key(job.local_path) for job in self.jobs if job.kind == 'download' and not job.finished}
+        accepted = []
+        for job in jobs:
+            if job.kind == 'download':
+                key = path_key(job.local_path)
+                if key in taken:
+                    logging.warning(f"같은 로컬 경로로 받는 작업이 이미 있어 대기열에 넣지 않습니다: {job.label()} "
+                                    f"-> {job.local_path}")
+                    continue
+                taken.add(key)
+            accepted.append(job)
+        return accepted
+
+    def pause(self, jobs):
+        """대기 중인 작업은 일시 정지하고, 실행 중인 작업은 다음 조각/블록에서 멈춥니다."""
+        self._control(jobs, 'pause')
+
+    def resume(self, jobs):
+        """일시 정지했거나 실패한 작업을 다시 대기열에 넣습니다. 실패한 작업은 시도 횟수를 초기화합니다."""
+        changed = []
+        with self._cond:
+            for job in jobs:
+                if job.state in (PAUSED, FAILED):
+                    if job.state == FAILED:
+                        job.attempts = 0
+                    job.state, job.error, job.finished_at = QUEUED, None, None
+                    job.next_attempt_at = 0.0
+                    self._push(job)
+                    self._save(job)
+                    changed.append(job)
+            self._cond.notify_all()
+        for job in changed:
+            self._notify(job)
+
+    def cancel(self, jobs):
+        """작업을 취소합니다. 취소한 다운로드의 받다 만 파일은 지웁니다."""
+        self._control(jobs, 'cancel')
+
+    def pause_all(self):
+        self.pause([job for job in self.job_list() if job.state in (QUEUED, RUNNING)])
+
+    def resume_all(self):
+        self.resume([job for job in self.job_list() if job.state == PAUSED])
+
+    def set_priority(self, jobs, priority):
+        """작업의 우선순위를 바꿉니다. 이미 실행 중인 작업은 멈추지 않습니다."""
+        with self._cond:
+            for job in jobs:
+                if job.finished or job.priority == priority:
+                    continue
+                job.priority = priority
+                if job.state == QUEUED and job.next_attempt_at <= time.monotonic():
+                    self._push(job)
+                self._save(job)
+            self._cond.notify_all()
+
+    def set_limits(self, upload_bytes_per_second, download_bytes_per_second):
+        """업로드/다운로드 속도 제한(초당 바이트, 0이면 제한 없음)을 바꿉니다. 실행 중인 작업에도 바로 적용됩니다."""
+        self.buckets['upload'].set_rate(upload_bytes_per_second)
+        self.buckets['download'].set_rate(download_bytes_per_second)
+        logging.info(f"전송 속도 제한 변경: 업로드 {upload_bytes_per_second or '제한 없음'}, "
+                     f"다운로드 {download_bytes_per_second or '제한 없음'} (바이트/초)")
+
+    def remove_finished(self):
+        """끝난 작업(완료, 실패, 취소)을 목록과 대기열 파일에서 지웁니다. 지운 작업 수를 반환합니다."""
+        with self._cond:
+            finished = [job for job in self.jobs if job.finished]
+            self.jobs = [job for job in self.jobs if not job.finished]
+            if self.store is not None and finished:
+                self.store.remove([job.id for job in finished])
+        return len(finished)
+
+    def job_list(self):
+        with self._cond:
+            return list(self.jobs)
+
+    def sample_rates(self):
+        """실행 중인 작업의 속도를 갱신하고 방향별 합계 {'upload': 초당 바이트, 'download': 초당 바이트}를 반환합니다."""
+        now = time.monotonic()
+        totals = {'upload': 0.0, 'download': 0.0}
+        with self._cond:
+            running = list(self._running.values())
+        for job in running:
+            if job.counts_bytes:
+                totals[job.direction] += job.sample_rate(now)
+        return totals
+
+    def unfinished(self):
+        """끝나지 않은 작업 수를 반환합니다."""
+        with self._cond:
+            return sum(not job.finished for job in self.jobs)
+
+    def wait(self, timeout=None):
+        """대기 중이거나 실행 중인 작업이 없을 때까지 기다립니다. 일시 정지한 작업은 기다리지 않습니다."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            while any(job.state in (QUEUED, RUNNING) for job in self.jobs):
+                remaining = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    return False
+                self._cond.wait(remaining)
+        return True
+
+    def close(self):
+        """새 작업을 시작하지 않고, 실행 중인 작업은 멈춰 다음 실행 때 이어서 하도록 대기 상태로 저장합니다."""
+        with self._cond:
+            self._closed = True
+            for job in self._running.values():
+                job._stop_reason = job._stop_reason or 'shutdown'
+                job._stop_event.set()
+            self._cond.notify_all()
+        self._executor.shutdown(wait=True)
+        self._dispatcher.join(timeout=5)
+        if self.store is not None:
+            self.store.close()
+
+    def _control(self, jobs, action):
+        changed = []
+        with self._cond:
+            for job in jobs:
+                if job.state == RUNNING:
+                    job._stop_reason = action
+                    job._stop_event.set()
+                elif job.state in (QUEUED, PAUSED) or (action == 'cancel' and job.state == FAILED):
+                    job.state = PAUSED if action == 'pause' else CANCELLED
+                    if job.state == CANCELLED:
+                        job.finished_at = time.time()
+                    job._token += 1  # 대기열에 남은 항목을 무효로 만듭니다.
+                    self._save(job)
+                    changed.append(job)
+            self._cond.notify_all()
+        for job in changed:
+            if job.state == CANCELLED:
+                remove_partial_download(job)
+            self._notify(job)
+
+    # --- 실행 ---
+
+    def _push(self, job):
+        job._token += 1
+        if job.next_attempt_at > time.monotonic():
+            heapq.heappush(self._delayed, (job.next_attempt_at, job.id, job._token, job))
+        else:
+            heapq.heappush(self._ready.setdefault(job.account_name, []), (-job.priority, job.id, job._token, job))
+
+    @staticmethod
+    def _is_current(entry):
+        job = entry[3]
+        return job.state == QUEUED and entry[2] == job._token
+
+    def _dispatch_loop(self):
+        with self._cond:
+            while not self._closed:
+                timeout = self._start_ready_jobs()
+                self._cond.wait(timeout)
+
+    def _start_ready_jobs(self):
+        """실행할 수 있는 작업을 우선순위 순으로 시작하고, 다음에 확인할 때까지 기다릴 시간을 반환합니다."""
+        now = time.monotonic()
+        while self._delayed and self._delayed[0][0] <= now:
+            entry = heapq.heappop(self._delayed)
+            if self._is_current(entry):
+                self._push(entry[3])
+
+        unavailable = set()
+        while len(self._running) < self.max_jobs:
+            best = None
+            for account_name, heap in self._ready.items():
+                while heap and not self._is_current(heap[0]):
+                    heapq.heappop(heap)
+                if (not heap or account_name in unavailable
+                        or self._active.get(account_name, 0) >= self.max_jobs_per_account):
+                    continue
+                if best is None or heap[0] < self._ready[best][0]:
+                    best = account_name
+            if best is None:
+                break
+            account = self.account_lookup(best)
+            dest_account = self._ready[best][0][3].dest_account
+            if account is None or (dest_account and self.account_lookup(dest_account) is None):
+                unavailable.add(best)
+                continue
+            job = heapq.heappop(self._ready[best])[3]
+            job.state = RUNNING
+            job.attempts += 1
+            job._sample = (job.done, now)
+            self._running[job.id] = job
+            self._active[best] = self._active.get(best, 0) + 1
+            self._save(job)
+            self._executor.submit(self._run, job, account)
+
+        timeout = self._delayed[0][0] - now if self._delayed else None
+        if unavailable:
+            timeout = min(timeout, ACCOUNT_RETRY_SECONDS) if timeout is not None else ACCOUNT_RETRY_SECONDS
+        return timeout
+
+    def _run(self, job, account):
+        self._notify(job)
+        started = time.perf_counter()
+        try:
+            self._execute(job, account)
+            error = None
+        except Exception as e:
+            error = e
+        elapsed = time.perf_counter() - started
+
+        with self._cond:
+            reason = job._stop_reason
+            job._stop_reason = None
+            job._stop_event = threading.Event()
+            del self._running[job.id]
+            self._active[job.account_name] -= 1
+            if error is None:
+                job.state, job.error = DONE, None
+            elif reason == 'pause':
+                job.state = PAUSED
+            elif reason == 'shutdown':
+                job.state = QUEUED
+            elif reason == 'cancel':
+                job.state = CANCELLED
+            elif is_retryable(error) and job.attempts < self.max_attempts:
+                delay = min(self.retry_max_delay, self.retry_delay * 2 ** (job.attempts - 1))
+                job.next_attempt_at = time.monotonic() + delay * random.uniform(0.9, 1.1)
+                job.state, job.error = QUEUED, str(error)
+                self._push(job)
+                metrics.inc('blobmoni_transfer_retries_total', kind=job.kind)
+                logging.warning(f"전송 작업 실패, {delay:.0f}초 뒤 다시 시도합니다 ({job.attempts}/{self.max_attempts}): "
+                                f"{job.label()}, 오류: {error}")
+            else:
+                job.state, job.error = FAILED, str(error)
+            if job.finished:
+                job.finished_at = time.time()
+            job.rate = 0.0
+            self._save(job)
+            self._cond.notify_all()
+
+        if job.counts_bytes and job.state in (DONE, FAILED):
+            record_transfer(job.direction, job.total or 0, elapsed, job.state == DONE)
+        if job.state == CANCELLED:
+            remove_partial_download(job)
+        if job.state == FAILED:
+            logging.error(f"전송 작업 실패: {KIND_LABELS[job.kind]} {job.label()}, 이유: {error}")
+        elif job.state == DONE:
+            logging.info(f"전송 작업 완료: {KIND_LABELS[job.kind]} {job.label()} ({elapsed:.1f}초)")
+        self._notify(job)
+
+    def _execute(self, job, account):
+        stop = job._stop_event
+        if job.kind in ('upload', 'download'):
+            bucket = self.buckets[job.kind]
+            # 실행 중에 제한을 바꿀 수도 있으므로 제한이 없어도 항상 버킷을 거칩니다.
+            throttle = lambda amount: bucket.consume(amount, stop)
+            blob_client = account['client'].get_blob_client(job.container, job.blob_name)
+            if job.kind == 'upload':
+                self.handler.uploader.upload(blob_client, job.local_path, job.update_progress, stop, throttle)
+            else:
+                directory = os.path.dirname(job.local_path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                self.handler.downloader.download(blob_client, job.local_path, job.update_progress, stop, throttle)
+            return
+        if job.kind in SYNC_KINDS:
+            self._execute_sync(job, account)
+            return
+
+        if job.kind == 'delete':
+            finished, failures = self.handler.delete_blobs(account, job.keys, job.update_progress, stop)
+        elif job.kind == 'delete_prefix':
+            finished, failures = self.handler.delete_prefix(account, job.container, job.blob_name,
+                                                            job.update_progress, stop)
+        else:
+            dest_account = self.account_lookup(job.dest_account) if job.dest_account else account
+            move = job.kind in ('move', 'move_prefix')
+            if job.kind in ('copy', 'move'):
+                finished, failures = self.handler.copy_blobs(account, job.keys, dest_account, job.dest_container,
+                                                             job.dest_prefix, move, job.update_progress, stop)
+            else:
+                finished, failures = self.handler.copy_prefix(account, job.container, job.blob_name, dest_account,
+                                                              job.dest_container, job.dest_prefix, move,
+                                                              job.update_progress, stop)
+        if job.kind not in ('copy', 'copy_prefix'):
+            job.deleted.extend(finished)
+        if job.keys is not None and finished and (failures or stop.is_set()):
+            # 다시 시도하거나 다시 시작할 때는 아직 처리하지 못한 블랍만 보냅니다.
+            removed = set(finished)
+            job.keys = [key for key in job.keys if key not in removed]
+        if stop.is_set():
+            raise TransferCancelled(job.label())
+        if failures:
+            (container, name), reason = failures[0]
+            if job.kind in COPY_KINDS:
+                raise CopyFailed(f"{len(failures)}개 {KIND_LABELS[job.kind]} 실패 (예: {container}/{name}: {reason})")
+            raise DeleteFailed(f"{len(failures)}개 삭제 실패 (예: {container}/{name}: {reason})")
+
+    def _execute_sync(self, job, account):
+        """동기화 작업은 실행할 때마다 다시 비교하므로, 다시 시도하거나 다시 시작하면 남은 차이만 처리합니다."""
+        stop = job._stop_event
+        bucket = self.buckets[job.direction]
+        direction = SYNC_UP if job.kind in UPLOAD_KINDS else SYNC_DOWN
+        plan = self.handler.plan_sync(account, direction, job.local_path, job.container, job.blob_name,
+                                      job.kind.startswith('mirror'), stop)
+        finished, failures = self.handler.run_sync(account, plan, job.update_progress, stop,
+                                                   lambda amount: bucket.consume(amount, stop))
+        job.deleted.extend((plan.container, action.blob_name) for action in finished if action.op == 'delete_remote')
+        if stop.is_set():
+            raise TransferCancelled(job.label())
+        if failures:
+            action, reason = failures[0]
+            raise SyncFailed(f"{len(failures)}개 동기화 실패 (예: {action.relative}: {reason})")
+
+    def _save(self, job):
+        if self.store is not None:
+            self.store.save(job)
+
+    def _notify(self, job):
+        if self.listener is not None:
+            try:
+                self.listener(job)
+            except Exception as e:
+                logging.error(f"전송 작업 알림 처리 중 오류: {e}")
+
+
+def remove_partial_download(job):
+    """취소한 다운로드 작업의 받다 만 파일과 매니페스트를 지웁니다."""
+    if job.kind != 'download':
+        return
+    for path in (job.local_path + PARTIAL_SUFFIX, job.local_path + MANIFEST_SUFFIX):
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            logging.warning(f"받다 만 파일을 지울 수 없습니다: {path}, 오류: {e}")
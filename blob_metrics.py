@@ -0,0 +1,391 @@
+import cProfile
+import io
+import logging
+import pstats
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class _Histogram:
+    __slots__ = ('buckets', 'counts', 'count', 'sum')
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+                break
+        self.count += 1
+        self.sum += value
+
+
+class MetricsRegistry:
+    """카운터, 게이지, 히스토그램 값을 보관하는 스레드 안전한 계측 저장소입니다.
+
+    값은 (이름, 레이블) 단위로 쌓이며, render()로 Prometheus 텍스트 또는 OpenMetrics 형식으로 내보내고
+    samples()로 통계 창에 보여 줄 행을 만듭니다. 카운터 이름은 '_total'로 끝나야 합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._meta = {}  # 이름 -> (종류, 설명, 히스토그램 구간)
+        self._values = {}  # 이름 -> {레이블 튜플: 값 또는 _Histogram}
+
+    def describe(self, name, kind, help_text, buckets=DEFAULT_BUCKETS):
+        self._meta[name] = (kind, help_text, tuple(buckets))
+        self._values.setdefault(name, {})
+
+    def inc(self, name, amount=1, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            series[key] = series.get(key, 0) + amount
+
+    def set(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            self._values.setdefault(name, {})[key] = value
+
+    def observe(self, name, value, **labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._values.setdefault(name, {})
+            histogram = series.get(key)
+            if histogram is None:
+                histogram = series[key] = _Histogram(self._meta.get(name, (None, None, DEFAULT_BUCKETS))[2])
+            histogram.observe(value)
+
+    def value(self, name, **labels):
+        """카운터나 게이지의 현재 값을 반환합니다. 없으면 0입니다."""
+        with self._lock:
+            return self._values.get(name, {}).get(tuple(sorted(labels.items())), 0)
+
+    def samples(self):
+        """통계 창용 (이름, 레이블 dict, 값) 목록을 반환합니다. 히스토그램은 (횟수, 합계)를 값으로 돌려줍니다."""
+        rows = []
+        with self._lock:
+            for name in sorted(self._values):
+                for key, value in sorted(self._values[name].items()):
+                    if isinstance(value, _Histogram):
+                        value = (value.count, value.sum)
+                    rows.append((name, dict(key), value))
+        return rows
+
+    def render(self, openmetrics=False):
+        """모든 값을 Prometheus 텍스트 형식(openmetrics=True면 OpenMetrics 1.0 형식)의 문자열로 만듭니다."""
+        lines = []
+        with self._lock:
+            for name in sorted(self._values):
+                kind, help_text, _ = self._meta.get(name, ('unknown' if openmetrics else 'untyped', '', None))
+                family = name[:-len('_total')] if openmetrics and kind == 'counter' else name
+                lines.append(f"# HELP {family} {_escape_help(help_text)}")
+                lines.append(f"# TYPE {family} {kind}")
+                for key, value in sorted(self._values[name].items()):
+                    if isinstance(value, _Histogram):
+                        cumulative = 0
+                        for bound, count in zip(value.buckets, value.counts):
+                            cumulative += count
+                            lines.append(f"{name}_bucket{_format_labels(key + (('le', _format_number(bound)),))} "
+                                         f"{cumulative}")
+                        lines.append(f"{name}_bucket{_format_labels(key + (('le', '+Inf'),))} {value.count}")
+                        lines.append(f"{name}_count{_format_labels(key)} {value.count}")
+                        lines.append(f"{name}_sum{_format_labels(key)} {_format_number(value.sum)}")
+                    else:
+                        lines.append(f"{name}{_format_labels(key)} {_format_number(value)}")
+        if openmetrics:
+            lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(key):
+    if not key:
+        return ""
+    pairs = ",".join(f'{label}="{_escape_label(value)}"' for label, value in key)
+    return "{" + pairs + "}"
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _escape_help(text):
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _format_number(value):
+    if isinstance(value, float) and value.is_integer():
+        return f"{value:.1f}"
+    return repr(value) if isinstance(value, float) else str(value)
+
+
+# 프로그램 전체가 함께 쓰는 계측 저장소
+metrics = MetricsRegistry()
+metrics.describe('blobmoni_list_duration_seconds', 'histogram', "컨테이너 목록 조회에 걸린 시간")
+metrics.describe('blobmoni_list_pages_total', 'counter', "목록 조회로 받은 페이지 수")
+metrics.describe('blobmoni_list_blobs_total', 'counter', "목록 조회로 받은 블랍 수")
+metrics.describe('blobmoni_container_list_seconds', 'gauge', "컨테이너별 마지막 목록 조회 시간")
+metrics.describe('blobmoni_container_list_pages', 'gauge', "컨테이너별 마지막 목록 조회의 페이지 수")
+metrics.describe('blobmoni_container_blobs_per_second', 'gauge', "컨테이너별 마지막 목록 조회의 초당 블랍 수")
+metrics.describe('blobmoni_api_calls_total', 'counter', "작업별 Azure Storage API 호출 수 (재시도 제외)")
+metrics.describe('blobmoni_api_retries_total', 'counter', "작업별 Azure Storage API 재시도 수")
+metrics.describe('blobmoni_api_errors_total', 'counter', "작업별 Azure Storage API 오류 응답 수")
+metrics.describe('blobmoni_transfer_bytes_total', 'counter', "전송한 바이트 수")
+metrics.describe('blobmoni_transfer_files_total', 'counter', "전송을 마친 파일 수")
+metrics.describe('blobmoni_transfer_bytes_per_second', 'gauge', "마지막으로 끝난 파일의 전송 속도")
+metrics.describe('blobmoni_transfer_retries_total', 'counter', "실패 후 다시 시도한 전송 작업 수")
+metrics.describe('blobmoni_copy_blobs_total', 'counter', "서버 측 복사/이동을 마친 블랍 수 (sync: Put Blob From URL, async: Copy Blob)")
+metrics.describe('blobmoni_copy_bytes_total', 'counter', "서버 측 복사로 옮긴 바이트 수")
+metrics.describe('blobmoni_sync_files_total', 'counter', "폴더 동기화에서 계획하거나(planned_*) 처리한 파일 수")
+metrics.describe('blobmoni_sync_hash_total', 'counter', "동기화 비교에 쓴 로컬 MD5 (cached: 해시 색인, computed: 새로 계산)")
+metrics.describe('blobmoni_transfer_throttle_seconds_total', 'counter', "속도 제한 때문에 전송을 멈추고 기다린 시간")
+metrics.describe('blobmoni_apply_seconds', 'histogram', "컨테이너 하나의 변경분을 화면(목록)에 반영하는 데 걸린 시간")
+metrics.describe('blobmoni_refresh_apply_seconds', 'histogram', "갱신 한 번에서 변경분 반영에 쓴 시간의 합")
+metrics.describe('blobmoni_refresh_duration_seconds', 'histogram', "갱신 한 번의 전체 시간")
+metrics.describe('blobmoni_change_feed_events_total', 'counter', "반영한 변경 피드 이벤트 수")
+metrics.describe('blobmoni_filter_seconds', 'histogram', "목록 필터 검색에 걸린 시간")
+
+
+def record_listing(account_name, container, seconds, pages, blobs, result):
+    """컨테이너 목록 조회 한 번의 결과를 기록합니다. result는 'full', 'unchanged', 'error' 중 하나입니다."""
+    metrics.observe('blobmoni_list_duration_seconds', seconds, account=account_name, result=result)
+    metrics.inc('blobmoni_list_pages_total', pages, account=account_name)
+    metrics.inc('blobmoni_list_blobs_total', blobs, account=account_name)
+    metrics.set('blobmoni_container_list_seconds', round(seconds, 6), account=account_name, container=container)
+    metrics.set('blobmoni_container_list_pages', pages, account=account_name, container=container)
+    if seconds > 0:
+        metrics.set('blobmoni_container_blobs_per_second', round(blobs / seconds, 1),
+                    account=account_name, container=container)
+
+
+def record_transfer(direction, size, seconds, ok):
+    """파일 하나의 전송 결과를 기록합니다. 바이트 수는 전송 중에 count_transfer_bytes로 따로 셉니다."""
+    metrics.inc('blobmoni_transfer_files_total', direction=direction, result='ok' if ok else 'error')
+    if ok and seconds > 0:
+        metrics.set('blobmoni_transfer_bytes_per_second', round(size / seconds, 1), direction=direction)
+
+
+def count_transfer_bytes(direction, amount):
+    metrics.inc('blobmoni_transfer_bytes_total', amount, direction=direction)
+
+
+def operation_name(http_request):
+    """요청 방식과 comp/restype 쿼리로 API 작업 이름을 정합니다."""
+    method = http_request.method.upper()
+    query = {key: values[0] for key, values in parse_qs(urlsplit(http_request.url).query).items()}
+    comp = query.get('comp')
+    if comp == 'list':
+        return 'list_blobs' if query.get('restype') == 'container' else 'list_containers'
+    if comp == 'blocklist':
+        return 'commit_block_list' if method == 'PUT' else 'get_block_list'
+    if comp == 'block':
+        return 'stage_block'
+    if comp == 'batch':
+        return 'blob_batch'
+    if comp:
+        return f"{method.lower()}_{comp}"
+    if method == 'HEAD':
+        return 'get_properties'
+    if method == 'GET':
+        return 'get_container_properties' if query.get('restype') == 'container' else 'download'
+    if method == 'PUT':
+        return 'copy' if 'x-ms-copy-source' in http_request.headers else 'upload'
+    return method.lower()
+
+
+def _on_sdk_request(request):
+    # 재시도 정책 뒤에서 시도마다 호출되며, 같은 요청의 context가 재시도 사이에 유지됩니다.
+    operation = operation_name(request.http_request)
+    if request.context.get('blobmoni_sent'):
+        metrics.inc('blobmoni_api_retries_total', operation=operation)
+    else:
+        request.context['blobmoni_sent'] = True
+        metrics.inc('blobmoni_api_calls_total', operation=operation)
+
+
+def _on_sdk_response(response):
+    status = response.http_response.status_code
+    if status >= 400:
+        metrics.inc('blobmoni_api_errors_total', operation=operation_name(response.http_request), status=str(status))
+
+
+def sdk_hooks():
+    """BlobServiceClient 생성 인자로 넘기면 API 호출, 재시도, 오류 응답을 작업별로 세는 훅입니다."""
+    return {'raw_request_hook': _on_sdk_request, 'raw_response_hook': _on_sdk_response}
+
+
+class LogSampler:
+    """블랍마다 남기는 로그처럼 자주 반복되는 debug 로그를 every번에 한 번만 남깁니다.
+
+    메시지는 실제로 남길 때만 make_message()로 만들며, debug 로그가 꺼져 있으면 아무것도 하지 않습니다.
+    """
+
+    def __init__(self, every=1000):
+        self.every = max(1, int(every))
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    def debug(self, key, make_message):
+        if not logging.getLogger().isEnabledFor(logging.DEBUG):
+            return
+        with self._lock:
+            count = self._counts.get(key, 0) + 1
+            self._counts[key] = count
+        if count % self.every == 1 or self.every == 1:
+            logging.debug(f"{make_message()} (표본 1/{self.every}, 누적 {count}회)")
+
+
+log_sampler = LogSampler()
+
+
+class CycleProfiler:
+    """다음 갱신 한 번을 cProfile로 기록해 .prof 파일로 저장합니다.
+
+    arm()으로 예약하면 begin()부터 end()까지 그 스레드(GUI 또는 헤드리스 루프)를 기록하고, 그 사이 목록 조회
+    스레드에서 call()로 실행한 작업도 각각 기록해 end()에서 합칩니다. 파이썬 3.12 이상처럼 프로파일러를 동시에
+    하나만 켤 수 있는 환경에서는 작업 스레드 기록을 건너뜁니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._armed_path = None
+        self._path = None
+        self._main = None
+        self._profiles = []
+
+    @property
+    def active(self):
+        return self._main is not None
+
+    @property
+    def armed(self):
+        return self._armed_path is not None
+
+    def arm(self, path=None):
+        """다음 갱신을 기록하도록 예약합니다. path가 없으면 현재 디렉토리에 시각이 들어간 파일 이름을 씁니다."""
+        self._armed_path = path or time.strftime("blobmoni_refresh_%Y%m%d_%H%M%S.prof")
+        logging.info(f"다음 갱신을 프로파일링합니다: {self._armed_path}")
+
+    def begin(self):
+        if self._armed_path is None or self._main is not None:
+            return
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError as e:
+            logging.warning(f"프로파일러를 켤 수 없습니다: {e}")
+            self._armed_path = None
+            return
+        self._path, self._armed_path = self._armed_path, None
+        self._main = profile
+
+    def call(self, func, *args):
+        """프로파일링 중이면 func(*args)를 기록하며 실행하고, 아니면 그대로 실행합니다."""
+        if self._main is None:
+            return func(*args)
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            return func(*args)
+        try:
+            return func(*args)
+        finally:
+            profile.disable()
+            with self._lock:
+                self._profiles.append(profile)
+
+    def end(self):
+        """기록을 멈추고 파일로 저장한 뒤 경로를 반환합니다. 기록 중이 아니면 None을 반환합니다."""
+        if self._main is None:
+            return None
+        self._main.disable()
+        with self._lock:
+            profiles, self._profiles = self._profiles, []
+        stats = pstats.Stats(self._main)
+        for profile in profiles:
+            stats.add(profile)
+        path, self._path, self._main = self._path, None, None
+        try:
+            stats.dump_stats(path)
+        except OSError as e:
+            logging.error(f"프로파일 결과를 저장할 수 없습니다: {path}, 오류: {e}")
+            return None
+        summary = io.StringIO()
+        pstats.Stats(path, stream=summary).sort_stats('cumulative').print_stats(20)
+        logging.info(f"갱신 프로파일 저장: {path} (작업 스레드 {len(profiles)}개)\n{summary.getvalue()}")
+        return path
+
+
+profiler = CycleProfiler()
+
+
+class MetricsServer:
+    """계측값을 /metrics 경로로 내보내는 로컬 HTTP 서버입니다. 데몬 스레드에서 실행됩니다.
+
+    요청의 Accept 헤더에 OpenMetrics가 있으면 OpenMetrics 형식으로, 아니면 Prometheus 텍스트 형식으로 응답합니다.
+    """
+
+    def __init__(self, registry, host='127.0.0.1', port=9464):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server = None
+
+    def start(self):
+        registry = self.registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?', 1)[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                openmetrics = 'application/openmetrics-text' in self.headers.get('Accept', '')
+                body = registry.render(openmetrics).encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', OPENMETRICS_CONTENT_TYPE if openmetrics else PROMETHEUS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # 수집기가 주기적으로 호출하므로 요청마다 로그를 남기지 않습니다.
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        threading.Thread(target=self._server.serve_forever, name='blob-metrics', daemon=True).start()
+        logging.info(f"계측 엔드포인트: http://{self.host}:{self.port}/metrics")
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def configure_metrics(config):
+    """설정에 따라 로그 표본 간격을 정하고, metrics_port가 있으면 계측 서버를 시작해 반환합니다.
+
+    metrics_port가 없거나 서버를 시작할 수 없으면 None을 반환합니다.
+    """
+    log_sampler.every = max(1, int(config.get('log_sample_every') or 1000))
+    port = config.get('metrics_port')
+    if port is None or port is False:
+        return None
+    try:
+        return MetricsServer(metrics, config.get('metrics_host') or '127.0.0.1', int(port)).start()
+    except OSError as e:
+        logging.error(f"계측 엔드포인트를 열 수 없습니다: 포트 {port}, 오류: {e}")
+        return None
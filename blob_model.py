@@ -0,0 +1,348 @@
+import bisect
+import json
+import time
+from array import array
+from itertools import accumulate
+from PyQt5.QtCore import Qt, QAbstractTableModel, QByteArray, QMimeData, QModelIndex
+from PyQt5.QtGui import QColor
+from blob_index import BlobNameIndex
+from blob_metrics import metrics
+from blob_store import BlobColumnStore
+
+BLOB_KEYS_MIME = 'application/x-blobmoni-keys'  # 계정 창 사이에 끌어다 놓는 블랍/경로 목록
+
+
+class BlobTableModel(QAbstractTableModel):
+    """BlobColumnStore를 QTableView에 보여주는 모델입니다.
+
+    행은 스크롤에 따라 FETCH_BATCH개씩 노출(canFetchMore/fetchMore)되며, 화면 항목 객체를 만들지 않고
+    data()가 호출될 때 배열에서 바로 값을 읽습니다. set_filter()로 필터를 걸면 BlobNameIndex가 찾은 행만 보여주며,
+    이때 뷰의 행 번호는 store_row()로 저장소 행 번호로 바꿔야 합니다.
+    """
+
+    COLUMNS = ["컨테이너", "이름", "크기", "수정 시각", "계층"]
+    FETCH_BATCH = 1000
+
+    def __init__(self, account, parent=None):
+        super().__init__(parent)
+        self.account = account
+        self.store = BlobColumnStore()
+        self.name_index = BlobNameIndex(self.store)
+        self.container_errors = {}  # 컨테이너 -> 마지막 조회 오류 메시지
+        self._visible = 0  # 뷰에 노출된 행 수
+        self.query = None  # 적용 중인 필터 (BlobQuery)
+        self._filtered = None  # 필터와 일치하는 저장소 행 번호 (필터가 없으면 None)
+        self.filter_seconds = 0.0  # 마지막 필터 검색에 걸린 시간
+
+    def register_containers(self, containers):
+        """컨테이너 표시 순서를 등록합니다."""
+        for container in containers:
+            self.store.container_id(container)
+
+    # --- QAbstractTableModel 구현 ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._visible
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = self.store_row(index.row()), index.column()
+        store = self.store
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return store.container_at(row)
+            if column == 1:
+                return store.names[row]
+            if column == 2:
+                return f"{store.sizes[row]:,}"
+            if column == 3:
+                modified = store.modified_at(row)
+                return modified.astimezone().strftime('%Y-%m-%d %H:%M:%S') if modified else ""
+            if column == 4:
+                return store.tier_at(row) or ""
+        elif role == Qt.TextAlignmentRole and column == 2:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        elif role == Qt.ToolTipRole:
+            container, name = store.key_at(row)
+            return f"{container}/{name}\nETag: {store.etags[row]}"
+        elif role == Qt.ForegroundRole and column == 0 and store.container_at(row) in self.container_errors:
+            return QColor(Qt.red)
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsDragEnabled | Qt.ItemNeverHasChildren
+
+    def mimeTypes(self):
+        return [BLOB_KEYS_MIME]
+
+    def mimeData(self, indexes):
+        rows = sorted({index.row() for index in indexes})
+        return blob_mime_data(self.account['account_name'], self.keys_for_rows(rows))
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._visible < self.row_total()
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        count = min(self.FETCH_BATCH, self.row_total() - self._visible)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._visible, self._visible + count - 1)
+        self._visible += count
+        self.endInsertRows()
+
+    def fetch_all(self):
+        """아직 노출하지 않은 행을 모두 노출합니다. (전체 선택 전에 호출)"""
+        total = self.row_total()
+        if total > self._visible:
+            self.beginInsertRows(QModelIndex(), self._visible, total - 1)
+            self._visible = total
+            self.endInsertRows()
+
+    # --- 필터 ---
+
+    def row_total(self):
+        """노출할 수 있는 전체 행 수입니다. 필터가 있으면 일치하는 행 수입니다."""
+        return len(self._filtered) if self._filtered is not None else len(self.store)
+
+    def store_row(self, row):
+        """뷰의 행 번호를 저장소 행 번호로 바꿉니다."""
+        return self._filtered[row] if self._filtered is not None else row
+
+    def set_filter(self, query):
+        """parse_query()로 만든 필터를 적용합니다. None이면 필터를 해제합니다."""
+        self.beginResetModel()
+        self.query = query
+        self._refilter()
+        self._visible = min(self.FETCH_BATCH, self.row_total())
+        self.endResetModel()
+
+    def _refilter(self):
+        if self.query is None:
+            self._filtered = None
+            return
+        started = time.perf_counter()
+        self._filtered = array('I', self.name_index.search(self.query))
+        self.filter_seconds = time.perf_counter() - started
+        metrics.observe('blobmoni_filter_seconds', self.filter_seconds)
+
+    def _apply_filtered(self, container, removed_names, added, changed):
+        """필터가 있을 때 컨테이너의 삭제/추가/변경을 저장소에 반영하고, 일치 목록에서 달라진 행만 뷰에 알립니다.
+
+        전체를 다시 검색하지 않고 바뀐 행만 조건과 비교하므로 선택 상태와 스크롤 위치가 유지됩니다. 순서는
+        (1) 저장소가 그대로일 때 삭제되는 행을 일치 목록에서 빼고, (2) 저장소를 바꾼 뒤 남은 일치 행 번호를 한 번에
+        다시 매기고, (3) 변경/추가된 행을 조건과 비교해 빠지거나 새로 일치하는 행을 알리는 순서입니다.
+        """
+        store, filtered = self.store, self._filtered
+        start, end = store.container_range(container)
+
+        def position(row):
+            p = bisect.bisect_left(filtered, row)
+            return p if p < len(filtered) and filtered[p] == row else -1
+
+        # (1) 삭제되는 행
+        removed_rows = sorted(row for row in (store.find(container, name) for name in removed_names) if row >= 0)
+        self._remove_filtered(p for p in map(position, removed_rows) if p >= 0)
+
+        # (2) 저장소 반영 후 행 번호 다시 매기기 (다른 컨테이너 뒤쪽 행은 같은 수만큼 밀립니다)
+        a, b = bisect.bisect_left(filtered, start), bisect.bisect_left(filtered, end)
+        for row, count in BlobColumnStore._group_runs(removed_rows):
+            store.remove_rows(row, count)
+        runs = store.insertion_runs(container, added)
+        for row, entries in runs:
+            store.insert_rows(row, container, entries)
+        runs.reverse()
+        insert_rows = [row for row, _ in runs]
+        inserted_before = list(accumulate(len(entries) for _, entries in runs))
+
+        def renumber(row):
+            row -= bisect.bisect_right(removed_rows, row)
+            k = bisect.bisect_right(insert_rows, row)
+            return row + (inserted_before[k - 1] if k else 0)
+
+        delta = len(added) - len(removed_rows)
+        filtered[a:b] = array('I', map(renumber, filtered[a:b]))
+        if delta:
+            filtered[b:] = array('I', [row + delta for row in filtered[b:]])
+
+        # (3) 변경된 행과 추가된 행을 조건과 비교
+        dropped, updated, matched = [], [], []
+        for entry in changed:
+            row = store.find(container, entry.name)
+            if row < 0:
+                continue
+            store.update_row(row, entry)
+            p = position(row)
+            now = self.name_index.row_matches(self.query, row)
+            if p >= 0:
+                (updated if now else dropped).append(p)
+            elif now:
+                matched.append(row)
+        matched.extend(row for row in (store.find(container, entry.name) for entry in added)
+                       if row >= 0 and self.name_index.row_matches(self.query, row))
+        for p in updated:
+            if p < self._visible:
+                self.dataChanged.emit(self.index(p, 0), self.index(p, len(self.COLUMNS) - 1))
+        self._remove_filtered(dropped)
+        self._insert_filtered(sorted(matched))
+        if self._visible == 0 and len(filtered):
+            self.fetchMore()
+
+    def _remove_filtered(self, positions):
+        """일치 목록의 위치들을 빼고 노출된 부분만 뷰에 알립니다."""
+        filtered = self._filtered
+        for p, count in BlobColumnStore._group_runs(sorted(positions)):
+            visible_count = min(p + count, self._visible) - p
+            if visible_count > 0:
+                self.beginRemoveRows(QModelIndex(), p, p + visible_count - 1)
+                del filtered[p:p + count]
+                self._visible -= visible_count
+                self.endRemoveRows()
+            else:
+                del filtered[p:p + count]
+
+    def _insert_filtered(self, rows):
+        """새로 일치하는 저장소 행(오름차순)을 일치 목록의 제자리에 넣고 노출된 부분만 뷰에 알립니다."""
+        filtered = self._filtered
+        runs = []
+        for row in rows:
+            p = bisect.bisect_left(filtered, row)
+            if runs and runs[-1][0] == p:
+                runs[-1][1].append(row)
+            else:
+                runs.append((p, [row]))
+        for p, group in reversed(runs):
+            # 이미 모든 행이 노출된 상태라면 맨 뒤에 붙는 행도 바로 노출합니다.
+            if p < self._visible or 0 < self._visible == len(filtered):
+                self.beginInsertRows(QModelIndex(), p, p + len(group) - 1)
+                filtered[p:p] = array('I', group)
+                self._visible += len(group)
+                self.endInsertRows()
+            else:
+                filtered[p:p] = array('I', group)
+
+    # --- 저장소 갱신 ---
+
+    def apply_snapshot(self, container, snapshot):
+        """새 스냅샷을 저장소와 비교해 달라진 행만 삽입/삭제/갱신하고 BlobDiff를 반환합니다."""
+        self.container_errors.pop(container, None)
+        diff = self.store.diff_container(container, snapshot)
+        self.apply_diff(container, diff)
+        return diff
+
+    def apply_diff(self, container, diff):
+        """BlobDiff의 행만 삽입/삭제/갱신하고 뷰에 알립니다."""
+        if self._filtered is not None:
+            if diff:
+                self._apply_filtered(container, [entry.name for entry in diff.removed], diff.added, diff.changed)
+            return
+        self._remove_runs(self.store.removal_runs(container, [entry.name for entry in diff.removed]))
+
+        for row, entries in self.store.insertion_runs(container, diff.added):
+            # 이미 모든 행이 노출된 상태라면 맨 뒤에 붙는 행도 바로 노출합니다.
+            if row < self._visible or 0 < self._visible == len(self.store):
+                self.beginInsertRows(QModelIndex(), row, row + len(entries) - 1)
+                self.store.insert_rows(row, container, entries)
+                self._visible += len(entries)
+                self.endInsertRows()
+            else:
+                self.store.insert_rows(row, container, entries)
+
+        for entry in diff.changed:
+            row = self.store.find(container, entry.name)
+            if row >= 0:
+                self.store.update_row(row, entry)
+                if row < self._visible:
+                    self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.COLUMNS) - 1))
+
+        # 처음 조회한 행이 화면을 채울 수 있도록 첫 묶음은 바로 노출합니다.
+        if self._visible == 0 and len(self.store):
+            self.fetchMore()
+
+    def clear(self):
+        """모든 행을 비웁니다. 컨테이너 표시 순서는 유지합니다."""
+        self.beginResetModel()
+        containers = self.store.containers
+        self.store = BlobColumnStore()
+        self.name_index = BlobNameIndex(self.store)
+        self.register_containers(containers)
+        self._visible = 0
+        self._refilter()
+        self.endResetModel()
+
+    def set_container_error(self, container, message):
+        """컨테이너 조회 실패를 기록합니다. 기존 행은 유지합니다."""
+        self.container_errors[container] = message
+        start, end = self.store.container_range(container)
+        if self._filtered is not None:
+            start, end = bisect.bisect_left(self._filtered, start), bisect.bisect_left(self._filtered, end)
+        end = min(end, self._visible)
+        if start < end:
+            self.dataChanged.emit(self.index(start, 0), self.index(end - 1, 0))
+
+    def remove_blobs(self, keys):
+        """(컨테이너, 블랍 이름) 목록에 해당하는 행을 한 번에 제거합니다."""
+        by_container = {}
+        for container, name in keys:
+            by_container.setdefault(container, []).append(name)
+        for container, names in by_container.items():
+            if self._filtered is not None:
+                self._apply_filtered(container, names, [], [])
+            else:
+                self._remove_runs(self.store.removal_runs(container, names))
+
+    def _remove_runs(self, runs):
+        for row, count in runs:
+            visible_count = min(row + count, self._visible) - row
+            if visible_count > 0:
+                self.beginRemoveRows(QModelIndex(), row, row + visible_count - 1)
+                self.store.remove_rows(row, count)
+                self._visible -= visible_count
+                self.endRemoveRows()
+            else:
+                self.store.remove_rows(row, count)
+
+    # --- 선택 ---
+
+    def keys_for_rows(self, rows):
+        """뷰의 행 번호 목록을 (컨테이너, 블랍 이름) 목록으로 변환합니다."""
+        return [self.store.key_at(self.store_row(row)) for row in rows]
+
+
+def blob_mime_data(account_name, keys, prefixes=()):
+    """끌어다 놓을 블랍 키 목록과 경로((컨테이너, prefix)) 목록을 QMimeData로 만듭니다."""
+    payload = {'account': account_name, 'keys': [list(key) for key in keys],
+               'prefixes': [list(prefix) for prefix in prefixes]}
+    mime = QMimeData()
+    mime.setData(BLOB_KEYS_MIME, QByteArray(json.dumps(payload, ensure_ascii=False).encode('utf-8')))
+    return mime
+
+
+def read_blob_mime_data(mime):
+    """blob_mime_data로 만든 데이터를 (계정 이름, 키 목록, 경로 목록)으로 읽습니다. 형식이 다르면 None을 반환합니다."""
+    if not mime.hasFormat(BLOB_KEYS_MIME):
+        return None
+    payload = json.loads(bytes(mime.data(BLOB_KEYS_MIME)).decode('utf-8'))
+    return (payload['account'], [tuple(key) for key in payload['keys']],
+            [tuple(prefix) for prefix in payload['prefixes']])
+
+
+def selected_rows(view):
+    """뷰에서 선택된 행 번호를 정렬해 반환합니다. 선택 구간(range) 단위로 계산해 행마다 인덱스를 만들지 않습니다."""
+    rows = set()
+    for selection_range in view.selectionModel().selection():
+        rows.update(range(selection_range.top(), selection_range.bottom() + 1))
+    return sorted(rows)
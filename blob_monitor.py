@@ -1,17 +1,33 @@
+import time
+_STARTED_AT = time.perf_counter()  # 시작 시간 측정 기준 (무거운 모듈을 불러오기 전)
+
 import sys
+import asyncio
 import threading
-import time
 import logging
 import os
 from PyQt5.QtWidgets import (
     QApplication, QWidget, QVBoxLayout, QLabel,
-    QSplitter, QPushButton, QMessageBox, QHBoxLayout, QLineEdit, QAbstractItemView, QListWidget, QMenu, QFileDialog
+    QSplitter, QPushButton, QMessageBox, QHBoxLayout, QLineEdit, QAbstractItemView, QTableView, QHeaderView,
+    QMenu, QFileDialog, QStackedWidget, QTreeView, QInputDialog
 )
-from PyQt5.QtCore import Qt
-from PyQt5.QtGui import QCursor
-from blob_storage import BlobStorageHandler
+from PyQt5.QtCore import Qt, QEvent, QThread, QTimer, pyqtSignal
+from blob_copy import copy_target_name, parent_dir, prefix_overlaps
+from blob_index import parse_query
+from blob_inventory import arrow_available
+from blob_model import BLOB_KEYS_MIME, BlobTableModel, read_blob_mime_data, selected_rows
+from blob_engine import MonitorEngine
+from blob_jobs import COPY_KINDS, DONE, RUNNING, UPLOAD_KINDS, TransferJob, TransferManager
+from blob_metrics import configure_metrics
+from blob_storage import BlobStorageHandler, ListingCancelled
+from blob_sync import OP_LABELS, SYNC_DOWN, SYNC_UP, DownloadPathConflict, download_paths
+from blob_tree import BlobTreeModel
+from stats_dialog import StatsDialog
+from transfers_panel import TransfersPanel
+from inventory_panel import InventoryPanel
+from preview_panel import BlobPreviewPanel
+from blob_worker import RefreshWorker
 from config_handler import ConfigHandler
-import re
 
 # 로그 설정
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
@@ -19,6 +35,16 @@ logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %
 class BlobMonitor(QWidget):
     VERSION = "1.0"
 
+    catalog_load_requested = pyqtSignal(object)  # 카탈로그에서 읽을 계정 목록
+    account_connected = pyqtSignal(object, object)  # 계정, 연결 오류 (성공 시 None)
+    changes_requested = pyqtSignal(object)  # 변경 피드를 읽을 계정 목록
+    transfer_job_changed = pyqtSignal(object)  # 추가되거나 상태가 바뀐 전송 작업
+    sync_planned = pyqtSignal(object, object)  # 동기화 요청, 비교 결과 (SyncPlan 또는 예외)
+
+    POLL_TICK_MS = 1000  # 조회할 차례인 컨테이너를 확인하는 주기
+    FILTER_DELAY_MS = 250  # 필터 입력이 멈춘 뒤 검색할 때까지 기다리는 시간
+    SYNC_PREVIEW_LINES = 2000  # 동기화 미리 보기에 보여줄 최대 항목 수
+
     def __init__(self):
         super().__init__()
         logging.debug("BlobMonitor 초기화 시작")
@@ -33,12 +59,35 @@ class BlobMonitor(QWidget):
         numeric_level = getattr(logging, log_level, logging.DEBUG)
         logging.getLogger().setLevel(numeric_level)
 
+        # 계측 값은 metrics_port를 설정하면 /metrics로, 항상 "통계" 창으로 볼 수 있습니다.
+        self.metrics_server = configure_metrics(self.config)
+        self.stats_dialog = None
+        self.inventory_panel = None  # 인벤토리 분석 패널 (열려 있을 때만)
+        self.preview_panel = None  # 블랍 미리 보기 패널 (열려 있을 때만)
+
         self.blob_handler = BlobStorageHandler(self.config)
-        self.blob_service_clients = self.blob_handler.initialize_blob_clients()
+        # 계정 연결과 컨테이너 조회는 창을 띄운 뒤 백그라운드에서 동시에 진행합니다.
+        self.blob_service_clients = self.blob_handler.create_accounts()
+        # 업로드/다운로드/삭제는 전송 대기열에서 백그라운드로 실행합니다. 저장된 작업은 계정이 연결되면 이어서 합니다.
+        self.transfer_manager = TransferManager(self.blob_handler, self.config, self._connected_account,
+                                                self.transfer_job_changed.emit)
+
+        # backend: async 이면 목록 조회를 qasync 이벤트 루프 위의 코루틴으로 실행합니다.
+        self.event_loop = None
+        self.async_engine = None
+        if self.config.get('backend') == 'async':
+            import blob_async  # aiohttp 등은 비동기 백엔드를 쓸 때만 불러옵니다.
+            if blob_async.async_backend_available():
+                self.event_loop = blob_async.install_qt_event_loop(QApplication.instance())
+                self.async_engine = blob_async.AsyncBlobEngine(self.config)
+                logging.info("비동기 백엔드(aiohttp, qasync)를 사용합니다.")
+            else:
+                logging.warning("aiohttp 또는 qasync가 설치되어 있지 않아 스레드 백엔드를 사용합니다.")
 
         self.layout_orientation = Qt.Vertical  # 초기 레이아웃 방향
         self.single_account_mode = None  # 특정 계정만 표시하는 모드 여부
         self.init_ui()  # UI 초기화
+        logging.info(f"창 표시까지 걸린 시간: {time.perf_counter() - _STARTED_AT:.2f}초")
         self.start_monitoring()  # 모니터링 시작
 
         logging.debug("BlobMonitor 초기화 완료")
@@ -59,44 +108,104 @@ class BlobMonitor(QWidget):
         self.interval_button.clicked.connect(self.update_refresh_interval)
         self.refresh_now_button = QPushButton("지금")
         self.refresh_now_button.clicked.connect(self.update_blobs)
+        self.cancel_refresh_button = QPushButton("취소")
+        self.cancel_refresh_button.setEnabled(False)
+        self.cancel_refresh_button.clicked.connect(self.cancel_refresh)
         self.layout_toggle_button = QPushButton("가로로 변경")
         self.layout_toggle_button.clicked.connect(self.toggle_layout_orientation)
+        self.stats_button = QPushButton("통계")
+        self.stats_button.clicked.connect(self.show_stats)
+        self.inventory_button = QPushButton("인벤토리 분석")
+        self.inventory_button.setToolTip("내려받은 Blob Inventory 보고서(CSV/Parquet)로 컨테이너/경로별 사용량을 집계합니다.")
+        self.inventory_button.clicked.connect(self.show_inventory)
+        self.transfers_button = QPushButton("전송")
+        self.transfers_button.setToolTip("업로드/다운로드/삭제 대기열을 보이거나 숨깁니다.")
+        self.transfers_button.clicked.connect(self.toggle_transfers_panel)
 
         self.control_layout.addWidget(self.version_label)
         self.control_layout.addWidget(self.interval_label)
         self.control_layout.addWidget(self.interval_input)
         self.control_layout.addWidget(self.interval_button)
         self.control_layout.addWidget(self.refresh_now_button)
+        self.control_layout.addWidget(self.cancel_refresh_button)
         self.control_layout.addWidget(self.layout_toggle_button)
+        self.control_layout.addWidget(self.stats_button)
+        self.control_layout.addWidget(self.inventory_button)
+        self.control_layout.addWidget(self.transfers_button)
 
         self.main_layout.addLayout(self.control_layout)
 
         # 메인 화면
         self.account_splitter = QSplitter(self.layout_orientation)
         self.account_widgets = []
+        self.status_labels = {}  # 계정 이름 -> 컨테이너 조회 오류 표시 라벨
+        self.tree_views = {}  # 계정 이름 -> 트리 보기 QTreeView
+        self.view_stacks = {}  # 계정 이름 -> 목록/트리 보기 전환용 QStackedWidget
+        self.filter_bars = {}  # 계정 이름 -> 필터 입력 줄 (QWidget)
+        self.filter_inputs = {}  # 계정 이름 -> 필터 입력 QLineEdit
+        self.filter_labels = {}  # 계정 이름 -> 필터 결과 라벨
+        self.drop_targets = {}  # 블랍을 끌어다 놓을 수 있는 뷰의 viewport -> (뷰, 계정)
 
         for account in self.blob_service_clients:
             account_layout = QVBoxLayout()
-            account_label = QLabel(f"계정: {account['account_name']}")
+            account_label = QLabel(f"계정: {account['account_name']} (연결 중...)")
             account_label.setStyleSheet("font-weight: bold;")
             account_label.mouseDoubleClickEvent = lambda event, acc=account: self.toggle_single_account_mode(event, acc)
-            list_widget = QListWidget()
-            list_widget.setSelectionMode(QAbstractItemView.ExtendedSelection)  # 다중 선택 가능
+            model = BlobTableModel(account, self)
+            model.register_containers(account['containers'])
+            view = QTableView()
+            view.setModel(model)
+            view.setSelectionBehavior(QAbstractItemView.SelectRows)
+            view.setSelectionMode(QAbstractItemView.ExtendedSelection)  # 다중 선택 가능
+            view.setWordWrap(False)
+            view.verticalHeader().hide()
+            view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)  # 행 높이를 계산하지 않도록 고정
+            view.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+            status_label = QLabel()
+            status_label.setStyleSheet("color: red;")
+            status_label.setWordWrap(True)
+            status_label.hide()
 
             # 마우스 오른쪽 클릭 시 팝업 메뉴 표시
-            list_widget.setContextMenuPolicy(Qt.CustomContextMenu)
-            list_widget.customContextMenuRequested.connect(lambda position, lst=list_widget, acc=account: self.show_context_menu(position, lst, acc))
+            view.setContextMenuPolicy(Qt.CustomContextMenu)
+            view.customContextMenuRequested.connect(lambda position, v=view, acc=account: self.show_context_menu(position, v, acc))
+            self._enable_blob_drag_drop(view, account)
 
-            self.account_widgets.append((account_label, list_widget, account))
+            filter_bar = self._create_filter_bar(account, model)
+
+            tree_view = self._create_tree_view(account)
+            view_stack = QStackedWidget()
+            view_stack.addWidget(view)
+            view_stack.addWidget(tree_view)
+            if self.config.get('default_view') == 'tree':
+                view_stack.setCurrentWidget(tree_view)
+                filter_bar.hide()  # 필터는 목록 보기에서만 사용합니다.
+
+            self.account_widgets.append((account_label, view, account))
+            self.status_labels[account['account_name']] = status_label
+            self.tree_views[account['account_name']] = tree_view
+            self.view_stacks[account['account_name']] = view_stack
 
             button_layout = QHBoxLayout()  # 버튼 레이아웃
             button_layout.setSpacing(10)  # 버튼 간격 조정
 
             select_all_button = QPushButton("전체 선택")
             select_all_button.setFixedHeight(35)
-            select_all_button.clicked.connect(lambda _, lst=list_widget: self.select_all_files(lst))
+            select_all_button.setToolTip("필터가 있으면 필터와 일치하는 블랍을 모두 선택합니다.")
+            select_all_button.clicked.connect(lambda _, acc=account: self.select_all_files(self._current_view(acc)))
+            tree_toggle_button = QPushButton("목록 보기" if view_stack.currentWidget() is tree_view else "트리 보기")
+            tree_toggle_button.setFixedHeight(35)
+            tree_toggle_button.clicked.connect(
+                lambda _, acc=account, btn=tree_toggle_button: self.toggle_tree_mode(acc, btn))
+
+            invalidate_button = QPushButton("캐시 비우기")
+            invalidate_button.setFixedHeight(35)
+            invalidate_button.setEnabled(self.blob_handler.catalog is not None)
+            invalidate_button.clicked.connect(lambda _, acc=account: self.invalidate_account_cache(acc))
 
             button_layout.addWidget(select_all_button)
+            button_layout.addWidget(tree_toggle_button)
+            button_layout.addWidget(invalidate_button)
 
             button_widget = QWidget()
             button_widget.setLayout(button_layout)
@@ -104,110 +213,539 @@ class BlobMonitor(QWidget):
 
             account_widget = QWidget()
             account_layout.addWidget(account_label)
-            account_layout.addWidget(list_widget)
+            account_layout.addWidget(status_label)
+            account_layout.addWidget(filter_bar)
+            account_layout.addWidget(view_stack)
             account_layout.addWidget(button_widget)
             account_widget.setLayout(account_layout)
             self.account_splitter.addWidget(account_widget)
 
-        self.main_layout.addWidget(self.account_splitter)
+        # 계정 목록 아래에 전송 패널을 둡니다. 작업을 추가하면 자동으로 나타납니다.
+        self.transfers_panel = TransfersPanel(self.transfer_manager)
+        self.transfers_panel.setVisible(self.transfer_manager.unfinished() > 0)
+        self.transfer_job_changed.connect(self.on_transfer_job_changed)
+        self.sync_planned.connect(self.on_sync_planned)
+        self.upload_refresh_timer = QTimer(self)
+        self.upload_refresh_timer.setSingleShot(True)
+        self.upload_refresh_timer.setInterval(1000)  # 업로드/복사가 여러 개 끝나도 목록은 한 번만 갱신합니다.
+        self.upload_refresh_timer.timeout.connect(self.update_blobs)
+
+        self.main_splitter = QSplitter(Qt.Vertical)
+        self.main_splitter.addWidget(self.account_splitter)
+        self.main_splitter.addWidget(self.transfers_panel)
+        self.main_splitter.setStretchFactor(0, 3)
+        self.main_splitter.setStretchFactor(1, 1)
+        self.main_layout.addWidget(self.main_splitter)
         self.setLayout(self.main_layout)
         self.resize(1200, 800)
         self.show()
 
         logging.debug("UI 초기화 완료")
 
-    def show_context_menu(self, position, list_widget, account):
+    def _create_filter_bar(self, account, model):
+        """목록 보기 위에 놓을 필터 입력 줄을 만듭니다. 입력이 멈추면 FILTER_DELAY_MS 뒤에 검색합니다."""
+        filter_input = QLineEdit()
+        filter_input.setPlaceholderText("필터: 이름 일부, ^prefix, logs/*.csv, size>10MB, modified>=2024-01-01, container:이름")
+        filter_input.setClearButtonEnabled(True)
+        filter_label = QLabel()
+        filter_timer = QTimer(self)
+        filter_timer.setSingleShot(True)
+        filter_timer.setInterval(self.FILTER_DELAY_MS)
+        filter_timer.timeout.connect(lambda acc=account: self.apply_filter(acc))
+        filter_input.textChanged.connect(lambda _: filter_timer.start())
+        filter_input.returnPressed.connect(lambda acc=account: (filter_timer.stop(), self.apply_filter(acc)))
+
+        filter_layout = QHBoxLayout()
+        filter_layout.setContentsMargins(0, 0, 0, 0)
+        filter_layout.addWidget(filter_input)
+        filter_layout.addWidget(filter_label)
+        filter_bar = QWidget()
+        filter_bar.setLayout(filter_layout)
+
+        self.filter_bars[account['account_name']] = filter_bar
+        self.filter_inputs[account['account_name']] = filter_input
+        self.filter_labels[account['account_name']] = filter_label
+        return filter_bar
+
+    def apply_filter(self, account):
+        """필터 입력을 해석해 계정의 목록 보기에 적용합니다. 잘못된 조건은 라벨에 표시하고 이전 필터를 유지합니다."""
+        label = self.filter_labels[account['account_name']]
+        text = self.filter_inputs[account['account_name']].text()
+        try:
+            query = parse_query(text)
+        except ValueError as e:
+            label.setStyleSheet("color: red;")
+            label.setText(str(e))
+            return
+        _, view = self._widgets_for(account)
+        view.model().set_filter(query)
+        label.setStyleSheet("")
+        self._update_filter_label(account, view.model())
+        if query is not None:
+            logging.debug(f"필터 적용: {account['account_name']} '{text}' -> {view.model().row_total()}개 "
+                          f"({view.model().filter_seconds * 1000:.1f}ms)")
+
+    def _update_filter_label(self, account, model):
+        """필터와 일치하는 블랍 수와 검색 시간을 표시합니다."""
+        label = self.filter_labels[account['account_name']]
+        if model.query is None:
+            label.clear()
+        else:
+            label.setText(f"{model.row_total():,}개 일치 ({model.filter_seconds * 1000:.0f}ms)")
+
+    def _create_tree_view(self, account):
+        """prefix 단위로 지연 조회하는 트리 보기를 만듭니다."""
+        tree_model = BlobTreeModel(account, self.blob_handler,
+                                   ttl=self.config.get('tree_cache_ttl', 300),
+                                   page_size=self.config.get('tree_page_size', 1000), parent=self)
+        tree_view = QTreeView()
+        tree_view.setModel(tree_model)
+        tree_view.setUniformRowHeights(True)
+        tree_view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        tree_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        tree_view.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        tree_view.header().setStretchLastSection(False)
+        tree_view.expanded.connect(tree_model.refresh_if_stale)
+        tree_view.doubleClicked.connect(tree_model.activate)
+        tree_view.setContextMenuPolicy(Qt.CustomContextMenu)
+        tree_view.customContextMenuRequested.connect(
+            lambda position, v=tree_view, acc=account: self.show_tree_context_menu(position, v, acc))
+        self._enable_blob_drag_drop(tree_view, account)
+        return tree_view
+
+    def _enable_blob_drag_drop(self, view, account):
+        """선택한 블랍을 다른 계정 창(또는 같은 창의 다른 경로)으로 끌어다 놓아 복사/이동할 수 있게 합니다.
+
+        놓는 처리는 모델 대신 eventFilter에서 하며, 원본 뷰가 행을 지우지 않도록 항상 복사 동작으로 받습니다.
+        """
+        view.setDragEnabled(True)
+        view.setDragDropMode(QAbstractItemView.DragDrop)
+        view.setDefaultDropAction(Qt.CopyAction)
+        view.viewport().installEventFilter(self)
+        self.drop_targets[view.viewport()] = (view, account)
+
+    def toggle_tree_mode(self, account, button):
+        """계정의 목록 보기와 트리 보기를 전환합니다. 트리 보기에서는 주기적인 전체 목록 조회를 하지 않습니다."""
+        view_stack = self.view_stacks[account['account_name']]
+        tree_view = self.tree_views[account['account_name']]
+        if view_stack.currentWidget() is tree_view:
+            view_stack.setCurrentIndex(0)
+            button.setText("트리 보기")
+            self.filter_bars[account['account_name']].show()
+        else:
+            view_stack.setCurrentWidget(tree_view)
+            button.setText("목록 보기")
+            self.filter_bars[account['account_name']].hide()
+        self._set_polled(account, self._is_polled(account))
+        self.poll_due_containers()
+
+    def _is_tree_mode(self, account):
+        return self.view_stacks[account['account_name']].currentWidget() is self.tree_views[account['account_name']]
+
+    def _current_view(self, account):
+        return self.view_stacks[account['account_name']].currentWidget()
+
+    def show_context_menu(self, position, view, account):
         """마우스 오른쪽 클릭 시 팝업 메뉴를 표시합니다."""
-        selected_items = list_widget.selectedItems()
-        
+        model = view.model()
+        rows = selected_rows(view)
+        upload_target = None
+        if rows:
+            # 마지막으로 선택한 파일과 같은 경로에 업로드
+            container, blob_name = model.keys_for_rows(rows[-1:])[0]
+            upload_target = (container, os.path.dirname(blob_name))
+        self._exec_blob_menu(position, view, account, model.keys_for_rows(rows), upload_target)
+
+    def show_tree_context_menu(self, position, tree_view, account):
+        """트리 보기에서 마우스 오른쪽 클릭 시 팝업 메뉴를 표시합니다."""
+        model = tree_view.model()
+        indexes = tree_view.selectionModel().selectedRows(0)
+        upload_target = model.upload_target(tree_view.indexAt(position)) if tree_view.indexAt(position).isValid() else None
+        self._exec_blob_menu(position, tree_view, account, model.keys_for_indexes(indexes), upload_target)
+
+    def _exec_blob_menu(self, position, view, account, keys, upload_target):
+        """선택한 블랍 키와 업로드 위치로 복사/다운로드/삭제/업로드 메뉴를 실행합니다."""
         menu = QMenu(self)
+        copy_action = download_action = delete_action = delete_prefix_action = None
+        copy_to_action = move_to_action = copy_prefix_action = move_prefix_action = preview_action = None
+        upload_targets = {}
+        sync_targets = {}
 
-        if not selected_items or selected_items[0].text().startswith("====="):
-            # 컨테이너가 선택된 경우 파일 업로드만 표시
-            upload_action = menu.addAction("파일 업로드")
-            container_name = re.search(r'===== 컨테이너:(.+?) =====', selected_items[0].text()).group(1).strip()
-        else:
+        if keys:
             # 파일이 선택된 경우 모든 메뉴 항목 표시
             copy_action = menu.addAction("파일 경로 복사")
             download_action = menu.addAction("파일 다운로드")
+            if len(keys) == 1:
+                preview_action = menu.addAction("미리 보기 / 따라가기")
+            copy_to_action = menu.addAction("다른 위치로 복사...")
+            move_to_action = menu.addAction("다른 위치로 이동...")
             delete_action = menu.addAction("파일 삭제")
-            upload_action = menu.addAction("파일 업로드")
-            container_name = None
+        if upload_target:
+            upload_targets[menu.addAction("파일 업로드")] = upload_target
+            copy_prefix_action = menu.addAction("경로 아래 모두 복사...")
+            move_prefix_action = menu.addAction("경로 아래 모두 이동...")
+            delete_prefix_action = menu.addAction("경로 아래 모두 삭제...")
+            sync_targets[menu.addAction("폴더 동기화...")] = upload_target
+        else:
+            # 업로드 위치가 정해지지 않았으면 컨테이너를 고르도록 표시
+            upload_menu = menu.addMenu("파일 업로드")
+            for container in account['containers']:
+                upload_targets[upload_menu.addAction(container)] = (container, "")
+            sync_menu = menu.addMenu("폴더 동기화")
+            for container in account['containers']:
+                sync_targets[sync_menu.addAction(container)] = (container, "")
+
+        action = menu.exec_(view.viewport().mapToGlobal(position))
+        if action is None:
+            return
+
+        if action in upload_targets:
+            container_name, blob_name_prefix = upload_targets[action]
+            self.upload_file(view, account, container_name, blob_name_prefix)
+        elif action in sync_targets:
+            self.sync_folder(view, account, *sync_targets[action])
+        elif action == copy_action:
+            self.copy_file_path_to_clipboard(keys)
+        elif action == download_action:
+            self.download_files(view, account, keys)
+        elif action == preview_action:
+            self.show_preview(account, *keys[0])
+        elif action == delete_action:
+            self.delete_files(view, account, keys)
+        elif action in (copy_to_action, move_to_action):
+            self.copy_files(view, account, keys, move=action == move_to_action)
+        elif action in (copy_prefix_action, move_prefix_action):
+            self.copy_prefix(view, account, *upload_target, move=action == move_prefix_action)
+        elif action == delete_prefix_action:
+            self.delete_prefix(view, account, *upload_target)
+
+    def copy_file_path_to_clipboard(self, keys):
+        """선택한 파일의 경로를 클립보드에 복사합니다."""
+        paths = [f"{container}/{name}" for container, name in keys]
+        if paths:
+            clipboard = QApplication.clipboard()
+            clipboard.setText("\n".join(paths))
+            logging.info(f"파일 경로 복사: {len(paths)}개")
+            QMessageBox.information(self, "알림", "파일 경로가 클립보드에 복사되었습니다.")
+
+    def delete_files(self, parent, account, keys):
+        """선택한 파일을 전송 대기열에서 배치 요청으로 삭제합니다. 삭제된 블랍은 끝나면 한 번에 화면에서 제거합니다."""
+        if not keys:
+            QMessageBox.information(parent, "알림", "삭제할 파일을 선택하세요.")
+            return
+        reply = QMessageBox.question(parent, "확인", f"선택한 {len(keys)}개의 파일을 삭제할까요?")
+        if reply != QMessageBox.Yes:
+            return
+        self.enqueue_transfers([TransferJob('delete', account['account_name'], keys[0][0],
+                                            keys=[tuple(key) for key in keys])])
+
+    def delete_prefix(self, parent, account, container, prefix):
+        """입력한 경로(prefix) 아래의 모든 파일을 전송 대기열에서 목록 조회와 동시에 배치로 삭제합니다."""
+        prefix, ok = QInputDialog.getText(parent, "경로 아래 모두 삭제", f"삭제할 경로 ({container} 컨테이너):",
+                                          text=f"{prefix}/" if prefix else "")
+        if not ok:
+            return
+        target = f"{container}/{prefix}" if prefix else f"{container} 컨테이너의 모든 파일"
+        reply = QMessageBox.warning(parent, "확인", f"{target} 아래의 모든 파일을 삭제합니다. 계속할까요?",
+                                    QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+        if reply != QMessageBox.Yes:
+            return
+        self.enqueue_transfers([TransferJob('delete_prefix', account['account_name'], container, prefix)])
+
+    def copy_files(self, parent, account, keys, move=False):
+        """선택한 파일을 고른 계정/컨테이너/경로로 서버 측 복사(이동)하는 작업을 전송 대기열에 넣습니다."""
+        destination = self.choose_copy_destination(parent, "이동" if move else "복사", account, keys[0][0])
+        if destination is not None:
+            self.enqueue_copy(parent, account, keys, [], *destination, move=move)
+
+    def copy_prefix(self, parent, account, container, prefix, move=False):
+        """입력한 경로(prefix) 아래의 모든 파일을 고른 위치로 서버 측 복사(이동)하는 작업을 전송 대기열에 넣습니다."""
+        title = "경로 아래 모두 이동" if move else "경로 아래 모두 복사"
+        prefix, ok = QInputDialog.getText(parent, title, f"{'이동' if move else '복사'}할 경로 ({container} 컨테이너):",
+                                          text=f"{prefix}/" if prefix else "")
+        if not ok:
+            return
+        destination = self.choose_copy_destination(parent, "이동" if move else "복사", account, container)
+        if destination is not None:
+            self.enqueue_copy(parent, account, [], [(container, prefix)], *destination, move=move)
+
+    def choose_copy_destination(self, parent, operation, account, container):
+        """연결된 계정의 컨테이너와 대상 경로를 고르게 합니다. (계정 이름, 컨테이너, 경로) 또는 None을 반환합니다."""
+        items = [f"{acc['account_name']}/{name}" for acc in self.blob_service_clients
+                 if acc['client'] is not None for name in acc['containers']]
+        if not items:
+            QMessageBox.warning(parent, "오류", "연결된 계정이 없습니다.")
+            return None
+        current = f"{account['account_name']}/{container}"
+        item, ok = QInputDialog.getItem(parent, f"{operation}할 위치", "대상 계정/컨테이너:", items,
+                                        items.index(current) if current in items else 0, False)
+        if not ok:
+            return None
+        prefix, ok = QInputDialog.getText(parent, f"{operation}할 위치", f"{item} 아래 경로 (비워 두면 최상위):")
+        if not ok:
+            return None
+        account_name, _, dest_container = item.partition('/')
+        return account_name, dest_container, prefix.strip().strip('/')
+
+    def enqueue_copy(self, parent, account, keys, prefixes, dest_account_name, dest_container, dest_prefix, move):
+        """블랍 키 목록과 경로 목록을 dest_account_name의 dest_container/dest_prefix로 복사(이동)하는 작업을 넣습니다.
 
-        action = menu.exec_(list_widget.viewport().mapToGlobal(position))
+        복사본 이름은 블랍은 파일 이름, 경로는 마지막 경로 이름부터 dest_prefix 아래에 붙습니다. 원본과 대상이
+        같거나 대상 이름이 겹치면 작업을 넣지 않습니다.
+        """
+        same_account = dest_account_name == account['account_name']
+        targets = {}
+        for container, name in keys:
+            target = (dest_container, copy_target_name(name, parent_dir(name), dest_prefix))
+            if target in targets or (same_account and target == (container, name)):
+                reason = "원본과 대상이 같습니다" if target not in targets else "대상 파일 이름이 겹칩니다"
+                QMessageBox.warning(parent, "오류", f"{reason}: {target[0]}/{target[1]}")
+                return
+            targets[target] = (container, name)
+        for container, prefix in prefixes:
+            if same_account and prefix_overlaps(container, prefix, dest_container, dest_prefix):
+                QMessageBox.warning(parent, "오류", f"대상 경로가 원본 경로와 겹칩니다: {container}/{prefix} -> "
+                                                  f"{dest_container}/{dest_prefix}")
+                return
+        if move and prefixes:
+            sources = ", ".join(f"{container}/{prefix}" for container, prefix in prefixes)
+            reply = QMessageBox.warning(parent, "확인", f"{sources} 아래의 모든 파일을 옮기고 원본을 삭제합니다. 계속할까요?",
+                                        QMessageBox.Yes | QMessageBox.No, QMessageBox.No)
+            if reply != QMessageBox.Yes:
+                return
 
-        if action == upload_action:
-            if container_name:
-                # 컨테이너 이름만 추출한 경우 해당 컨테이너로 업로드
-                self.blob_handler.upload_file(list_widget, account, container_name=container_name)
+        options = {'dest_account': dest_account_name, 'dest_container': dest_container, 'dest_prefix': dest_prefix}
+        jobs = []
+        if keys:
+            jobs.append(TransferJob('move' if move else 'copy', account['account_name'], keys[0][0],
+                                    keys=[tuple(key) for key in keys], **options))
+        for container, prefix in prefixes:
+            jobs.append(TransferJob('move_prefix' if move else 'copy_prefix', account['account_name'], container,
+                                    prefix, **options))
+        self.enqueue_transfers(jobs)
+
+    def eventFilter(self, obj, event):
+        """계정 창의 뷰에 끌어다 놓은 블랍을 받습니다. 놓을 때는 복사/이동 메뉴를 보여줍니다."""
+        target = self.drop_targets.get(obj)
+        if target is None or event.type() not in (QEvent.DragEnter, QEvent.DragMove, QEvent.Drop):
+            return super().eventFilter(obj, event)
+        if not event.mimeData().hasFormat(BLOB_KEYS_MIME):
+            return False
+        event.setDropAction(Qt.CopyAction)
+        event.accept()
+        if event.type() == QEvent.Drop:
+            view, account = target
+            position = event.pos()
+            dropped = read_blob_mime_data(event.mimeData())
+            # 끌기가 끝난 뒤에 메뉴를 띄웁니다.
+            QTimer.singleShot(0, lambda: self.on_blobs_dropped(view, account, position, *dropped))
+        return True
+
+    def on_blobs_dropped(self, view, account, position, source_name, keys, prefixes):
+        """놓은 위치의 컨테이너/경로로 복사할지 이동할지 고르게 하고 작업을 넣습니다."""
+        source = self._connected_account(source_name)
+        if source is None or self._connected_account(account['account_name']) is None:
+            QMessageBox.warning(view, "오류", "연결된 계정 사이에서만 복사할 수 있습니다.")
+            return
+        index = view.indexAt(position)
+        if isinstance(view.model(), BlobTableModel):
+            if index.isValid():
+                container, name = view.model().keys_for_rows([index.row()])[0]
+                destination = (container, os.path.dirname(name))
             else:
-                # 일반적인 업로드
-                self.blob_handler.upload_file(list_widget, account)
-        elif 'copy_action' in locals() and action == copy_action:
-            self.blob_handler.copy_file_path_to_clipboard(selected_items)
-        elif 'download_action' in locals() and action == download_action:
-            self.download_files(list_widget, account, selected_items)
-        elif 'delete_action' in locals() and action == delete_action:
-            self.blob_handler.delete_selected_files(list_widget, account)
-
-    def upload_file(self, list_widget, account):
-        """파일 업로드 처리를 담당합니다."""
-        selected_items = list_widget.selectedItems()
-        container_name = None
-
-        if selected_items:
-            target_path = selected_items[-1].text()
-
-            if target_path.startswith("====="):
-                container_name = target_path.split(":")[1].strip()  # 컨테이너 이름만 추출
-            elif "/" not in target_path:
-                container_name = target_path.strip()
-        
-        # BlobStorageHandler의 upload_file 호출 시 container_name 전달
-        result = self.blob_handler.upload_file(list_widget, account, container_name=container_name)
-
-        # 여러 파일 업로드 후 알림 메시지 한 번만 표시
-        if result:
-            msg_box = QMessageBox(QMessageBox.Information, "알림", f"{len(result)}개의 파일이 업로드되었습니다.")
-            msg_box.setStandardButtons(QMessageBox.Ok)
-            msg_box.button(QMessageBox.Ok).setShortcut(Qt.Key_Return)
-            msg_box.exec_()
-
-    def download_files(self, list_widget, account, selected_items):
-        """선택한 파일을 다운로드합니다."""
+                destination = None
+        else:
+            destination = view.model().upload_target(index) if index.isValid() else None
+        if destination is None:
+            if not account['containers']:
+                return
+            container, ok = QInputDialog.getItem(view, "놓을 위치", "대상 컨테이너:", account['containers'], 0, False)
+            if not ok:
+                return
+            destination = (container, "")
+        if (source_name == account['account_name'] and not prefixes
+                and all(destination == (container, os.path.dirname(name)) for container, name in keys)):
+            return  # 끌기를 시작한 자리에 다시 놓았습니다.
+
+        count = len(keys) + len(prefixes)
+        place = f"{account['account_name']}/{destination[0]}/{destination[1]}".rstrip('/')
+        menu = QMenu(self)
+        copy_action = menu.addAction(f"여기로 복사 ({count}개 → {place})")
+        move_action = menu.addAction(f"여기로 이동 ({count}개 → {place})")
+        menu.addSeparator()
+        menu.addAction("취소")
+        action = menu.exec_(view.viewport().mapToGlobal(position))
+        if action in (copy_action, move_action):
+            self.enqueue_copy(view, source, keys, prefixes, account['account_name'], *destination,
+                              move=action == move_action)
+
+    def invalidate_account_cache(self, account):
+        """계정의 카탈로그 캐시를 비웁니다. 화면의 목록은 다음 갱신 때 다시 기록됩니다."""
+        reply = QMessageBox.question(self, "확인", f"계정 {account['account_name']}의 캐시된 목록을 삭제할까요?")
+        if reply != QMessageBox.Yes:
+            return
+        self.blob_handler.catalog.invalidate_account(account['account_name'])
+        # 화면 목록을 비워야 다음 갱신에서 모든 블랍이 다시 카탈로그에 기록됩니다.
+        _, view = self._widgets_for(account)
+        view.model().clear()
+        self.update_blobs()
+
+    def remove_deleted_blobs(self, account, keys):
+        """삭제된 블랍을 목록 보기와 트리 보기에서 한 번에 제거합니다."""
+        if not keys:
+            return
+        _, view = self._widgets_for(account)
+        view.model().remove_blobs(keys)
+        self._update_filter_label(account, view.model())
+        self.tree_views[account['account_name']].model().remove_blobs(keys)
+
+    def upload_file(self, view, account, container_name=None, blob_name_prefix=""):
+        """파일을 골라 전송 대기열에 업로드 작업으로 넣습니다. 업로드가 끝나면 목록을 갱신합니다.
+
+        container_name이 없으면 마지막으로 선택한 파일과 같은 경로(없으면 첫 컨테이너)에 업로드합니다.
+        """
+        if container_name is None:
+            rows = selected_rows(view) if isinstance(view.model(), BlobTableModel) else []
+            if rows:
+                container_name, blob_name = view.model().keys_for_rows(rows[-1:])[0]
+                blob_name_prefix = os.path.dirname(blob_name)
+            elif account['containers']:
+                container_name, blob_name_prefix = account['containers'][0], ""
+            else:
+                QMessageBox.warning(view, "오류", "업로드할 경로를 선택하세요.")
+                return
+
+        # 파일 선택 (다중 파일 가능)
+        file_paths, _ = QFileDialog.getOpenFileNames(view, "파일 선택")
+        if not file_paths:
+            return  # 파일 선택 취소
+
+        items, invalid = [], []
+        for file_path in file_paths:
+            blob_name = self.blob_handler.make_blob_name(blob_name_prefix, file_path)
+            # Azure Blob Storage에서는 Blob 이름에 연속된 슬래시나 특정 문자 패턴이 문제가 될 수 있음
+            if self.blob_handler.is_valid_blob_name(blob_name):
+                items.append((file_path, blob_name))
+            else:
+                logging.warning(f"유효하지 않은 Blob 이름으로 업로드 시도됨: {blob_name}")
+                invalid.append(blob_name)
+        if invalid:
+            QMessageBox.warning(view, "오류", "유효하지 않은 Blob 이름은 제외됩니다:\n" + "\n".join(invalid))
+        if not items:
+            return
+
+        self.enqueue_transfers([TransferJob('upload', account['account_name'], container_name, blob_name, file_path)
+                                for file_path, blob_name in items])
+
+    def download_files(self, parent, account, keys):
+        """선택한 파일을 저장할 디렉토리를 골라 전송 대기열에 다운로드 작업으로 넣습니다."""
         logging.debug(f"선택한 파일 다운로드 시도. 계정: {account['account_name']}")
-        if not selected_items:
-            QMessageBox.information(list_widget, "알림", "다운로드할 파일을 선택하세요.")
+        if not keys:
+            QMessageBox.information(parent, "알림", "다운로드할 파일을 선택하세요.")
             return
 
         # 다운로드할 경로 선택 (공통 경로 선택)
-        save_directory = QFileDialog.getExistingDirectory(list_widget, "저장할 디렉토리 선택")
+        save_directory = QFileDialog.getExistingDirectory(parent, "저장할 디렉토리 선택")
         if not save_directory:
             return  # 저장 경로를 선택하지 않은 경우
 
-        for item in selected_items:
-            file_path = item.text()
+        # 블랍 이름의 폴더 구조대로 저장하며, 저장 경로가 겹치는 블랍은 받지 않습니다.
+        targets = download_paths(keys, save_directory)
+        conflicts = [str(target) for target in targets if isinstance(target, DownloadPathConflict)]
+        if conflicts:
+            QMessageBox.warning(parent, "오류", "다음 파일은 다운로드에서 제외됩니다:\n" + "\n".join(conflicts))
+        jobs = [TransferJob('download', account['account_name'], container, blob_path, target)
+                for (container, blob_path), target in zip(keys, targets)
+                if not isinstance(target, DownloadPathConflict)]
+        if jobs:
+            self.enqueue_transfers(jobs)
 
-            if file_path.startswith("=====") or "[오류]" in file_path:
-                continue
+    def sync_folder(self, parent, account, container, prefix):
+        """동기화 방향과 로컬 디렉토리를 고르게 하고, 백그라운드에서 비교해 바꿀 내용을 미리 보여줍니다."""
+        directions = ["로컬 → 컨테이너 (올리기)", "컨테이너 → 로컬 (받기)"]
+        choice, ok = QInputDialog.getItem(parent, "폴더 동기화", "동기화 방향:", directions, 0, False)
+        if not ok:
+            return
+        direction = SYNC_UP if choice == directions[0] else SYNC_DOWN
+        local_dir = QFileDialog.getExistingDirectory(parent, "동기화할 로컬 디렉토리 선택")
+        if not local_dir:
+            return
+        prefix, ok = QInputDialog.getText(parent, "폴더 동기화", f"동기화할 경로 ({container} 컨테이너, 비워 두면 전체):",
+                                          text=f"{prefix}/" if prefix else "")
+        if not ok:
+            return
+        other_side = "컨테이너의 블랍" if direction == SYNC_UP else "로컬 파일"
+        mirror = QMessageBox.question(parent, "폴더 동기화", f"반대쪽에 없는 {other_side}도 삭제할까요? (미러)",
+                                      QMessageBox.Yes | QMessageBox.No, QMessageBox.No) == QMessageBox.Yes
+        request = (account['account_name'], direction, local_dir, container, prefix.strip(), mirror)
 
+        # 비교에는 목록 조회와 바뀐 파일의 MD5 계산이 있어 작업 스레드에서 합니다.
+        def run():
             try:
-                container, blob_path = file_path.split("/", 1)
-                container_client = account['client'].get_container_client(container)
-                blob_client = container_client.get_blob_client(blob_path)
+                result = self.blob_handler.plan_sync(account, direction, local_dir, container, prefix.strip(), mirror)
+            except Exception as e:
+                logging.error(f"동기화 비교 실패: {local_dir} <-> {container}/{prefix}, 오류: {e}")
+                result = e
+            self.sync_planned.emit(request, result)
 
-                save_path = os.path.join(save_directory, os.path.basename(blob_path))
+        logging.info(f"동기화 비교 시작: {local_dir} <-> {account['account_name']}/{container}/{prefix}")
+        threading.Thread(target=run, name='blob-sync-plan', daemon=True).start()
 
-                with open(save_path, "wb") as file:
-                    data = blob_client.download_blob()
-                    file.write(data.readall())
+    def on_sync_planned(self, request, result):
+        """비교 결과(dry-run)를 보여주고, 실행하기로 하면 동기화 작업을 전송 대기열에 넣습니다.
 
-                logging.info(f"다운로드 성공: {blob_path} -> {save_path}")
-            except Exception as e:
-                logging.error(f"다운로드 실패: {file_path}, 이유: {e}")
-                QMessageBox.warning(list_widget, "오류", f"파일 다운로드 실패: {file_path}\n{e}")
+        작업은 실행할 때 다시 비교하므로 미리 보기 이후에 바뀐 파일도 반영됩니다.
+        """
+        account_name, direction, local_dir, container, prefix, mirror = request
+        if isinstance(result, Exception):
+            QMessageBox.warning(self, "오류", f"동기화할 내용을 비교하지 못했습니다: {result}")
+            return
+        plan = result
+        if not plan.actions:
+            QMessageBox.information(self, "폴더 동기화", f"바꿀 파일이 없습니다. ({plan.summary()})")
+            return
+        kind = f"{'mirror' if mirror else 'sync'}_{direction}"
+        job = TransferJob(kind, account_name, container, prefix, local_dir)
+        lines = [f"{OP_LABELS[action.op]}: {action.relative} ({action.reason})"
+                 for action in plan.actions[:self.SYNC_PREVIEW_LINES]]
+        if len(plan.actions) > self.SYNC_PREVIEW_LINES:
+            lines.append(f"... 외 {len(plan.actions) - self.SYNC_PREVIEW_LINES:,}개")
+        lines += [f"건너뜀: {relative} ({reason})" for relative, reason in plan.skipped[:self.SYNC_PREVIEW_LINES]]
+        box = QMessageBox(QMessageBox.Question, "폴더 동기화 미리 보기",
+                          f"{job.label()}\n\n{plan.summary()}\n\n동기화를 실행할까요?",
+                          QMessageBox.Yes | QMessageBox.No, self)
+        box.setDefaultButton(QMessageBox.No)
+        box.setDetailedText("\n".join(lines))
+        if box.exec_() == QMessageBox.Yes:
+            self.enqueue_transfers([job])
+
+    def enqueue_transfers(self, jobs):
+        """작업을 전송 대기열에 넣고 전송 패널을 보여줍니다."""
+        if len(self.transfer_manager.enqueue(jobs)) < len(jobs):
+            rejected = [f"{job.label()} -> {job.local_path}" for job in jobs if job.id is None]
+            QMessageBox.warning(self, "오류", "같은 로컬 경로로 받는 작업이 이미 있어 제외됩니다:\n" + "\n".join(rejected))
+        self.transfers_panel.show()
+        self.transfers_panel.refresh()
 
-        QMessageBox.information(list_widget, "알림", "선택한 파일이 다운로드되었습니다.")
+    def toggle_transfers_panel(self):
+        self.transfers_panel.setVisible(not self.transfers_panel.isVisible())
+
+    def on_transfer_job_changed(self, job):
+        """전송 작업의 상태가 바뀌면 삭제(이동)된 블랍을 화면에서 지우고, 업로드나 복사가 끝나면 목록 갱신을 예약합니다."""
+        if job.deleted and job.state != RUNNING:
+            deleted, job.deleted = job.deleted, []
+            account = self._connected_account(job.account_name)
+            if account is not None:
+                self.remove_deleted_blobs(account, deleted)
+        if (job.kind in UPLOAD_KINDS or job.kind in COPY_KINDS) and job.state == DONE:
+            self.upload_refresh_timer.start()
+
+    def _connected_account(self, account_name):
+        """이름이 account_name인 연결된 계정을 반환합니다. 전송 관리자의 작업 스레드에서도 호출됩니다."""
+        for account in self.blob_service_clients:
+            if account['account_name'] == account_name and account['client'] is not None:
+                return account
+        return None
 
     def update_refresh_interval(self):
         """refresh_interval 값을 업데이트하고 YAML에 저장합니다."""
@@ -219,6 +757,7 @@ class BlobMonitor(QWidget):
                 self.config['refresh_interval'] = new_interval
                 self.config_handler.save_config(self.config)
                 self.interval_label.setText(f"현재 refresh_interval: {self.refresh_interval} 초")
+                self.engine.scheduler.set_min_interval(new_interval)
                 QMessageBox.information(self, "알림", f"refresh_interval이 {new_interval} 초로 업데이트되었습니다.")
                 logging.info(f"refresh_interval이 {new_interval} 초로 업데이트되었습니다.")
             else:
@@ -242,6 +781,10 @@ class BlobMonitor(QWidget):
                     label.parentWidget().show()
                 else:
                     label.parentWidget().hide()
+        # 숨긴 계정의 컨테이너는 스케줄에서 빼고, 다시 보이면 바로 조회합니다.
+        for _, _, acc in self.account_widgets:
+            self._set_polled(acc, self._is_polled(acc))
+        self.poll_due_containers()
 
     def toggle_layout_orientation(self):
         """가로/세로 레이아웃 변경"""
@@ -255,37 +798,322 @@ class BlobMonitor(QWidget):
 
         self.account_splitter.setOrientation(self.layout_orientation)
 
+    def show_stats(self):
+        """계측값을 보여주는 통계 창을 엽니다. 창은 하나만 띄우고 닫아도 다시 열 수 있습니다."""
+        if self.stats_dialog is None:
+            self.stats_dialog = StatsDialog(self.metrics_server, self)
+        self.stats_dialog.show()
+        self.stats_dialog.raise_()
+
+    def show_inventory(self):
+        """인벤토리 보고서 파일을 골라 계정 목록 옆에 분석 패널을 엽니다. 패널은 하나만 띄웁니다."""
+        paths, _ = QFileDialog.getOpenFileNames(self, "인벤토리 보고서 선택", "",
+                                                "Blob Inventory 보고서 (*.csv *.parquet)")
+        if not paths:
+            return
+        if not arrow_available() and any(path.lower().endswith('.parquet') for path in paths):
+            QMessageBox.warning(self, "오류", "Parquet 보고서를 읽으려면 pyarrow가 필요합니다. (pip install pyarrow)")
+            return
+        if self.inventory_panel is not None:
+            self.inventory_panel.close_panel()
+        self.inventory_panel = InventoryPanel(paths, self.config, self)
+        self.inventory_panel.closed.connect(self.on_inventory_closed)
+        self.account_splitter.addWidget(self.inventory_panel)
+
+    def on_inventory_closed(self):
+        self.inventory_panel = None
+
+    def show_preview(self, account, container, blob_name):
+        """블랍의 끝부분을 구간 요청으로 읽어 계정 목록 옆의 미리 보기 패널에 보여줍니다. 패널은 하나만 띄웁니다."""
+        if account['client'] is None:
+            QMessageBox.warning(self, "오류", "계정이 아직 연결되지 않았습니다.")
+            return
+        if self.preview_panel is not None:
+            self.preview_panel.close_panel()
+        self.preview_panel = BlobPreviewPanel(account, container, blob_name, self.config, self)
+        self.preview_panel.closed.connect(self.on_preview_closed)
+        self.account_splitter.addWidget(self.preview_panel)
+
+    def on_preview_closed(self):
+        if self.sender() is self.preview_panel:
+            self.preview_panel = None
+
     def start_monitoring(self):
-        """블랍 모니터링을 시작합니다."""
+        """블랍 모니터링을 시작합니다. 목록 조회는 별도 스레드에서 실행되고 결과는 시그널로 전달됩니다."""
         logging.debug("블랍 모니터링 시작")
-        self.update_blobs()
-        self.monitoring_thread = threading.Thread(target=self.monitor_blobs, daemon=True)
-        self.monitoring_thread.start()
+        self.refresh_batches = {}  # 진행 중인 조회 묶음의 취소 이벤트 -> RefreshBatch
+        self.refresh_totals = {}
+        self.connecting_accounts = set()  # 연결 중인 계정 이름
+        self.connect_errors = {}  # 계정 이름 -> 마지막 연결 오류
+        self.reconnect_due = {}  # 연결에 실패한 계정 이름 -> (연속 실패 횟수, 다시 연결해 볼 시각)
+
+        self.refresh_thread = QThread(self)
+        self.refresh_worker = RefreshWorker(self.blob_handler)
+        self.refresh_worker.moveToThread(self.refresh_thread)
+        self.changes_requested.connect(self.refresh_worker.read_changes)
+        self.refresh_worker.changes_received.connect(self.on_changes_received)
+        self.refresh_worker.container_listed.connect(self.on_container_listed)
+        self.refresh_worker.container_failed.connect(self.on_container_failed)
+        self.refresh_worker.container_unchanged.connect(self.on_container_unchanged)
+        self.refresh_worker.refresh_finished.connect(self.on_refresh_finished)
+        self.refresh_thread.start()
+        # 카탈로그 읽기는 전용 스레드에서 하므로 변경 피드 읽기나 목록 조회가 시작 화면 채우기를 늦추지 않습니다.
+        self.catalog_thread = QThread(self)
+        self.catalog_worker = RefreshWorker(self.blob_handler)
+        self.catalog_worker.moveToThread(self.catalog_thread)
+        self.catalog_load_requested.connect(self.catalog_worker.load_catalog)
+        self.catalog_worker.container_cached.connect(self.on_container_cached)
+        self.catalog_thread.start()
+        self.account_connected.connect(self.on_account_connected)
+
+        # 컨테이너마다 다음 조회 시각을 따로 관리합니다. 변경이 없으면 간격을 늘리고 변경이 있으면 줄입니다.
+        # 조회 규칙은 헤드리스 모드와 같은 MonitorEngine이 정하고, 화면은 각 계정의 BlobTableModel입니다.
+        self.engine = MonitorEngine(self.blob_handler, self.config, self.refresh_interval)
+        for _, view, account in self.account_widgets:
+            self.engine.set_target(account, view.model())
+        self.monitor_timer = QTimer(self)
+        self.monitor_timer.timeout.connect(self.poll_due_containers)
+        self.monitor_timer.start(self.POLL_TICK_MS)
 
-    def monitor_blobs(self):
-        """설정된 간격으로 블랍을 업데이트합니다."""
-        while True:
-            time.sleep(self.refresh_interval)
-            logging.debug("모니터링 중 블랍 업데이트 호출")
-            self.update_blobs()
+        # 변경 피드를 쓰는 계정은 목록을 다시 조회하는 대신 피드의 이벤트를 주기적으로 읽어 반영합니다.
+        self.change_feed_timer = QTimer(self)
+        self.change_feed_timer.timeout.connect(self.request_changes)
+        self.change_feed_timer.start(self.engine.change_feed_interval * 1000)
+
+        # 설정에 컨테이너가 있는 계정은 연결을 기다리지 않고 카탈로그의 목록으로 화면을 먼저 채웁니다.
+        # 실제 목록 조회는 계정마다 연결이 끝나는 대로 시작합니다.
+        accounts = [account for _, _, account in self.account_widgets]
+        self.catalog_load_requested.emit([account for account in accounts if account['containers']])
+        self._connect_accounts(accounts)
+
+    def _connect_accounts(self, accounts):
+        """계정들을 백그라운드에서 동시에 연결합니다. 결과는 account_connected 시그널로 전달됩니다."""
+        accounts = [account for account in accounts if account['account_name'] not in self.connecting_accounts]
+        for account in accounts:
+            self.connecting_accounts.add(account['account_name'])
+        self.blob_handler.connect_accounts(accounts, self.account_connected.emit)
+
+    def on_account_connected(self, account, error):
+        """계정 연결이 끝나면 화면을 연결된 상태로 바꾸고 목록 조회를 시작합니다."""
+        self.connecting_accounts.discard(account['account_name'])
+        label, view = self._widgets_for(account)
+        status_label = self.status_labels[account['account_name']]
+        if error is not None:
+            # 실패할 때마다 다시 연결해 볼 때까지의 간격을 두 배로 늘립니다. (poll_error_max_interval까지)
+            failures = self.reconnect_due.get(account['account_name'], (0, 0.0))[0] + 1
+            delay = min(self.refresh_interval * 2 ** (failures - 1),
+                        float(self.config.get('poll_error_max_interval', 900)))
+            self.reconnect_due[account['account_name']] = (failures, time.monotonic() + delay)
+            self.connect_errors[account['account_name']] = error
+            label.setText(f"계정: {account['account_name']} (연결 실패)")
+            status_label.setText(f"[오류] 계정 연결 실패: {error} - {delay:.0f}초 뒤 다시 연결합니다.")
+            status_label.show()
+            return
+
+        self.reconnect_due.pop(account['account_name'], None)
+        had_error = self.connect_errors.pop(account['account_name'], None) is not None
+        known = set(view.model().store.containers)
+        view.model().register_containers(account['containers'])
+        self.tree_views[account['account_name']].model().add_containers(account['containers'])
+        label.setText(f"계정: {account['account_name']}")
+        if had_error:
+            self._update_status_label(account, view.model())
+        new_containers = [container for container in account['containers'] if container not in known]
+        if new_containers:
+            self.catalog_load_requested.emit([dict(account, containers=new_containers)])
+        if not self.connecting_accounts:
+            logging.info(f"모든 계정 연결 완료: 시작 후 {time.perf_counter() - _STARTED_AT:.2f}초")
+        if self._is_polled(account):
+            self.engine.schedule_account(account)
+        if account['change_source'] is not None:
+            self.changes_requested.emit([account])
+        self.poll_due_containers()
 
     def update_blobs(self):
-        """모든 계정과 컨테이너의 블랍 목록을 업데이트합니다."""
+        """보이는 모든 계정의 컨테이너를 바로 조회할 차례로 만들고 조회를 시작합니다.
+
+        이미 조회 중인 컨테이너는 그 조회가 끝난 결과를 씁니다.
+        """
         logging.debug("update_blobs 함수 호출됨")
-        for i, (label, list_widget, account) in enumerate(self.account_widgets):
-            if self.single_account_mode and self.single_account_mode != account:
-                continue
-            list_widget.clear()
-            self.blob_handler.update_blobs(account, list_widget)
-
-    def select_all_files(self, list_widget):
-        """컨테이너명을 제외하고 파일만 선택합니다."""
-        for index in range(list_widget.count()):
-            item = list_widget.item(index)
-            if not item.text().startswith("=====") and "파일이 없습니다" not in item.text():
-                item.setSelected(True)
+        self.engine.reschedule_now(self._pollable_accounts())
+        self.poll_due_containers()
+
+    def poll_due_containers(self):
+        """조회할 차례가 된 컨테이너 중 조회 중이 아닌 것만 갱신하고, 연결에 실패한 계정은 때가 되면 다시 연결합니다.
+
+        이번 실행에서 이미 전체 목록을 받은 컨테이너는 첫 페이지만 먼저 비교하도록 probe를 함께 보냅니다.
+        """
+        now = time.monotonic()
+        retry = [account for _, _, account in self.account_widgets
+                 if account['client'] is None and self.reconnect_due.get(account['account_name'], (0, now))[1] < now]
+        if retry:
+            self._connect_accounts(retry)
+
+        accounts, probes = self.engine.due_refresh(self._pollable_accounts())
+        if accounts:
+            self._start_refresh(accounts, probes)
+
+    def _is_polled(self, account):
+        """계정의 목록을 주기적으로 조회해야 하는지 반환합니다. 숨긴 계정과 트리 보기는 조회하지 않습니다."""
+        if self.single_account_mode and self.single_account_mode != account:
+            return False
+        return not self._is_tree_mode(account)  # 트리 보기는 펼친 prefix만 필요할 때 조회합니다.
+
+    def _set_polled(self, account, polled):
+        """계정을 폴링 스케줄러에 등록하거나 뺍니다. 다시 등록하면 바로 조회할 차례가 됩니다."""
+        if account['client'] is None:
+            return  # 연결되면 on_account_connected에서 등록합니다.
+        if polled:
+            self.engine.schedule_account(account)
+        else:
+            self.engine.unschedule_account(account)
+
+    def _pollable_accounts(self):
+        """지금 목록을 조회할 수 있는 (연결되어 있고 보이는) 계정 목록을 반환합니다."""
+        return [account for _, _, account in self.account_widgets
+                if account['client'] is not None and self._is_polled(account)]
+
+    def _start_refresh(self, accounts, probes):
+        """accounts의 컨테이너 조회를 백그라운드에서 시작합니다. 다른 조회 묶음이 진행 중이어도 따로 실행됩니다."""
+        for account in accounts:
+            self.refresh_totals[account['account_name']] = [0, 0]
+        cancel_event = threading.Event()
+        self.refresh_batches[cancel_event] = self.engine.begin_refresh(accounts)
+        self.cancel_refresh_button.setEnabled(True)
+        if self.async_engine is not None:
+            asyncio.ensure_future(self._refresh_async(accounts, cancel_event, probes))
+        else:
+            self.refresh_worker.start_refresh(accounts, cancel_event, probes)
+
+    async def _refresh_async(self, accounts, cancel_event, probes):
+        """비동기 백엔드로 목록을 조회합니다. 이벤트 루프가 GUI 스레드에서 돌기 때문에 화면을 바로 갱신합니다."""
+        listings = self.async_engine.iter_container_listings(accounts, cancel_event, probes)
+        try:
+            async for account, container, snapshot, error in listings:
+                if isinstance(error, ListingCancelled):
+                    continue
+                if error is not None:
+                    self.on_container_failed(account, container, error)
+                elif snapshot is None:
+                    self.on_container_unchanged(account, container)
+                else:
+                    self.on_container_listed(account, container, snapshot)
+        except Exception as e:
+            logging.error(f"비동기 갱신 중 오류 발생: {e}")
+        self.on_refresh_finished(cancel_event, cancel_event.is_set())
+
+    def cancel_refresh(self):
+        """진행 중인 모든 갱신을 취소합니다."""
+        if self.refresh_batches:
+            logging.info("블랍 목록 갱신 취소 요청")
+            for cancel_event in self.refresh_batches:
+                cancel_event.set()
+
+    def on_container_cached(self, account, container, snapshot):
+        """카탈로그에 저장되어 있던 목록으로 화면을 먼저 채웁니다."""
+        if not self.engine.should_apply_cached(account, container):
+            return  # 이미 실제 목록을 받았다면 오래된 카탈로그 목록으로 덮어쓰지 않습니다.
+        _, view = self._widgets_for(account)
+        view.model().apply_snapshot(container, snapshot)
+        self._update_filter_label(account, view.model())
+        logging.debug(f"카탈로그에서 목록 복원: {account['account_name']}/{container} ({len(snapshot)}개)")
+
+    def on_container_listed(self, account, container, snapshot):
+        """백그라운드에서 조회가 끝난 컨테이너 목록을 화면에 반영하고 변경분을 카탈로그에 기록합니다."""
+        label, view = self._widgets_for(account)
+        diff = self.engine.container_listed(account, container, snapshot)
+        self._update_status_label(account, view.model())
+        totals = self.refresh_totals.setdefault(account['account_name'], [0, 0])
+        totals[0] += len(diff.added)
+        totals[1] += len(diff.removed)
+        label.setText(f"계정: {account['account_name']} (최근 갱신: {totals[0]}개 추가 / {totals[1]}개 삭제)")
+
+    def request_changes(self):
+        """변경 피드를 쓰는 연결된 계정의 새 이벤트 읽기를 작업 스레드에 요청합니다."""
+        accounts = [account for _, _, account in self.account_widgets
+                    if account['client'] is not None and account['change_source'] is not None]
+        if accounts:
+            self.changes_requested.emit(accounts)
+
+    def on_changes_received(self, account, events, cursor):
+        """변경 피드 이벤트를 화면과 카탈로그에 반영한 뒤 커서를 저장합니다."""
+        label, view = self._widgets_for(account)
+        diffs = self.engine.apply_changes(account, events, cursor)
+        self._update_filter_label(account, view.model())
+        added = sum(len(diff.added) for _, diff in diffs)
+        removed = sum(len(diff.removed) for _, diff in diffs)
+        if added or removed:
+            label.setText(f"계정: {account['account_name']} (변경 피드: {added}개 추가 / {removed}개 삭제)")
+
+    def on_container_unchanged(self, account, container):
+        """첫 페이지 확인 결과 변경이 없는 컨테이너는 다음 조회 간격만 늘립니다."""
+        self.engine.container_unchanged(account, container)
+
+    def on_container_failed(self, account, container, error):
+        """컨테이너 조회 실패를 화면에 표시하고 다음 조회를 늦춥니다."""
+        _, view = self._widgets_for(account)
+        self.engine.container_failed(account, container, error)
+        self._update_status_label(account, view.model())
+
+    def _update_status_label(self, account, model):
+        """계정의 컨테이너 조회 오류를 상태 라벨에 표시하고 필터 결과 수를 갱신합니다."""
+        self._update_filter_label(account, model)
+        status_label = self.status_labels[account['account_name']]
+        if model.container_errors:
+            status_label.setText("\n".join(model.container_errors.values()))
+            status_label.show()
+        else:
+            status_label.hide()
+
+    def on_refresh_finished(self, cancel_event, cancelled):
+        """조회 묶음이 끝나면 결과를 받지 못한 컨테이너를 한 주기 뒤로 미룹니다."""
+        batch = self.refresh_batches.pop(cancel_event, None)
+        self.cancel_refresh_button.setEnabled(bool(self.refresh_batches))
+        if cancelled:
+            logging.info("블랍 목록 갱신이 취소되었습니다.")
+        if batch is not None:
+            self.engine.finish_refresh(batch)
+
+    def _widgets_for(self, account):
+        """계정에 해당하는 (label, view)를 찾습니다."""
+        for label, view, acc in self.account_widgets:
+            if acc['account_name'] == account['account_name']:
+                return label, view
+        raise KeyError(account['account_name'])
+
+    def closeEvent(self, event):
+        """창을 닫을 때 진행 중인 갱신을 취소하고 작업 스레드를 정리합니다."""
+        self.monitor_timer.stop()
+        self.cancel_refresh()
+        for thread in (self.refresh_thread, self.catalog_thread):
+            thread.quit()
+            thread.wait(5000)
+        self.transfer_manager.close()  # 진행 중인 전송은 멈추고 다음 실행 때 이어서 합니다.
+        if self.preview_panel is not None:
+            self.preview_panel.close_panel()  # 따라가기를 멈춥니다.
+        if self.blob_handler.catalog is not None:
+            self.blob_handler.catalog.close()
+        self.blob_handler.syncer.close()
+        super().closeEvent(event)
+
+    def select_all_files(self, view):
+        """목록의 모든 파일을 선택합니다. 목록 보기에서는 아직 노출되지 않은 행도 함께 선택됩니다.
+
+        필터가 있으면 색인이 찾은 일치 행만 모델에 있으므로 그 행들이 모두 선택됩니다.
+        """
+        if isinstance(view.model(), BlobTableModel):
+            view.model().fetch_all()
+        view.selectAll()
 
 if __name__ == '__main__':
     app = QApplication(sys.argv)
     ex = BlobMonitor()
-    sys.exit(app.exec_())
+    if ex.event_loop is None:
+        sys.exit(app.exec_())
+
+    # 비동기 백엔드: Qt 이벤트 루프를 qasync 루프로 실행하고, 앱이 종료되면 공유 연결 풀을 닫습니다.
+    app_closed = asyncio.Event()
+    app.aboutToQuit.connect(app_closed.set)
+    with ex.event_loop:
+        ex.event_loop.run_until_complete(app_closed.wait())
+        ex.event_loop.run_until_complete(ex.async_engine.close())
@@ -0,0 +1,134 @@
+import logging
+import random
+import time
+
+
+class _PollState:
+    __slots__ = ('interval', 'fixed_interval', 'next_due', 'failures', 'last_full')
+
+    def __init__(self, interval, fixed_interval=None):
+        self.interval = fixed_interval or interval
+        self.fixed_interval = fixed_interval  # 변경 여부와 관계없이 쓰는 고정 간격 (변경 피드를 쓰는 컨테이너)
+        self.next_due = 0.0  # 처음에는 바로 조회
+        self.failures = 0
+        self.last_full = None  # 마지막으로 전체 목록을 받은 시각
+
+
+class PollScheduler:
+    """컨테이너마다 다음 조회 시각을 따로 관리하는 폴링 스케줄러입니다.
+
+    변경이 있으면 간격을 min_interval로 되돌리고, 변경이 없으면 backoff 배로 늘려 max_interval까지 키웁니다.
+    조회에 실패하면 실패 횟수에 따라 지수적으로 늦추며(error_max_interval까지), 모든 간격에는 jitter 비율만큼
+    무작위 흔들림을 더해 여러 컨테이너의 요청이 한꺼번에 몰리지 않도록 합니다. 키는 (계정 이름, 컨테이너)이며
+    Qt에 의존하지 않습니다.
+    """
+
+    def __init__(self, min_interval=60, max_interval=3600, backoff=2.0, jitter=0.1, error_max_interval=900,
+                 full_interval=3600):
+        self.min_interval = max(1.0, float(min_interval))
+        self.max_interval = max(self.min_interval, float(max_interval))
+        self.backoff = max(1.0, float(backoff))
+        self.jitter = min(max(0.0, float(jitter)), 0.5)
+        self.error_max_interval = max(self.min_interval, float(error_max_interval))
+        self.full_interval = float(full_interval) if full_interval else None
+        self._states = {}
+
+    def add(self, key, fixed_interval=None, due_now=True):
+        """조회 대상을 등록합니다. due_now면 바로 조회할 차례가 되고, 아니면 한 간격 뒤에 조회합니다.
+
+        fixed_interval을 주면 backoff 없이 항상 그 간격으로 조회합니다.
+        """
+        if key in self._states:
+            return
+        state = _PollState(self.min_interval, fixed_interval)
+        self._states[key] = state
+        if not due_now:
+            state.last_full = time.monotonic()
+            self._schedule(state, state.interval, state.last_full)
+
+    def discard(self, key):
+        self._states.pop(key, None)
+
+    def due(self, now=None):
+        """지금 조회할 차례인 키 목록을 다음 조회 시각 순으로 반환합니다."""
+        now = time.monotonic() if now is None else now
+        ready = [(state.next_due, key) for key, state in self._states.items() if state.next_due <= now]
+        return [key for _, key in sorted(ready)]
+
+    def needs_full_listing(self, key, now=None):
+        """간이 확인(probe)을 건너뛰고 전체 목록을 받아야 하는지 반환합니다.
+
+        첫 페이지만 비교하는 확인은 그 뒤쪽의 변경을 놓칠 수 있으므로 full_interval마다 한 번은 전체를 받습니다.
+        """
+        state = self._states.get(key)
+        if state is None or state.last_full is None:
+            return True
+        now = time.monotonic() if now is None else now
+        return self.full_interval is not None and now - state.last_full >= self.full_interval
+
+    def record_result(self, key, changed, full_listing, now=None):
+        """조회 결과를 기록하고 다음 조회 시각을 정합니다."""
+        state = self._states.get(key)
+        if state is None:
+            return
+        now = time.monotonic() if now is None else now
+        state.failures = 0
+        if full_listing:
+            state.last_full = now
+        if state.fixed_interval:
+            state.interval = state.fixed_interval
+        elif changed:
+            state.interval = self.min_interval
+        else:
+            state.interval = min(state.interval * self.backoff, self.max_interval)
+        self._schedule(state, state.interval, now)
+
+    def record_error(self, key, now=None):
+        """조회 실패를 기록하고 실패 횟수에 따라 다음 조회를 늦춥니다."""
+        state = self._states.get(key)
+        if state is None:
+            return
+        now = time.monotonic() if now is None else now
+        state.failures += 1
+        delay = min(self.min_interval * (2 ** state.failures), self.error_max_interval)
+        self._schedule(state, delay, now)
+        logging.debug(f"조회 실패로 다음 조회를 늦춥니다: {key[0]}/{key[1]} ({state.failures}회 실패, {delay:.0f}초 뒤)")
+
+    def reschedule_now(self, keys=None):
+        """지정한 키(없으면 전체)를 바로 조회할 차례로 만들고 간격을 min_interval로 되돌립니다.
+
+        직접 요청한 조회이므로 첫 페이지 확인 없이 전체 목록을 받습니다.
+        """
+        for key in (self._states if keys is None else keys):
+            state = self._states.get(key)
+            if state is not None:
+                state.interval = state.fixed_interval or self.min_interval
+                state.next_due = 0.0
+                state.last_full = None
+
+    def postpone(self, keys, now=None):
+        """결과 없이 끝난(취소된) 조회를 간격은 그대로 두고 min_interval 뒤로 미룹니다."""
+        now = time.monotonic() if now is None else now
+        for key in keys:
+            state = self._states.get(key)
+            if state is not None:
+                self._schedule(state, self.min_interval, now)
+
+    def set_min_interval(self, min_interval):
+        """최소 간격을 바꾸고 모든 대상을 새 간격으로 다시 시작합니다."""
+        self.min_interval = max(1.0, float(min_interval))
+        self.max_interval = max(self.min_interval, self.max_interval)
+        self.error_max_interval = max(self.min_interval, self.error_max_interval)
+        now = time.monotonic()
+        for state in self._states.values():
+            state.interval = state.fixed_interval or self.min_interval
+            self._schedule(state, state.interval, now)
+
+    def interval_of(self, key):
+        state = self._states.get(key)
+        return state.interval if state is not None else None
+
+    def _schedule(self, state, delay, now):
+        if self.jitter:
+            delay *= random.uniform(1 - self.jitter, 1 + self.jitter)
+        state.next_due = now + delay
@@ -0,0 +1,54 @@
+from collections import namedtuple
+
+# 블랍 한 개의 목록 정보 (스냅샷 비교 시 ETag를 기준으로 변경 여부를 판단)
+BlobEntry = namedtuple('BlobEntry', ['name', 'etag', 'size', 'last_modified', 'tier'])
+
+
+def entry_from_blob(blob):
+    """list_blobs()가 돌려준 BlobProperties를 BlobEntry로 변환합니다."""
+    tier = getattr(blob, 'blob_tier', None)
+    return BlobEntry(
+        name=blob.name,
+        etag=blob.etag,
+        size=blob.size,
+        last_modified=blob.last_modified,
+        tier=getattr(tier, 'value', tier),
+    )
+
+
+class BlobSnapshot:
+    """컨테이너 하나의 블랍 목록 스냅샷입니다. 블랍 이름을 키로 BlobEntry를 보관합니다."""
+
+    def __init__(self, entries=None):
+        self.entries = {}
+        for entry in entries or ():
+            self.entries[entry.name] = entry
+
+    def __len__(self):
+        return len(self.entries)
+
+    def __contains__(self, name):
+        return name in self.entries
+
+    def get(self, name):
+        return self.entries.get(name)
+
+
+class BlobDiff:
+    """저장된 목록과 새 목록 사이의 추가/삭제/변경 내역입니다. (BlobColumnStore.diff_container/diff_changes가 만듭니다)"""
+
+    def __init__(self, added, removed, changed):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    def summary(self):
+        """'N개 추가 / M개 삭제' 형태의 요약 문자열을 반환합니다."""
+        text = f"{len(self.added)}개 추가 / {len(self.removed)}개 삭제"
+        if self.changed:
+            text += f" / {len(self.changed)}개 변경"
+        return text
+
@@ -1,20 +1,94 @@
 import logging
 import re
-from azure.storage.blob import BlobServiceClient, BlobClient
-from PyQt5.QtWidgets import QMessageBox, QFileDialog, QListWidgetItem, QMenu, QApplication
-from PyQt5.QtCore import Qt, QMimeData
-from PyQt5.QtGui import QCursor
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import os
+from blob_batch import BlobBatchDeleter
+from blob_catalog import BlobCatalog
+from blob_changefeed import (
+    CHANGE_FEED_CONTAINER, AzureSegmentStore, LocalSegmentStore, ChangeFeedReader, ChangeFeedCursors, avro_available
+)
+from blob_copy import BlobCopier
+from blob_metrics import log_sampler, profiler, record_listing, record_transfer, sdk_hooks
+from blob_snapshot import BlobSnapshot, entry_from_blob
+from blob_sync import DownloadPathConflict, FolderSync, download_paths
+from blob_transfer import BlobDownloader, BlobUploader
 
 logging.basicConfig(level=logging.DEBUG, format='%(asctime)s - %(levelname)s - %(message)s')
 
+class ListingCancelled(Exception):
+    """갱신이 취소되어 컨테이너 목록 조회를 중단했을 때 발생합니다."""
+
+
+def account_name_from_connection_string(connection_string):
+    """SDK를 불러오지 않고 연결 문자열에서 계정 이름을 읽습니다. 찾지 못하면 None을 반환합니다."""
+    for part in connection_string.split(';'):
+        key, _, value = part.partition('=')
+        key = key.strip().lower()
+        if key == 'usedevelopmentstorage' and value.strip().lower() == 'true':
+            return 'devstoreaccount1'  # Azurite 기본 계정
+        if key == 'accountname' and value:
+            return value.strip()
+        if key == 'blobendpoint' and value:
+            # https://<계정>.blob.core.windows.net 형식의 엔드포인트
+            host = value.strip().split('://', 1)[-1]
+            return host.split('.', 1)[0].split('/', 1)[0] or None
+    return None
+
+
 class BlobStorageHandler:
     def __init__(self, config):
         self.config = config
+        # 컨테이너 목록 조회용 스레드 풀 설정
+        self.per_account_concurrency = max(1, int(config.get('list_per_account_concurrency') or 4))
+        self.container_timeout = config.get('list_container_timeout', 120)
+        self.probe_page_size = int(config.get('poll_probe_page_size') or 1000)
+        self.list_executor = ThreadPoolExecutor(max_workers=int(config.get('list_max_workers') or 16),
+                                                thread_name_prefix='blob-list')
+
+        # 파일 전송 설정
+        self.downloader = BlobDownloader(chunk_size=int(config.get('download_chunk_mb', 8)) * 1024 * 1024,
+                                         max_concurrency=int(config.get('download_max_concurrency', 4)))
+        self.uploader = BlobUploader(block_size=int(config.get('upload_block_mb', 8)) * 1024 * 1024,
+                                     max_concurrency=int(config.get('upload_max_concurrency', 4)))
+        self.transfer_executor = ThreadPoolExecutor(max_workers=int(config.get('transfer_parallel_files', 3)),
+                                                    thread_name_prefix='blob-transfer')
+
+        self.batch_deleter = BlobBatchDeleter(max_concurrency=int(config.get('delete_max_concurrency', 4)))
+
+        # 계정/컨테이너 사이 복사와 이동은 내려받지 않고 서버 측 복사로 합니다.
+        self.copier = BlobCopier(max_concurrency=int(config.get('copy_max_concurrency', 16)),
+                                 sync_max_bytes=int(config.get('copy_sync_max_mb', 256)) * 1024 * 1024,
+                                 poll_interval=float(config.get('copy_poll_interval', 1)),
+                                 poll_max_interval=float(config.get('copy_poll_max_interval', 30)),
+                                 sas_hours=float(config.get('copy_sas_hours', 24)))
+
+        # 로컬 디렉토리와 컨테이너의 증분 동기화 (로컬 MD5는 해시 색인에 보관)
+        self.syncer = FolderSync(self.uploader, self.downloader, self.batch_deleter,
+                                 config.get('sync_index_path') or 'blobmoni_sync.sqlite3',
+                                 max_concurrency=int(config.get('sync_parallel_files', 4)),
+                                 valid_name=self.is_valid_blob_name)
+
+        # 시작 시 화면을 바로 채우기 위한 로컬 목록 카탈로그
+        self.catalog = None
+        if config.get('catalog_enabled', True):
+            try:
+                self.catalog = BlobCatalog(config.get('catalog_path') or 'blobmoni_catalog.sqlite3',
+                                           int(config.get('catalog_max_mb', 512)) * 1024 * 1024)
+            except Exception as e:
+                logging.error(f"카탈로그를 열 수 없습니다. 캐시 없이 실행합니다. 오류: {e}")
 
-    def initialize_blob_clients(self):
-        """Azure Blob 서비스 클라이언트를 초기화합니다."""
-        clients = []
+        # 변경 피드를 읽은 위치 (계정별)
+        self.change_cursors = ChangeFeedCursors(config.get('change_feed_cursor_path') or 'blobmoni_changefeed.json')
+
+    def create_accounts(self):
+        """환경 변수의 연결 문자열로 계정 목록을 만듭니다. 네트워크 요청이나 SDK 로딩 없이 바로 반환됩니다.
+
+        각 계정의 'client'는 connect_account가 끝날 때까지 None이며, 설정에 컨테이너가 없으면 'containers'는
+        빈 목록입니다.
+        """
+        accounts = []
         account_index = 1
         while True:
             connection_string = os.getenv(f"AZURE_CONNECTION_{account_index}")
@@ -22,87 +96,129 @@ class BlobStorageHandler:
             if not connection_string:
                 break
 
-            try:
-                client = BlobServiceClient.from_connection_string(connection_string)
-                account_name = client.account_name
-                containers = self.config.get(f'account_{account_index}_containers')
-                if not containers:
-                    containers = [container.name for container in client.list_containers()]
-                clients.append({
-                    'account_name': account_name,
-                    'client': client,
-                    'containers': containers
-                })
-                logging.debug(f"계정 {account_name} 초기화 성공. 컨테이너: {containers}")
-            except Exception as e:
-                logging.error(f"오류: 계정 {account_index} 초기화 중 문제가 발생했습니다. 오류 내용: {e}")
-
+            account_name = account_name_from_connection_string(connection_string) or f"account_{account_index}"
+            accounts.append({
+                'account_name': account_name,
+                'client': None,
+                'connection_string': connection_string,  # 비동기 백엔드가 aio 클라이언트를 만들 때 사용
+                'containers': list(self.config.get(f'account_{account_index}_containers') or []),
+                'change_source': None,  # 변경 피드를 쓸 수 있으면 연결 후 ChangeFeedReader
+                'index': account_index,
+            })
             account_index += 1
 
-        return clients
-
-    def upload_file(self, list_widget, account, container_name=None):
-        """파일 탐색기를 열어 선택한 파일을 업로드합니다."""
-        logging.debug(f"파일 업로드 시도. 계정: {account['account_name']}")
-        
-        # 컨테이너가 명시되지 않은 경우 선택된 항목에서 추출
-        if container_name is None:
-            selected_items = list_widget.selectedItems()
-            if not selected_items:
-                QMessageBox.warning(list_widget, "오류", "업로드할 경로를 선택하세요.")
-                return
-
-            target_path_item = selected_items[-1]
-            target_path = target_path_item.text()
-
-            if target_path.startswith("====="):
-                container_name = target_path.split(":")[1].strip()  # 컨테이너 이름만 추출
-                blob_name_prefix = ""  # 최상위 디렉토리에 업로드
-            elif "/" not in target_path:
-                container_name = target_path.strip()
-                blob_name_prefix = ""
-            else:
-                try:
-                    container_name, blob_path_prefix = target_path.split("/", 1)
-                    blob_name_prefix = os.path.dirname(blob_path_prefix)
-                except ValueError:
-                    QMessageBox.warning(list_widget, "오류", "올바른 경로를 선택하세요.")
-                    return
+        return accounts
+
+    def connect_account(self, account):
+        """계정의 Blob 서비스 클라이언트를 만들고, 설정에 컨테이너가 없으면 컨테이너 목록을 조회합니다."""
+        from azure.storage.blob import BlobServiceClient  # SDK는 처음 연결할 때 불러옵니다.
+
+        started = time.perf_counter()
+        client = BlobServiceClient.from_connection_string(account['connection_string'], **sdk_hooks())
+        containers = self.config.get(f"account_{account['index']}_containers")
+        if not containers:
+            containers = [container.name for container in client.list_containers()]
+        account['client'] = client
+        account['containers'] = list(containers)
+        account['change_source'] = self.create_change_source(account, client)
+        logging.debug(f"계정 {account['account_name']} 초기화 성공 ({time.perf_counter() - started:.2f}초). "
+                      f"컨테이너: {containers}")
+        return account
+
+    def create_change_source(self, account, client):
+        """계정의 변경 소스를 만듭니다. 변경 피드를 쓸 수 없으면 None을 반환하며, 이때는 주기적인 목록 조회를 씁니다.
+
+        account_N_change_feed(없으면 change_feed) 설정이 false면 쓰지 않고, true 또는 auto면 $blobchangefeed
+        컨테이너가 있을 때 사용합니다. 디렉토리 경로를 주면 내려받아 둔 세그먼트 파일을 읽습니다.
+        """
+        setting = self.config.get(f"account_{account['index']}_change_feed", self.config.get('change_feed', 'auto'))
+        if setting is False or setting is None or str(setting).lower() in ('false', 'off', 'no'):
+            return None
+        if not avro_available():
+            logging.warning(f"fastavro가 설치되어 있지 않아 변경 피드 대신 목록 조회를 사용합니다: {account['account_name']} "
+                            f"(pip install fastavro)")
+            return None
+        if setting is True or str(setting).lower() in ('true', 'auto', 'on', 'yes'):
+            store = AzureSegmentStore(client.get_container_client(CHANGE_FEED_CONTAINER))
         else:
-            blob_name_prefix = ""  # 명시된 컨테이너에는 최상위에 업로드
-
-        # 파일 선택 (다중 파일 가능)
-        file_paths, _ = QFileDialog.getOpenFileNames(list_widget, "파일 선택")
-        if not file_paths:
-            return  # 파일 선택 취소
-
+            store = LocalSegmentStore(str(setting))
         try:
-            container_client = account['client'].get_container_client(container_name)
-
-            for file_path in file_paths:
-                # 파일 이름 생성
-                blob_name = f"{blob_name_prefix}/{os.path.basename(file_path)}" if blob_name_prefix else os.path.basename(file_path)
-
-                # 유효한 Blob 이름을 보장하기 위해 공백 및 잘못된 문자 제거
-                blob_name = re.sub(r'[^a-zA-Z0-9_\-/. ]', '_', blob_name)  # 유효하지 않은 문자는 '_'로 대체
-                blob_name = blob_name.strip('/')  # 앞뒤의 슬래시 제거
-
-                # Azure Blob Storage에서는 Blob 이름에 연속된 슬래시나 특정 문자 패턴이 문제가 될 수 있음
-                if not self.is_valid_blob_name(blob_name):
-                    QMessageBox.warning(list_widget, "오류", f"유효하지 않은 Blob 이름입니다: {blob_name}")
-                    logging.warning(f"유효하지 않은 Blob 이름으로 업로드 시도됨: {blob_name}")
-                    continue
-
-                # 파일 업로드
-                with open(file_path, "rb") as data:
-                    container_client.upload_blob(name=blob_name, data=data, overwrite=True)
-
-                logging.info(f"파일 업로드 성공: {blob_name}")
-                QMessageBox.information(list_widget, "알림", f"파일이 업로드되었습니다: {blob_name}")
-
+            enabled = store.exists()
         except Exception as e:
-            QMessageBox.critical(list_widget, "오류", f"파일 업로드 실패: {e}")
-            logging.error(f"파일 업로드 실패: {e}")
+            logging.warning(f"변경 피드 확인 실패, 목록 조회를 사용합니다: {account['account_name']}, 오류: {e}")
+            return None
+        if not enabled:
+            logging.debug(f"변경 피드가 없어 목록 조회를 사용합니다: {account['account_name']}")
+            return None
+        logging.info(f"변경 피드 사용: {account['account_name']}")
+        return ChangeFeedReader(store, account['containers'])
+
+    def read_changes(self, account):
+        """저장된 커서 이후의 변경 피드 이벤트를 읽어 (ChangeEvent 목록, 새 커서)를 반환합니다."""
+        return account['change_source'].read_changes(self.change_cursors.get(account['account_name']))
+
+    def commit_change_cursor(self, account, cursor):
+        """이벤트를 화면과 카탈로그에 반영한 뒤 커서를 저장합니다."""
+        if cursor is not None and cursor != self.change_cursors.get(account['account_name']):
+            self.change_cursors.set(account['account_name'], cursor)
+
+    def connect_accounts(self, accounts, callback=None):
+        """여러 계정을 목록 조회 스레드 풀에서 동시에 연결합니다.
+
+        계정마다 연결이 끝나면 callback(account, 오류 또는 None)이 작업 스레드에서 호출됩니다. Future 목록을 반환합니다.
+        """
+        def run(account):
+            try:
+                self.connect_account(account)
+                error = None
+            except Exception as e:
+                logging.error(f"오류: 계정 {account['account_name']} 초기화 중 문제가 발생했습니다. 오류 내용: {e}")
+                error = e
+            if callback:
+                callback(account, error)
+            if error is not None:
+                raise error
+            return account
+
+        return [self.list_executor.submit(run, account) for account in accounts]
+
+    def make_blob_name(self, blob_name_prefix, file_path):
+        """업로드할 로컬 파일의 Blob 이름을 만듭니다."""
+        # 파일 이름 생성
+        blob_name = f"{blob_name_prefix}/{os.path.basename(file_path)}" if blob_name_prefix else os.path.basename(file_path)
+
+        # 유효한 Blob 이름을 보장하기 위해 공백 및 잘못된 문자 제거
+        blob_name = re.sub(r'[^a-zA-Z0-9_\-/. ]', '_', blob_name)  # 유효하지 않은 문자는 '_'로 대체
+        return blob_name.strip('/')  # 앞뒤의 슬래시 제거
+
+    def upload_files(self, account, container_name, items, progress_callback=None, finished_callback=None,
+                     cancel_event=None):
+        """(로컬 파일 경로, Blob 이름) 목록을 전송 스레드 풀에서 동시에 블록 단위로 업로드합니다.
+
+        progress_callback(번호, 올린 바이트, 전체 바이트)와 finished_callback(번호, 오류 또는 None)은
+        작업 스레드에서 호출됩니다. 각 파일의 Future 목록을 반환합니다.
+        """
+        logging.debug(f"파일 업로드 시도. 계정: {account['account_name']}, 컨테이너: {container_name}, {len(items)}개")
+
+        def run(index, file_path, blob_name):
+            try:
+                blob_client = account['client'].get_blob_client(container_name, blob_name)
+                callback = (lambda done, total: progress_callback(index, done, total)) if progress_callback else None
+                started = time.perf_counter()
+                self.uploader.upload(blob_client, file_path, callback, cancel_event)
+                record_transfer('upload', os.path.getsize(file_path), time.perf_counter() - started, True)
+                error = None
+            except Exception as e:
+                logging.error(f"파일 업로드 실패: {file_path} -> {container_name}/{blob_name}, 이유: {e}")
+                record_transfer('upload', 0, 0, False)
+                error = e
+            if finished_callback:
+                finished_callback(index, error)
+            if error is not None:
+                raise error
+
+        return [self.transfer_executor.submit(run, index, file_path, blob_name)
+                for index, (file_path, blob_name) in enumerate(items)]
 
     def is_valid_blob_name(self, blob_name):
         """Azure Blob Storage의 유효한 Blob 이름인지 확인합니다."""
@@ -116,118 +232,213 @@ class BlobStorageHandler:
             return False
         return True
 
-    def delete_selected_files(self, list_widget, account):
-        """선택한 파일을 삭제합니다."""
-        logging.debug(f"선택한 파일 삭제 시도. 계정: {account['account_name']}")
-        selected_items = list_widget.selectedItems()
-        if not selected_items:
-            QMessageBox.information(list_widget, "알림", "삭제할 파일을 선택하세요.")
-            return
-
-        for item in selected_items:
-            file_path = item.text()
-
-            if file_path.startswith("=====") or "[오류]" in file_path:
-                continue
-
+    def delete_blobs(self, account, keys, progress_callback=None, cancel_event=None):
+        """(컨테이너, 블랍 이름) 목록을 Blob Batch 요청으로 삭제합니다. (삭제된 키 목록, 실패 목록)을 반환합니다."""
+        logging.debug(f"선택한 파일 삭제 시도. 계정: {account['account_name']}, {len(keys)}개")
+        return self.batch_deleter.delete(account, keys, progress_callback, cancel_event)
+
+    def delete_prefix(self, account, container, prefix, progress_callback=None, cancel_event=None):
+        """container/prefix 아래의 모든 블랍을 목록 조회와 동시에 배치로 삭제합니다."""
+        return self.batch_deleter.delete_prefix(account, container, prefix, progress_callback, cancel_event)
+
+    def copy_blobs(self, account, keys, dest_account, dest_container, dest_prefix="", move=False,
+                   progress_callback=None, cancel_event=None):
+        """(컨테이너, 블랍 이름) 목록을 dest_account의 dest_container/dest_prefix 아래로 서버 측 복사합니다.
+
+        move가 True면 복사본을 확인한 뒤 원본을 지웁니다. (복사한 원본 키 목록, 실패 목록)을 반환합니다.
+        """
+        logging.debug(f"선택한 파일 {'이동' if move else '복사'} 시도. {account['account_name']} -> "
+                      f"{dest_account['account_name']}/{dest_container}/{dest_prefix}, {len(keys)}개")
+        return self.copier.copy_blobs(account, keys, dest_account, dest_container, dest_prefix, move,
+                                      progress_callback, cancel_event)
+
+    def copy_prefix(self, account, container, prefix, dest_account, dest_container, dest_prefix="", move=False,
+                    progress_callback=None, cancel_event=None):
+        """container/prefix 아래의 모든 블랍을 목록 조회와 동시에 dest_container/dest_prefix 아래로 서버 측 복사합니다."""
+        return self.copier.copy_prefix(account, container, prefix, dest_account, dest_container, dest_prefix, move,
+                                       progress_callback, cancel_event)
+
+    def plan_sync(self, account, direction, local_dir, container, prefix="", mirror=False, cancel_event=None):
+        """로컬 디렉토리와 container/prefix를 비교해 동기화 계획(SyncPlan)을 만듭니다. direction은 'up' 또는 'down'입니다."""
+        logging.debug(f"동기화 비교 시도. 계정: {account['account_name']}, {local_dir} <-> {container}/{prefix}")
+        return self.syncer.plan(account, direction, local_dir, container, prefix, mirror, cancel_event)
+
+    def run_sync(self, account, plan, progress_callback=None, cancel_event=None, throttle=None):
+        """동기화 계획을 실행합니다. (처리한 SyncAction 목록, 실패 목록)을 반환합니다."""
+        return self.syncer.run(account, plan, progress_callback, cancel_event, throttle)
+
+    def download_blobs(self, account, keys, save_directory, progress_callback=None, finished_callback=None,
+                       cancel_event=None):
+        """여러 블랍을 전송 스레드 풀에서 동시에 save_directory로 내려받습니다.
+
+        블랍 이름의 폴더 구조대로 save_directory 아래에 저장하며(download_paths), 저장 경로가 앞의 블랍과 겹치거나
+        디렉토리 밖을 가리키는 블랍은 받지 않고 DownloadPathConflict로 실패합니다.
+        progress_callback(번호, 받은 바이트, 전체 바이트)와 finished_callback(번호, 오류 또는 None)은
+        작업 스레드에서 호출됩니다. 각 파일의 Future 목록을 반환합니다.
+        """
+        def run(index, container, blob_path, save_path):
             try:
-                container, blob_path = file_path.split("/", 1)
-                container_client = account['client'].get_container_client(container)
-                container_client.delete_blob(blob_path)
-                list_widget.takeItem(list_widget.row(item))
-                logging.info(f"삭제 성공: {file_path}")
+                if isinstance(save_path, DownloadPathConflict):
+                    raise save_path
+                os.makedirs(os.path.dirname(save_path), exist_ok=True)
+                blob_client = account['client'].get_blob_client(container, blob_path)
+                callback = (lambda done, total: progress_callback(index, done, total)) if progress_callback else None
+                started = time.perf_counter()
+                self.downloader.download(blob_client, save_path, callback, cancel_event)
+                record_transfer('download', os.path.getsize(save_path), time.perf_counter() - started, True)
+                error = None
             except Exception as e:
-                logging.error(f"삭제 실패: {file_path}, 이유: {e}")
-                QMessageBox.warning(list_widget, "오류", f"파일 삭제 실패: {file_path}\n{e}")
-
-        QMessageBox.information(list_widget, "알림", "선택한 파일이 삭제되었습니다.")
-
-    def download_file(self, list_widget, account):
-        """선택한 파일을 다운로드합니다."""
-        logging.debug(f"선택한 파일 다운로드 시도. 계정: {account['account_name']}")
-        selected_items = list_widget.selectedItems()
-        if not selected_items:
-            QMessageBox.information(list_widget, "알림", "다운로드할 파일을 선택하세요.")
-            return
-
-        for item in selected_items:
-            file_path = item.text()
-
-            if file_path.startswith("=====") or "[오류]" in file_path:
-                continue
-
-            try:
-                container, blob_path = file_path.split("/", 1)
-                container_client = account['client'].get_container_client(container)
-                blob_client = container_client.get_blob_client(blob_path)
-
-                save_path, _ = QFileDialog.getSaveFileName(list_widget, "파일 저장", os.path.basename(blob_path))
-                if not save_path:
-                    continue  # 저장 경로를 선택하지 않은 경우
-
-                with open(save_path, "wb") as file:
-                    data = blob_client.download_blob()
-                    file.write(data.readall())
-
-                logging.info(f"다운로드 성공: {blob_path} -> {save_path}")
-                QMessageBox.information(list_widget, "알림", f"파일이 다운로드되었습니다: {save_path}")
-            except Exception as e:
-                logging.error(f"다운로드 실패: {file_path}, 이유: {e}")
-                QMessageBox.warning(list_widget, "오류", f"파일 다운로드 실패: {file_path}\n{e}")
-
-    def update_blobs(self, account, list_widget):
-        """모든 계정과 컨테이너의 블랍 목록을 업데이트합니다."""
-        logging.debug(f"블랍 목록 업데이트 시도. 계정: {account['account_name']}")
-        for container in account['containers']:
-            try:
+                logging.error(f"다운로드 실패: {container}/{blob_path}, 이유: {e}")
+                record_transfer('download', 0, 0, False)
+                error = e
+            if finished_callback:
+                finished_callback(index, error)
+            if error is not None:
+                raise error
+
+        targets = download_paths(keys, save_directory)
+        return [self.transfer_executor.submit(run, index, container, blob_path, save_path)
+                for index, ((container, blob_path), save_path) in enumerate(zip(keys, targets))]
+
+    def iter_container_listings(self, accounts, cancel_event=None, probes=None):
+        """여러 계정의 컨테이너 목록 조회를 스레드 풀에서 동시에 실행하고 끝나는 순서대로 결과를 돌려줍니다.
+
+        계정마다 동시에 조회하는 컨테이너 수는 list_per_account_concurrency로 제한되며,
+        (account, container, snapshot, error) 튜플을 생성합니다. 실패한 컨테이너는 snapshot이 None입니다.
+        cancel_event가 설정되면 진행 중인 조회는 다음 페이지에서 중단되고 남은 조회는 시작하지 않습니다.
+        probes는 (계정 이름, 컨테이너) -> 화면에 있는 앞쪽 (이름, ETag) 목록이며, 첫 페이지가 이와 같아 조회를
+        건너뛴 컨테이너는 snapshot이 None입니다.
+        """
+        probes = probes or {}
+        accounts_by_name = {account['account_name']: account for account in accounts}
+        pending = {name: deque(account['containers']) for name, account in accounts_by_name.items()}
+        active = {name: 0 for name in accounts_by_name}
+        running = {}  # future -> (account, container)
+
+        def submit_more(account_name):
+            queue = pending[account_name]
+            while queue and active[account_name] < self.per_account_concurrency:
+                container = queue.popleft()
+                account = accounts_by_name[account_name]
                 logging.debug(f"컨테이너 접근 시도: {container}")
-                container_client = account['client'].get_container_client(container)
-                blobs = container_client.list_blobs()
-                separator = QListWidgetItem(f"===== 컨테이너: {container} =====")
-                separator.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)  # 선택 가능하도록 플래그 설정
-                list_widget.addItem(separator)
-
-                has_blobs = False
-                for blob in blobs:
-                    has_blobs = True
-                    logging.debug(f"블랍 추가: {blob.name}")
-                    list_widget.addItem(f"{container}/{blob.name}")
-
-                if not has_blobs:
-                    logging.debug(f"컨테이너 '{container}'에 파일이 없습니다.")
-                    list_widget.addItem(f"{container}: 파일이 없습니다.")
+                future = self.list_executor.submit(profiler.call, self.list_container, account, container,
+                                                   cancel_event, probes.get((account_name, container)))
+                running[future] = (account, container)
+                active[account_name] += 1
 
-            except Exception as e:
-                logging.error(f"[오류] 컨테이너 접근 실패: {container}, 오류 메시지: {str(e)}")
-                error_item = QListWidgetItem(f"[오류] 컨테이너 접근 실패: {container}, 메시지: {str(e)}")
-                error_item.setForeground(Qt.red)
-                list_widget.addItem(error_item)
-
-    def context_menu_event(self, list_widget, event, account):
-        """마우스 오른쪽 버튼 클릭 시 팝업 메뉴를 표시합니다."""
-        selected_items = list_widget.selectedItems()
-        if not selected_items:
-            return
-
-        menu = QMenu(list_widget)
-        copy_action = menu.addAction("파일 경로 복사")
-        download_action = menu.addAction("파일 다운로드")
-        delete_action = menu.addAction("파일 삭제")
-
-        action = menu.exec_(QCursor.pos())
-
-        if action == copy_action:
-            self.copy_file_path_to_clipboard(selected_items)
-        elif action == download_action:
-            self.download_file(list_widget, account)
-        elif action == delete_action:
-            self.delete_selected_files(list_widget, account)
-
-    def copy_file_path_to_clipboard(self, selected_items):
-        """선택한 파일의 경로를 클립보드에 복사합니다."""
-        paths = [item.text() for item in selected_items if not item.text().startswith("=====") and "[오류]" not in item.text()]
-        if paths:
-            clipboard = QApplication.clipboard()
-            clipboard.setText("\n".join(paths))
-            logging.info(f"파일 경로 복사: {paths}")
-            QMessageBox.information(None, "알림", "파일 경로가 클립보드에 복사되었습니다.")
+        for account_name in accounts_by_name:
+            submit_more(account_name)
+
+        try:
+            while running:
+                if cancel_event is not None and cancel_event.is_set():
+                    return
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    account, container = running.pop(future)
+                    active[account['account_name']] -= 1
+                    submit_more(account['account_name'])
+                    try:
+                        yield account, container, future.result(), None
+                    except Exception as e:
+                        yield account, container, None, e
+        finally:
+            # 중간에 순회를 멈추면 아직 시작하지 않은 조회는 취소합니다.
+            for future in running:
+                future.cancel()
+
+    def list_container(self, account, container, cancel_event=None, probe=None):
+        """컨테이너의 전체 블랍 목록을 조회해 BlobSnapshot으로 반환합니다.
+
+        list_container_timeout(초)을 넘기면 페이지 사이에서 조회를 중단하고 TimeoutError를 발생시킵니다.
+        cancel_event가 설정되면 ListingCancelled를 발생시킵니다.
+
+        probe(이전 목록의 앞쪽 (이름, ETag) 목록)가 주어지면 먼저 poll_probe_page_size 크기의 첫 페이지만
+        조회합니다. 다음 페이지가 있고 첫 페이지가 probe와 같으면 변경이 없는 것으로 보고 None을 반환하며,
+        다르면 받은 첫 페이지에 이어서 나머지를 조회합니다. 첫 페이지로 목록이 끝나면 그대로 전체 목록이 됩니다.
+        """
+        started = time.perf_counter()
+        stats = {'pages': 0, 'blobs': 0}
+        try:
+            snapshot = self._list_pages(account, container, cancel_event, probe, stats)
+        except ListingCancelled:
+            raise
+        except Exception:
+            record_listing(account['account_name'], container, time.perf_counter() - started,
+                           stats['pages'], stats['blobs'], 'error')
+            raise
+        record_listing(account['account_name'], container, time.perf_counter() - started,
+                       stats['pages'], stats['blobs'], 'unchanged' if snapshot is None else 'full')
+        return snapshot
+
+    def _list_pages(self, account, container, cancel_event, probe, stats):
+        """list_container의 실제 조회입니다. 받은 페이지 수와 블랍 수를 stats에 기록합니다."""
+        container_client = account['client'].get_container_client(container)
+        kwargs = {}
+        deadline = None
+        if self.container_timeout:
+            kwargs['timeout'] = self.container_timeout  # 요청 한 건당 서버 측 제한 시간
+            deadline = time.monotonic() + self.container_timeout
+
+        entries = []
+        continuation_token = None
+        if probe is not None:
+            first_page = container_client.list_blobs(results_per_page=self.probe_page_size, **kwargs).by_page()
+            entries.extend(entry_from_blob(blob) for blob in next(first_page, []))
+            stats['pages'] += 1
+            stats['blobs'] = len(entries)
+            continuation_token = first_page.continuation_token
+            if not continuation_token:
+                return BlobSnapshot(entries)
+            if [(entry.name, entry.etag) for entry in entries] == probe:
+                logging.debug(f"첫 페이지가 같아 전체 조회를 건너뜁니다: {account['account_name']}/{container}")
+                return None
+            if cancel_event is not None and cancel_event.is_set():
+                raise ListingCancelled(container)
+
+        for page in container_client.list_blobs(**kwargs).by_page(continuation_token=continuation_token):
+            entries.extend(entry_from_blob(blob) for blob in page)
+            stats['pages'] += 1
+            stats['blobs'] = len(entries)
+            log_sampler.debug(('list_page', account['account_name'], container),
+                              lambda: f"목록 페이지 수신: {account['account_name']}/{container} "
+                                      f"({stats['pages']}페이지, 누적 {len(entries)}개)")
+            if cancel_event is not None and cancel_event.is_set():
+                raise ListingCancelled(container)
+            if deadline is not None and time.monotonic() > deadline:
+                raise TimeoutError(f"목록 조회가 {self.container_timeout}초를 초과했습니다. ({len(entries)}개까지 조회)")
+        return BlobSnapshot(entries)
+
+    def list_prefix_page(self, account, container, prefix="", continuation_token=None, page_size=None):
+        """가상 디렉토리(prefix) 바로 아래 항목을 '/' 구분자로 한 페이지만 조회합니다.
+
+        (하위 prefix 목록, BlobEntry 목록, 다음 페이지 continuation token)을 반환합니다.
+        """
+        from azure.storage.blob import BlobPrefix
+
+        container_client = account['client'].get_container_client(container)
+        kwargs = {'name_starts_with': prefix or None, 'delimiter': '/'}
+        if page_size:
+            kwargs['results_per_page'] = page_size
+        pages = container_client.walk_blobs(**kwargs).by_page(continuation_token=continuation_token)
+
+        prefixes, entries = [], []
+        for item in next(pages, []):
+            if isinstance(item, BlobPrefix):
+                prefixes.append(item.name)
+            else:
+                entries.append(entry_from_blob(item))
+        logging.debug(f"prefix 조회: {container}/{prefix} -> 하위 prefix {len(prefixes)}개, 블랍 {len(entries)}개")
+        return prefixes, entries, pages.continuation_token
+
+    def apply_snapshot(self, account, model, container, snapshot):
+        """새 스냅샷을 모델에 반영하고 변경 요약을 기록합니다."""
+        diff = model.apply_snapshot(container, snapshot)
+        if diff:
+            logging.info(f"컨테이너 '{account['account_name']}/{container}' 변경 사항: {diff.summary()}")
+        return diff
+
+    def show_listing_error(self, account, model, container, error):
+        """컨테이너 조회 실패를 로그와 화면에 표시합니다. 이전 목록은 그대로 유지합니다."""
+        logging.error(f"[오류] 컨테이너 접근 실패: {container}, 오류 메시지: {str(error)}")
+        model.set_container_error(container, f"[오류] 컨테이너 접근 실패: {container}, 메시지: {str(error)}")
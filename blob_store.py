@@ -0,0 +1,236 @@
+import bisect
+from array import array
+from datetime import datetime, timezone
+from blob_snapshot import BlobEntry, BlobDiff
+
+
+class BlobColumnStore:
+    """블랍 목록을 열(column) 단위의 배열로 보관하는 저장소입니다.
+
+    행은 컨테이너 등록 순서, 그 안에서는 블랍 이름순으로 정렬되어 있으며 컨테이너마다 연속된 구간을 차지합니다.
+    컨테이너 이름과 액세스 계층은 정수 id로 인턴(intern)하고, 크기와 수정 시각은 array에 저장해
+    블랍 한 개당 파이썬 객체를 최소한으로 만듭니다. Qt에 의존하지 않습니다.
+    """
+
+    def __init__(self):
+        self.containers = []  # 컨테이너 id -> 이름
+        self._container_ids = {}
+        self.counts = []  # 컨테이너 id -> 행 수
+        self.listeners = []  # 행이 삽입/삭제될 때 (컨테이너 id, 구간 안의 위치, 늘어난 행 수)로 호출 (이름 색인용)
+        self.tiers = [None]  # 계층 id -> 이름
+        self._tier_ids = {None: 0}
+
+        self.container_col = array('I')
+        self.names = []
+        self.etags = []
+        self.sizes = array('q')
+        self.modified = array('d')  # UTC epoch 초 (알 수 없으면 0)
+        self.tier_col = array('B')
+
+    def __len__(self):
+        return len(self.names)
+
+    def container_id(self, container):
+        """컨테이너 이름을 id로 인턴합니다. 처음 보는 컨테이너는 맨 뒤 구간으로 등록됩니다."""
+        cid = self._container_ids.get(container)
+        if cid is None:
+            cid = len(self.containers)
+            self.containers.append(container)
+            self._container_ids[container] = cid
+            self.counts.append(0)
+        return cid
+
+    def _tier_id(self, tier):
+        tid = self._tier_ids.get(tier)
+        if tid is None:
+            tid = len(self.tiers)
+            self.tiers.append(tier)
+            self._tier_ids[tier] = tid
+        return tid
+
+    def container_range(self, container):
+        """컨테이너가 차지하는 행 구간 (start, end)를 반환합니다."""
+        cid = self.container_id(container)
+        start = sum(self.counts[:cid])
+        return start, start + self.counts[cid]
+
+    def find(self, container, name):
+        """블랍의 행 번호를 반환합니다. 없으면 -1을 반환합니다."""
+        start, end = self.container_range(container)
+        row = bisect.bisect_left(self.names, name, start, end)
+        if row < end and self.names[row] == name:
+            return row
+        return -1
+
+    def key_at(self, row):
+        """행의 (컨테이너 이름, 블랍 이름)을 반환합니다."""
+        return self.containers[self.container_col[row]], self.names[row]
+
+    def container_at(self, row):
+        return self.containers[self.container_col[row]]
+
+    def modified_at(self, row):
+        """행의 수정 시각을 datetime(UTC)으로 반환합니다."""
+        ts = self.modified[row]
+        return datetime.fromtimestamp(ts, timezone.utc) if ts else None
+
+    def tier_at(self, row):
+        return self.tiers[self.tier_col[row]]
+
+    def entry_at(self, row):
+        """행을 BlobEntry로 반환합니다."""
+        return BlobEntry(self.names[row], self.etags[row], self.sizes[row], self.modified_at(row), self.tier_at(row))
+
+    def container_head(self, container, count):
+        """컨테이너의 앞쪽 count개 블랍을 이름순 (이름, ETag) 목록으로 반환합니다."""
+        start, end = self.container_range(container)
+        end = min(end, start + count)
+        return list(zip(self.names[start:end], self.etags[start:end]))
+
+    def diff_container(self, container, snapshot):
+        """저장된 컨테이너 구간과 새 스냅샷을 이름순으로 병합 비교해 BlobDiff를 반환합니다.
+
+        이전 목록을 별도의 스냅샷으로 들고 있지 않고 저장소 자체를 기준으로 비교합니다.
+        """
+        start, end = self.container_range(container)
+        new_names = sorted(snapshot.entries)
+        added, removed, changed = [], [], []
+        i, j = start, 0
+        while i < end or j < len(new_names):
+            if j >= len(new_names) or (i < end and self.names[i] < new_names[j]):
+                removed.append(self.entry_at(i))
+                i += 1
+            elif i >= end or new_names[j] < self.names[i]:
+                added.append(snapshot.entries[new_names[j]])
+                j += 1
+            else:
+                entry = snapshot.entries[new_names[j]]
+                if entry.etag != self.etags[i]:
+                    changed.append(entry)
+                i += 1
+                j += 1
+        return BlobDiff(added, removed, changed)
+
+    def diff_changes(self, container, events):
+        """변경 피드 이벤트(ChangeEvent)들을 순서대로 합쳐 저장소 기준의 BlobDiff로 바꿉니다.
+
+        같은 블랍의 이벤트는 마지막 상태만 반영하며, 이벤트에 없는 정보(계층, 크기)는 직전 상태의 값을 유지합니다.
+        직전 상태는 같은 묶음의 앞선 이벤트이고, 없으면 저장된 행입니다. 앞에서 삭제된 블랍은 유지할 값이 없습니다.
+        """
+        final = {}
+        for event in events:
+            entry = event.entry
+            if entry is not None:
+                if event.name in final:
+                    previous = final[event.name]  # 앞선 이벤트에서 삭제되었으면 None
+                else:
+                    row = self.find(container, event.name)
+                    previous = self.entry_at(row) if row >= 0 else None
+                if previous is not None:
+                    entry = entry._replace(size=previous.size if entry.size is None else entry.size,
+                                           tier=entry.tier or previous.tier)
+            final[event.name] = entry
+
+        added, removed, changed = [], [], []
+        for name in sorted(final):
+            entry = final[name]
+            row = self.find(container, name)
+            if entry is None:
+                if row >= 0:
+                    removed.append(self.entry_at(row))
+            elif row < 0:
+                added.append(entry)
+            elif entry.etag != self.etags[row]:
+                changed.append(entry)
+        return BlobDiff(added, removed, changed)
+
+    def removal_runs(self, container, names):
+        """삭제할 블랍 이름들을 연속된 행 구간 [(start, count), ...]으로 묶어 뒤쪽 구간부터 반환합니다."""
+        rows = sorted(row for row in (self.find(container, name) for name in names) if row >= 0)
+        return self._group_runs(rows)
+
+    def insertion_runs(self, container, entries):
+        """추가할 BlobEntry들을 삽입 위치별로 묶어 [(row, [entry, ...]), ...]를 뒤쪽 위치부터 반환합니다.
+
+        entries는 이름순으로 정렬되어 있어야 하며, 이미 있는 이름은 포함하지 않아야 합니다.
+        """
+        start, end = self.container_range(container)
+        runs = []
+        for entry in entries:
+            row = bisect.bisect_left(self.names, entry.name, start, end)
+            if runs and runs[-1][0] == row:
+                runs[-1][1].append(entry)
+            else:
+                runs.append((row, [entry]))
+        runs.reverse()
+        return runs
+
+    def remove_rows(self, row, count):
+        """row부터 count개 행을 제거합니다. 한 컨테이너 구간 안에 있어야 합니다."""
+        cid = self.container_col[row]
+        end = row + count
+        self._notify(cid, row, -count)
+        del self.container_col[row:end]
+        del self.names[row:end]
+        del self.etags[row:end]
+        del self.sizes[row:end]
+        del self.modified[row:end]
+        del self.tier_col[row:end]
+        self.counts[cid] -= count
+
+    def insert_rows(self, row, container, entries):
+        """row 위치에 컨테이너의 블랍 행들을 삽입합니다."""
+        cid = self.container_id(container)
+        count = len(entries)
+        self._notify(cid, row, count)
+        self.container_col[row:row] = array('I', [cid]) * count
+        self.names[row:row] = [entry.name for entry in entries]
+        self.etags[row:row] = [entry.etag for entry in entries]
+        self.sizes[row:row] = array('q', [entry.size or 0 for entry in entries])
+        self.modified[row:row] = array('d', [_timestamp(entry.last_modified) for entry in entries])
+        self.tier_col[row:row] = array('B', [self._tier_id(entry.tier) for entry in entries])
+        self.counts[cid] += count
+
+    def update_row(self, row, entry):
+        """기존 행의 ETag, 크기, 수정 시각, 계층을 갱신합니다."""
+        self.etags[row] = entry.etag
+        self.sizes[row] = entry.size or 0
+        self.modified[row] = _timestamp(entry.last_modified)
+        self.tier_col[row] = self._tier_id(entry.tier)
+
+    def apply_diff(self, container, diff):
+        """BlobDiff를 저장소에 그대로 반영합니다. (화면 알림이 필요 없는 경우에 사용)"""
+        for row, count in self.removal_runs(container, [entry.name for entry in diff.removed]):
+            self.remove_rows(row, count)
+        for row, entries in self.insertion_runs(container, diff.added):
+            self.insert_rows(row, container, entries)
+        for entry in diff.changed:
+            row = self.find(container, entry.name)
+            if row >= 0:
+                self.update_row(row, entry)
+
+    def _notify(self, cid, row, delta):
+        if self.listeners:
+            position = row - sum(self.counts[:cid])
+            for listener in self.listeners:
+                listener(cid, position, delta)
+
+    @staticmethod
+    def _group_runs(rows):
+        runs = []
+        for row in rows:
+            if runs and runs[-1][0] + runs[-1][1] == row:
+                runs[-1][1] += 1
+            else:
+                runs.append([row, 1])
+        runs.reverse()
+        return [tuple(run) for run in runs]
+
+
+def _timestamp(value):
+    """datetime을 UTC epoch 초로 변환합니다. 값이 없으면 0을 반환합니다."""
+    if value is None:
+        return 0.0
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
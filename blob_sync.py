@@ -0,0 +1,502 @@
+import logging
+import os
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from blob_copy import content_md5
+from blob_metrics import metrics
+from blob_transfer import MANIFEST_SUFFIX, PARTIAL_SUFFIX, TransferCancelled, file_md5
+
+SYNC_UP, SYNC_DOWN = 'up', 'down'  # 로컬 -> 컨테이너, 컨테이너 -> 로컬
+OP_LABELS = {'upload': "올리기", 'download': "받기", 'delete_remote': "원격 삭제", 'delete_local': "로컬 삭제"}
+MTIME_TOLERANCE = 2.0  # 수정 시각을 비교할 때 같은 것으로 보는 차이 (초, FAT 파일 시스템의 2초 단위 포함)
+_SKIP_SUFFIXES = (PARTIAL_SUFFIX, MANIFEST_SUFFIX, MANIFEST_SUFFIX + ".tmp")  # 받다 만 파일과 매니페스트
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS files (
+    path TEXT PRIMARY KEY,
+    size INTEGER NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    md5 BLOB NOT NULL
+) WITHOUT ROWID;
+"""
+
+
+class SyncFailed(Exception):
+    """폴더 동기화에서 일부 파일을 보내거나 받지 못했을 때 발생합니다. 다시 시도하면 남은 차이만 처리합니다."""
+
+
+class DownloadPathConflict(Exception):
+    """내려받을 로컬 경로가 저장 디렉토리 밖을 가리키거나 다른 블랍의 경로와 겹칠 때 발생합니다."""
+
+
+class LocalHashIndex:
+    """로컬 파일의 MD5를 (크기, 수정 시각)과 함께 SQLite 파일에 보관하는 해시 색인입니다.
+
+    크기와 수정 시각(ns)이 기록과 같으면 파일을 다시 읽지 않고 저장된 MD5를 씁니다. 새로 계산한 값은 모아 두었다가
+    flush()에서 한 트랜잭션으로 기록합니다.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pending = {}  # 절대 경로 -> (크기, 수정 시각, MD5) 또는 None(삭제)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        logging.debug(f"동기화 해시 색인 열기: {os.path.abspath(path)}")
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def load(self, root):
+        """root 디렉토리 아래 파일의 {절대 경로: (크기, 수정 시각, MD5)}를 한 번의 조회로 읽습니다."""
+        root = os.path.join(os.path.abspath(root), "")
+        with self._lock:
+            rows = self._conn.execute("SELECT path, size, mtime_ns, md5 FROM files WHERE path >= ? AND path < ?",
+                                      (root, root[:-1] + chr(ord(root[-1]) + 1))).fetchall()
+            cached = {path: (size, mtime_ns, bytes(md5)) for path, size, mtime_ns, md5 in rows}
+            for path, record in self._pending.items():
+                if path.startswith(root):
+                    if record is None:
+                        cached.pop(path, None)
+                    else:
+                        cached[path] = record
+        return cached
+
+    def md5(self, path, stat=None, cached=None):
+        """파일의 MD5 digest를 반환합니다. 크기와 수정 시각이 기록과 같으면 파일을 읽지 않습니다.
+
+        cached는 load()로 미리 읽은 dict이며, 없으면 색인에서 이 파일만 찾습니다.
+        """
+        path = os.path.abspath(path)
+        stat = stat or os.stat(path)
+        if cached is None:
+            cached = self._lookup(path)
+        record = cached.get(path)
+        if record is not None and record[0] == stat.st_size and record[1] == stat.st_mtime_ns:
+            metrics.inc('blobmoni_sync_hash_total', result='cached')
+            return record[2]
+        digest = file_md5(path)
+        metrics.inc('blobmoni_sync_hash_total', result='computed')
+        self.remember(path, digest, stat)
+        return digest
+
+    def remember(self, path, digest, stat=None):
+        """파일의 현재 (크기, 수정 시각)에 대한 MD5를 기록합니다."""
+        path = os.path.abspath(path)
+        stat = stat or os.stat(path)
+        with self._lock:
+            self._pending[path] = (stat.st_size, stat.st_mtime_ns, bytes(digest))
+
+    def forget(self, paths):
+        """지운 파일의 기록을 없앱니다."""
+        with self._lock:
+            for path in paths:
+                self._pending[os.path.abspath(path)] = None
+
+    def flush(self):
+        """모아 둔 기록을 한 트랜잭션으로 씁니다."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            if not pending:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany("DELETE FROM files WHERE path = ?",
+                                           [(path,) for path, record in pending.items() if record is None])
+                    self._conn.executemany("INSERT OR REPLACE INTO files VALUES (?, ?, ?, ?)",
+                                           [(path,) + record for path, record in pending.items() if record is not None])
+            except sqlite3.Error as e:
+                logging.error(f"동기화 해시 색인 기록 실패: {e}")
+
+    def _lookup(self, path):
+        with self._lock:
+            if path in self._pending:
+                record = self._pending[path]
+                return {path: record} if record is not None else {}
+            row = self._conn.execute("SELECT size, mtime_ns, md5 FROM files WHERE path = ?", (path,)).fetchone()
+        return {path: (row[0], row[1], bytes(row[2]))} if row else {}
+
+
+class SyncAction:
+    """동기화 계획의 항목 하나입니다. op는 OP_LABELS의 키이며, remote는 원격 블랍 속성(없으면 None)입니다."""
+
+    __slots__ = ('op', 'relative', 'local_path', 'blob_name', 'size', 'reason', 'remote')
+
+    def __init__(self, op, relative, local_path, blob_name, size, reason, remote=None):
+        self.op = op
+        self.relative = relative
+        self.local_path = local_path
+        self.blob_name = blob_name
+        self.size = size
+        self.reason = reason
+        self.remote = remote
+
+    def __repr__(self):
+        return f"SyncAction({self.op}, {self.relative!r}, {self.reason})"
+
+
+class SyncPlan:
+    """로컬 디렉토리와 container/prefix를 비교한 결과입니다. 실행하지 않고 그대로 보여주면 dry-run 보고서가 됩니다."""
+
+    def __init__(self, direction, local_dir, container, prefix, mirror):
+        self.direction = direction
+        self.local_dir = local_dir
+        self.container = container
+        self.prefix = prefix
+        self.mirror = mirror
+        self.actions = []
+        self.unchanged = 0
+        self.skipped = []  # [(상대 경로, 사유), ...]
+        self.hashed = 0  # 계획을 세우면서 새로 MD5를 계산한 파일 수
+
+    @property
+    def transfer_bytes(self):
+        return sum(action.size for action in self.actions if action.op in ('upload', 'download'))
+
+    def counts(self):
+        """{op: (항목 수, 바이트 수)}를 반환합니다."""
+        counts = {}
+        for action in self.actions:
+            count, size = counts.get(action.op, (0, 0))
+            counts[action.op] = (count + 1, size + (action.size or 0))
+        return counts
+
+    def summary(self):
+        from blob_inventory import format_size
+
+        counts = self.counts()
+        parts = []
+        for op in ('upload', 'download', 'delete_remote', 'delete_local'):
+            if op in counts:
+                count, size = counts[op]
+                parts.append(f"{OP_LABELS[op]} {count:,}개" + (f" ({format_size(size)})" if op in ('upload', 'download')
+                                                              else ""))
+        parts.append(f"변경 없음 {self.unchanged:,}개")
+        if self.skipped:
+            parts.append(f"건너뜀 {len(self.skipped):,}개")
+        return ", ".join(parts)
+
+
+def blob_dir(prefix):
+    """prefix를 'a/b/' 형태의 디렉토리 prefix로 바꿉니다. 비어 있으면 ''입니다."""
+    prefix = (prefix or "").strip('/')
+    return prefix + '/' if prefix else ""
+
+
+def safe_relative(relative):
+    """블랍의 상대 이름이 로컬 디렉토리 밖을 가리키지 않는 파일 경로면 True를 반환합니다."""
+    parts = relative.split('/')
+    return bool(relative) and not os.path.isabs(relative) and all(part not in ("", ".", "..") for part in parts)
+
+
+def path_key(path):
+    """같은 로컬 파일을 가리키는 경로를 비교할 수 있도록 절대 경로로 정규화합니다."""
+    return os.path.normcase(os.path.abspath(path))
+
+
+def inside_directory(path, root):
+    """path가 root 아래를 가리키면 True입니다. Windows에서 '\\'나 드라이브 이름이 들어간 블랍 이름도 걸러냅니다."""
+    try:
+        return os.path.relpath(path, root).split(os.sep)[0] != os.pardir
+    except ValueError:  # 다른 드라이브
+        return False
+
+
+def download_paths(keys, save_directory):
+    """(컨테이너, 블랍 이름) 목록의 로컬 저장 경로를 save_directory 아래에 정합니다.
+
+    블랍 이름의 폴더 구조를 그대로 두므로 'x/log.txt'와 'y/log.txt'는 서로 다른 파일이 됩니다. 각 항목은 경로
+    문자열이거나, 디렉토리 밖을 가리키는 이름 또는 다른 컨테이너의 같은 이름처럼 앞의 블랍과 경로가 겹칠 때의
+    DownloadPathConflict입니다.
+    """
+    root = os.path.abspath(save_directory)
+    taken = {}  # 정규화한 경로 -> 먼저 차지한 블랍
+    targets = []
+    for container, blob_name in keys:
+        path = os.path.join(root, *blob_name.split('/'))
+        if not safe_relative(blob_name) or not inside_directory(path, root):
+            targets.append(DownloadPathConflict(f"로컬 파일 이름으로 쓸 수 없는 블랍 이름: {container}/{blob_name}"))
+            continue
+        key = path_key(path)
+        if key in taken:
+            targets.append(DownloadPathConflict(f"같은 로컬 경로에 먼저 받는 블랍이 있습니다: {taken[key]} ({path})"))
+            continue
+        taken[key] = f"{container}/{blob_name}"
+        targets.append(path)
+    return targets
+
+
+class FolderSync:
+    """로컬 디렉토리와 container/prefix를 한 방향으로 맞추는 증분 동기화입니다.
+
+    plan()은 로컬 파일 목록과 원격 목록을 비교해 보낼(받을) 파일과 지울 파일을 고릅니다. 크기가 다르면 바로
+    전송 대상이고, 크기가 같으면 원격 Content-MD5와 로컬 MD5를 비교합니다. 로컬 MD5는 LocalHashIndex에 보관되어
+    바뀌지 않은 파일은 다시 읽지 않으며, 원격에 MD5가 없으면 수정 시각으로 판단합니다. run()은 계획의 전송을
+    max_concurrency개씩 동시에 실행하고, mirror면 반대쪽에만 있는 파일을 지웁니다.
+    """
+
+    def __init__(self, uploader, downloader, batch_deleter, index_path, max_concurrency=4, valid_name=None):
+        self.uploader = uploader
+        self.downloader = downloader
+        self.batch_deleter = batch_deleter
+        self.index_path = index_path
+        self.max_concurrency = max(1, max_concurrency)
+        self.valid_name = valid_name
+        self._index = None
+        self._index_lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='blob-sync')
+
+    @property
+    def index(self):
+        """해시 색인은 처음 동기화할 때 엽니다."""
+        with self._index_lock:
+            if self._index is None:
+                self._index = LocalHashIndex(self.index_path)
+            return self._index
+
+    def close(self):
+        with self._index_lock:
+            if self._index is not None:
+                self._index.close()
+                self._index = None
+
+    def plan(self, account, direction, local_dir, container, prefix="", mirror=False, cancel_event=None):
+        """로컬 디렉토리와 container/prefix를 비교해 SyncPlan을 만듭니다. 파일은 바꾸지 않습니다."""
+        if direction not in (SYNC_UP, SYNC_DOWN):
+            raise ValueError(f"알 수 없는 동기화 방향입니다: {direction}")
+        local_dir = os.path.abspath(local_dir)
+        if direction == SYNC_UP and not os.path.isdir(local_dir):
+            raise ValueError(f"로컬 디렉토리가 없습니다: {local_dir}")
+        plan = SyncPlan(direction, local_dir, container, blob_dir(prefix), mirror)
+        local = self._local_files(local_dir, cancel_event) if os.path.isdir(local_dir) else {}
+        remote = self._remote_blobs(account, container, plan.prefix, cancel_event)
+        cached = self.index.load(local_dir)
+        hash_needed = []  # 크기가 같고 원격 MD5가 있어 로컬 MD5와 비교해야 하는 (상대 경로, 로컬 경로, stat, 블랍)
+
+        sources, targets = (local, remote) if direction == SYNC_UP else (remote, local)
+        for relative in sorted(sources):
+            if cancel_event is not None and cancel_event.is_set():
+                raise TransferCancelled("동기화 계획 취소")
+            local_path = os.path.join(local_dir, *relative.split('/'))
+            blob_name = plan.prefix + relative
+            if direction == SYNC_UP and self.valid_name is not None and not self.valid_name(blob_name):
+                plan.skipped.append((relative, "유효하지 않은 Blob 이름"))
+                continue
+            if direction == SYNC_DOWN and not safe_relative(relative):
+                plan.skipped.append((relative, "로컬 파일 이름으로 쓸 수 없는 블랍 이름"))
+                continue
+            stat, blob = local.get(relative), remote.get(relative)
+            op = 'upload' if direction == SYNC_UP else 'download'
+            size = stat.st_size if direction == SYNC_UP else blob.size
+            if relative not in targets:
+                plan.actions.append(SyncAction(op, relative, local_path, blob_name, size, "새 파일", blob))
+                continue
+            reason = self._quick_difference(direction, stat, blob)
+            if reason == 'md5':
+                hash_needed.append((relative, local_path, stat, blob))
+            elif reason:
+                plan.actions.append(SyncAction(op, relative, local_path, blob_name, size, reason, blob))
+            else:
+                plan.unchanged += 1
+
+        # 로컬 MD5가 필요한 파일은 색인에 없는 것만 읽으며, 여러 파일을 동시에 계산합니다.
+        plan.hashed = sum(1 for _, local_path, stat, _ in hash_needed
+                          if not _index_matches(cached.get(local_path), stat))
+        digests = self._executor.map(lambda item: self.index.md5(item[1], item[2], cached), hash_needed)
+        for (relative, local_path, stat, blob), digest in zip(hash_needed, digests):
+            if digest == content_md5(blob):
+                plan.unchanged += 1
+            else:
+                op = 'upload' if direction == SYNC_UP else 'download'
+                plan.actions.append(SyncAction(op, relative, local_path, plan.prefix + relative,
+                                               stat.st_size if direction == SYNC_UP else blob.size, "MD5 다름", blob))
+
+        if mirror:
+            for relative in sorted(set(targets) - set(sources)):
+                local_path = os.path.join(local_dir, *relative.split('/'))
+                if direction == SYNC_UP:
+                    plan.actions.append(SyncAction('delete_remote', relative, local_path, plan.prefix + relative,
+                                                   remote[relative].size, "로컬에 없음", remote[relative]))
+                else:
+                    plan.actions.append(SyncAction('delete_local', relative, local_path, plan.prefix + relative,
+                                                   local[relative].st_size, "원격에 없음"))
+
+        # 지워진 로컬 파일의 기록은 색인에서 뺍니다.
+        live = {os.path.join(local_dir, *relative.split('/')) for relative in local}
+        self.index.forget(path for path in cached if path not in live)
+        self.index.flush()
+        for op, (count, _) in plan.counts().items():
+            metrics.inc('blobmoni_sync_files_total', count, operation=f"planned_{op}")
+        logging.info(f"동기화 계획 ({'올리기' if direction == SYNC_UP else '받기'}"
+                     f"{', 미러' if mirror else ''}): {local_dir} <-> {account['account_name']}/{container}/"
+                     f"{plan.prefix} - {plan.summary()} (MD5 계산 {plan.hashed}개)")
+        return plan
+
+    @staticmethod
+    def _quick_difference(direction, stat, blob):
+        """파일을 읽지 않고 알 수 있는 차이를 반환합니다. 같으면 None, MD5를 비교해야 하면 'md5'입니다."""
+        if stat.st_size != blob.size:
+            return "크기 다름"
+        if content_md5(blob) is not None:
+            return 'md5'
+        remote_time = blob.last_modified.timestamp() if blob.last_modified else None
+        if remote_time is None:
+            return None
+        # 원격 MD5가 없으면 수정 시각으로 판단합니다. 받은 파일은 수정 시각을 블랍과 같게 맞춰 둡니다.
+        if direction == SYNC_UP and stat.st_mtime > remote_time + MTIME_TOLERANCE:
+            return "로컬이 더 최근"
+        if direction == SYNC_DOWN and abs(stat.st_mtime - remote_time) > MTIME_TOLERANCE:
+            return "수정 시각 다름"
+        return None
+
+    @staticmethod
+    def _local_files(local_dir, cancel_event=None):
+        """local_dir 아래 파일의 {'/'로 구분한 상대 경로: stat}을 반환합니다. 받다 만 파일은 제외합니다."""
+        files = {}
+        for directory, _, names in os.walk(local_dir):
+            if cancel_event is not None and cancel_event.is_set():
+                raise TransferCancelled("동기화 계획 취소")
+            for name in names:
+                if name.endswith(_SKIP_SUFFIXES):
+                    continue
+                path = os.path.join(directory, name)
+                try:
+                    stat = os.stat(path)
+                except OSError as e:
+                    logging.warning(f"파일 정보를 읽을 수 없어 건너뜁니다: {path}, 오류: {e}")
+                    continue
+                files[os.path.relpath(path, local_dir).replace(os.sep, '/')] = stat
+        return files
+
+    @staticmethod
+    def _remote_blobs(account, container, prefix, cancel_event=None):
+        """container/prefix 아래 블랍의 {prefix 뒤의 상대 이름: 블랍 속성}을 반환합니다. 디렉토리 표시 블랍은 제외합니다."""
+        blobs = {}
+        container_client = account['client'].get_container_client(container)
+        for blob in container_client.list_blobs(name_starts_with=prefix or None):
+            if cancel_event is not None and cancel_event.is_set():
+                raise TransferCancelled("동기화 계획 취소")
+            if blob.name.endswith('/'):
+                continue
+            blobs[blob.name[len(prefix):]] = blob
+        return blobs
+
+    def run(self, account, plan, progress_callback=None, cancel_event=None, throttle=None):
+        """계획의 전송을 동시에 실행하고 지울 파일을 지웁니다. (처리한 SyncAction 목록, [(SyncAction, 사유), ...])를 반환합니다.
+
+        progress_callback(보낸 바이트, 전체 바이트)는 작업 스레드에서 호출됩니다. 취소되면 남은 항목은 실행하지 않고
+        그때까지의 결과를 반환합니다.
+        """
+        transfers = [action for action in plan.actions if action.op in ('upload', 'download')]
+        total = sum(action.size for action in transfers)
+        container_client = account['client'].get_container_client(plan.container)
+        lock = threading.Lock()
+        state = {'done': 0}
+        finished, failures = [], []
+        if progress_callback:
+            progress_callback(0, total)
+
+        def transfer(action):
+            last = [0]
+
+            def on_progress(done, _):
+                with lock:
+                    state['done'] += done - last[0]
+                    last[0] = done
+                    sent = state['done']
+                if progress_callback:
+                    progress_callback(sent, total)
+
+            if cancel_event is not None and cancel_event.is_set():
+                return
+            try:
+                blob_client = container_client.get_blob_client(action.blob_name)
+                if action.op == 'upload':
+                    # 올리면서 기록할 MD5는 색인의 값을 써서 파일을 한 번 더 읽지 않습니다.
+                    digest = self.index.md5(action.local_path)
+                    self.uploader.upload(blob_client, action.local_path, on_progress, cancel_event, throttle,
+                                         content_md5=digest)
+                else:
+                    self._download(blob_client, action, on_progress, cancel_event, throttle)
+            except TransferCancelled:
+                return
+            except Exception as e:
+                logging.error(f"동기화 {OP_LABELS[action.op]} 실패: {action.relative}, 이유: {e}")
+                with lock:
+                    failures.append((action, str(e)))
+                return
+            metrics.inc('blobmoni_sync_files_total', operation=action.op)
+            with lock:
+                finished.append(action)
+
+        try:
+            futures = [self._executor.submit(transfer, action) for action in transfers]
+            for future in futures:
+                future.result()
+        finally:
+            self.index.flush()
+        if cancel_event is not None and cancel_event.is_set():
+            return finished, failures
+
+        removals = [action for action in plan.actions if action.op == 'delete_remote']
+        if removals:
+            by_key = {(plan.container, action.blob_name): action for action in removals}
+            deleted, failed = self.batch_deleter.delete(account, list(by_key), cancel_event=cancel_event)
+            finished.extend(by_key[key] for key in deleted)
+            failures.extend((by_key[tuple(key)], reason) for key, reason in failed)
+            metrics.inc('blobmoni_sync_files_total', len(deleted), operation='delete_remote')
+        removals = [action for action in plan.actions if action.op == 'delete_local']
+        if removals:
+            for action in removals:
+                try:
+                    os.remove(action.local_path)
+                    finished.append(action)
+                    metrics.inc('blobmoni_sync_files_total', operation='delete_local')
+                except FileNotFoundError:
+                    finished.append(action)
+                except OSError as e:
+                    failures.append((action, str(e)))
+            self.index.forget(action.local_path for action in removals)
+            self.index.flush()
+            prune_empty_dirs(plan.local_dir, [action.local_path for action in removals])
+        logging.info(f"동기화 완료: {plan.local_dir} <-> {account['account_name']}/{plan.container}/{plan.prefix} "
+                     f"({len(finished)}개 처리, {len(failures)}개 실패)")
+        return finished, failures
+
+    def _download(self, blob_client, action, progress_callback, cancel_event, throttle):
+        """블랍을 받은 뒤 원격 MD5가 있으면 확인해 색인에 기록하고, 수정 시각을 블랍과 같게 맞춥니다."""
+        directory = os.path.dirname(action.local_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self.downloader.download(blob_client, action.local_path, progress_callback, cancel_event, throttle)
+        expected = content_md5(action.remote)
+        if expected is not None:
+            # 방금 쓴 파일이라 대부분 페이지 캐시에서 읽습니다.
+            if file_md5(action.local_path) != expected:
+                raise SyncFailed(f"받은 파일의 MD5가 블랍과 다릅니다: {action.relative}")
+        if action.remote.last_modified is not None:
+            modified = action.remote.last_modified.timestamp()
+            os.utime(action.local_path, (modified, modified))
+        if expected is not None:
+            self.index.remember(action.local_path, expected)
+
+
+def _index_matches(record, stat):
+    return record is not None and record[0] == stat.st_size and record[1] == stat.st_mtime_ns
+
+
+def prune_empty_dirs(root, paths):
+    """지운 파일들의 상위 디렉토리 중 비어 있는 것을 root 바로 아래까지 지웁니다."""
+    root = os.path.abspath(root)
+    for directory in sorted({os.path.dirname(os.path.abspath(path)) for path in paths}, key=len, reverse=True):
+        while directory != root and directory.startswith(os.path.join(root, "")):
+            try:
+                os.rmdir(directory)
+            except OSError:
+                break  # 비어 있지 않거나 이미 없습니다.
+            directory = os.path.dirname(directory)
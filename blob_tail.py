@@ -0,0 +1,94 @@
+import codecs
+import logging
+from blob_metrics import count_transfer_bytes
+
+
+class BlobTail:
+    """블랍 전체를 받지 않고 처음이나 끝의 일부만 구간(range) 요청으로 읽는 미리 보기/따라가기 엔진입니다.
+
+    tail()로 끝부분을 읽은 뒤 poll()을 부르면 속성을 조회해 마지막으로 읽은 위치(offset) 뒤에 붙은 구간만 받습니다.
+    append 블랍이나 계속 늘어나는 로그 블랍용이며, 받은 바이트는 증분 디코더로 풀어 여러 바이트 문자가 구간
+    경계에서 잘려도 깨지지 않습니다. 한 번에 받는 양은 max_fetch 바이트로 제한하고, 그보다 많이 늘었으면 앞부분은
+    건너뜁니다. 블랍이 작아지거나 다시 만들어지면(생성 시각이 바뀌면) 끝부분부터 다시 읽습니다.
+    """
+
+    def __init__(self, blob_client, encoding='utf-8', max_fetch=1024 * 1024):
+        self.blob_client = blob_client
+        self.encoding = encoding
+        self.max_fetch = max(1, max_fetch)
+        self.offset = 0  # 다음에 읽을 위치
+        self.size = None  # 마지막으로 확인한 블랍 크기
+        self.blob_type = None
+        self.skipped = 0  # 마지막 poll()에서 max_fetch를 넘어 건너뛴 바이트 수
+        self.restarted = False  # 마지막 poll()에서 블랍이 바뀌어 끝부분부터 다시 읽었는지
+        self._created = None
+        self._decoder = None
+        codecs.lookup(encoding)  # 알 수 없는 인코딩이면 여기서 LookupError
+
+    def head(self, length):
+        """처음 length 바이트를 읽어 텍스트로 반환합니다. 이어서 poll()하면 그 뒤부터 받습니다."""
+        props = self._properties()
+        self._reset_decoder()
+        data = self._read(0, min(length, props.size))
+        self.offset = len(data)
+        return self._decode(data)
+
+    def tail(self, length):
+        """마지막 length 바이트를 읽어 텍스트로 반환합니다. 중간부터 읽었으면 잘린 첫 줄은 버립니다."""
+        props = self._properties()
+        return self._read_from(max(0, props.size - length), props.size)
+
+    def poll(self):
+        """블랍이 늘었으면 늘어난 구간만 받아 텍스트로 반환합니다. 바뀐 것이 없으면 빈 문자열입니다."""
+        previous = self._created
+        props = self._properties()
+        self.skipped = 0
+        self.restarted = (props.size < self.offset
+                          or (previous is not None and self._created is not None and self._created != previous))
+        if self.restarted:
+            logging.info(f"블랍이 작아졌거나 다시 만들어져 끝부분부터 다시 읽습니다: {self.blob_client.blob_name}")
+            return self._read_from(max(0, props.size - self.max_fetch), props.size)
+        if props.size == self.offset:
+            return ""
+        if props.size - self.offset > self.max_fetch:
+            self.skipped = props.size - self.max_fetch - self.offset
+            logging.warning(f"따라가기: {self.blob_client.blob_name}이(가) 한 번에 너무 많이 늘어 "
+                            f"{self.skipped:,} bytes를 건너뜁니다.")
+            return self._read_from(props.size - self.max_fetch, props.size)
+        data = self._read(self.offset, props.size - self.offset)
+        self.offset += len(data)
+        return self._decode(data)
+
+    def _read_from(self, start, end):
+        """start부터 end까지 새로 읽습니다. 디코더를 초기화하며, 중간부터 읽으면 잘린 첫 줄을 버립니다."""
+        self._reset_decoder()
+        # 바로 앞 1바이트도 함께 받아, 구간이 줄 경계에서 시작하면 첫 줄을 버리지 않습니다.
+        begin = max(0, start - 1)
+        data = self._read(begin, end - begin)
+        self.offset = begin + len(data)
+        if begin < start:
+            newline = data.find(b'\n')
+            data = data[newline + 1:] if newline != -1 else data[1:]
+        return self._decode(data)
+
+    def _properties(self):
+        props = self.blob_client.get_blob_properties()
+        self.size = props.size
+        blob_type = getattr(props, 'blob_type', None)
+        self.blob_type = getattr(blob_type, 'value', blob_type)  # 'AppendBlob', 'BlockBlob', 'PageBlob'
+        self._created = getattr(props, 'creation_time', None)
+        return props
+
+    def _read(self, offset, length):
+        if length <= 0:
+            return b""
+        data = self.blob_client.download_blob(offset=offset, length=length).readall()
+        count_transfer_bytes('download', len(data))
+        return data
+
+    def _reset_decoder(self):
+        self._decoder = codecs.getincrementaldecoder(self.encoding)(errors='replace')
+
+    def _decode(self, data):
+        # 바이너리 블랍의 NUL 문자는 화면에 쓸 수 없어 대체 문자로 바꿉니다.
+        return self._decoder.decode(data).replace('\x00', '\ufffd')
@@ -0,0 +1,285 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from blob_metrics import count_transfer_bytes
+
+MANIFEST_SUFFIX = ".blobmoni-part.json"
+PARTIAL_SUFFIX = ".blobmoni-part"
+MAX_BLOCKS = 50000  # 블록 블랍 하나에 커밋할 수 있는 최대 블록 수
+DESTINATION_WAIT_SECONDS = 0.2  # 같은 경로를 받는 다른 다운로드를 기다리며 취소를 확인하는 간격
+
+_destination_locks = {}  # 정규화한 대상 경로 -> [Lock, 사용 중인 다운로드 수]
+_destination_guard = threading.Lock()
+
+
+class TransferCancelled(Exception):
+    """사용자가 전송을 취소했을 때 발생합니다. 이어서 전송할 수 있도록 진행 상태는 남겨 둡니다."""
+
+
+class BlobDownloader:
+    """블랍을 일정 크기의 구간(range)으로 나누어 동시에 받아 디스크에 바로 쓰는 다운로드 엔진입니다.
+
+    받는 동안에는 '<대상>.blobmoni-part' 파일에 쓰고, 완료된 구간 번호를 매니페스트
+    '<대상>.blobmoni-part.json'에 기록합니다. 같은 ETag의 블랍을 다시 받으면 완료된 구간은 건너뜁니다.
+    같은 대상 경로로 받는 다운로드는 한 번에 하나씩 실행되어 받다 만 파일과 매니페스트를 함께 쓰지 않습니다.
+    """
+
+    def __init__(self, chunk_size=8 * 1024 * 1024, max_concurrency=4):
+        self.chunk_size = chunk_size
+        self.max_concurrency = max(1, max_concurrency)
+
+    def download(self, blob_client, dest_path, progress_callback=None, cancel_event=None, throttle=None):
+        """blob_client의 블랍을 dest_path로 내려받습니다.
+
+        progress_callback(받은 바이트, 전체 바이트)는 작업 스레드에서 호출됩니다. throttle(바이트 수)을 주면
+        받은 조각마다 호출해 속도 제한에 맞을 때까지 기다립니다. 같은 대상 경로를 받는 다른 다운로드가 있으면
+        끝날 때까지 기다립니다.
+        """
+        key = os.path.normcase(os.path.abspath(dest_path))
+        with _destination_guard:
+            entry = _destination_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            while not entry[0].acquire(timeout=DESTINATION_WAIT_SECONDS):
+                if cancel_event is not None and cancel_event.is_set():
+                    raise TransferCancelled(blob_client.blob_name)
+            try:
+                return self._download(blob_client, dest_path, progress_callback, cancel_event, throttle)
+            finally:
+                entry[0].release()
+        finally:
+            with _destination_guard:
+                entry[1] -= 1
+                if not entry[1]:
+                    del _destination_locks[key]
+
+    def _download(self, blob_client, dest_path, progress_callback, cancel_event, throttle):
+        from azure.core import MatchConditions
+
+        props = blob_client.get_blob_properties()
+        total = props.size
+        etag = props.etag
+        part_path = dest_path + PARTIAL_SUFFIX
+        manifest_path = dest_path + MANIFEST_SUFFIX
+        chunk_count = max(1, -(-total // self.chunk_size))
+
+        done_chunks = load_manifest(manifest_path, part_path, etag, total, self.chunk_size)
+        if done_chunks:
+            logging.info(f"다운로드 이어받기: {blob_client.blob_name} ({len(done_chunks)}/{chunk_count} 구간 완료)")
+        else:
+            with open(part_path, "wb") as f:
+                f.truncate(total)
+
+        state = {'received': sum(chunk_length(i, total, self.chunk_size) for i in done_chunks)}
+        lock = threading.Lock()
+        if progress_callback:
+            progress_callback(state['received'], total)
+
+        def fetch_chunk(index):
+            offset = index * self.chunk_size
+            length = chunk_length(index, total, self.chunk_size)
+            if length == 0:
+                return
+            stream = blob_client.download_blob(offset=offset, length=length, etag=etag,
+                                               match_condition=MatchConditions.IfNotModified)
+            position = offset
+            for piece in stream.chunks():
+                if cancel_event is not None and cancel_event.is_set():
+                    raise TransferCancelled(blob_client.blob_name)
+                with lock:
+                    out.seek(position)
+                    out.write(piece)
+                    state['received'] += len(piece)
+                    received = state['received']
+                count_transfer_bytes('download', len(piece))
+                position += len(piece)
+                if progress_callback:
+                    progress_callback(received, total)
+                if throttle:
+                    throttle(len(piece))
+            with lock:
+                out.flush()
+                done_chunks.add(index)
+                save_manifest(manifest_path, etag, total, self.chunk_size, done_chunks)
+
+        pending = [i for i in range(chunk_count) if i not in done_chunks]
+        with open(part_path, "r+b") as out:
+            if len(pending) <= 1 or self.max_concurrency == 1:
+                for index in pending:
+                    fetch_chunk(index)
+            else:
+                with ThreadPoolExecutor(max_workers=min(self.max_concurrency, len(pending)),
+                                        thread_name_prefix='blob-range') as pool:
+                    futures = [pool.submit(fetch_chunk, index) for index in pending]
+                    try:
+                        for future in futures:
+                            future.result()
+                    except BaseException:
+                        for future in futures:
+                            future.cancel()
+                        raise
+
+        os.replace(part_path, dest_path)
+        if os.path.exists(manifest_path):
+            os.remove(manifest_path)
+        logging.info(f"다운로드 성공: {blob_client.blob_name} -> {dest_path} ({total} bytes)")
+        return dest_path
+
+
+class BlobUploader:
+    """파일을 블록으로 나누어 stage_block으로 동시에 올린 뒤 commit_block_list로 확정하는 업로드 엔진입니다.
+
+    블록 id는 파일 크기, 수정 시각, 블록 크기로 정해지므로 같은 파일을 다시 올리면 서버에 이미 올라가 있는
+    미확정(uncommitted) 블록은 건너뜁니다. 블록마다 Content-MD5를 보내 서버에서 검증하며,
+    커밋할 때 파일 전체의 MD5를 블랍 속성에 기록합니다.
+    """
+
+    def __init__(self, block_size=8 * 1024 * 1024, max_concurrency=4):
+        self.block_size = block_size
+        self.max_concurrency = max(1, max_concurrency)
+
+    def upload(self, blob_client, file_path, progress_callback=None, cancel_event=None, throttle=None,
+               content_md5=None):
+        """file_path를 blob_client 위치에 덮어써 올립니다.
+
+        progress_callback(올린 바이트, 전체 바이트)는 작업 스레드에서 호출됩니다. throttle(바이트 수)을 주면
+        블록을 보내기 전에 호출해 속도 제한에 맞을 때까지 기다립니다. content_md5에 이미 계산한 파일 MD5를 주면
+        커밋할 때 파일을 다시 읽지 않습니다.
+        """
+        from azure.storage.blob import BlobBlock, ContentSettings
+
+        total, block_size, block_ids = plan_blocks(file_path, self.block_size)
+        block_count = len(block_ids)
+
+        if block_count == 1:
+            # 블록 하나로 충분한 작은 파일은 한 번의 요청으로 올립니다.
+            with open(file_path, "rb") as f:
+                data = f.read()
+            if throttle:
+                throttle(total)
+            if cancel_event is not None and cancel_event.is_set():
+                raise TransferCancelled(blob_client.blob_name)
+            blob_client.upload_blob(data, overwrite=True, validate_content=True,
+                                    content_settings=ContentSettings(content_md5=bytearray(hashlib.md5(data).digest())))
+            count_transfer_bytes('upload', total)
+            if progress_callback:
+                progress_callback(total, total)
+            logging.info(f"파일 업로드 성공: {blob_client.blob_name} ({total} bytes)")
+            return blob_client.blob_name
+
+        staged = self._staged_blocks(blob_client)
+        skip = {index for index, block_id in enumerate(block_ids)
+                if staged.get(block_id) == chunk_length(index, total, block_size)}
+        if skip:
+            logging.info(f"업로드 이어올리기: {blob_client.blob_name} ({len(skip)}/{block_count} 블록 완료)")
+
+        lock = threading.Lock()
+        state = {'sent': sum(chunk_length(i, total, block_size) for i in skip)}
+        if progress_callback:
+            progress_callback(state['sent'], total)
+
+        def stage(index):
+            if cancel_event is not None and cancel_event.is_set():
+                raise TransferCancelled(blob_client.blob_name)
+            length = chunk_length(index, total, block_size)
+            with open(file_path, "rb") as f:
+                f.seek(index * block_size)
+                data = f.read(length)
+            if throttle:
+                throttle(length)
+            blob_client.stage_block(block_ids[index], data, length=length, validate_content=True)
+            count_transfer_bytes('upload', length)
+            with lock:
+                state['sent'] += length
+                sent = state['sent']
+            if progress_callback:
+                progress_callback(sent, total)
+
+        pending = [index for index in range(block_count) if index not in skip]
+        with ThreadPoolExecutor(max_workers=min(self.max_concurrency, max(1, len(pending))),
+                                thread_name_prefix='blob-block') as pool:
+            futures = [pool.submit(stage, index) for index in pending]
+            try:
+                for future in futures:
+                    future.result()
+            except BaseException:
+                for future in futures:
+                    future.cancel()
+                raise
+
+        if cancel_event is not None and cancel_event.is_set():
+            raise TransferCancelled(blob_client.blob_name)
+        blob_client.commit_block_list([BlobBlock(block_id=block_id) for block_id in block_ids],
+                                      content_settings=ContentSettings(
+                                          content_md5=bytearray(content_md5 or file_md5(file_path))))
+        logging.info(f"파일 업로드 성공: {blob_client.blob_name} ({total} bytes, {block_count} 블록)")
+        return blob_client.blob_name
+
+    @staticmethod
+    def _staged_blocks(blob_client):
+        """서버에 올라가 있는 미확정 블록의 {id: 크기}를 반환합니다. 블랍이 없으면 빈 dict를 반환합니다."""
+        try:
+            _, uncommitted = blob_client.get_block_list('uncommitted')
+        except Exception:
+            return {}
+        return {block.id: block.size for block in uncommitted}
+
+
+def file_md5(file_path, chunk_size=4 * 1024 * 1024):
+    """파일 전체의 MD5 digest(bytes)를 계산합니다."""
+    digest = hashlib.md5()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.digest()
+
+
+def chunk_length(index, total, chunk_size):
+    """index번째 구간(블록)의 길이를 반환합니다."""
+    return max(0, min(chunk_size, total - index * chunk_size))
+
+
+def plan_blocks(file_path, block_size):
+    """업로드할 파일의 (전체 크기, 블록 크기, 블록 id 목록)을 계산합니다.
+
+    블록 수가 MAX_BLOCKS를 넘지 않도록 필요하면 블록 크기를 1MB 단위로 키웁니다. 같은 파일(크기, 수정 시각)과
+    블록 크기라면 항상 같은 id가 만들어지므로 이어올리기에 사용할 수 있습니다. id 길이는 모두 같아야 합니다.
+    """
+    stat = os.stat(file_path)
+    total = stat.st_size
+    if total > block_size * MAX_BLOCKS:
+        mb = 1024 * 1024
+        needed = -(-total // MAX_BLOCKS)
+        block_size = -(-needed // mb) * mb
+    block_count = max(1, -(-total // block_size))
+    id_prefix = hashlib.sha1(f"{total}:{stat.st_mtime_ns}:{block_size}".encode()).hexdigest()[:16]
+    return total, block_size, [f"{id_prefix}-{index:06d}" for index in range(block_count)]
+
+
+def load_manifest(manifest_path, part_path, etag, total, chunk_size):
+    """이어받을 수 있는 다운로드 매니페스트면 완료된 구간 번호 집합을, 아니면 빈 집합을 반환합니다."""
+    if not (os.path.exists(manifest_path) and os.path.exists(part_path)):
+        return set()
+    try:
+        with open(manifest_path, encoding="utf-8") as mf:
+            data = json.load(mf)
+    except (OSError, ValueError) as e:
+        logging.warning(f"다운로드 매니페스트를 읽을 수 없어 처음부터 받습니다: {manifest_path}, 오류: {e}")
+        return set()
+    if (data.get('etag') != etag or data.get('size') != total or data.get('chunk_size') != chunk_size
+            or os.path.getsize(part_path) != total):
+        logging.info(f"블랍이 변경되었거나 구간 크기가 달라 처음부터 받습니다: {manifest_path}")
+        return set()
+    return set(data.get('done', []))
+
+
+def save_manifest(manifest_path, etag, total, chunk_size, done_chunks):
+    """완료된 구간 번호를 매니페스트에 원자적으로 기록합니다."""
+    data = {'etag': etag, 'size': total, 'chunk_size': chunk_size, 'done': sorted(done_chunks)}
+    tmp_path = manifest_path + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as mf:
+        json.dump(data, mf)
+    os.replace(tmp_path, manifest_path)
@@ -0,0 +1,321 @@
+import logging
+import os
+import time
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, pyqtSignal
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import QApplication, QStyle
+from blob_model import BLOB_KEYS_MIME, blob_mime_data
+
+
+class _TreeNode:
+    """트리의 노드 하나입니다. 컨테이너/prefix 노드는 펼칠 때 자식을 한 페이지씩 불러옵니다."""
+
+    ROOT, CONTAINER, PREFIX, BLOB, MORE = range(5)
+
+    __slots__ = ('parent', 'row', 'kind', 'container', 'path', 'entry', 'children',
+                 'next_token', 'loaded_at', 'loading', 'error')
+
+    def __init__(self, parent, kind, container=None, path="", entry=None):
+        self.parent = parent
+        self.row = 0
+        self.kind = kind
+        self.container = container
+        self.path = path  # prefix 노드는 'a/b/', 블랍 노드는 전체 블랍 이름
+        self.entry = entry
+        self.children = []
+        self.next_token = None
+        self.loaded_at = None  # 첫 페이지를 불러온 시각 (time.monotonic)
+        self.loading = False
+        self.error = None
+
+    @property
+    def is_folder(self):
+        return self.kind in (self.CONTAINER, self.PREFIX)
+
+    def display_name(self):
+        if self.kind == self.CONTAINER:
+            return self.container
+        if self.kind == self.MORE:
+            return f"[오류] {self.error} (더블 클릭하여 다시 시도)" if self.error else "(더 보기...)"
+        name = self.path.rstrip('/')
+        return name[len(self.parent.path):] if self.parent.kind == self.PREFIX else name
+
+
+class BlobTreeModel(QAbstractItemModel):
+    """'/' 구분자 기반으로 가상 디렉토리를 한 단계씩 불러오는 트리 모델입니다.
+
+    처음에는 컨테이너 노드만 있고, 노드를 펼칠 때 해당 prefix의 첫 페이지를 백그라운드에서 조회합니다.
+    다음 페이지가 있으면 '(더 보기...)' 노드를 두어 필요할 때만 이어서 조회합니다.
+    불러온 노드는 ttl초 동안 캐시되며, 그 이후 다시 펼치면 새로 조회합니다.
+    """
+
+    COLUMNS = ["이름", "크기", "수정 시각"]
+
+    page_loaded = pyqtSignal(object, object, object)  # node, 요청한 continuation token, Future
+
+    def __init__(self, account, blob_handler, ttl=300, page_size=1000, parent=None):
+        super().__init__(parent)
+        self.account = account
+        self.blob_handler = blob_handler
+        self.ttl = ttl
+        self.page_size = page_size
+        self.root = _TreeNode(None, _TreeNode.ROOT)
+        for container in account['containers']:
+            self._append_child(self.root, _TreeNode(self.root, _TreeNode.CONTAINER, container))
+        self.page_loaded.connect(self._on_page_loaded)
+
+        style = QApplication.style()
+        self._folder_icon = style.standardIcon(QStyle.SP_DirIcon)
+        self._file_icon = style.standardIcon(QStyle.SP_FileIcon)
+
+    # --- QAbstractItemModel 구현 ---
+
+    def node(self, index):
+        return index.internalPointer() if index.isValid() else self.root
+
+    def index(self, row, column, parent=QModelIndex()):
+        node = self.node(parent)
+        if 0 <= row < len(node.children) and 0 <= column < len(self.COLUMNS):
+            return self.createIndex(row, column, node.children[row])
+        return QModelIndex()
+
+    def parent(self, index):
+        if not index.isValid():
+            return QModelIndex()
+        parent = index.internalPointer().parent
+        if parent is None or parent is self.root:
+            return QModelIndex()
+        return self.createIndex(parent.row, 0, parent)
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid() and parent.column() != 0:
+            return 0
+        return len(self.node(parent).children)
+
+    def columnCount(self, parent=QModelIndex()):
+        return len(self.COLUMNS)
+
+    def hasChildren(self, parent=QModelIndex()):
+        node = self.node(parent)
+        if node.kind == _TreeNode.ROOT:
+            return bool(node.children)
+        if node.is_folder:
+            return node.loaded_at is None or bool(node.children)
+        return False
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.internalPointer().kind != _TreeNode.MORE:
+            flags |= Qt.ItemIsDragEnabled
+        return flags
+
+    def mimeTypes(self):
+        return [BLOB_KEYS_MIME]
+
+    def mimeData(self, indexes):
+        """블랍 노드는 블랍 키로, 컨테이너/prefix 노드는 그 아래 전체를 뜻하는 경로로 담습니다."""
+        prefixes = []
+        for index in indexes:
+            node = self.node(index)
+            if index.column() == 0 and node.is_folder:
+                prefixes.append((node.container, node.path))
+        return blob_mime_data(self.account['account_name'], self.keys_for_indexes(indexes), prefixes)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        node = index.internalPointer()
+        column = index.column()
+
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return node.display_name()
+            if node.kind == _TreeNode.BLOB:
+                if column == 1:
+                    return f"{node.entry.size:,}" if node.entry.size is not None else ""
+                if column == 2 and node.entry.last_modified:
+                    return node.entry.last_modified.astimezone().strftime('%Y-%m-%d %H:%M:%S')
+        elif role == Qt.DecorationRole and column == 0:
+            if node.is_folder:
+                return self._folder_icon
+            if node.kind == _TreeNode.BLOB:
+                return self._file_icon
+        elif role == Qt.TextAlignmentRole and column == 1:
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        elif role == Qt.ForegroundRole and node.kind == _TreeNode.MORE:
+            return QColor(Qt.red) if node.error else QColor(Qt.gray)
+        elif role == Qt.ToolTipRole and node.kind in (_TreeNode.PREFIX, _TreeNode.BLOB):
+            return f"{node.container}/{node.path}"
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        node = self.node(parent)
+        return node.is_folder and node.loaded_at is None and not node.loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        node = self.node(parent)
+        if node.is_folder and not node.loading:
+            self._start_load(node, None)
+
+    # --- 지연 조회 ---
+
+    def activate(self, index):
+        """'(더 보기...)' 노드를 더블 클릭하면 다음 페이지(또는 실패한 페이지)를 불러옵니다."""
+        node = self.node(index)
+        if node.kind == _TreeNode.MORE and not node.parent.loading:
+            folder = node.parent
+            self._start_load(folder, folder.next_token if folder.loaded_at is not None else None)
+
+    def refresh_if_stale(self, index):
+        """캐시 유효 시간(ttl)이 지난 노드를 다시 펼치면 첫 페이지부터 새로 조회합니다."""
+        node = self.node(index)
+        if (node.is_folder and not node.loading and node.loaded_at is not None
+                and time.monotonic() - node.loaded_at > self.ttl):
+            logging.debug(f"트리 캐시 만료: {node.container}/{node.path}")
+            self._start_load(node, None)
+
+    def _start_load(self, node, continuation_token):
+        node.loading = True
+        future = self.blob_handler.list_executor.submit(
+            self.blob_handler.list_prefix_page, self.account, node.container, node.path,
+            continuation_token, self.page_size)
+        # 작업 스레드에서 호출되지만 시그널은 GUI 스레드의 _on_page_loaded로 큐잉됩니다.
+        future.add_done_callback(lambda f, n=node, t=continuation_token: self.page_loaded.emit(n, t, f))
+
+    def _on_page_loaded(self, node, continuation_token, future):
+        node.loading = False
+        if not self._is_attached(node):
+            return  # 조회 중에 부모가 새로 고쳐져 떨어져 나간 노드
+
+        parent_index = self._index_of(node)
+        try:
+            prefixes, entries, next_token = future.result()
+        except Exception as e:
+            logging.error(f"prefix 조회 실패: {node.container}/{node.path}, 오류: {e}")
+            node.error = str(e)
+            self._set_more_node(node, parent_index, True)
+            return
+
+        node.error = None
+        if continuation_token is None:
+            # 첫 페이지: 기존 자식(만료된 캐시)을 새 결과로 교체
+            self._remove_children(node, parent_index, 0, len(node.children))
+            node.loaded_at = time.monotonic()
+        node.next_token = next_token
+
+        new_nodes = [_TreeNode(node, _TreeNode.PREFIX, node.container, prefix) for prefix in prefixes]
+        new_nodes += [_TreeNode(node, _TreeNode.BLOB, node.container, entry.name, entry) for entry in entries]
+        self._set_more_node(node, parent_index, False)
+        if new_nodes:
+            first = len(node.children)
+            self.beginInsertRows(parent_index, first, first + len(new_nodes) - 1)
+            for child in new_nodes:
+                self._append_child(node, child)
+            self.endInsertRows()
+        if next_token:
+            self._set_more_node(node, parent_index, True)
+        elif not node.children:
+            # 비어 있는 prefix는 펼침 표시를 없앱니다.
+            self.dataChanged.emit(parent_index, parent_index)
+
+    def _set_more_node(self, node, parent_index, present):
+        """'(더 보기...)' 노드를 자식 목록 맨 끝에 두거나 제거합니다."""
+        has_more = bool(node.children) and node.children[-1].kind == _TreeNode.MORE
+        if present and not has_more:
+            row = len(node.children)
+            self.beginInsertRows(parent_index, row, row)
+            self._append_child(node, _TreeNode(node, _TreeNode.MORE, node.container))
+            self.endInsertRows()
+        elif not present and has_more:
+            self._remove_children(node, parent_index, len(node.children) - 1, 1)
+        elif present and has_more:
+            more_index = self.index(len(node.children) - 1, 0, parent_index)
+            self.dataChanged.emit(more_index, more_index)
+        if present:
+            node.children[-1].error = node.error
+
+    # --- 삭제 반영 ---
+
+    def remove_blobs(self, keys):
+        """삭제된 (컨테이너, 블랍 이름)에 해당하는 노드를 이미 불러온 범위 안에서 제거합니다."""
+        for container, name in keys:
+            node = next((c for c in self.root.children if c.container == container), None)
+            parts = name.split('/')
+            path = ""
+            for part in parts[:-1]:
+                if node is None:
+                    break
+                path += part + '/'
+                node = next((c for c in node.children if c.kind == _TreeNode.PREFIX and c.path == path), None)
+            if node is None:
+                continue
+            blob = next((c for c in node.children if c.kind == _TreeNode.BLOB and c.path == name), None)
+            if blob is not None:
+                self._remove_children(node, self._index_of(node), blob.row, 1)
+
+    def add_containers(self, containers):
+        """계정 연결이 끝난 뒤 새로 알게 된 컨테이너 노드를 최상위에 추가합니다."""
+        known = {child.container for child in self.root.children}
+        new_nodes = [_TreeNode(self.root, _TreeNode.CONTAINER, container)
+                     for container in containers if container not in known]
+        if not new_nodes:
+            return
+        first = len(self.root.children)
+        self.beginInsertRows(QModelIndex(), first, first + len(new_nodes) - 1)
+        for child in new_nodes:
+            self._append_child(self.root, child)
+        self.endInsertRows()
+
+    def keys_for_indexes(self, indexes):
+        """선택된 인덱스 중 블랍 노드를 (컨테이너, 블랍 이름) 목록으로 변환합니다."""
+        keys = []
+        for index in indexes:
+            node = self.node(index)
+            if index.column() == 0 and node.kind == _TreeNode.BLOB:
+                keys.append((node.container, node.path))
+        return keys
+
+    def upload_target(self, index):
+        """업로드 위치 (컨테이너, blob 이름 prefix)를 반환합니다."""
+        node = self.node(index)
+        if node.kind == _TreeNode.CONTAINER:
+            return node.container, ""
+        if node.kind == _TreeNode.PREFIX:
+            return node.container, node.path.rstrip('/')
+        if node.kind == _TreeNode.BLOB:
+            return node.container, os.path.dirname(node.path)
+        return None
+
+    # --- 내부 도우미 ---
+
+    def _append_child(self, parent, child):
+        child.row = len(parent.children)
+        parent.children.append(child)
+
+    def _remove_children(self, node, parent_index, first, count):
+        if count <= 0:
+            return
+        self.beginRemoveRows(parent_index, first, first + count - 1)
+        for child in node.children[first:first + count]:
+            child.parent = None
+        del node.children[first:first + count]
+        for row in range(first, len(node.children)):
+            node.children[row].row = row
+        self.endRemoveRows()
+
+    def _index_of(self, node):
+        if node is self.root:
+            return QModelIndex()
+        return self.createIndex(node.row, 0, node)
+
+    def _is_attached(self, node):
+        while node is not None and node is not self.root:
+            node = node.parent
+        return node is self.root
@@ -0,0 +1,86 @@
+import logging
+import threading
+from PyQt5.QtCore import QObject, pyqtSignal, pyqtSlot
+from blob_storage import ListingCancelled
+
+
+class RefreshWorker(QObject):
+    """GUI 스레드 밖에서 블랍 목록을 조회하고 결과를 시그널로 GUI 스레드에 전달합니다.
+
+    위젯은 건드리지 않으며, 컨테이너 하나의 조회가 끝날 때마다 container_listed 또는
+    container_failed 시그널을 보내고 조회 묶음이 끝나면 refresh_finished를 보냅니다.
+    start_refresh는 묶음마다 스레드를 따로 띄우므로 느린 컨테이너의 조회가 다른 묶음을 막지 않습니다.
+    load_catalog(로컬 카탈로그의 목록을 container_cached로 전달)와 read_changes(변경 피드 이벤트를
+    changes_received로 전달)는 이 객체가 옮겨진 QThread에서 실행됩니다.
+    """
+
+    container_cached = pyqtSignal(object, str, object)  # account, container, 카탈로그의 BlobSnapshot
+    container_listed = pyqtSignal(object, str, object)  # account, container, BlobSnapshot
+    container_failed = pyqtSignal(object, str, object)  # account, container, 예외
+    container_unchanged = pyqtSignal(object, str)  # account, container (첫 페이지 확인 결과 변경 없음)
+    changes_received = pyqtSignal(object, object, object)  # account, ChangeEvent 목록, 새 커서
+    refresh_finished = pyqtSignal(object, bool)  # 조회 묶음의 취소 이벤트, 취소 여부
+
+    def __init__(self, blob_handler):
+        super().__init__()
+        self.blob_handler = blob_handler
+
+    @pyqtSlot(object)
+    def load_catalog(self, accounts):
+        """로컬 카탈로그에 저장된 목록을 읽어 화면을 먼저 채울 수 있도록 전달합니다."""
+        catalog = self.blob_handler.catalog
+        if catalog is None:
+            return
+        for account in accounts:
+            for container in account['containers']:
+                try:
+                    snapshot = catalog.load_container(account['account_name'], container)
+                except Exception as e:
+                    logging.error(f"카탈로그 읽기 실패: {account['account_name']}/{container}, 오류: {e}")
+                    continue
+                if snapshot is not None:
+                    self.container_cached.emit(account, container, snapshot)
+
+    @pyqtSlot(object)
+    def read_changes(self, accounts):
+        """변경 피드를 쓰는 계정의 새 이벤트를 읽어 전달합니다."""
+        for account in accounts:
+            try:
+                events, cursor = self.blob_handler.read_changes(account)
+            except Exception as e:
+                logging.error(f"변경 피드 읽기 실패: {account['account_name']}, 오류: {e}")
+                continue
+            self.changes_received.emit(account, events, cursor)
+
+    def start_refresh(self, accounts, cancel_event, probes):
+        """accounts의 컨테이너 조회를 새 스레드에서 시작합니다. 끝나면 refresh_finished(cancel_event, 취소 여부)를 보냅니다."""
+        threading.Thread(target=self.run_refresh, args=(accounts, cancel_event, probes),
+                         name='blob-refresh', daemon=True).start()
+
+    def run_refresh(self, accounts, cancel_event, probes):
+        """accounts의 모든 컨테이너를 조회합니다. cancel_event가 설정되면 즉시 중단합니다.
+
+        probes에 있는 컨테이너는 첫 페이지만 먼저 비교해 변경이 없으면 container_unchanged를 보냅니다.
+        """
+        logging.debug(f"백그라운드 갱신 시작. 계정 수: {len(accounts)}")
+        listings = self.blob_handler.iter_container_listings(accounts, cancel_event, probes)
+        try:
+            for account, container, snapshot, error in listings:
+                if cancel_event.is_set():
+                    break
+                if isinstance(error, ListingCancelled):
+                    continue
+                if error is not None:
+                    self.container_failed.emit(account, container, error)
+                elif snapshot is None:
+                    self.container_unchanged.emit(account, container)
+                else:
+                    self.container_listed.emit(account, container, snapshot)
+        except Exception as e:
+            logging.error(f"백그라운드 갱신 중 오류 발생: {e}")
+        finally:
+            listings.close()
+
+        cancelled = cancel_event.is_set()
+        logging.debug(f"백그라운드 갱신 종료. 취소 여부: {cancelled}")
+        self.refresh_finished.emit(cancel_event, cancelled)
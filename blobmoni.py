@@ -0,0 +1,596 @@
+import argparse
+import json
+import logging
+import os
+import signal
+import sys
+import threading
+from datetime import datetime, timezone
+from blob_engine import MonitorEngine
+from blob_inventory import InventoryAnalyzer, find_report_files, format_size
+from blob_jobs import (
+    COPY_KINDS, FAILED, KIND_LABELS, SYNC_KINDS, PRIORITY_HIGH, PRIORITY_LOW, PRIORITY_NORMAL, QUEUED, RUNNING, STATE_LABELS,
+    TransferJob, TransferManager
+)
+from blob_metrics import configure_metrics, profiler
+from blob_snapshot import entry_from_blob
+from blob_storage import BlobStorageHandler
+from blob_sync import OP_LABELS, SYNC_UP, DownloadPathConflict, download_paths
+from blob_tail import BlobTail
+from config_handler import ConfigHandler
+
+# 화면 없이 실행하는 blobmoni 명령줄 도구입니다. PyQt5를 불러오지 않습니다.
+#
+#   python blobmoni.py watch                      # 모니터링 루프를 돌며 변경 이벤트를 JSON Lines로 출력
+#   python blobmoni.py ls [컨테이너[/prefix]]
+#   python blobmoni.py get 컨테이너/블랍 ... -o 디렉토리
+#   python blobmoni.py put 파일 ... 컨테이너[/prefix]
+#   python blobmoni.py rm 컨테이너/블랍 ... [--prefix]
+#   python blobmoni.py cp 컨테이너/블랍 ... 컨테이너[/prefix] [--prefix] [--to-account 계정]   # 서버 측 복사 (mv는 이동)
+#   python blobmoni.py sync up|down 로컬디렉토리 컨테이너[/prefix] [--mirror] [--dry-run]   # 바뀐 파일만 동기화
+#   python blobmoni.py tail 컨테이너/블랍 [-c KB] [--head] [-f]   # 끝(처음) 일부만 읽기, -f면 새로 붙는 내용을 계속 출력
+#   python blobmoni.py inventory 보고서파일또는디렉토리 ... [--depth N]
+#   python blobmoni.py queue [--run] [--retry-failed] [--clear]   # 저장된 전송 대기열 (get/put --queue로 추가)
+
+PRIORITY_CHOICES = {'low': PRIORITY_LOW, 'normal': PRIORITY_NORMAL, 'high': PRIORITY_HIGH}
+
+
+def emit_json(record):
+    """한 줄짜리 JSON을 표준 출력에 씁니다."""
+    sys.stdout.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+    sys.stdout.flush()
+
+
+def entry_record(entry):
+    return {
+        'name': entry.name,
+        'size': entry.size,
+        'etag': entry.etag,
+        'last_modified': entry.last_modified.isoformat() if entry.last_modified else None,
+        'tier': entry.tier,
+    }
+
+
+def split_path(path):
+    """'컨테이너/블랍 경로'를 (컨테이너, 블랍 경로)로 나눕니다."""
+    container, _, name = path.strip('/').partition('/')
+    return container, name
+
+
+def connect(handler, account_name=None):
+    """계정을 연결해 반환합니다. account_name이 없으면 모든 계정, 있으면 그 계정 하나만 연결합니다."""
+    accounts = handler.create_accounts()
+    if account_name:
+        accounts = [account for account in accounts if account['account_name'] == account_name]
+        if not accounts:
+            raise SystemExit(f"계정을 찾을 수 없습니다: {account_name}")
+    elif not accounts:
+        raise SystemExit("AZURE_CONNECTION_1 환경 변수가 설정되어 있지 않습니다.")
+    futures = handler.connect_accounts(accounts)
+    return [future.result() for future in futures if future.exception() is None]
+
+
+def single_account(handler, args):
+    accounts = connect(handler, args.account) if args.account else connect(handler)[:1]
+    if not accounts:
+        raise SystemExit("계정에 연결할 수 없습니다.")
+    return accounts[0]
+
+
+def install_stop_handler(stop_event):
+    """Ctrl+C와 SIGTERM을 받으면 stop_event를 설정합니다."""
+    def handle(signum, frame):
+        logging.info("중지 요청을 받았습니다.")
+        stop_event.set()
+
+    signal.signal(signal.SIGINT, handle)
+    if hasattr(signal, 'SIGTERM'):
+        signal.signal(signal.SIGTERM, handle)
+
+
+def cmd_watch(handler, config, args):
+    """모든 계정을 GUI와 같은 규칙으로 모니터링하고 블랍 변경을 JSON Lines로 출력합니다."""
+    def on_diff(account, container, diff, source):
+        now = datetime.now(timezone.utc).isoformat()
+        for event, entries in (('added', diff.added), ('removed', diff.removed), ('changed', diff.changed)):
+            for entry in entries:
+                emit_json(dict(entry_record(entry), time=now, event=event, source=source,
+                               account=account['account_name'], container=container))
+
+    accounts = connect(handler, args.account)
+    if not accounts:
+        logging.error("연결된 계정이 없어 종료합니다.")
+        return 1
+    stop_event = threading.Event()
+    install_stop_handler(stop_event)
+    if args.profile_refresh:
+        profiler.arm(args.profile_refresh)
+    engine = MonitorEngine(handler, config, config.get('refresh_interval', 60), on_diff=on_diff)
+    logging.info(f"헤드리스 모니터링 시작: 계정 {len(accounts)}개")
+    engine.run(accounts, stop_event)
+    return 0
+
+
+def cmd_ls(handler, config, args):
+    """컨테이너 목록 또는 컨테이너/prefix 아래의 블랍 목록을 출력합니다."""
+    account = single_account(handler, args)
+    if not args.path:
+        for container in account['containers']:
+            emit_json({'container': container}) if args.json else print(container)
+        return 0
+
+    container, prefix = split_path(args.path)
+    container_client = account['client'].get_container_client(container)
+    for blob in container_client.list_blobs(name_starts_with=prefix or None):
+        if args.json:
+            emit_json(dict(entry_record(entry_from_blob(blob)), container=container))
+        else:
+            modified = blob.last_modified.strftime('%Y-%m-%d %H:%M:%S') if blob.last_modified else '-'
+            print(f"{blob.size:>14}  {modified}  {blob.name}")
+    return 0
+
+
+def cmd_inventory(handler, config, args):
+    """내려받은 Blob Inventory 보고서를 집계해 컨테이너/prefix별 블랍 수, 용량, 계층과 나이 분포를 출력합니다."""
+    try:
+        paths = find_report_files(args.paths)
+    except ValueError as e:
+        raise SystemExit(str(e))
+    if not paths:
+        raise SystemExit("인벤토리 보고서 파일(.csv, .parquet)을 찾지 못했습니다.")
+    analyzer = InventoryAnalyzer(prefix_depth=args.depth or config.get('inventory_prefix_depth', 2),
+                                 max_prefixes=config.get('inventory_max_prefixes', 100000),
+                                 batch_rows=config.get('inventory_batch_rows', 65536))
+    cancel_event = threading.Event()
+    install_stop_handler(cancel_event)
+    if not analyzer.add_files(paths, cancel_event=cancel_event):
+        return 1
+
+    if args.json:
+        for record in analyzer.records():
+            emit_json(record)
+        return 0
+
+    def print_rollup(label, rollup, indent):
+        tiers = ", ".join(f"{tier or '-'} {format_size(size)}" for tier, (_, size) in
+                          sorted(rollup.tiers.items(), key=lambda item: -item[1][1]))
+        print(f"{'  ' * indent}{label}  {rollup.count:,}개  {format_size(rollup.bytes)}  [{tiers}]")
+
+    def print_children(container, prefix, indent):
+        for child, rollup in analyzer.child_prefixes(container, prefix):
+            print_rollup(child or "(최상위 블랍)", rollup, indent)
+            if child:
+                print_children(container, child, indent + 1)
+
+    print(f"보고서 {len(analyzer.files)}개, {analyzer.rows:,}행")
+    for container, rollup in analyzer.containers():
+        print_rollup(container, rollup, 0)
+        print_children(container, None, 1)
+    return 0
+
+
+def run_transfers(names, start, args):
+    """전송 작업을 시작하고 모두 끝날 때까지 기다립니다. 실패한 파일이 있으면 1을 반환합니다."""
+    cancel_event = threading.Event()
+    install_stop_handler(cancel_event)
+    results = {}
+
+    def finished(index, error):
+        results[index] = error
+        record = {'name': names[index], 'ok': error is None}
+        if error is not None:
+            record['error'] = str(error)
+        if args.json:
+            emit_json(record)
+        else:
+            print(f"{'완료' if error is None else '실패'}: {names[index]}" + (f" ({error})" if error else ""),
+                  file=sys.stdout if error is None else sys.stderr)
+
+    futures = start(finished, cancel_event)
+    for future in futures:
+        try:
+            future.result()
+        except Exception:
+            pass  # 결과는 finished에서 이미 출력했습니다.
+    return 1 if any(error is not None for error in results.values()) else 0
+
+
+def account_name_for_queue(handler, args):
+    """대기열에 넣을 작업의 계정 이름입니다. 연결하지 않고 설정에서 찾습니다."""
+    names = [account['account_name'] for account in handler.create_accounts()]
+    if args.account:
+        if args.account not in names:
+            raise SystemExit(f"계정을 찾을 수 없습니다: {args.account}")
+        return args.account
+    if not names:
+        raise SystemExit("AZURE_CONNECTION_1 환경 변수가 설정되어 있지 않습니다.")
+    return names[0]
+
+
+def enqueue_jobs(handler, config, jobs):
+    """작업을 저장된 전송 대기열에 넣기만 합니다. 실행은 'queue --run' 또는 GUI가 합니다."""
+    if not config.get('transfer_queue_enabled', True):
+        raise SystemExit("transfer_queue_enabled가 false라 대기열을 사용할 수 없습니다.")
+    manager = TransferManager(handler, config, lambda account_name: None)
+    try:
+        for job in manager.enqueue(jobs):
+            print(f"대기열에 추가: #{job.id} {KIND_LABELS[job.kind]} {job.label()}")
+    finally:
+        manager.close()
+    rejected = [job for job in jobs if job.id is None]
+    for job in rejected:
+        print(f"같은 로컬 경로로 받는 작업이 이미 있어 넣지 않았습니다: {job.label()} -> {job.local_path}", file=sys.stderr)
+    return 1 if rejected else 0
+
+
+def cmd_get(handler, config, args):
+    """블랍들을 블랍 이름의 폴더 구조대로 동시에 내려받습니다. 중단된 다운로드는 다시 실행하면 이어받습니다.
+
+    두 블랍이 같은 로컬 파일에 저장되거나 저장 디렉토리 밖을 가리키면 아무것도 받지 않고 1을 반환합니다.
+    """
+    keys = [split_path(path) for path in args.paths]
+    targets = download_paths(keys, args.output)
+    conflicts = [(f"{container}/{name}", target) for (container, name), target in zip(keys, targets)
+                 if isinstance(target, DownloadPathConflict)]
+    for name, conflict in conflicts:
+        if args.json:
+            emit_json({'name': name, 'ok': False, 'error': str(conflict)})
+        else:
+            print(f"실패: {name} ({conflict})", file=sys.stderr)
+    if conflicts:
+        return 1
+    if args.queue:
+        account_name = account_name_for_queue(handler, args)
+        return enqueue_jobs(handler, config, [
+            TransferJob('download', account_name, container, name, target, priority=PRIORITY_CHOICES[args.priority])
+            for (container, name), target in zip(keys, targets)])
+    account = single_account(handler, args)
+    os.makedirs(args.output, exist_ok=True)
+    names = [f"{container}/{name}" for container, name in keys]
+    return run_transfers(names, lambda finished, cancel_event: handler.download_blobs(
+        account, keys, args.output, finished_callback=finished, cancel_event=cancel_event), args)
+
+
+def cmd_put(handler, config, args):
+    """로컬 파일들을 컨테이너[/prefix]에 동시에 업로드합니다."""
+    container, prefix = split_path(args.destination)
+    items = []
+    for file_path in args.files:
+        blob_name = handler.make_blob_name(prefix, file_path)
+        if not handler.is_valid_blob_name(blob_name):
+            print(f"유효하지 않은 Blob 이름이라 건너뜁니다: {blob_name}", file=sys.stderr)
+            continue
+        items.append((file_path, blob_name))
+    if not items:
+        return 1
+    if args.queue:
+        account_name = account_name_for_queue(handler, args)
+        return enqueue_jobs(handler, config, [
+            TransferJob('upload', account_name, container, blob_name, os.path.abspath(file_path),
+                        priority=PRIORITY_CHOICES[args.priority]) for file_path, blob_name in items])
+    account = single_account(handler, args)
+    names = [f"{container}/{blob_name}" for _, blob_name in items]
+    return run_transfers(names, lambda finished, cancel_event: handler.upload_files(
+        account, container, items, finished_callback=finished, cancel_event=cancel_event), args)
+
+
+def cmd_rm(handler, config, args):
+    """블랍들을 배치 요청으로 삭제합니다. --prefix면 각 경로 아래의 모든 블랍을 삭제합니다."""
+    account = single_account(handler, args)
+    cancel_event = threading.Event()
+    install_stop_handler(cancel_event)
+    deleted, failures = [], []
+    if args.prefix:
+        for path in args.paths:
+            container, prefix = split_path(path)
+            ok, failed = handler.delete_prefix(account, container, prefix, cancel_event=cancel_event)
+            deleted += ok
+            failures += failed
+    else:
+        ok, failed = handler.delete_blobs(account, [split_path(path) for path in args.paths],
+                                          cancel_event=cancel_event)
+        deleted += ok
+        failures += failed
+
+    for container, name in deleted:
+        emit_json({'name': f"{container}/{name}", 'ok': True}) if args.json else print(f"삭제: {container}/{name}")
+    for (container, name), reason in failures:
+        if args.json:
+            emit_json({'name': f"{container}/{name}", 'ok': False, 'error': reason})
+        else:
+            print(f"실패: {container}/{name} ({reason})", file=sys.stderr)
+    return 1 if failures else 0
+
+
+def cmd_cp(handler, config, args):
+    """블랍들을 내려받지 않고 서버 측 복사로 컨테이너[/prefix] 아래에 복사합니다. --to-account면 다른 계정으로 복사합니다.
+
+    mv는 복사본을 확인한 뒤 원본을 지웁니다. --prefix면 각 경로 아래의 모든 블랍을 복사합니다.
+    """
+    move = args.command == 'mv'
+    dest_container, dest_prefix = split_path(args.destination)
+    sources = [split_path(path) for path in args.paths]
+    if args.queue:
+        account_name = account_name_for_queue(handler, args)
+        dest_name = args.to_account or account_name
+        if dest_name not in [account['account_name'] for account in handler.create_accounts()]:
+            raise SystemExit(f"계정을 찾을 수 없습니다: {dest_name}")
+        options = {'priority': PRIORITY_CHOICES[args.priority], 'dest_account': dest_name,
+                   'dest_container': dest_container, 'dest_prefix': dest_prefix}
+        if args.prefix:
+            jobs = [TransferJob('move_prefix' if move else 'copy_prefix', account_name, container, prefix, **options)
+                    for container, prefix in sources]
+        else:
+            jobs = [TransferJob('move' if move else 'copy', account_name, sources[0][0], keys=sources, **options)]
+        return enqueue_jobs(handler, config, jobs)
+
+    account = single_account(handler, args)
+    dest = account
+    if args.to_account and args.to_account != account['account_name']:
+        accounts = connect(handler, args.to_account)
+        if not accounts:
+            raise SystemExit(f"계정에 연결할 수 없습니다: {args.to_account}")
+        dest = accounts[0]
+    cancel_event = threading.Event()
+    install_stop_handler(cancel_event)
+    copied, failures = [], []
+    try:
+        if args.prefix:
+            for container, prefix in sources:
+                ok, failed = handler.copy_prefix(account, container, prefix, dest, dest_container, dest_prefix, move,
+                                                 cancel_event=cancel_event)
+                copied += ok
+                failures += failed
+        else:
+            copied, failures = handler.copy_blobs(account, sources, dest, dest_container, dest_prefix, move,
+                                                  cancel_event=cancel_event)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    for container, name in copied:
+        if args.json:
+            emit_json({'name': f"{container}/{name}", 'ok': True})
+        else:
+            print(f"{'이동' if move else '복사'}: {container}/{name}")
+    for (container, name), reason in failures:
+        if args.json:
+            emit_json({'name': f"{container}/{name}", 'ok': False, 'error': reason})
+        else:
+            print(f"실패: {container}/{name} ({reason})", file=sys.stderr)
+    return 1 if failures or cancel_event.is_set() else 0
+
+
+def cmd_sync(handler, config, args):
+    """로컬 디렉토리와 컨테이너[/prefix]를 비교해 바뀐 파일만 한 방향으로 보냅니다(up) 또는 받습니다(down).
+
+    --mirror면 반대쪽에만 있는 파일을 지우고, --dry-run이면 바꿀 내용만 출력합니다.
+    """
+    container, prefix = split_path(args.destination)
+    local_dir = os.path.abspath(args.local_dir)
+    kind = f"{'mirror' if args.mirror else 'sync'}_{args.direction}"
+    if args.queue:
+        if args.direction == SYNC_UP and not os.path.isdir(local_dir):
+            raise SystemExit(f"로컬 디렉토리가 없습니다: {local_dir}")
+        return enqueue_jobs(handler, config, [TransferJob(kind, account_name_for_queue(handler, args), container,
+                                                          prefix, local_dir, priority=PRIORITY_CHOICES[args.priority])])
+
+    account = single_account(handler, args)
+    cancel_event = threading.Event()
+    install_stop_handler(cancel_event)
+    try:
+        plan = handler.plan_sync(account, args.direction, local_dir, container, prefix, args.mirror, cancel_event)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    def report(action, state, error=None):
+        if args.json:
+            record = {'action': action.op, 'path': action.relative, 'blob': f"{container}/{action.blob_name}",
+                      'local_path': action.local_path, 'size': action.size, 'reason': action.reason, 'state': state}
+            if error is not None:
+                record['error'] = error
+            emit_json(record)
+        elif error is not None:
+            print(f"실패: {OP_LABELS[action.op]} {action.relative} ({error})", file=sys.stderr)
+        else:
+            print(f"{'계획' if state == 'planned' else '완료'}: {OP_LABELS[action.op]} {action.relative} ({action.reason})")
+
+    for relative, reason in plan.skipped:
+        print(f"건너뜀: {relative} ({reason})", file=sys.stderr)
+    if args.dry_run:
+        for action in plan.actions:
+            report(action, 'planned')
+        print(f"계획: {plan.summary()}", file=sys.stderr if args.json else sys.stdout)
+        return 0
+
+    finished, failures = handler.run_sync(account, plan, cancel_event=cancel_event)
+    for action in finished:
+        report(action, 'done')
+    for action, reason in failures:
+        report(action, 'failed', reason)
+    print(f"동기화: {plan.summary()} - {len(finished):,}개 처리, {len(failures):,}개 실패",
+          file=sys.stderr if args.json else sys.stdout)
+    return 1 if failures or cancel_event.is_set() else 0
+
+
+def cmd_tail(handler, config, args):
+    """블랍의 끝(--head면 처음) N KB만 구간 요청으로 읽어 출력합니다. -f면 새로 붙는 구간만 받아 이어서 출력합니다."""
+    account = single_account(handler, args)
+    container, name = split_path(args.path)
+    length = int(float(args.kb or config.get('preview_kb', 64)) * 1024)
+    try:
+        tail = BlobTail(account['client'].get_blob_client(container, name),
+                        args.encoding or config.get('preview_encoding') or 'utf-8',
+                        max(length, int(config.get('preview_follow_max_kb', 1024)) * 1024))
+    except LookupError as e:
+        raise SystemExit(f"알 수 없는 인코딩입니다: {e}")
+    stop_event = threading.Event()
+    install_stop_handler(stop_event)
+
+    def write(text):
+        if text:
+            sys.stdout.write(text)
+            sys.stdout.flush()
+
+    write(tail.head(length) if args.head else tail.tail(length))
+    base_interval = args.interval or float(config.get('preview_follow_interval', 2))
+    max_interval = max(base_interval, float(config.get('preview_follow_max_interval', 30)))
+    interval = base_interval
+    while args.follow and not stop_event.wait(interval):
+        try:
+            text = tail.poll()
+        except Exception as e:
+            logging.warning(f"따라가기 확인 실패, 잠시 뒤 다시 시도합니다: {e}")
+            interval = min(interval * 2, max_interval)
+            continue
+        if tail.restarted:
+            print("blobmoni: 블랍이 작아졌거나 다시 만들어져 끝부분부터 다시 읽습니다.", file=sys.stderr)
+        elif tail.skipped:
+            print(f"blobmoni: {format_size(tail.skipped)}를 건너뜁니다.", file=sys.stderr)
+        write(text)
+        # 새 내용이 없으면 확인 간격을 늘립니다.
+        interval = base_interval if text else min(interval * 2, max_interval)
+    return 0
+
+
+def cmd_queue(handler, config, args):
+    """저장된 전송 대기열을 출력합니다. --run이면 대기 중인 작업을 모두 실행하고, Ctrl+C로 멈추면 다음에 이어서 합니다."""
+    if not config.get('transfer_queue_enabled', True):
+        raise SystemExit("transfer_queue_enabled가 false라 대기열을 사용할 수 없습니다.")
+    accounts = {}
+    if args.run:
+        accounts = {account['account_name']: account for account in connect(handler, args.account)}
+    manager = TransferManager(handler, config, accounts.get)
+    try:
+        if args.clear:
+            print(f"끝난 작업 {manager.remove_finished()}개를 지웠습니다.", file=sys.stderr)
+        if args.retry_failed:
+            manager.resume([job for job in manager.job_list() if job.state == FAILED])
+        if args.run:
+            stop_event = threading.Event()
+            install_stop_handler(stop_event)
+            while not stop_event.wait(1.0):
+                jobs = [job for job in manager.job_list() if job.account_name in accounts
+                        and (not job.dest_account or job.dest_account in accounts)]
+                if not any(job.state in (QUEUED, RUNNING) for job in jobs):
+                    break
+                rates = manager.sample_rates()
+                logging.info(f"전송 중 {sum(job.state == RUNNING for job in jobs)}개, "
+                             f"대기 {sum(job.state == QUEUED for job in jobs)}개 "
+                             f"(업로드 {format_size(rates['upload'])}/s, 다운로드 {format_size(rates['download'])}/s)")
+        jobs = manager.job_list()
+    finally:
+        manager.close()
+
+    for job in jobs:
+        if args.json:
+            record = {'id': job.id, 'kind': job.kind, 'account': job.account_name, 'target': job.label(),
+                      'local_path': job.local_path or None, 'state': job.state, 'priority': job.priority,
+                      'attempts': job.attempts, 'done': job.done, 'total': job.total, 'error': job.error}
+            if job.kind in COPY_KINDS:
+                record.update(dest_account=job.dest_account, dest_container=job.dest_container,
+                              dest_prefix=job.dest_prefix)
+            elif job.kind in SYNC_KINDS:
+                record.update(container=job.container, prefix=job.blob_name)
+            emit_json(record)
+        else:
+            error = f"  ({job.error})" if job.error else ""
+            print(f"#{job.id:<5} {KIND_LABELS[job.kind]:<6} {STATE_LABELS[job.state]:<6} {job.account_name}: "
+                  f"{job.label()}{error}")
+    return 1 if any(job.state == FAILED for job in jobs) else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='blobmoni', description="blobmoni (블랍뭐니?) 헤드리스 모드")
+    parser.add_argument('--config', default='config.yaml', help="설정 파일 경로 (기본: config.yaml)")
+    parser.add_argument('--account', help="사용할 계정 이름 (기본: 첫 번째 계정, watch는 모든 계정)")
+    parser.add_argument('--log-level', help="로그 레벨 (기본: 설정 파일의 log_level)")
+    parser.add_argument('--json', action='store_true', help="결과를 JSON Lines로 출력")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    watch = sub.add_parser('watch', help="모니터링 루프를 돌며 변경 이벤트를 JSON Lines로 출력")
+    watch.add_argument('--profile-refresh', metavar='PATH', help="첫 갱신 한 번을 cProfile로 기록할 .prof 파일 경로")
+
+    ls = sub.add_parser('ls', help="컨테이너 또는 블랍 목록 출력")
+    ls.add_argument('path', nargs='?', help="컨테이너[/prefix]")
+
+    get = sub.add_parser('get', help="블랍 다운로드")
+    get.add_argument('paths', nargs='+', help="컨테이너/블랍")
+    get.add_argument('-o', '--output', default='.', help="저장할 디렉토리, 블랍 이름의 폴더 구조대로 저장 (기본: 현재 디렉토리)")
+
+    put = sub.add_parser('put', help="파일 업로드")
+    put.add_argument('files', nargs='+', help="업로드할 로컬 파일")
+    put.add_argument('destination', help="컨테이너[/prefix]")
+    cp = sub.add_parser('cp', help="서버 측 복사 (내려받지 않고 컨테이너/계정 사이에 복사)")
+    mv = sub.add_parser('mv', help="서버 측 이동 (복사본을 확인한 뒤 원본 삭제)")
+    for command in (cp, mv):
+        command.add_argument('paths', nargs='+', help="컨테이너/블랍 (--prefix면 컨테이너/prefix)")
+        command.add_argument('destination', help="대상 컨테이너[/prefix]")
+        command.add_argument('--prefix', action='store_true', help="경로 아래의 모든 블랍 복사")
+        command.add_argument('--to-account', help="대상 계정 이름 (기본: 원본과 같은 계정)")
+
+    sync = sub.add_parser('sync', help="로컬 디렉토리와 컨테이너의 증분 동기화 (바뀐 파일만 전송)")
+    sync.add_argument('direction', choices=('up', 'down'), help="up: 로컬 -> 컨테이너, down: 컨테이너 -> 로컬")
+    sync.add_argument('local_dir', help="로컬 디렉토리")
+    sync.add_argument('destination', help="컨테이너[/prefix]")
+    sync.add_argument('--mirror', action='store_true', help="반대쪽에만 있는 파일 삭제 (up이면 블랍, down이면 로컬 파일)")
+    sync.add_argument('--dry-run', action='store_true', help="바꾸지 않고 전송/삭제할 파일만 출력")
+
+    for command in (get, put, cp, mv, sync):
+        command.add_argument('--queue', action='store_true', help="바로 전송하지 않고 저장된 전송 대기열에 넣기")
+        command.add_argument('--priority', choices=PRIORITY_CHOICES, default='normal', type=str.lower,
+                             help="--queue로 넣을 작업의 우선순위 (기본: normal)")
+
+    rm = sub.add_parser('rm', help="블랍 삭제")
+    rm.add_argument('paths', nargs='+', help="컨테이너/블랍 (--prefix면 컨테이너/prefix)")
+    rm.add_argument('--prefix', action='store_true', help="경로 아래의 모든 블랍 삭제")
+
+    tail = sub.add_parser('tail', help="블랍의 끝(또는 처음) 일부만 읽기, -f로 새로 붙는 내용 따라가기")
+    tail.add_argument('path', help="컨테이너/블랍")
+    tail.add_argument('-c', '--kb', type=float, help="읽을 크기 (KB, 기본: 설정의 preview_kb, 64)")
+    position = tail.add_mutually_exclusive_group()
+    position.add_argument('--head', action='store_true', help="끝 대신 처음 부분 읽기")
+    position.add_argument('-f', '--follow', action='store_true', help="새로 붙는 내용을 계속 출력 (Ctrl+C로 종료)")
+    tail.add_argument('--interval', type=float, help="따라가기 확인 간격 (초, 기본: 설정의 preview_follow_interval, 2)")
+    tail.add_argument('--encoding', help="텍스트 인코딩 (기본: 설정의 preview_encoding, utf-8)")
+
+    inventory = sub.add_parser('inventory', help="내려받은 Blob Inventory 보고서(CSV/Parquet) 집계")
+    inventory.add_argument('paths', nargs='+', help="보고서 파일 또는 보고서가 있는 디렉토리")
+    inventory.add_argument('--depth', type=int, help="집계할 prefix 깊이 (기본: 설정의 inventory_prefix_depth, 2)")
+
+    queue = sub.add_parser('queue', help="저장된 전송 대기열 출력 및 실행")
+    queue.add_argument('--run', action='store_true', help="대기 중인 작업을 모두 끝날 때까지 실행")
+    queue.add_argument('--retry-failed', action='store_true', help="실패한 작업을 다시 대기열에 넣기")
+    queue.add_argument('--clear', action='store_true', help="끝난 작업(완료, 실패, 취소)을 대기열에서 지우기")
+    return parser
+
+
+COMMANDS = {'watch': cmd_watch, 'ls': cmd_ls, 'get': cmd_get, 'put': cmd_put, 'rm': cmd_rm, 'cp': cmd_cp,
+            'mv': cmd_cp, 'sync': cmd_sync, 'tail': cmd_tail, 'inventory': cmd_inventory, 'queue': cmd_queue}
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    config_handler = ConfigHandler(args.config)
+    config_handler.load_env()
+    config = config_handler.load_config() or {}
+
+    log_level = (args.log_level or config.get('log_level', 'INFO')).upper()
+    root_logger = logging.getLogger()
+    root_logger.setLevel(getattr(logging, log_level, logging.INFO))
+    for log_handler in root_logger.handlers:
+        log_handler.setStream(sys.stderr)  # 표준 출력은 결과 전용으로 둡니다.
+
+    metrics_server = configure_metrics(config) if args.command == 'watch' else None
+    handler = BlobStorageHandler(config)
+    try:
+        return COMMANDS[args.command](handler, config, args)
+    finally:
+        if handler.catalog is not None:
+            handler.catalog.close()
+        handler.syncer.close()
+        if metrics_server is not None:
+            metrics_server.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,145 @@
+import logging
+import threading
+from PyQt5.QtCore import Qt, pyqtSignal
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTreeWidget, QTreeWidgetItem, QHeaderView
+)
+from blob_inventory import AGE_LABELS, InventoryAnalyzer, format_size
+from qt_signals import TaskSignals
+
+
+def share_text(parts, total, limit=3):
+    """[(이름, 값), ...]을 값이 큰 순서로 '이름 60% · 이름 30%' 형태의 문자열로 만듭니다."""
+    if not total:
+        return ""
+    parts = sorted((part for part in parts if part[1]), key=lambda part: -part[1])
+    return " · ".join(f"{name} {value * 100 / total:.0f}%" for name, value in parts[:limit])
+
+
+def rollup_tooltip(rollup):
+    """계층별, 나이별 블랍 수와 용량 전체를 보여주는 툴팁 문자열을 만듭니다."""
+    lines = ["[계층]"]
+    for tier, (count, size) in sorted(rollup.tiers.items(), key=lambda item: -item[1][1]):
+        lines.append(f"  {tier or '(없음)'}: {count:,}개, {format_size(size)}")
+    lines.append("[마지막 수정 이후]")
+    for label, count, size in zip(AGE_LABELS, rollup.age_counts, rollup.age_bytes):
+        if count:
+            lines.append(f"  {label}: {count:,}개, {format_size(size)}")
+    return "\n".join(lines)
+
+
+class InventoryPanel(QWidget):
+    """Blob Inventory 보고서 집계를 계정 목록 옆에 보여주는 패널입니다.
+
+    보고서는 작업 스레드에서 InventoryAnalyzer로 집계하며, 컨테이너 항목을 펼치면 그 아래 prefix 집계를
+    용량이 큰 순서로 보여줍니다. 닫기 버튼을 누르면 진행 중인 집계를 취소하고 closed 시그널을 보냅니다.
+    """
+
+    COLUMNS = ["경로", "블랍 수", "용량", "계층 (용량 비율)", "마지막 수정 이후 (용량 비율)"]
+    closed = pyqtSignal()
+
+    def __init__(self, paths, config, parent=None):
+        super().__init__(parent)
+        self.paths = paths
+        self.analyzer = InventoryAnalyzer(prefix_depth=config.get('inventory_prefix_depth', 2),
+                                          max_prefixes=config.get('inventory_max_prefixes', 100000),
+                                          batch_rows=config.get('inventory_batch_rows', 65536))
+        self.cancel_event = threading.Event()
+
+        title = QLabel("인벤토리 분석")
+        title.setStyleSheet("font-weight: bold;")
+        self.status_label = QLabel(f"보고서 {len(paths)}개 집계 중...")
+        self.status_label.setWordWrap(True)
+
+        self.tree = QTreeWidget()
+        self.tree.setColumnCount(len(self.COLUMNS))
+        self.tree.setHeaderLabels(self.COLUMNS)
+        self.tree.setUniformRowHeights(True)
+        self.tree.header().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.tree.itemExpanded.connect(self.on_item_expanded)
+
+        close_button = QPushButton("닫기")
+        close_button.clicked.connect(self.close_panel)
+        bottom = QHBoxLayout()
+        bottom.addWidget(self.status_label, 1)
+        bottom.addWidget(close_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(title)
+        layout.addWidget(self.tree)
+        layout.addLayout(bottom)
+        self.setLayout(layout)
+
+        # 패널이 닫힌 뒤에도 작업 스레드가 시그널을 보낼 수 있으므로 패널을 부모로 두지 않습니다.
+        self.signals = TaskSignals()
+        self.signals.progress.connect(self.on_progress)
+        self.signals.finished.connect(self.on_finished)
+        threading.Thread(target=self._run, name='blob-inventory', daemon=True).start()
+
+    def _run(self):
+        try:
+            result = self.analyzer.add_files(
+                self.paths, lambda index, count, rows: self.signals.progress.emit(rows, (index, count)),
+                self.cancel_event)
+        except Exception as e:
+            logging.error(f"인벤토리 보고서 집계 실패: {e}")
+            result = e
+        self.signals.finished.emit(result)
+
+    def on_progress(self, rows, position):
+        index, count = position
+        self.status_label.setText(f"보고서 {min(index + 1, count)}/{count}개 집계 중... {rows:,}행")
+
+    def on_finished(self, result):
+        if isinstance(result, Exception):
+            self.status_label.setText(f"[오류] {result}")
+            self.status_label.setStyleSheet("color: red;")
+            return
+        if not result:
+            return  # 취소됨
+        analyzer = self.analyzer
+        text = f"보고서 {len(analyzer.files)}개, {analyzer.rows:,}행"
+        if analyzer.overflowed:
+            text += f" (prefix가 {analyzer.max_prefixes:,}개를 넘어 일부는 '(기타)'로 모았습니다)"
+        self.status_label.setText(text)
+        for container, rollup in analyzer.containers():
+            self.tree.addTopLevelItem(self._make_item(container, rollup, container, None))
+
+    def _make_item(self, label, rollup, container, prefix):
+        item = QTreeWidgetItem([label, f"{rollup.count:,}", format_size(rollup.bytes),
+                                share_text([(tier or "(없음)", size) for tier, (_, size) in rollup.tiers.items()],
+                                           rollup.bytes),
+                                share_text(list(zip(AGE_LABELS, rollup.age_bytes)), rollup.bytes)])
+        for column in (1, 2):
+            item.setTextAlignment(column, int(Qt.AlignRight | Qt.AlignVCenter))
+        item.setToolTip(0, rollup_tooltip(rollup))
+        item.setData(0, Qt.UserRole, (container, prefix))
+        if prefix != "" and self.analyzer.children.get((container, prefix)):
+            item.setChildIndicatorPolicy(QTreeWidgetItem.ShowIndicator)
+        return item
+
+    def on_item_expanded(self, item):
+        """처음 펼칠 때 바로 아래 prefix 항목을 만듭니다."""
+        if item.childCount():
+            return
+        container, prefix = item.data(0, Qt.UserRole)
+        children = self.analyzer.child_prefixes(container, prefix)
+        for child, rollup in children:
+            label = "(최상위 블랍)" if child == "" else child[len(prefix or ""):]
+            item.addChild(self._make_item(label, rollup, container, child))
+
+        # 하위 prefix에 속하지 않는, 이 prefix 바로 아래의 블랍
+        if prefix is not None:
+            parent = self.analyzer.rollups[(container, prefix)]
+            count = parent.count - sum(rollup.count for _, rollup in children)
+            size = parent.bytes - sum(rollup.bytes for _, rollup in children)
+            if count > 0:
+                rest_item = QTreeWidgetItem(["(이 경로의 블랍)", f"{count:,}", format_size(size)])
+                for column in (1, 2):
+                    rest_item.setTextAlignment(column, int(Qt.AlignRight | Qt.AlignVCenter))
+                item.addChild(rest_item)
+
+    def close_panel(self):
+        self.cancel_event.set()
+        self.closed.emit()
+        self.deleteLater()
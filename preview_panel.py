@@ -0,0 +1,172 @@
+import itertools
+import logging
+import threading
+from PyQt5.QtCore import pyqtSignal
+from PyQt5.QtGui import QFontDatabase, QTextCursor
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QCheckBox, QComboBox, QPlainTextEdit
+)
+from blob_inventory import format_size
+from blob_tail import BlobTail
+from qt_signals import TaskSignals
+
+
+class BlobPreviewPanel(QWidget):
+    """블랍의 처음이나 끝 N KB만 구간 요청으로 읽어 보여주는 미리 보기 패널입니다.
+
+    "따라가기"를 켜면 끝부분을 읽은 뒤 주기적으로 속성을 확인해 새로 붙은 구간만 받아 아래에 덧붙입니다. 새 내용이
+    없으면 확인 간격을 preview_follow_max_interval까지 늘립니다. 화면에는 최대 preview_max_lines줄만 남기고 오래된
+    줄부터 지우므로 오래 따라가도 메모리 사용량이 늘지 않습니다. 읽기는 작업 스레드에서 하며, 다시 읽거나 닫으면
+    진행 중인 읽기는 결과를 버립니다.
+    """
+
+    MODES = ["끝부분", "처음 부분"]
+    closed = pyqtSignal()
+
+    def __init__(self, account, container, blob_name, config, parent=None):
+        super().__init__(parent)
+        self.blob_client = account['client'].get_blob_client(container, blob_name)
+        self.path = f"{account['account_name']}/{container}/{blob_name}"
+        self.encoding = config.get('preview_encoding') or 'utf-8'
+        self.max_fetch = int(config.get('preview_follow_max_kb', 1024)) * 1024
+        self.follow_interval = float(config.get('preview_follow_interval', 2))
+        self.follow_max_interval = max(self.follow_interval, float(config.get('preview_follow_max_interval', 30)))
+        self._sessions = itertools.count(1)
+        self._session = 0
+        self._stop_event = threading.Event()
+
+        title = QLabel(f"미리 보기: {self.path}")
+        title.setStyleSheet("font-weight: bold;")
+        title.setWordWrap(True)
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(self.MODES)
+        self.size_input = QLineEdit(str(int(config.get('preview_kb', 64))))
+        self.size_input.setFixedWidth(60)
+        reload_button = QPushButton("다시 읽기")
+        reload_button.clicked.connect(self.reload)
+        self.follow_check = QCheckBox("따라가기")
+        self.follow_check.toggled.connect(self.on_follow_toggled)
+        controls = QHBoxLayout()
+        controls.addWidget(self.mode_combo)
+        controls.addWidget(self.size_input)
+        controls.addWidget(QLabel("KB"))
+        controls.addWidget(reload_button)
+        controls.addWidget(self.follow_check)
+        controls.addStretch(1)
+
+        self.text = QPlainTextEdit()
+        self.text.setReadOnly(True)
+        self.text.setMaximumBlockCount(int(config.get('preview_max_lines', 10000)))
+        self.text.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+
+        self.status_label = QLabel()
+        self.status_label.setWordWrap(True)
+        close_button = QPushButton("닫기")
+        close_button.clicked.connect(self.close_panel)
+        bottom = QHBoxLayout()
+        bottom.addWidget(self.status_label, 1)
+        bottom.addWidget(close_button)
+
+        layout = QVBoxLayout()
+        layout.addWidget(title)
+        layout.addLayout(controls)
+        layout.addWidget(self.text)
+        layout.addLayout(bottom)
+        self.setLayout(layout)
+
+        # 패널이 닫힌 뒤에도 작업 스레드가 시그널을 보낼 수 있으므로 패널을 부모로 두지 않습니다.
+        self.signals = TaskSignals()
+        self.signals.progress.connect(self.on_text)
+        self.signals.finished.connect(self.on_failed)
+        self.reload()
+
+    def reload(self):
+        """진행 중인 읽기를 멈추고 지정한 위치와 크기로 다시 읽습니다. 따라가기가 켜져 있으면 이어서 따라갑니다."""
+        try:
+            length = int(float(self.size_input.text()) * 1024)
+            if length <= 0:
+                raise ValueError
+        except ValueError:
+            self.status_label.setText("읽을 크기는 0보다 큰 숫자(KB)로 입력하세요.")
+            return
+        self._stop_event.set()
+        self._stop_event = threading.Event()
+        self._session = next(self._sessions)
+        follow = self.follow_check.isChecked()
+        head = not follow and self.mode_combo.currentIndex() == 1
+        self.status_label.setText("읽는 중...")
+        threading.Thread(target=self._run, args=(self._session, self._stop_event, head, length, follow),
+                         name='blob-preview', daemon=True).start()
+
+    def on_follow_toggled(self, checked):
+        # 따라가기는 항상 끝부분부터 읽습니다.
+        self.mode_combo.setEnabled(not checked)
+        if checked:
+            self.mode_combo.setCurrentIndex(0)
+        self.reload()
+
+    def _run(self, session, stop_event, head, length, follow):
+        try:
+            tail = BlobTail(self.blob_client, self.encoding, max(self.max_fetch, length))
+            text = tail.head(length) if head else tail.tail(length)
+            self.signals.progress.emit((session, True), (text, self._status(tail, follow)))
+            interval = self.follow_interval
+            while follow and not stop_event.wait(interval):
+                try:
+                    text = tail.poll()
+                except Exception as e:
+                    # 일시적인 오류일 수 있으므로 간격을 늘려 계속 따라갑니다.
+                    logging.warning(f"따라가기 확인 실패: {self.path}, 오류: {e}")
+                    interval = min(interval * 2, self.follow_max_interval)
+                    self.signals.progress.emit((session, False), ("", f"[오류] {e} - {interval:.0f}초 뒤 다시 확인합니다."))
+                    continue
+                if tail.restarted:
+                    text = "\n[블랍이 작아졌거나 다시 만들어져 끝부분부터 다시 읽습니다]\n" + text
+                elif tail.skipped:
+                    text = f"\n[... {format_size(tail.skipped)} 건너뜀 ...]\n" + text
+                # 새 내용이 없으면 확인 간격을 늘리고, 있으면 처음 간격으로 되돌립니다.
+                interval = self.follow_interval if text else min(interval * 2, self.follow_max_interval)
+                self.signals.progress.emit((session, False), (text, self._status(tail, follow)))
+        except Exception as e:
+            logging.error(f"미리 보기 읽기 실패: {self.path}, 오류: {e}")
+            self.signals.finished.emit((session, e))
+
+    def _status(self, tail, follow):
+        size = format_size(tail.size or 0)
+        text = f"{tail.blob_type or '블랍'} {size}, {format_size(tail.offset)}까지 읽음"
+        return text + (" · 따라가는 중" if follow else "")
+
+    def on_text(self, key, payload):
+        session, reset = key
+        if session != self._session:
+            return  # 다시 읽기 전에 시작한 읽기의 결과입니다.
+        text, status = payload
+        self.status_label.setText(status)
+        if reset:
+            self.text.setPlainText(text)
+            if self.follow_check.isChecked() or self.mode_combo.currentIndex() == 0:
+                self.text.moveCursor(QTextCursor.End)
+            else:
+                self.text.moveCursor(QTextCursor.Start)
+            return
+        if not text:
+            return
+        scrollbar = self.text.verticalScrollBar()
+        at_bottom = scrollbar.value() >= scrollbar.maximum() - 2
+        cursor = QTextCursor(self.text.document())
+        cursor.movePosition(QTextCursor.End)
+        cursor.insertText(text)
+        if at_bottom:
+            scrollbar.setValue(scrollbar.maximum())
+
+    def on_failed(self, result):
+        session, error = result
+        if session == self._session:
+            self.status_label.setText(f"[오류] {error}")
+
+    def close_panel(self):
+        self._stop_event.set()
+        self._session = 0
+        self.closed.emit()
+        self.deleteLater()
@@ -0,0 +1,8 @@
+from PyQt5.QtCore import QObject, pyqtSignal
+
+
+class TaskSignals(QObject):
+    """작업 스레드에서 실행되는 일괄 작업(인벤토리 집계, 미리 보기 등)의 진행 상황과 결과를 GUI 스레드로 전달합니다."""
+
+    progress = pyqtSignal(object, object)  # 처리한 수, 전체 수 (모르면 None)
+    finished = pyqtSignal(object)  # 작업 결과 또는 예외
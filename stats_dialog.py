@@ -0,0 +1,83 @@
+from PyQt5.QtCore import QTimer
+from PyQt5.QtWidgets import (
+    QDialog, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QTableWidget, QTableWidgetItem, QHeaderView
+)
+from blob_metrics import metrics, profiler
+from transfers_panel import format_rate
+
+
+def format_metric_value(name, value):
+    """통계 창에 표시할 값 문자열을 만듭니다. 히스토그램 값은 (횟수, 합계)입니다."""
+    if isinstance(value, tuple):
+        count, total = value
+        average = total / count if count else 0.0
+        return f"{count}회, 평균 {average:.3f}초, 합계 {total:.2f}초"
+    if name.endswith('_bytes_per_second'):
+        return format_rate(value)
+    if name.endswith('_bytes_total'):
+        return f"{value / (1024 * 1024):.1f} MB"
+    if isinstance(value, float):
+        return f"{value:.3f}"
+    return str(value)
+
+
+class StatsDialog(QDialog):
+    """목록 조회, API 호출, 전송, 화면 반영 계측값을 표로 보여주는 창입니다.
+
+    값은 REFRESH_MS마다 다시 읽으며, "다음 갱신 프로파일링" 버튼은 다음 갱신 한 번을 cProfile로 기록합니다.
+    """
+
+    REFRESH_MS = 1000
+
+    def __init__(self, metrics_server=None, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("통계")
+        self.resize(760, 520)
+
+        layout = QVBoxLayout()
+        if metrics_server is not None:
+            endpoint = f"http://{metrics_server.host}:{metrics_server.port}/metrics"
+            layout.addWidget(QLabel(f"계측 엔드포인트: {endpoint}"))
+
+        self.table = QTableWidget(0, 3)
+        self.table.setHorizontalHeaderLabels(["항목", "레이블", "값"])
+        self.table.verticalHeader().hide()
+        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+        layout.addWidget(self.table)
+
+        self.profile_label = QLabel()
+        button_layout = QHBoxLayout()
+        self.profile_button = QPushButton("다음 갱신 프로파일링")
+        self.profile_button.clicked.connect(self.arm_profiler)
+        close_button = QPushButton("닫기")
+        close_button.clicked.connect(self.close)
+        button_layout.addWidget(self.profile_label)
+        button_layout.addStretch()
+        button_layout.addWidget(self.profile_button)
+        button_layout.addWidget(close_button)
+        layout.addLayout(button_layout)
+        self.setLayout(layout)
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.refresh)
+        self.timer.start(self.REFRESH_MS)
+        self.refresh()
+
+    def refresh(self):
+        rows = metrics.samples()
+        self.table.setRowCount(len(rows))
+        for row, (name, labels, value) in enumerate(rows):
+            label_text = ", ".join(f"{key}={text}" for key, text in labels.items())
+            for column, text in enumerate((name, label_text, format_metric_value(name, value))):
+                self.table.setItem(row, column, QTableWidgetItem(text))
+        if profiler.active:
+            self.profile_label.setText("이번 갱신을 프로파일링하는 중...")
+        elif profiler.armed:
+            self.profile_label.setText("다음 갱신을 프로파일링합니다. 결과는 로그와 .prof 파일에 남습니다.")
+        else:
+            self.profile_label.setText("")
+
+    def arm_profiler(self):
+        profiler.arm()
+        self.refresh()
@@ -0,0 +1,211 @@
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from PyQt5.QtGui import QColor
+from PyQt5.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit, QPushButton, QTableView, QAbstractItemView, QHeaderView,
+    QMessageBox
+)
+from blob_inventory import format_size
+from blob_jobs import (
+    CANCELLED, DONE, FAILED, KIND_LABELS, PAUSED, PRIORITY_HIGH, PRIORITY_LABELS, PRIORITY_LOW, QUEUED, RUNNING,
+    STATE_LABELS, SYNC_KINDS
+)
+from blob_model import selected_rows
+
+
+def format_rate(bytes_per_second):
+    """초당 바이트를 사람이 읽기 쉬운 단위로 변환합니다."""
+    for unit in ("B/s", "KB/s", "MB/s", "GB/s"):
+        if bytes_per_second < 1024 or unit == "GB/s":
+            return f"{bytes_per_second:.1f} {unit}"
+        bytes_per_second /= 1024
+
+
+class TransferJobModel(QAbstractTableModel):
+    """TransferManager의 작업 목록을 표로 보여주는 모델입니다. refresh()를 주기적으로 호출해 갱신합니다."""
+
+    COLUMNS = ["작업", "대상", "상태", "진행률", "속도", "우선순위", "시도"]
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.jobs = manager.job_list()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.jobs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return self.COLUMNS[section]
+        return None
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        job, column = self.jobs[index.row()], index.column()
+        if role == Qt.DisplayRole:
+            if column == 0:
+                return KIND_LABELS[job.kind]
+            if column == 1:
+                return job.label()
+            if column == 2:
+                return STATE_LABELS[job.state]
+            if column == 3:
+                return progress_text(job)
+            if column == 4:
+                return format_rate(job.rate) if job.state == RUNNING and job.counts_bytes else ""
+            if column == 5:
+                return PRIORITY_LABELS.get(job.priority, str(job.priority))
+            if column == 6:
+                return str(job.attempts)
+        elif role == Qt.ToolTipRole:
+            lines = [f"{job.account_name}: {job.label()}"]
+            if job.local_path:
+                lines.append(f"로컬 {'디렉토리' if job.kind in SYNC_KINDS else '파일'}: {job.local_path}")
+            if job.error:
+                lines.append(f"마지막 오류: {job.error}")
+            return "\n".join(lines)
+        elif role == Qt.ForegroundRole and column == 2:
+            if job.state == FAILED or (job.state == QUEUED and job.error):
+                return QColor(Qt.red)
+            if job.state in (DONE, CANCELLED):
+                return QColor(Qt.darkGray)
+        elif role == Qt.TextAlignmentRole and column in (3, 4, 6):
+            return int(Qt.AlignRight | Qt.AlignVCenter)
+        return None
+
+    def refresh(self):
+        """작업 목록을 다시 읽습니다. 새 작업은 뒤에 붙이고, 작업이 지워졌으면 모델을 다시 설정합니다."""
+        jobs = self.manager.job_list()
+        old = len(self.jobs)
+        if len(jobs) >= old and all(a is b for a, b in zip(jobs, self.jobs)):
+            if len(jobs) > old:
+                self.beginInsertRows(QModelIndex(), old, len(jobs) - 1)
+                self.jobs = jobs
+                self.endInsertRows()
+            if old:
+                self.dataChanged.emit(self.index(0, 0), self.index(old - 1, len(self.COLUMNS) - 1))
+        else:
+            self.beginResetModel()
+            self.jobs = jobs
+            self.endResetModel()
+
+    def jobs_for_rows(self, rows):
+        return [self.jobs[row] for row in rows if row < len(self.jobs)]
+
+
+def progress_text(job):
+    """진행률 열에 보여줄 문자열입니다. 전송은 바이트, 삭제는 블랍 수로 표시합니다."""
+    if job.counts_bytes:
+        if not job.total:
+            return format_size(job.done) if job.done else ""
+        return f"{job.done * 100 / job.total:.0f}% ({format_size(job.done)} / {format_size(job.total)})"
+    if job.total:
+        return f"{job.done:,}/{job.total:,}개"
+    return f"{job.done:,}개" if job.done else ""
+
+
+class TransfersPanel(QWidget):
+    """전송 대기열의 작업별 상태, 진행률, 속도와 전체 처리량을 보여주고 작업을 제어하는 패널입니다.
+
+    선택한 작업을 일시 정지/다시 시작/취소하거나 우선순위를 바꿀 수 있고, 업로드/다운로드 속도 제한(MB/s)을
+    실행 중에 바꿀 수 있습니다. 화면은 REFRESH_MS마다 갱신합니다.
+    """
+
+    REFRESH_MS = 1000
+
+    def __init__(self, manager, parent=None):
+        super().__init__(parent)
+        self.manager = manager
+        self.model = TransferJobModel(manager, self)
+
+        self.view = QTableView()
+        self.view.setModel(self.model)
+        self.view.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.view.setWordWrap(False)
+        self.view.verticalHeader().hide()
+        self.view.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.view.horizontalHeader().setSectionResizeMode(1, QHeaderView.Stretch)
+
+        self.summary_label = QLabel()
+        title = QLabel("전송")
+        title.setStyleSheet("font-weight: bold;")
+        header = QHBoxLayout()
+        header.addWidget(title)
+        header.addWidget(self.summary_label, 1)
+
+        buttons = QHBoxLayout()
+        for text, handler in (("일시 정지", lambda: manager.pause(self.selected_jobs())),
+                              ("다시 시작", lambda: manager.resume(self.selected_jobs())),
+                              ("취소", self.cancel_selected),
+                              ("우선순위 높게", lambda: manager.set_priority(self.selected_jobs(), PRIORITY_HIGH)),
+                              ("우선순위 낮게", lambda: manager.set_priority(self.selected_jobs(), PRIORITY_LOW)),
+                              ("모두 일시 정지", manager.pause_all),
+                              ("모두 다시 시작", manager.resume_all),
+                              ("끝난 작업 지우기", manager.remove_finished)):
+            button = QPushButton(text)
+            button.clicked.connect(lambda _, h=handler: (h(), self.refresh()))
+            buttons.addWidget(button)
+        buttons.addStretch(1)
+
+        upload_limit = manager.buckets['upload'].rate / (1024 * 1024)
+        download_limit = manager.buckets['download'].rate / (1024 * 1024)
+        self.upload_limit_input = QLineEdit(f"{upload_limit:g}" if upload_limit else "")
+        self.download_limit_input = QLineEdit(f"{download_limit:g}" if download_limit else "")
+        for line_edit in (self.upload_limit_input, self.download_limit_input):
+            line_edit.setPlaceholderText("제한 없음")
+            line_edit.setFixedWidth(80)
+        limit_button = QPushButton("속도 제한 적용")
+        limit_button.clicked.connect(self.apply_limits)
+        buttons.addWidget(QLabel("업로드 MB/s"))
+        buttons.addWidget(self.upload_limit_input)
+        buttons.addWidget(QLabel("다운로드 MB/s"))
+        buttons.addWidget(self.download_limit_input)
+        buttons.addWidget(limit_button)
+
+        layout = QVBoxLayout()
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.addLayout(header)
+        layout.addWidget(self.view)
+        layout.addLayout(buttons)
+        self.setLayout(layout)
+
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self.refresh)
+        self._timer.start(self.REFRESH_MS)
+        self.refresh()
+
+    def selected_jobs(self):
+        return self.model.jobs_for_rows(selected_rows(self.view))
+
+    def cancel_selected(self):
+        jobs = [job for job in self.selected_jobs() if not job.finished or job.state == FAILED]
+        if jobs and QMessageBox.question(self, "확인", f"선택한 작업 {len(jobs)}개를 취소할까요?") == QMessageBox.Yes:
+            self.manager.cancel(jobs)
+
+    def apply_limits(self):
+        try:
+            upload = float(self.upload_limit_input.text() or 0)
+            download = float(self.download_limit_input.text() or 0)
+            if upload < 0 or download < 0:
+                raise ValueError
+        except ValueError:
+            QMessageBox.warning(self, "오류", "속도 제한은 0 이상의 숫자(MB/s)로 입력하세요. 비워 두면 제한하지 않습니다.")
+            return
+        self.manager.set_limits(int(upload * 1024 * 1024), int(download * 1024 * 1024))
+
+    def refresh(self):
+        if not self.isVisible():
+            return
+        rates = self.manager.sample_rates()
+        self.model.refresh()
+        counts = {}
+        for job in self.model.jobs:
+            counts[job.state] = counts.get(job.state, 0) + 1
+        parts = [f"{STATE_LABELS[state]} {counts[state]}" for state in (RUNNING, QUEUED, PAUSED, FAILED)
+                 if counts.get(state)]
+        self.summary_label.setText(" · ".join(parts + [f"업로드 {format_rate(rates['upload'])}",
+                                                       f"다운로드 {format_rate(rates['download'])}"]))